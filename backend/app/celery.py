@@ -30,6 +30,7 @@ app.conf.task_routes = {
     "buildings.tasks.building_archive_handler_task": {"queue": "celery"},
     "cities.tasks.calculate_city_fields_task": {"queue": "beat"},
     "dvizh_api.tasks.update_offers_data_task": {"queue": "beat"},
+    "feeds.tasks.build_feeds_task": {"queue": "beat"},
     "main_page.tasks.deactivate_main_page_slides_task": {"queue": "beat"},
     "mortgage.tasks.calculate_mortgage_page_fields_task": {"queue": "beat"},
     "news.tasks.deactivate_old_actions_task": {"queue": "beat"},
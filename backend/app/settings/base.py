@@ -296,6 +296,15 @@ CELERYBEAT_SCHEDULE = {
         "task": "amocrm.tasks.update_credentials",
         "schedule": crontab(minute="*/10"),
     },
+    "build_feeds_task": {
+        "task": "feeds.tasks.build_feeds_task",
+        "schedule": crontab(minute="*/15"),
+    },
+    "force_build_feeds_task": {
+        "task": "feeds.tasks.build_feeds_task",
+        "schedule": crontab(minute=0, hour=4),
+        "kwargs": {"force": True},
+    },
     "update_projects_task": {
         "task": "profitbase.tasks.update_projects_task",
         "schedule": crontab(minute="*/20"),
@@ -5,52 +5,88 @@ from django.conf import settings
 from django.core.cache import caches
 from django.views.decorators.csrf import csrf_exempt
 from graphene_django.views import GraphQLView
-from graphql import Source, execute, parse
+from graphql import execute
 from graphql.execution.executor import subscribe
 from graphql.utils.get_operation_ast import get_operation_ast
 from rest_framework.views import APIView
 from rx import Observable
 
 from caches.classes import CrontabCache, ResolverCache, UserAgentCache
+from caches.documents import parse_document
 
 
-class SentryCachedGraphQLView(GraphQLView):
-    def execute_graphql_request(
-        self, request, data, query, variables, operation_name, show_graphiql=False
-    ):
-        chrome = "Chrome" in request.user_agent.browser.family
-        cache = ResolverCache(query, variables, request.site.domain, chrome)
-        if cache.cacheable:
-            result = self._execute_cached_graphql_request(
-                cache, chrome, request, data, query, variables, operation_name, show_graphiql
-            )
+class ResolverCacheMixin:
+    """
+    Кэш ответов для запросов из caches.storages.query_storage
+
+    При попадании в кэш возвращается готовый JSON без выполнения запроса.
+    """
+
+    def get_response(self, request, data, show_graphiql=False):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        resolver_cache = None
+        if not show_graphiql:
+            resolver_cache = self.get_resolver_cache(request, query, variables, operation_name)
+        if resolver_cache is not None:
+            cached = resolver_cache.get_result()
+            if cached is not None:
+                return cached, 200
+
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+
+        status_code = 200
+        if execution_result:
+            response = {}
+
+            if execution_result.errors:
+                response["errors"] = [
+                    self.format_error(e) for e in execution_result.errors
+                ]
+
+            if execution_result.invalid:
+                status_code = 400
+            else:
+                response["data"] = execution_result.data
+
+            if self.batch:
+                response["id"] = id
+                response["status"] = status_code
+
+            result = self.response_json_encode(request, response, pretty=show_graphiql)
+            self.set_cached_response(resolver_cache, request, execution_result, result)
         else:
-            result = self._execute_default_graphql_request(
-                request, data, query, variables, operation_name, show_graphiql
-            )
-        return result
+            result = None
+
+        return result, status_code
+
+    def response_json_encode(self, request, response, pretty):
+        return self.json_encode(request, response, pretty)
+
+    def get_resolver_cache(self, request, query, variables, operation_name):
+        if self.batch:
+            return None
+        chrome = "Chrome" in request.user_agent.browser.family
+        resolver_cache = ResolverCache(query, variables, request.site.domain, chrome, operation_name)
+        if not resolver_cache.cacheable:
+            return None
+        return resolver_cache
+
+    def set_cached_response(self, resolver_cache, request, execution_result, result) -> None:
+        if resolver_cache is None or execution_result.errors or execution_result.invalid:
+            return
+        resolver_cache.set_result(result)
+        if resolver_cache.need_crontab:
+            CrontabCache.add(resolver_cache.name)
+        if resolver_cache.need_ua:
+            UserAgentCache.set_result(request.user_agent, "Chrome" in request.user_agent.browser.family)
 
-    def _execute_cached_graphql_request(
-            self, cache, chrome, request, data, query, variables, operation_name, show_graphiql=False
-    ):
-        cache.set_options()
-        result = cache.get_result()
-        if not result:
-            result = super().execute_graphql_request(
-                request, data, query, variables, operation_name, show_graphiql
-            )
-            if result and result.errors:
-                self._capture_sentry_exceptions(result.errors)
-            if result and not result.errors:
-                cache.set_result(result)
-                if cache.need_crontab:
-                    CrontabCache.add(cache.name)
-                if cache.need_ua:
-                    UserAgentCache.set_result(request.user_agent, chrome)
-        return result
 
-    def _execute_default_graphql_request(
-            self, request, data, query, variables, operation_name, show_graphiql=False
+class SentryCachedGraphQLView(ResolverCacheMixin, GraphQLView):
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
     ):
         result = super().execute_graphql_request(
             request, data, query, variables, operation_name, show_graphiql
@@ -67,22 +103,26 @@ class SentryCachedGraphQLView(GraphQLView):
                 sentry_sdk.capture_exception(error)
 
 
-class ExtraCachingGraphQLView(GraphQLView, APIView):
+class ExtraCachingGraphQLView(ResolverCacheMixin, GraphQLView, APIView):
     """Класс с рядом переопределенных методов Graphene с кэшированием запросов."""
     def get_operation_ast(self, request):
         data = self.parse_body(request)
         query = request.GET.get("query") or data.get("query")
 
-        if not query:
+        document = parse_document(query)
+        if not document:
             return None
 
-        source = Source(query, name="GraphQL request")
-
-        document_ast = parse(source)
-        operation_ast = get_operation_ast(document_ast, None)
+        operation_ast = get_operation_ast(document.ast, None)
 
         return operation_ast
 
+    def is_resolver_cached(self, request) -> bool:
+        """Запрос кэшируется ResolverCache в get_response"""
+        data = self.parse_body(request)
+        query = request.GET.get("query") or data.get("query")
+        return ResolverCache(query, None, None, False).cacheable
+
     @staticmethod
     def fetch_cache_key(request):
         """ Returns a hashed cache key. """
@@ -103,11 +143,14 @@ class ExtraCachingGraphQLView(GraphQLView, APIView):
 
         cache = caches["default"]
         operation_ast = self.get_operation_ast(request)
-        if operation_ast and operation_ast.name.value == 'allCities':
+        if operation_ast and operation_ast.name and operation_ast.name.value == 'allCities':
             return self.super_call(request, *args, **kwargs)
         if operation_ast and operation_ast.operation == "mutation":
             cache.clear()
             return self.super_call(request, *args, **kwargs)
+        if operation_ast and self.is_resolver_cached(request):
+            # Кэшируется в get_response по нормализованному запросу
+            return self.super_call(request, *args, **kwargs)
 
         cache_key = "_graplql_{}".format(self.fetch_cache_key(request))
         response = cache.get(cache_key)
@@ -139,37 +182,3 @@ class ExtraCachingGraphQLView(GraphQLView, APIView):
         view = super(ExtraCachingGraphQLView, cls).as_view(*args, **kwargs)
         view = csrf_exempt(view)
         return view
-
-    def get_response(self, request, data, show_graphiql=False):
-        query, variables, operation_name, id = self.get_graphql_params(request, data)
-
-        execution_result = self.execute_graphql_request(
-            request, data, query, variables, operation_name, show_graphiql
-        )
-
-        status_code = 200
-        if execution_result:
-            response = {}
-
-            if execution_result.errors:
-                response["errors"] = [
-                    self.format_error(e) for e in execution_result.errors
-                ]
-
-            if execution_result.invalid:
-                status_code = 400
-            else:
-                response["data"] = execution_result.data
-
-            if self.batch:
-                response["id"] = id
-                response["status"] = status_code
-
-            result = self.response_json_encode(request, response, pretty=show_graphiql)
-        else:
-            result = None
-
-        return result, status_code
-
-    def response_json_encode(self, request, response, pretty):
-        return self.json_encode(request, response, pretty)
@@ -17,8 +17,12 @@ def calculate_building_min_flat_prices():
 
 
 def calculate_building_finish_dates():
+    from properties.facets import PropertyFacetSnapshot
+
     buildings = Building.objects.annotate_finish_dates()
     buildings.update(built_year=F("built_year_a"), ready_quarter=F("ready_quarter_a"))
+    # update() не вызывает post_save, а срок сдачи есть в снимке фасетов
+    PropertyFacetSnapshot.invalidate()
 
 
 def calculate_section_min_flat_prices():
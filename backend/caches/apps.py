@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CachesAppConfig(AppConfig):
     name = "caches"
     verbose_name = "Кэши"
+
+    def ready(self):
+        from . import signals
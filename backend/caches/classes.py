@@ -1,8 +1,9 @@
 from __future__ import annotations
+from hashlib import sha1
 from json import dumps, loads
+from time import time_ns
 from sentry_sdk import capture_exception
-from typing import Any, Dict, List
-from base64 import b64encode, b64decode
+from typing import Any, Dict, List, Optional
 from django.contrib.sites.models import Site
 from django.core.cache import cache
 from django.http import HttpRequest
@@ -13,6 +14,7 @@ from app.settings import TESTING
 from favorite.classes import Favorite
 from django.utils.decorators import classproperty
 from django.contrib.sessions.backends.cache import SessionStore
+from .documents import GraphQLDocument, canonical_json, parse_document
 from .storages import query_storage
 from .exceptions import CacheError
 
@@ -20,54 +22,69 @@ from .exceptions import CacheError
 class ResolverCache(object):
     """
     Кэш для определенных резолверов
+
+    Ключ строится из хэша нормализованного документа, каноничных переменных,
+    домена и ЮА (если нужны резолверу) и версий тегов моделей. В кэше хранится
+    готовый JSON ответа в байтах, поэтому попадание не требует выполнения graphene
+    и повторной сериализации. Изменение моделей, указанных в models резолвера,
+    повышает версию тега (см. caches.signals), старые ключи перестают читаться.
     """
 
-    _crontab_cache_name = "cache_update_list"
     _storage = query_storage
     _cache = cache
-    _skip = "SKIP"
+    _prefix = "resolver-cache"
+    _tag_prefix = "resolver-cache-tag"
+    # Поля, зависящие от сессии, не кэшируются
+    _session_fields = frozenset(("isFavorite",))
 
-    def __init__(self, query, variables, domain, chrome) -> None:
+    def __init__(self, query, variables, domain, chrome, operation_name=None) -> None:
+        if isinstance(variables, str):
+            try:
+                variables = loads(variables) if variables else None
+            except ValueError:
+                variables = None
         self._query = query
-        self._variables = variables
+        self._variables = variables or None
         self._domain = domain
-        self._chrome = dumps(chrome)
+        self._chrome = bool(chrome)
+        self._operation_name = operation_name
 
         self._result = None
         self._name = None
+        self._key = None
         self._cacheable = None
-        self._gql_data = None
-        self._operation = None
-
-        self._use_variables = False
-        self._use_domain = False
-        self._use_user_agent = False
-        self._use_crontab = False
-        self._cache_time = 3600
+        self._document = None
+        self._options = None
 
     @classmethod
     def init_from_cache(cls, name) -> ResolverCache:
         """
         Инициалиция из кэша по имени
         """
-        components = name.split("_")
-        query = b64decode(components[0]).decode("utf-8")
-        domain = components[1] if components[1] != cls._skip else None
-        chrome = loads(components[2]) if components[1] != cls._skip else False
-        variables = b64decode(components[3]).decode("utf-8") if components[3] != cls._skip else None
-        crontab = loads(components[4])
-        time = int(components[5])
-        self = cls(query, variables, domain, chrome)
+        meta = cls._cache.get(cls._meta_key(name))
+        if not meta:
+            raise CacheError(f"Resolver cache meta not found: {name}")
+        self = cls(meta["query"], meta["variables"], meta["domain"], meta["chrome"], meta["operation_name"])
+        self._cacheable = self.cacheable
         self._name = name
-        self._cacheable = True
-        self._use_domain = bool(domain)
-        self._use_user_agent = bool(chrome)
-        self._use_variables = bool(variables)
-        self._use_crontab = bool(crontab)
-        self._cache_time = time
-        self._gql_data = {"query": query, "variables": variables, "operationName": None}
         return self
 
+    @classmethod
+    def invalidate(cls, *models) -> None:
+        """
+        Сброс кэшей резолверов, зависящих от моделей (app_label.ModelName)
+        """
+        for model in models:
+            label = model if isinstance(model, str) else model._meta.label
+            if label in cls._storage.models:
+                cls._cache.set(cls._tag_key(label), str(time_ns()), None)
+
+    @property
+    def document(self) -> Optional[GraphQLDocument]:
+        if self._document is None:
+            self._document = parse_document(self._query, self._operation_name)
+        return self._document
+
     @property
     def cacheable(self) -> bool:
         """
@@ -75,112 +92,134 @@ class ResolverCache(object):
         """
         if self._cacheable is None:
             self._cacheable = True
-            if not self._query:
+            if not self._query or TESTING:
                 self._cacheable = False
-            if self.operation not in self._storage.queries:
+            elif not self.document or self.document.operation != "query" or not self.document.fields:
                 self._cacheable = False
-            if TESTING:
+            elif any(field not in self._storage for field in self.document.fields):
+                self._cacheable = False
+            elif self.document.field_names & self._session_fields:
                 self._cacheable = False
         return self._cacheable
 
     @property
-    def operation(self) -> str:
+    def operation(self) -> Optional[str]:
         """
-        Получение имени операции
+        Получение имени операции (первое корневое поле)
         """
-        if not self._operation:
-            try:
-                operation = "".join(
-                    self._query[self._query.find("{") + 1 :][
-                        : self._query[self._query.find("{") + 1 :].find("{")
-                    ].split()
-                )
-                if operation.count("("):
-                    operation = operation[: operation.find("(")]
-            except (IndexError, AttributeError):
-                operation = None
-            self._operation = operation
-        return self._operation
+        if self.document and self.document.fields:
+            return self.document.fields[0]
+        return None
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """
+        Опции декоратора, для нескольких корневых полей объединяются
+        """
+        if self._options is None:
+            self._check_cacheable()
+            self._options = self._storage.merge(self.document.fields)
+        return self._options
 
     @property
     def name(self) -> str:
         """
-        Получение имени кэша
+        Получение имени кэша (без версий тегов)
         """
-        if self._cacheable is None:
-            raise CacheError("Cacheable check was not provided.")
-        if not self._cacheable:
-            raise CacheError("Cannot access name in case of uncacheability")
+        self._check_cacheable()
         if self._name is None:
-            name = b64encode(self._query.encode("utf-8")).decode("utf-8")
-            if self._domain and self._use_domain:
-                name += "_" + self._domain
-            else:
-                name += "_" + self._skip
-            if self._use_user_agent:
-                name += "_" + self._chrome
-            else:
-                name += "_" + self._skip
-            if self._variables and self._use_variables:
-                name += "_" + b64encode(dumps(self._variables).encode("utf-8")).decode("utf-8")
-            else:
-                name += "_" + self._skip
-            name += "_" + dumps(self._use_crontab) + "_" + str(self._cache_time)
-            self._name = name
+            components = [
+                self.document.digest,
+                canonical_json(self._variables) if self.options["variables"] else None,
+                self._domain if self.options["domain"] else None,
+                self._chrome if self.options["user_agent"] else None,
+            ]
+            digest = sha1(canonical_json(components).encode("utf-8")).hexdigest()
+            self._name = f"{self._prefix}:{'-'.join(self.document.fields)}:{digest}"
         return self._name
 
+    @property
+    def key(self) -> str:
+        """
+        Ключ результата с версиями тегов моделей
+        """
+        if self._key is None:
+            models = self.options["models"]
+            if models:
+                versions = self._cache.get_many([self._tag_key(model) for model in models])
+                version = sha1(
+                    canonical_json([versions.get(self._tag_key(model)) for model in models]).encode("utf-8")
+                ).hexdigest()[:12]
+                self._key = f"{self.name}:{version}"
+            else:
+                self._key = self.name
+        return self._key
+
     @property
     def need_crontab(self) -> bool:
         """
         Нужно ли добавлять в кронтаб
         """
-        return self._use_crontab
+        return self.options["crontab"]
 
     @property
     def need_ua(self) -> bool:
         """
         Нужен ли ЮА
         """
-        return self._use_user_agent
+        return self.options["user_agent"]
 
-    def set_result(self, result) -> None:
+    def set_options(self) -> None:
         """
-        Установка резульата в кэш
+        Установка опций из декоратора
         """
-        self._cache.set(self.name, result, self._cache_time)
+        self._options = None
+        self._options = self.options
 
-    def set_options(self) -> None:
+    def set_result(self, result) -> None:
         """
-        Установка опций из декоратора
+        Установка резульата в кэш, result - готовый JSON ответа
         """
-        options = self._storage[self._operation]
-        self._use_variables = options.get("variables", False)
-        self._use_domain = options.get("domain", False)
-        self._use_user_agent = options.get("user_agent", False)
-        self._cache_time = options.get("time", 3600)
-        self._use_crontab = options.get("crontab", False)
+        if isinstance(result, str):
+            result = result.encode("utf-8")
+        self._cache.set(self.key, result, self.options["time"])
+        if self.need_crontab:
+            self._cache.set(self._meta_key(self.name), self.meta, max(self.options["time"] * 2, 3600))
 
-    def get_result(self) -> Any:
+    def get_result(self) -> Optional[bytes]:
         """
         Получение результата из кэша
         """
         if self._result is None:
-            self._result = self._cache.get(self.name)
+            self._result = self._cache.get(self.key)
         return self._result
 
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """
+        Данные для восстановления кэша в кронтабе
+        """
+        return dict(
+            query=self._query,
+            variables=self._variables,
+            domain=self._domain,
+            chrome=self._chrome,
+            operation_name=self._operation_name,
+        )
+
     @property
     def updatable(self) -> bool:
         """
         Может ли кэш быть обновлен
         """
-        return bool(self._query and self._domain and self._chrome and self._name)
+        return bool(self._query and self._domain and self._name and self.cacheable)
 
     @property
     def site(self) -> Site:
         """
         Сайт кэша
         """
-        if self._domain and self._use_domain:
+        if self._domain and self.options["domain"]:
             return Site.objects.filter(domain=self._domain).first()
         return Site.objects.first()
 
@@ -191,10 +230,10 @@ class ResolverCache(object):
         """
         data = dict(
             request=self.request,
-            data=self._gql_data,
+            data={"query": self._query, "variables": self._variables, "operationName": self._operation_name},
             query=self._query,
             variables=self._variables,
-            operation_name=None,
+            operation_name=self._operation_name,
         )
         return data
 
@@ -208,11 +247,23 @@ class ResolverCache(object):
         rest_request = Request(django_request)
         rest_request.site = self.site
         rest_request.method = "POST"
-        rest_request.user_agent = UserAgentCache.get_result(loads(self._chrome))
+        rest_request.user_agent = UserAgentCache.get_result(self._chrome)
         rest_request.session = SessionStore()
         rest_request.favorite = Favorite(rest_request.session)
         return rest_request
 
+    def _check_cacheable(self) -> None:
+        if not self.cacheable:
+            raise CacheError("Cannot access name in case of uncacheability")
+
+    @classmethod
+    def _meta_key(cls, name) -> str:
+        return f"{name}:meta"
+
+    @classmethod
+    def _tag_key(cls, label) -> str:
+        return f"{cls._tag_prefix}:{label}"
+
 
 class UserAgentCache(object):
     """
@@ -295,7 +346,8 @@ class CrontabCache(object):
                 resolver_cache = ResolverCache.init_from_cache(name)
                 if resolver_cache.updatable:
                     result = cls.result(**resolver_cache.update_data)
-                    resolver_cache.set_result(result)
+                    if result and not result.errors:
+                        resolver_cache.set_result(dumps({"data": result.data}, separators=(",", ":")))
             except Exception as error:
                 capture_exception(error)
 
@@ -11,6 +11,7 @@ def cached_resolver(**options) -> Callable:
     :domain: использовать домен
     :crontab: использовать кронтаб
     :time: время кэширования
+    :models: модели (app_label.ModelName), изменение которых сбрасывает кэш
     """
 
     def decorator(resolver) -> Callable:
@@ -21,3 +22,10 @@ def cached_resolver(**options) -> Callable:
         return resolver
 
     return decorator
+
+
+def cached_query(query_name, **options) -> None:
+    """
+    Добавляет в список кэширования поле без собственного резолвера (например, specs)
+    """
+    query_storage.add(query_name, options)
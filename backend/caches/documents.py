@@ -0,0 +1,68 @@
+from functools import lru_cache
+from hashlib import sha1
+from json import dumps
+from typing import Any, FrozenSet, Iterator, NamedTuple, Optional, Tuple
+
+from graphql import Source, parse
+from graphql.language.ast import Field
+from graphql.language.printer import print_ast
+from graphql.utils.get_operation_ast import get_operation_ast
+
+
+class GraphQLDocument(NamedTuple):
+    """
+    Разобранный GraphQL запрос
+    """
+
+    ast: Any
+    digest: str
+    operation: Optional[str]
+    fields: Tuple[str, ...]
+    field_names: FrozenSet[str]
+
+
+@lru_cache(maxsize=1024)
+def parse_document(query: str, operation_name: Optional[str] = None) -> Optional[GraphQLDocument]:
+    """
+    Разбор запроса с кэшированием по тексту запроса
+
+    digest - хэш нормализованного документа (без пробелов и комментариев),
+    fields - корневые поля операции, по которым определяется кэш резолверов,
+    field_names - все запрошенные поля документа
+    """
+    if not query:
+        return None
+    try:
+        document_ast = parse(Source(query, name="GraphQL request"))
+    except Exception:
+        return None
+    operation_ast = get_operation_ast(document_ast, operation_name)
+    if operation_ast is None:
+        return GraphQLDocument(document_ast, "", None, tuple(), frozenset())
+    fields = tuple(
+        selection.name.value
+        for selection in operation_ast.selection_set.selections
+        if isinstance(selection, Field)
+    )
+    if len(fields) != len(operation_ast.selection_set.selections):
+        # Фрагменты на корневом уровне не кэшируются
+        fields = tuple()
+    digest = sha1(print_ast(document_ast).encode("utf-8")).hexdigest()
+    field_names = frozenset(_walk_field_names(document_ast.definitions))
+    return GraphQLDocument(document_ast, digest, operation_ast.operation, fields, field_names)
+
+
+def _walk_field_names(nodes) -> Iterator[str]:
+    for node in nodes:
+        if isinstance(node, Field):
+            yield node.name.value
+        selection_set = getattr(node, "selection_set", None)
+        if selection_set is not None:
+            yield from _walk_field_names(selection_set.selections)
+
+
+def canonical_json(value: Any) -> str:
+    """
+    Каноничный JSON: порядок ключей и пробелы не влияют на результат
+    """
+    return dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
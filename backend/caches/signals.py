@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+
+from .classes import ResolverCache
+from .storages import query_storage
+
+
+def invalidate_resolver_cache(sender, **kwargs) -> None:
+    """
+    Сброс кэша резолверов при изменении модели
+    """
+    if sender._meta.label in query_storage.models:
+        ResolverCache.invalidate(sender._meta.label)
+
+
+post_save.connect(invalidate_resolver_cache, dispatch_uid="invalidate_resolver_cache_save")
+post_delete.connect(invalidate_resolver_cache, dispatch_uid="invalidate_resolver_cache_delete")
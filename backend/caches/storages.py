@@ -1,11 +1,34 @@
 class QueryStorage(dict):
 
+    defaults = dict(variables=False, domain=False, user_agent=False, crontab=False, time=3600, models=())
+
     def add(self, query_name, options):
-        self[query_name] = options
+        self[query_name] = {**self.defaults, **options, "models": tuple(options.get("models", ()))}
 
     @property
     def queries(self) -> list:
         return list(self.keys())
 
+    @property
+    def models(self) -> set:
+        """
+        Модели, изменение которых сбрасывает кэш резолверов
+        """
+        return {model for options in self.values() for model in options["models"]}
+
+    def merge(self, query_names) -> dict:
+        """
+        Общие опции для нескольких корневых полей запроса
+        """
+        options = [self[query_name] for query_name in query_names]
+        return dict(
+            variables=any(option["variables"] for option in options),
+            domain=any(option["domain"] for option in options),
+            user_agent=any(option["user_agent"] for option in options),
+            crontab=all(option["crontab"] for option in options),
+            time=min(option["time"] for option in options),
+            models=tuple(sorted({model for option in options for model in option["models"]})),
+        )
+
 
 query_storage = QueryStorage()
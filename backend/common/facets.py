@@ -0,0 +1,338 @@
+from bisect import bisect_left, bisect_right
+from threading import RLock
+from time import time_ns
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+
+from .utils import ceil, floor
+
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """
+    Битовая маска строк снимка: i-й бит числа соответствует i-й строке
+    """
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def bitmap_count(bitmap: int) -> int:
+    return bin(bitmap).count("1")
+
+
+class BitmapIndex(object):
+    """
+    Битмап-индекс колонки: значение -> маска строк с этим значением.
+    У строки может быть несколько значений (например, акции помещения)
+    """
+
+    def __init__(self, column: Sequence[Iterable[Hashable]], size: int) -> None:
+        positions: Dict[Hashable, List[int]] = {}
+        for position, values in enumerate(column):
+            for value in values:
+                if value is not None:
+                    positions.setdefault(value, []).append(position)
+        self.bitmaps: Dict[Hashable, int] = {
+            value: to_bitmap(value_positions, size) for value, value_positions in positions.items()
+        }
+
+    def mask(self, values: Iterable[Hashable]) -> int:
+        bitmap = 0
+        for value in values:
+            bitmap |= self.bitmaps.get(value, 0)
+        return bitmap
+
+    def values(self, mask: int) -> List[Hashable]:
+        return [value for value, bitmap in self.bitmaps.items() if bitmap & mask]
+
+
+class RangeIndex(object):
+    """
+    Индекс числовой колонки для диапазонов и min/max.
+
+    Строки отсортированы по значению и разбиты на куски по chunk_size, для каждого
+    куска заранее посчитана маска, поэтому фильтр по диапазону и поиск границ
+    сводятся к нескольким операциям над масками целых кусков. None не индексируются.
+    """
+
+    chunk_size = 256
+
+    def __init__(self, column: Sequence[Any], size: int) -> None:
+        self._size = size
+        self._order = sorted(
+            (position for position, value in enumerate(column) if value is not None),
+            key=column.__getitem__,
+        )
+        self._values = [column[position] for position in self._order]
+        self._chunks = [
+            to_bitmap(self._order[start:start + self.chunk_size], size)
+            for start in range(0, len(self._order), self.chunk_size)
+        ]
+
+    def mask(self, start: Any = None, stop: Any = None) -> int:
+        low = 0 if start is None else bisect_left(self._values, start)
+        high = len(self._values) if stop is None else bisect_right(self._values, stop)
+        if low >= high:
+            return 0
+        first_chunk = -(-low // self.chunk_size)
+        last_chunk = high // self.chunk_size
+        if first_chunk >= last_chunk:
+            return to_bitmap(self._order[low:high], self._size)
+        bitmap = to_bitmap(
+            self._order[low:first_chunk * self.chunk_size] + self._order[last_chunk * self.chunk_size:high],
+            self._size,
+        )
+        for chunk in self._chunks[first_chunk:last_chunk]:
+            bitmap |= chunk
+        return bitmap
+
+    def bounds(self, mask: int) -> Tuple[Any, Any]:
+        return self._find(mask, reverse=False), self._find(mask, reverse=True)
+
+    def _find(self, mask: int, reverse: bool) -> Any:
+        chunk_numbers = range(len(self._chunks))
+        for chunk_number in reversed(chunk_numbers) if reverse else chunk_numbers:
+            if not self._chunks[chunk_number] & mask:
+                continue
+            start = chunk_number * self.chunk_size
+            indexes = range(start, min(start + self.chunk_size, len(self._order)))
+            for index in reversed(indexes) if reverse else indexes:
+                if mask >> self._order[index] & 1:
+                    return self._values[index]
+        return None
+
+
+class SnapshotFrame(object):
+    """
+    Неизменяемое состояние снимка: строки по позициям и индексы по ним
+    """
+
+    def __init__(self, rows: Dict[int, Any], indexes: Dict[str, Any]) -> None:
+        self.ids: List[int] = list(rows)
+        self.rows: List[Any] = list(rows.values())
+        self.positions: Dict[int, int] = {pk: position for position, pk in enumerate(self.ids)}
+        self.size = len(self.ids)
+        self.indexes = indexes
+
+    def __getitem__(self, name: str) -> Any:
+        return self.indexes[name]
+
+    def mask(self, ids: Iterable[int]) -> int:
+        return to_bitmap((self.positions[pk] for pk in ids if pk in self.positions), self.size)
+
+
+class ColumnarSnapshot(object):
+    """
+    Колоночный снимок строк модели в памяти процесса.
+
+    Строки загружаются сегментами (например, по проекту). Версии сегментов хранятся
+    в кэше Django, invalidate() повышает версию, и при следующем обращении процесс
+    перечитывает из базы только устаревшие сегменты, после чего пересобирает индексы.
+    Без общей версии в кэше снимок перечитывается целиком.
+    Строки, которых нет в снимке, дочитываются по id.
+    """
+
+    _cache = cache
+    _tag_prefix = "columnar-snapshot"
+    _all_segments = "all"
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._segments: Dict[Hashable, Dict[int, Any]] = {}
+        self._versions: Dict[Hashable, Optional[str]] = {}
+        self._frame: Optional[SnapshotFrame] = None
+
+    def load_rows(self, segments: Optional[List[Hashable]] = None, ids: Optional[List[int]] = None):
+        """
+        Строки снимка: итерируемое (сегмент, id, строка).
+        Без аргументов загружаются все строки, попадающие в снимок
+        """
+        raise NotImplementedError
+
+    def build_indexes(self, rows: List[Any], size: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def invalidate(cls, *segments: Hashable) -> None:
+        """
+        Сброс сегментов снимка во всех процессах, без аргументов сбрасываются все
+        """
+        keys = [cls._tag_key(segment) for segment in segments] or [cls._tag_key(cls._all_segments)]
+        cls._cache.set_many({key: str(time_ns()) for key in keys}, None)
+
+    def frame(self, ids: Sequence[int] = ()) -> SnapshotFrame:
+        """
+        Актуальное состояние снимка, содержащее строки с переданными id
+        """
+        with self._lock:
+            if self._refresh() or self._frame is None:
+                self._rebuild()
+            missing = [pk for pk in ids if pk not in self._frame.positions]
+            if missing and self._load(ids=missing):
+                self._rebuild()
+            return self._frame
+
+    def _rebuild(self) -> None:
+        rows = {pk: row for segment_rows in self._segments.values() for pk, row in segment_rows.items()}
+        frame = SnapshotFrame(rows, {})
+        frame.indexes = self.build_indexes(frame.rows, frame.size)
+        self._frame = frame
+
+    def _refresh(self) -> bool:
+        all_key = self._tag_key(self._all_segments)
+        tags = self._cache.get_many([all_key, *(self._tag_key(segment) for segment in self._segments)])
+        if tags.get(all_key) is None:
+            # Версии еще нет или она вытеснена из кэша: заводим новую. Если кэш ничего
+            # не хранит (DummyCache), версии не будет и снимок перечитывается каждый раз
+            self._cache.add(all_key, str(time_ns()), None)
+            tags[all_key] = self._cache.get(all_key)
+        if self._frame is None or tags[all_key] is None or tags[all_key] != self._versions.get(self._all_segments):
+            self._segments.clear()
+            self._versions = {self._all_segments: tags.get(all_key)}
+            self._load()
+            return True
+        stale = [
+            segment
+            for segment in self._segments
+            if tags.get(self._tag_key(segment)) != self._versions.get(segment)
+        ]
+        if not stale:
+            return False
+        for segment in stale:
+            self._segments.pop(segment)
+        self._load(segments=stale)
+        return True
+
+    def _load(self, segments: Optional[List[Hashable]] = None, ids: Optional[List[int]] = None) -> bool:
+        if segments:
+            tags = self._cache.get_many([self._tag_key(segment) for segment in segments])
+            for segment in segments:
+                self._versions[segment] = tags.get(self._tag_key(segment))
+        loaded, new_segments = False, set()
+        for segment, pk, row in self.load_rows(segments=segments, ids=ids):
+            if segment not in self._segments and segment not in self._versions:
+                new_segments.add(segment)
+            self._segments.setdefault(segment, {})[pk] = row
+            loaded = True
+        if new_segments:
+            tags = self._cache.get_many([self._tag_key(segment) for segment in new_segments])
+            for segment in new_segments:
+                self._versions[segment] = tags.get(self._tag_key(segment))
+        return loaded
+
+    @classmethod
+    def _tag_key(cls, segment: Hashable) -> str:
+        return f"{cls._tag_prefix}:{segment}"
+
+
+class ColumnFacet(object):
+    """
+    Фасет фильтра, вычисляемый по снимку.
+
+    filtered - фильтр применяется по снимку и убирается из SQL запроса,
+    иначе он остается в запросе, а по снимку считается только фасет.
+    spec - фасет подходит для specs() (диапазон без подписей)
+    """
+
+    filtered = True
+    spec = False
+
+    def supports(self, _filter: Any) -> bool:
+        """
+        Подходит ли фасет для фильтра с этим именем в конкретном FilterSet
+        """
+        return True
+
+    def mask(self, frame: SnapshotFrame, value: Any) -> Optional[int]:
+        """
+        Маска строк, прошедших фильтр, None - фильтр не применяется
+        """
+        raise NotImplementedError
+
+    def facet(self, frame: SnapshotFrame, mask: int, filterset: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class RangeFacet(ColumnFacet):
+    """
+    Фасет RangeFilter: фильтр по диапазону, в фасете границы значений
+    """
+
+    spec = True
+
+    def __init__(self, index: str) -> None:
+        self.index = index
+
+    def mask(self, frame: SnapshotFrame, value: Any) -> Optional[int]:
+        if not value or (value.start is None and value.stop is None):
+            return None
+        return frame[self.index].mask(value.start, value.stop)
+
+    def facet(self, frame: SnapshotFrame, mask: int, filterset: Any) -> Dict[str, Any]:
+        low, high = frame[self.index].bounds(mask)
+        return {"range": {"min": floor(low), "max": ceil(high)}}
+
+
+class ColumnarFacets(object):
+    """
+    Фасеты FacetFilterSet по колоночному снимку.
+
+    Одним запросом получаются id строк queryset'а фильтра без фильтров, которые
+    считаются по снимку, остальное (маски фильтров, количество, фасеты) вычисляется
+    в памяти. Фасет фильтра считается по маске всех остальных фильтров, как и в SQL версии.
+    При filtered=False фильтры не применяются (для specs()).
+    """
+
+    snapshot: ColumnarSnapshot = None
+    columns: Dict[str, ColumnFacet] = {}
+
+    def __init__(self, filterset: Any, filtered: bool = True) -> None:
+        self.filterset = filterset
+        self.names = [
+            name
+            for name, column in self.columns.items()
+            if name in filterset.filters and column.supports(filterset.filters[name])
+        ]
+        self.masks: Dict[str, int] = {}
+        if filtered:
+            queryset = filterset.qs_without(self.filtered_names)
+        else:
+            self.names = [name for name in self.names if self.columns[name].spec]
+            if not self.names:
+                return
+            queryset = filterset.queryset
+        ids = list(queryset.order_by().values_list("pk", flat=True))
+        self.frame = self.snapshot.frame(ids)
+        self.base = self.frame.mask(ids)
+        if filtered:
+            for name in self.filtered_names:
+                mask = self.columns[name].mask(self.frame, filterset.form.cleaned_data.get(name))
+                if mask is not None:
+                    self.masks[name] = mask
+        self.full = self.mask_without()
+
+    @property
+    def filtered_names(self) -> List[str]:
+        return [name for name in self.names if self.columns[name].filtered]
+
+    @property
+    def count(self) -> int:
+        return bitmap_count(self.full)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def has_spec(self, name: str) -> bool:
+        return name in self.names and self.columns[name].spec
+
+    def mask_without(self, name: Optional[str] = None) -> int:
+        mask = self.base
+        for mask_name, filter_mask in self.masks.items():
+            if mask_name != name:
+                mask &= filter_mask
+        return mask
+
+    def facet(self, name: str) -> Dict[str, Any]:
+        return self.columns[name].facet(self.frame, self.mask_without(name), self.filterset)
@@ -58,12 +58,31 @@ class IntegerFilter(Filter):
 
 # noinspection PyProtectedMember
 class FacetFilterSet(FilterSet):
+    # Подкласс common.facets.ColumnarFacets, фасеты его колонок считаются в памяти
+    columnar_facets_class = None
+
+    def qs_without(self, filter_names):
+        """
+        Queryset фильтра без указанных фильтров
+        """
+        backup_filters, backup_cleaned_data = self.filters, self.form.cleaned_data
+        self.filters = {name: _filter for name, _filter in backup_filters.items() if name not in filter_names}
+        self.form.cleaned_data = {
+            name: value for name, value in backup_cleaned_data.items() if name not in filter_names
+        }
+        try:
+            return self.filter_queryset(self.queryset.all())
+        finally:
+            self.filters, self.form.cleaned_data = backup_filters, backup_cleaned_data
+
     def facets(self):
         facets = []
         backup_filters = self.filters
         self.is_valid()
         backup_cleaned_data = self.form.cleaned_data
-        count = self.qs.count()
+        columnar = self.columnar_facets_class(self) if self.columnar_facets_class else None
+        self.columnar = columnar
+        count = columnar.count if columnar else self.qs.count()
         for filter_name, _filter in self.filters.items():
             self.filters = backup_filters.copy()
             self.form.cleaned_data = backup_cleaned_data.copy()
@@ -73,7 +92,9 @@ class FacetFilterSet(FilterSet):
                 self.form.cleaned_data.pop(filter_name)
             if hasattr(self, "_qs"):
                 delattr(self, "_qs")
-            if hasattr(_filter, "aggregate_method"):
+            if columnar and filter_name in columnar:
+                facets.append({"name": filter_name, **columnar.facet(filter_name)})
+            elif hasattr(_filter, "aggregate_method"):
                 method = getattr(_filter, "aggregate_method")
                 if isinstance(_filter, (RangeFilter, BaseRangeFilter, NumberFilter)):
                     facets.append({"name": filter_name, "range": getattr(self, method)(self.qs)})
@@ -151,11 +172,14 @@ class FacetFilterSet(FilterSet):
         backup_filters = self.filters
         self.is_valid()
         backup_cleaned_data = self.form.cleaned_data
+        columnar = self.columnar_facets_class(self, filtered=False) if self.columnar_facets_class else None
         for filter_name, _filter in self.filters.items():
             self.filters = backup_filters.copy()
             self.form.cleaned_data = backup_cleaned_data.copy()
             if hasattr(_filter, "skip"):
                 continue
+            elif columnar and columnar.has_spec(filter_name):
+                specs.append({"name": filter_name, **columnar.facet(filter_name)})
             elif hasattr(_filter, "specs"):
                 method = getattr(_filter, "specs")
                 specs.append({"name": filter_name, "choices": getattr(self, method)(self.qs)})
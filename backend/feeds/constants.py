@@ -5,3 +5,11 @@ class FeedType(TextChoices):
     YANDEX = "yandex", "Яндекс"
     CIAN = "cian", "Циан"
     AVITO = "avito", "Авито"
+
+
+# Помещений в одной выборке при генерации фида
+FEED_CHUNK_SIZE = 500
+# Размер блока при отдаче собранного файла фида
+FEED_FILE_CHUNK_SIZE = 64 * 1024
+# Задержка пересборки фидов после изменений, секунды
+FEED_BUILD_DELAY = 60
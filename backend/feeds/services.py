@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import logging
+from tempfile import TemporaryFile
+from time import time
+from typing import Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import get_storage_class
+from django.db.models import Count, Max
+from django.template import Context
+from django.template.defaulttags import ForNode
+from django.template.loader import get_template
+
+from properties.models import Property
+from .constants import FEED_BUILD_DELAY, FEED_CHUNK_SIZE, FEED_FILE_CHUNK_SIZE
+from .models import Feed
+
+logger = logging.getLogger(__name__)
+
+
+class FeedRenderer:
+    """
+    Потоковая генерация фида
+
+    Шаблон фида делится по циклу {% for object in object_list %}: шапка и подвал рендерятся
+    один раз, тело цикла - для каждого помещения. Помещения загружаются пачками по id,
+    поэтому в памяти не держится ни весь список помещений, ни весь документ.
+    """
+
+    def __init__(self, feed: Feed, template_type: str, chunk_size: int = FEED_CHUNK_SIZE) -> None:
+        self.feed = feed
+        self.template_type = template_type
+        self.chunk_size = chunk_size
+
+    @property
+    def template_name(self) -> str:
+        return f"feed/{self.template_type}/{self.feed.property_type}.xml"
+
+    def iter_chunks(self) -> Iterator[List[Property]]:
+        """
+        Помещения фида пачками. iterator() в Django 3.0 не выполняет prefetch_related,
+        поэтому пачки выбираются по id
+        """
+        ids = list(Property.objects.filter_feed(feed=self.feed).order_by("id").values_list("id", flat=True))
+        for start in range(0, len(ids), self.chunk_size):
+            yield list(
+                Property.objects.filter(id__in=ids[start:start + self.chunk_size])
+                .annotate_feed()
+                .order_by("id")
+                .distinct("id")
+            )
+
+    def stream(self) -> Iterator[str]:
+        template = get_template(self.template_name).template
+        nodelist = list(template.nodelist)
+        loop_index = next(
+            (
+                index
+                for index, node in enumerate(nodelist)
+                if isinstance(node, ForNode) and node.sequence.token == "object_list"
+            ),
+            None,
+        )
+        context = Context({"feed": self.feed}, autoescape=template.engine.autoescape)
+        with context.render_context.push_state(template), context.bind_template(template):
+            if loop_index is None:
+                context["object_list"] = [obj for chunk in self.iter_chunks() for obj in chunk]
+                yield template.nodelist.render(context)
+                return
+
+            loop = nodelist[loop_index]
+            yield "".join(node.render_annotated(context) for node in nodelist[:loop_index])
+            empty = True
+            for chunk in self.iter_chunks():
+                parts = []
+                for obj in chunk:
+                    with context.push(**{loop.loopvars[0]: obj}):
+                        parts.append(loop.nodelist_loop.render(context))
+                empty = False
+                yield "".join(parts)
+            if empty:
+                yield loop.nodelist_empty.render(context)
+            yield "".join(node.render_annotated(context) for node in nodelist[loop_index + 1:])
+
+
+class FeedFile:
+    """
+    Заранее собранный сжатый файл фида
+
+    Файл лежит в хранилище под именем с ETag, описание актуального файла
+    (имя, ETag, время сборки, сигнатура данных) хранится в кэше.
+    """
+
+    _cache = cache
+
+    def __init__(self, feed: Feed, template_type: str) -> None:
+        self.feed = feed
+        self.template_type = template_type
+        self.storage = get_storage_class(settings.BASE_FILE_STORAGE)()
+
+    @property
+    def cache_key(self) -> str:
+        return f"feed-file:{self.template_type}:{self.feed.slug}"
+
+    def meta(self) -> Optional[dict]:
+        return self._cache.get(self.cache_key)
+
+    def signature(self) -> str:
+        """
+        Сигнатура данных фида, если она не изменилась, плановая пересборка пропускается.
+
+        Массовые изменения помещений (update/bulk_update) должны сами обновлять changed.
+        Изменения корпусов и проектов пересобирают фиды сигналами, остальное связанное
+        с фидом подхватывает ежесуточная принудительная пересборка
+        """
+        stats = (
+            Property.objects.filter_feed(feed=self.feed)
+            .order_by()
+            .distinct()
+            .aggregate(changed=Max("changed"), count=Count("id"))
+        )
+        return f"{self.feed.updated.isoformat()}:{stats['changed']}:{stats['count']}"
+
+    def build(self, force: bool = False) -> Optional[dict]:
+        old_meta = self.meta()
+        signature = self.signature()
+        if not force and old_meta and old_meta.get("signature") == signature:
+            return old_meta
+
+        digest = hashlib.md5()
+        with TemporaryFile() as content:
+            with gzip.GzipFile(fileobj=content, mode="wb") as compressed:
+                for part in FeedRenderer(self.feed, self.template_type).stream():
+                    data = part.encode("utf-8")
+                    digest.update(data)
+                    compressed.write(data)
+            content.seek(0)
+            etag = digest.hexdigest()
+            name = self.storage.save(f"feeds/{self.template_type}/{self.feed.slug}-{etag}.xml.gz", File(content))
+
+        meta = dict(name=name, etag=etag, modified=int(time()), signature=signature)
+        self._cache.set(self.cache_key, meta, None)
+        if old_meta and old_meta["name"] != name:
+            self.storage.delete(old_meta["name"])
+        return meta
+
+    def open(self, meta: dict):
+        return self.storage.open(meta["name"], "rb")
+
+    def iter_decompressed(self, meta: dict) -> Iterator[bytes]:
+        with self.open(meta) as content, gzip.GzipFile(fileobj=content, mode="rb") as decompressed:
+            while True:
+                data = decompressed.read(FEED_FILE_CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+
+
+def build_feeds(feed_ids: Optional[List[int]] = None, force: bool = False) -> None:
+    """
+    Сборка файлов активных фидов по всем их типам шаблонов
+    """
+    feeds = Feed.objects.filter_active()
+    if feed_ids is not None:
+        feeds = feeds.filter(id__in=feed_ids)
+    for feed in feeds:
+        for template_type in feed.template_type:
+            try:
+                FeedFile(feed, template_type).build(force=force)
+            except Exception:
+                logger.exception(f"Feed build failed. feed = {feed.slug}, template = {template_type}")
+
+
+def schedule_feeds_build(feed_ids: Optional[List[int]] = None) -> None:
+    """
+    Отложенная пересборка фидов, повторные изменения в течение задержки объединяются
+    """
+    from .tasks import build_feeds_task
+
+    if feed_ids is None:
+        if cache.add("feed-build-scheduled:all", 1, FEED_BUILD_DELAY):
+            build_feeds_task.apply_async(kwargs=dict(force=True), countdown=FEED_BUILD_DELAY)
+        return
+    feed_ids = [feed_id for feed_id in feed_ids if cache.add(f"feed-build-scheduled:{feed_id}", 1, FEED_BUILD_DELAY)]
+    if feed_ids:
+        build_feeds_task.apply_async(kwargs=dict(feed_ids=feed_ids, force=True), countdown=FEED_BUILD_DELAY)
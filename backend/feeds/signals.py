@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from buildings.models import Building
+from projects.models import Project
+from properties.models import Property
+from .models import Feed
+from .services import schedule_feeds_build
+
+
+@receiver(post_save, sender=Feed)
+@receiver(m2m_changed, sender=Feed.buildings.through)
+def rebuild_feed_on_change(sender, instance, **kwargs) -> None:
+    """
+    Пересборка фида при изменении его настроек
+    """
+    if kwargs.get("action", "post_").startswith("post_") and isinstance(instance, Feed):
+        transaction.on_commit(lambda: schedule_feeds_build([instance.id]))
+
+
+@receiver(post_save, sender=Property)
+def rebuild_feeds_on_property_change(sender, instance, **kwargs) -> None:
+    """
+    Пересборка фидов, в которые может попасть помещение
+    """
+    if not instance.building_id:
+        return
+    feed_ids = list(
+        Feed.objects.filter(
+            is_active=True, property_type=instance.type, buildings=instance.building_id
+        ).values_list("id", flat=True)
+    )
+    if feed_ids:
+        transaction.on_commit(lambda: schedule_feeds_build(feed_ids))
+
+
+@receiver(post_save, sender=Building)
+@receiver(post_save, sender=Project)
+def rebuild_feeds_on_building_change(sender, instance, **kwargs) -> None:
+    """
+    Пересборка фидов с корпусом или корпусами проекта: их поля выводятся в фиде,
+    а changed помещений при этом не меняется
+    """
+    buildings = {"buildings": instance.id} if sender is Building else {"buildings__project": instance.id}
+    feed_ids = list(Feed.objects.filter(is_active=True, **buildings).values_list("id", flat=True).distinct())
+    if feed_ids:
+        transaction.on_commit(lambda: schedule_feeds_build(feed_ids))
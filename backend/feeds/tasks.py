@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from celery import shared_task
+
+from .services import build_feeds
+
+
+@shared_task
+def build_feeds_task(feed_ids: Optional[List[int]] = None, force: bool = False) -> None:
+    build_feeds(feed_ids=feed_ids, force=force)
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from buildings.tests.factories import BuildingFactory
+from properties.constants import PropertyType
+from properties.models import Property
+from properties.services import update_price_with_special_offers
+from properties.tests.factories import FlatFactory, SpecialOfferFactory
+from ..models import Feed
+from ..services import FeedFile
+
+
+class FeedSignatureTest(TestCase):
+    def setUp(self):
+        self.building = BuildingFactory()
+        self.feed = Feed.objects.create(name="feed", slug="feed", property_type=PropertyType.FLAT)
+        self.feed.buildings.add(self.building)
+        self.flat = FlatFactory(
+            building=self.building,
+            project=self.building.project,
+            price=Decimal(1000000),
+            original_price=Decimal(1000000),
+        )
+
+    def signature(self):
+        return FeedFile(Feed.objects.get(id=self.feed.id), "yandex").signature()
+
+    def test_price_with_special_offers(self):
+        signature = self.signature()
+        update_price_with_special_offers()
+        self.assertEqual(self.signature(), signature)
+
+        SpecialOfferFactory(discount_value=100000).properties.add(self.flat)
+        update_price_with_special_offers()
+        self.assertEqual(Property.objects.get(id=self.flat.id).price, Decimal(900000))
+        self.assertNotEqual(self.signature(), signature)
+
+    @patch("feeds.signals.schedule_feeds_build")
+    @patch("feeds.signals.transaction.on_commit", side_effect=lambda callback: callback())
+    def test_building_change(self, _on_commit, schedule):
+        self.building.name = "new name"
+        self.building.save()
+        schedule.assert_called_once_with([self.feed.id])
+
+        schedule.reset_mock()
+        self.building.project.save()
+        schedule.assert_called_once_with([self.feed.id])
+
+        schedule.reset_mock()
+        BuildingFactory().save()
+        schedule.assert_not_called()
@@ -1,34 +1,53 @@
-from django.http import Http404
-from django.shortcuts import get_object_or_404
-from django.views.generic import DetailView
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.generic import View
 
-from properties.models import Property
 from .models import Feed
+from .services import FeedFile, FeedRenderer, schedule_feeds_build
 
 
-class FeedDetailView(DetailView):
-    content_type = "application/xml"
-    context_object_name = "feed"
+class FeedDetailView(View):
+    """
+    Фид для площадок
+
+    Отдается заранее собранный сжатый файл с ETag/Last-Modified и поддержкой условных
+    запросов. Пока файл не собран, фид генерируется потоком и ставится в сборку.
+    """
 
-    def get_queryset(self):
-        return Feed.objects.filter_active()
+    content_type = "application/xml"
 
-    def get_object(self, queryset=None):
-        slug = self.kwargs.get('slug', '')
-        if queryset is None:
-            queryset = self.get_queryset()
+    def get_object(self):
+        slug = self.kwargs.get("slug", "")
         try:
-            return queryset.get(slug=slug)
+            return Feed.objects.filter_active().get(slug=slug)
         except Feed.DoesNotExist:
             raise Http404("Фид с указанным slug не найден")
 
-    def get_template_names(self):
-        template_type = self.kwargs.get('template_slug', '')
+    def get(self, request, *args, **kwargs):
         feed = self.get_object()
-        template_name = f"feed/{template_type}/{feed.property_type}.xml"
-        return template_name
+        template_type = self.kwargs.get("template_slug", "")
+        feed_file = FeedFile(feed, template_type)
+
+        meta = feed_file.meta() if template_type in feed.template_type else None
+        if meta is None:
+            if template_type in feed.template_type:
+                schedule_feeds_build([feed.id])
+            return StreamingHttpResponse(
+                FeedRenderer(feed, template_type).stream(), content_type=self.content_type
+            )
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        ctx["object_list"] = Property.objects.filter_feed(feed=self.get_object()).annotate_feed()
-        return ctx
+        etag = quote_etag(meta["etag"])
+        response = get_conditional_response(request, etag=etag, last_modified=meta["modified"])
+        if response is None:
+            if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+                response = FileResponse(feed_file.open(meta), content_type=self.content_type)
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = StreamingHttpResponse(
+                    feed_file.iter_decompressed(meta), content_type=self.content_type
+                )
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(meta["modified"])
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
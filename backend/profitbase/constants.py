@@ -21,3 +21,8 @@ CONVERT_TYPE_MAP = {
 
 NEGATIVE_VALUES = {"нет", None}
 POSITIVE_VALUES = {"Да", "да"}
+
+PROPERTY_IMPORT_CHUNK_SIZE = 500
+PROPERTY_HASH_TIMEOUT = 60 * 60 * 24
+PROPERTY_HASH_KEY = "profitbase-property-hash-{}"
+PROPERTY_DERIVED_FIELDS = ("is_kitchen", "is_furniture", "is_planoplan", "plan", "plan_hover")
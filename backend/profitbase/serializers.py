@@ -144,21 +144,9 @@ class PropertyProfitBaseSerializer(serializers.ModelSerializer):
             floor_data = {
                 "count": qs["max"]
             }
-        section_params = {
-            "building_id": building_id,
-            "number": section_number
-        }
-        section = Section.objects.filter(building_id=building_id, number=section_number).last()
-        if not section:
-            section = Section.objects.create(
-                building_id=building_id, number=section_number, total_floors=floor_data["count"]
-            )
-        if section.total_floors != floor_data["count"]:
-            section_params.update({"total_floors": floor_data["count"]})
-        Section.objects.filter(pk=section.pk).update(**section_params)
+        section = self.get_section(building_id, section_number, floor_data["count"])
         ret["section_id"] = section.pk
-        floor, _ = Floor.objects.get_or_create(section=section, number=floor_number)
-        ret["floor_id"] = floor.pk
+        ret["floor_id"] = self.get_floor_id(section, floor_number)
         self.custom_fields = {field["id"]: field["value"] for field in custom_fields}
         ret["original_price"] = self.custom_fields["property_price"] or 0
         ret["price_per_meter"] = self.custom_fields["price_meter"] or 0
@@ -239,27 +227,81 @@ class PropertyProfitBaseSerializer(serializers.ModelSerializer):
                 ret[field] = 0.0
         ret["plan_code"] = self.custom_fields["code"] if self.custom_fields["code"] else ""
         if ret["article"]:
-            layout = Layout.objects.filter(name=ret["article"]).last()
-            if not layout:
-                layout, _ = Layout.objects.get_or_create(
-                    name=ret["article"],
-                    defaults={
-                        "project_id": ret["project_id"],
-                        "building_id": ret["building_id"],
-                        "floor_id": ret["floor_id"],
-                    },
-                )
-            ret["layout"] = layout
-        ret = self.disable_features(ret)
+            ret["layout"] = self.get_layout(ret)
+        ret = self.disable_features(ret, cache=self.import_cache)
         return ret
 
+    @property
+    def import_cache(self) -> Optional[dict]:
+        """
+        Кэш справочных данных на время импорта, передаётся через context["import_cache"]
+        """
+        return self.context.get("import_cache")
+
+    def get_section(self, building_id, section_number, total_floors) -> Section:
+        """Секция корпуса с актуальной этажностью"""
+        cache = self.import_cache
+        key = ("section", building_id, section_number)
+        section = cache.get(key) if cache is not None else None
+        if section is None:
+            section = Section.objects.filter(building_id=building_id, number=section_number).last()
+            if not section:
+                section = Section.objects.create(
+                    building_id=building_id, number=section_number, total_floors=total_floors
+                )
+        if section.total_floors != total_floors:
+            Section.objects.filter(pk=section.pk).update(total_floors=total_floors)
+            section.total_floors = total_floors
+        if cache is not None:
+            cache[key] = section
+        return section
+
+    def get_floor_id(self, section: Section, floor_number) -> int:
+        """Этаж секции"""
+        cache = self.import_cache
+        key = ("floor", section.pk, floor_number)
+        if cache is not None and key in cache:
+            return cache[key]
+        floor, _ = Floor.objects.get_or_create(section=section, number=floor_number)
+        if cache is not None:
+            cache[key] = floor.pk
+        return floor.pk
+
+    def get_layout(self, ret: dict):
+        """Планировка по артикулу"""
+        cache = self.import_cache
+        key = ("layout", ret["article"])
+        if cache is not None and key in cache:
+            return cache[key]
+        layout = Layout.objects.filter(name=ret["article"]).last()
+        if not layout:
+            layout, _ = Layout.objects.get_or_create(
+                name=ret["article"],
+                defaults={
+                    "project_id": ret["project_id"],
+                    "building_id": ret["building_id"],
+                    "floor_id": ret["floor_id"],
+                },
+            )
+        if cache is not None:
+            cache[key] = layout
+        return layout
+
     @staticmethod
-    def disable_features(ret) -> dict:
+    def disable_features(ret, cache: Optional[dict] = None) -> dict:
         """Отключение особенностей объекта недвижимости"""
 
-        disabled_features = Feature.objects.filter(
-            property_kind__contains=[ret["type"]], lot_page_show=False
-        ).values_list("kind", flat=True)
+        key = ("disabled_features", ret["type"])
+        if cache is not None and key in cache:
+            disabled_features = cache[key]
+        else:
+            disabled_features = list(
+                Feature.objects.filter(
+                    property_kind__contains=[ret["type"]], lot_page_show=False
+                ).values_list("kind", flat=True)
+            )
+            if cache is not None:
+                cache[key] = disabled_features
 
         for feature in disabled_features:
             if not feature == FeatureType.HAS_BALCONY_OR_LOGGIA:
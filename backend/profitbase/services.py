@@ -1,21 +1,27 @@
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import transaction
 from django.utils.timezone import now, timedelta
 
 from buildings.models import Building
+from caches.classes import ResolverCache
+from feeds.services import schedule_feeds_build
 from projects.models import Project
+from properties.facets import PropertyFacetSnapshot
 from properties.models import Property, SpecialOffer
 from request_forms.constants import RequestType
 from request_forms.models import Manager
 
 from . import logger
 from .api import ProfitBaseAPI
+from .constants import PROPERTY_DERIVED_FIELDS, PROPERTY_HASH_TIMEOUT, PROPERTY_IMPORT_CHUNK_SIZE
 from .serializers import (BuildingProfitBaseSerializer,
                           ProjectProfitBaseSerializer,
                           PropertyProfitBaseSerializer,
                           SpecialOfferProfitBaseSerializer)
-from .utils import parse_bool
+from .utils import hash_property_data, parse_bool, partition, property_hash_key
 
 
 class ProfitBaseService:
@@ -63,11 +69,26 @@ class ProfitBaseService:
                 continue
             update_realty_for_project.delay(project["id"], self.api.access_token)
 
-    def update_property_for_project(self, project_id: str, access_token: str = ""):
-        """Обновление помещений только в одном проекте"""
+    def update_property_for_project(self, project_id: str, access_token: str = "") -> dict:
+        """Обновление помещений только в одном проекте
+
+        Существующие помещения и корпуса загружаются одним запросом, неизменившиеся
+        записи определяются по хэшу ответа ProfitBase и пропускаются, изменившиеся
+        сохраняются через bulk_create/bulk_update пачками по PROPERTY_IMPORT_CHUNK_SIZE.
+        """
         building_projects_mapping = dict(Building.objects.values_list("id", "project_id"))
         properties_data_list = self.api.get_properties(project_id)
         logger.info(f"Starting update project = {project_id}")
+
+        stats = dict(inserted=0, updated=0, unchanged=0, failed=0)
+        property_ids = [data["id"] for data in properties_data_list]
+        instances = {}
+        for ids in partition(property_ids, PROPERTY_IMPORT_CHUNK_SIZE):
+            instances.update(Property.objects.in_bulk(ids))
+        hashes = cache.get_many([property_hash_key(property_id) for property_id in property_ids])
+
+        unchanged_ids, changed, new_hashes = [], [], {}
+        import_cache = {}
         for data in properties_data_list:
             try:
                 if data["house_id"] not in building_projects_mapping.keys():
@@ -79,20 +100,86 @@ class ProfitBaseService:
                         {serializer.instance.id: serializer.instance.project_id}
                     )
                 data["project_id"] = building_projects_mapping[data["house_id"]]
-                instance = Property.objects.filter(id=data["id"]).first()
+                instance = instances.get(data["id"])
                 data.update({"floor_count_data": self.api.get_floors_count(data["house_id"])})
+                key = property_hash_key(data["id"])
+                data_hash = hash_property_data(data)
+                if instance and hashes.get(key) == data_hash:
+                    unchanged_ids.append(instance.id)
+                    continue
                 if instance:
-                    data["house_id"] = instance.building.id
+                    data["house_id"] = instance.building_id
                     data["plan_3d_1"] = instance.plan_3d_1
                 data.update(data.pop("area", {}))
-                serializer = PropertyProfitBaseSerializer(instance=instance, data=data)
+                serializer = PropertyProfitBaseSerializer(
+                    instance=instance, data=data, context={"import_cache": import_cache}
+                )
                 serializer.is_valid(True)
-                serializer.save()
+                changed.append((instance, serializer.validated_data))
+                new_hashes[key] = data_hash
             except Exception as exc:
+                stats["failed"] += 1
                 logger.exception(
                     f"Error occurred during update. project {project_id}."
                 )
-        logger.info("Done.")
+
+        for ids in partition(unchanged_ids, PROPERTY_IMPORT_CHUNK_SIZE):
+            stats["unchanged"] += Property.objects.filter(id__in=ids).update(update_time=now())
+
+        for chunk in partition(changed, PROPERTY_IMPORT_CHUNK_SIZE):
+            try:
+                inserted, updated = self._save_properties(chunk)
+            except Exception as exc:
+                stats["failed"] += len(chunk)
+                logger.exception(
+                    f"Error occurred during bulk update. project {project_id}."
+                )
+                continue
+            stats["inserted"] += inserted
+            stats["updated"] += updated
+            cache.set_many(
+                {property_hash_key(validated_data["id"]): new_hashes[property_hash_key(validated_data["id"])]
+                 for _, validated_data in chunk},
+                timeout=PROPERTY_HASH_TIMEOUT,
+            )
+        if stats["inserted"] or stats["updated"]:
+            ResolverCache.invalidate("properties.Property")
+            PropertyFacetSnapshot.invalidate(
+                *{validated_data.get("project_id") for _, validated_data in changed} - {None}
+            )
+            schedule_feeds_build()
+        logger.info(f"Done. project = {project_id}, stats = {stats}")
+        return stats
+
+    @staticmethod
+    def _save_properties(chunk: list) -> tuple:
+        """Пакетное сохранение помещений, возвращает (создано, обновлено)"""
+        buildings = Building.objects.in_bulk(
+            {validated_data.get("building_id") for _, validated_data in chunk} - {None}
+        )
+        # bulk_update не обновляет auto_now поля, changed выставляется явно для сигнатуры фидов
+        to_create, to_update, update_fields = [], [], {*PROPERTY_DERIVED_FIELDS, "changed"}
+        changed = now()
+        for instance, validated_data in chunk:
+            if instance is None:
+                instance = Property(**validated_data)
+                to_create.append(instance)
+            else:
+                for field, value in validated_data.items():
+                    setattr(instance, field, value)
+                update_fields.update(validated_data.keys())
+                instance.changed = changed
+                to_update.append(instance)
+            if instance.building_id in buildings:
+                instance.building = buildings[instance.building_id]
+            instance.set_derived_fields(refresh_layout=False)
+        update_fields.discard("id")
+        with transaction.atomic():
+            if to_create:
+                Property.objects.bulk_create(to_create)
+            if to_update:
+                Property.objects.bulk_update(to_update, fields=sorted(update_fields))
+        return len(to_create), len(to_update)
 
     def update_offers(self):
         """Обновление данных об акциях."""
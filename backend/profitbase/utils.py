@@ -1,11 +1,13 @@
+import json
 from datetime import datetime
+from hashlib import md5
 
 import pytz
 import requests
 from django.core.files import File
 from django.core.files.temp import NamedTemporaryFile
 
-from .constants import NEGATIVE_VALUES, POSITIVE_VALUES
+from .constants import NEGATIVE_VALUES, POSITIVE_VALUES, PROPERTY_HASH_KEY
 
 
 def make_hashable(o):
@@ -21,6 +23,20 @@ def make_hashable(o):
     return o
 
 
+def hash_property_data(data: dict) -> str:
+    """Хэш записи помещения из ProfitBase для пропуска неизменившихся записей"""
+    return md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def property_hash_key(property_id) -> str:
+    return PROPERTY_HASH_KEY.format(property_id)
+
+
+def partition(items: list, size: int):
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
 def parse_bool(value):
     if type(value) == str:
         value = value.strip().lower()
@@ -423,6 +423,9 @@ class ProjectQuery(ObjectType):
     project = Field(ProjectType, slug=String(), description="Получение проекта по slug")
 
     @staticmethod
+    @cached_resolver(
+        variables=True, user_agent=True, domain=True, time=5 * 60, models=("projects.Project",)
+    )
     def resolve_all_projects(obj, info, **kwargs):
         """
         Результат запроса allProjects
@@ -464,7 +467,9 @@ class ProjectQuery(ObjectType):
         return queryset
 
     @staticmethod
-    @cached_resolver(variables=True, user_agent=True, domain=True, crontab=False, time=5 * 60)
+    @cached_resolver(
+        variables=True, user_agent=True, domain=True, crontab=False, time=5 * 60, models=("projects.Project",)
+    )
     def resolve_project(obj, info, **kwargs):
         """
         Кеш результат запрос project
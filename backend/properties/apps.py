@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PropertiesAppConfig(AppConfig):
     name = "properties"
     verbose_name = "Объекты собственности"
+
+    def ready(self):
+        from . import signals
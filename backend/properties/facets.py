@@ -0,0 +1,253 @@
+from collections import namedtuple
+from typing import Any, Dict, List
+
+from django.db.models import BooleanField
+from django_filters import CharFilter, RangeFilter
+from graphene.utils.str_converters import to_camel_case
+from graphene_django.filter import GlobalIDMultipleChoiceFilter
+from graphql_relay import from_global_id, to_global_id
+
+from common.facets import BitmapIndex, ColumnarFacets, ColumnarSnapshot, ColumnFacet, RangeFacet, RangeIndex
+from common.filters import ListInFilter
+
+from .constants import FeatureType
+from .models import Feature, Property, SpecialOffer
+
+# Особенности, которые являются булевыми полями помещения, остальные проверяются запросом
+FEATURE_FIELDS = tuple(
+    kind
+    for kind in FeatureType.values
+    if any(field.name == kind and isinstance(field, BooleanField) for field in Property._meta.get_fields())
+)
+
+PROPERTY_ROW_FIELDS = (
+    "id",
+    "project_id",
+    "project__slug",
+    "project__order",
+    "type",
+    "price",
+    "area",
+    "floor__number",
+    "rooms",
+    "building__built_year",
+    "building__ready_quarter",
+    "balconies_count",
+    "loggias_count",
+    "lounge_balcony",
+    *FEATURE_FIELDS,
+)
+
+PropertyRow = namedtuple(
+    "PropertyRow", (*(field.replace("__", "_") for field in PROPERTY_ROW_FIELDS), "features", "offers")
+)
+
+
+class PropertyFacetSnapshot(ColumnarSnapshot):
+    """
+    Снимок активных помещений для фасетов каталога, сегменты - проекты
+    """
+
+    _tag_prefix = "property-facets"
+
+    def load_rows(self, segments=None, ids=None):
+        queryset = Property.objects.all()
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        else:
+            queryset = queryset.filter_active(include_booked=True)
+            if segments is not None:
+                queryset = queryset.filter(project_id__in=segments)
+
+        offers: Dict[int, List[tuple]] = {}
+        visible_offers = set(
+            SpecialOffer.objects.filter(is_display=True, is_active=True).values_list("id", flat=True)
+        )
+        for property_id, offer_id in SpecialOffer.properties.through.objects.filter(
+            property_id__in=queryset.values("id")
+        ).values_list("property_id", "specialoffer_id"):
+            offers.setdefault(property_id, []).append((offer_id, offer_id in visible_offers))
+
+        for values in queryset.order_by().values_list(*PROPERTY_ROW_FIELDS):
+            row = dict(zip(PROPERTY_ROW_FIELDS, values))
+            features = [kind for kind in FEATURE_FIELDS if row[kind]]
+            if row["balconies_count"] or row["loggias_count"] or row["lounge_balcony"]:
+                features.append(FeatureType.HAS_BALCONY_OR_LOGGIA.value)
+            yield row["project_id"], row["id"], PropertyRow(
+                *values, features=tuple(features), offers=tuple(offers.get(row["id"], ()))
+            )
+
+    def build_indexes(self, rows, size):
+        return {
+            "type": BitmapIndex([(row.type,) for row in rows], size),
+            "price": RangeIndex([row.price for row in rows], size),
+            "area": RangeIndex([row.area for row in rows], size),
+            "floor": RangeIndex([row.floor_number for row in rows], size),
+            "rooms": BitmapIndex(
+                [(None if row.rooms is None else "4" if row.rooms >= 4 else str(row.rooms),) for row in rows], size
+            ),
+            "project": BitmapIndex([(row.project_slug,) for row in rows], size),
+            "project_order": {row.project_slug: (row.project_order, row.project_id) for row in rows},
+            "completion_date": BitmapIndex(
+                [
+                    (None,)
+                    if row.building_built_year is None and row.building_ready_quarter is None
+                    else ((row.building_built_year, row.building_ready_quarter),)
+                    for row in rows
+                ],
+                size,
+            ),
+            "features": BitmapIndex([row.features for row in rows], size),
+            "offers": BitmapIndex([(offer_id for offer_id, _ in row.offers) for row in rows], size),
+            "visible_offers": BitmapIndex(
+                [(offer_id for offer_id, visible in row.offers if visible) for row in rows], size
+            ),
+        }
+
+
+property_facet_snapshot = PropertyFacetSnapshot()
+
+
+class PropertyColumnFacet(ColumnFacet):
+    """
+    Фасет фильтра BasePropertyFilterSet, подходит только для фильтра с тем же объявлением
+    """
+
+    filter_class = None
+    field_name = None
+    method = None
+
+    def supports(self, _filter: Any) -> bool:
+        return (
+            type(_filter) is self.filter_class
+            and _filter.field_name == self.field_name
+            and _filter.method == self.method
+        )
+
+
+class PropertyRangeFacet(PropertyColumnFacet, RangeFacet):
+    filter_class = RangeFilter
+
+    def __init__(self, index: str, field_name: str) -> None:
+        super().__init__(index)
+        self.field_name = field_name
+
+
+class RoomsFacet(PropertyColumnFacet):
+    filter_class = ListInFilter
+    field_name = "rooms"
+    method = "filter_rooms"
+
+    def mask(self, frame, value):
+        if not value:
+            return None
+        return frame["rooms"].mask(str(rooms) for rooms in value)
+
+    def facet(self, frame, mask, filterset):
+        return {"choices": sorted(frame["rooms"].values(mask))}
+
+
+class ProjectFacet(PropertyColumnFacet):
+    filter_class = GlobalIDMultipleChoiceFilter
+    field_name = "project__slug"
+
+    def mask(self, frame, value):
+        if not value:
+            return None
+        return frame["project"].mask(from_global_id(global_id)[1] for global_id in value)
+
+    def facet(self, frame, mask, filterset):
+        from projects.schema import ProjectType
+
+        slugs = sorted(frame["project"].values(mask), key=frame["project_order"].__getitem__)
+        return {"choices": [to_global_id(ProjectType.__name__, slug) for slug in slugs]}
+
+
+class CompletionDateFacet(PropertyColumnFacet):
+    filter_class = CharFilter
+    field_name = "completion_date"
+    method = "completion_date_filter"
+
+    def mask(self, frame, value):
+        if not value:
+            return None
+        try:
+            year, quarter = value.split("-")
+            year, quarter = int(year), int(quarter)
+        except ValueError:
+            return None
+        return frame["completion_date"].mask([(year, quarter)])
+
+    def facet(self, frame, mask, filterset):
+        dates = sorted(
+            frame["completion_date"].values(mask),
+            key=lambda date: (date[0] is None, date[0] or 0, date[1] is None, date[1] or 0),
+        )
+        return {"choices": [f"{year}-{quarter}" for year, quarter in dates]}
+
+
+class SpecialOffersFacet(PropertyColumnFacet):
+    filter_class = ListInFilter
+    field_name = "specialoffer__id"
+
+    def mask(self, frame, value):
+        if not value:
+            return None
+        offer_ids = [int(offer_id) for offer_id in value if str(offer_id).isdigit()]
+        return frame["offers"].mask(offer_ids)
+
+    def facet(self, frame, mask, filterset):
+        return {"choices": sorted(frame["visible_offers"].values(mask))}
+
+
+class FeaturesFacet(PropertyColumnFacet):
+    """
+    Фильтр по особенностям остается в запросе: filter_queryset применяет его и к фасету
+    """
+
+    filter_class = ListInFilter
+    field_name = "features"
+    method = "filter_features"
+    filtered = False
+
+    def facet(self, frame, mask, filterset):
+        kinds = Feature.objects.for_filter(filterset.PROPERTY_TYPE, filterset.request).values_list(
+            "kind", flat=True
+        )
+        features = []
+        for kind in kinds:
+            camel_kind = to_camel_case(kind)
+            if camel_kind in features:
+                continue
+            if kind in FEATURE_FIELDS or kind == FeatureType.HAS_BALCONY_OR_LOGGIA:
+                exists = bool(frame["features"].mask([kind]) & mask)
+            else:
+                exists = filterset.qs.filter(**{kind: True}).exists()
+            if exists:
+                features.append(camel_kind)
+        return {"choices": features}
+
+
+class PropertyColumnarFacets(ColumnarFacets):
+    """
+    Фасеты каталога помещений по снимку property_facet_snapshot
+    """
+
+    snapshot = property_facet_snapshot
+    columns = {
+        "project": ProjectFacet(),
+        "price": PropertyRangeFacet("price", "price"),
+        "area": PropertyRangeFacet("area", "area"),
+        "completion_date": CompletionDateFacet(),
+        "features": FeaturesFacet(),
+        "special_offers": SpecialOffersFacet(),
+        "rooms": RoomsFacet(),
+        "floor": PropertyRangeFacet("floor", "floor__number"),
+    }
+
+    @property
+    def types(self) -> List[str]:
+        """
+        Типы помещений, прошедших все фильтры
+        """
+        return self.frame["type"].values(self.full)
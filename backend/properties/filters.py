@@ -28,6 +28,7 @@ from projects.models import Project
 from projects.schema import ProjectType
 
 from .constants import FeatureType, PropertyStatus
+from .facets import PropertyColumnarFacets
 from .constants import PropertyType as PropertyTypeChoices
 from .constants import SimilarPropertiesTab
 from .models import (Feature, Furnish, FurnishFurniture, FurnishKitchen,
@@ -77,6 +78,8 @@ class BasePropertyFilterSet(GrapheneFilterSetMixin, FacetFilterSet):
     special_offers.specs = "get_special_offers_specs"
     special_offers.aggregate_method = "aggregate_special_offers"
 
+    columnar_facets_class = PropertyColumnarFacets
+
     class Meta:
         model = Property
         fields = ()
@@ -315,10 +318,11 @@ class FlatFilterSet(BasePropertyFilterSet):
 
     def facets(self):
         facets = super().facets()
+        types = self.columnar.types
         facets.update(dict(
-            with_commercial=self.qs.filter(type=PropertyTypeChoices.COMMERCIAL).exists(),
-            with_flat=self.qs.filter(type=PropertyTypeChoices.FLAT).exists(),
-            with_commercial_apartment=self.qs.filter(type=PropertyTypeChoices.COMMERCIAL_APARTMENT).exists()
+            with_commercial=PropertyTypeChoices.COMMERCIAL in types,
+            with_flat=PropertyTypeChoices.FLAT in types,
+            with_commercial_apartment=PropertyTypeChoices.COMMERCIAL_APARTMENT in types
         ))
         return facets
 
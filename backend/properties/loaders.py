@@ -0,0 +1,98 @@
+from threading import RLock
+from time import time_ns
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from django.core.cache import cache
+
+from .constants import FeatureType
+from .models import Feature
+
+
+class FeatureCatalogue:
+    """
+    Каталог особенностей в памяти процесса
+
+    Версия каталога хранится в кэше Django, invalidate() повышает ее,
+    и при следующем обращении процесс перечитывает особенности из базы.
+    Без общего кэша (DummyCache) каталог перечитывается при каждом обращении.
+    """
+
+    _cache = cache
+    _version_key = "feature-catalogue"
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._features: Optional[List[Feature]] = None
+        self._version: Optional[str] = None
+
+    def invalidate(self) -> None:
+        """
+        Сброс каталога во всех процессах
+        """
+        with self._lock:
+            self._features = None
+        self._cache.set(self._version_key, str(time_ns()), None)
+
+    def features(self) -> List[Feature]:
+        version = self._cache.get(self._version_key)
+        if version is None:
+            self._cache.add(self._version_key, str(time_ns()), None)
+            version = self._cache.get(self._version_key)
+        with self._lock:
+            if self._features is None or version is None or version != self._version:
+                self._features = list(Feature.objects.prefetch_related("cities"))
+                self._version = version
+            return self._features
+
+
+feature_catalogue = FeatureCatalogue()
+
+
+class RequestLoader:
+    """
+    Загрузчик на время одного запроса GraphQL
+
+    Каталог особенностей читается один раз на запрос, особенности объектов
+    подбираются по их булевым полям в памяти. Остальные повторяющиеся выборки
+    (например, отделки города) запоминаются по ключу.
+    """
+
+    _context_attr = "_request_loader"
+
+    def __init__(self) -> None:
+        self._features: Optional[List[Feature]] = None
+        self._memo: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def for_info(cls, info) -> "RequestLoader":
+        loader = getattr(info.context, cls._context_attr, None)
+        if loader is None:
+            loader = cls()
+            setattr(info.context, cls._context_attr, loader)
+        return loader
+
+    def features(self, obj: Any, property_kind: Optional[List[str]] = None, **flags: bool) -> List[Feature]:
+        """
+        Особенности объекта: виды по его булевым полям, property_kind сравнивается целиком,
+        flags - значения полей особенности (lot_page_show, icon_flats_show)
+        """
+        kinds = frozenset(kind for kind in FeatureType.values if getattr(obj, kind, False))
+        if not kinds:
+            return []
+        key = ("features", kinds, tuple(property_kind) if property_kind is not None else None, *sorted(flags.items()))
+        if key not in self._memo:
+            if self._features is None:
+                self._features = feature_catalogue.features()
+            self._memo[key] = [
+                feature
+                for feature in self._features
+                if feature.kind in kinds
+                and (property_kind is None or list(feature.property_kind) == list(property_kind))
+                and all(getattr(feature, name) == value for name, value in flags.items())
+            ]
+        return self._memo[key]
+
+    def memoize(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        if key not in self._memo:
+            self._memo[key] = load()
+        return self._memo[key]
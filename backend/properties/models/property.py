@@ -400,8 +400,16 @@ class Property(models.Model):
             )
 
     def save(self, *args, **kwargs):
-        from .layout import Layout
         super().save(*args, **kwargs)
+        self.set_derived_fields()
+        super().save()
+
+    def set_derived_fields(self, refresh_layout: bool = True) -> None:
+        """
+        Поля, вычисляемые из корпуса, планировки и планоплана.
+        При пакетном импорте планировка уже загружена, refresh_layout=False.
+        """
+        from .layout import Layout
         if self.furnish_kitchen_set and self.building and self.kitchen_price:
             if self.building.show_furnish_kitchen:
                 self.is_kitchen = True
@@ -413,13 +421,14 @@ class Property(models.Model):
         if self.planoplan:
             self.is_planoplan = True
         if not self.plan and self.layout:
-            if layout_obj := Layout.objects.filter(pk=self.layout.id).first():
+            layout_obj = Layout.objects.filter(pk=self.layout.id).first() if refresh_layout else self.layout
+            if layout_obj:
                 if plan_url := layout_obj.plan.name:
                     self.plan.name = plan_url
         # if not self.plan and self.project and self.building and self.number:
         #     path_to_file = f'/bim/{self.project.slug}/{self.building.name}/{self.number}.svg'
         #     self.plan.name = path_to_file
         if (not self.plan_hover or self.plan_hover == ['']) and self.layout:
-            if layout_obj := Layout.objects.filter(pk=self.layout.id).first():
+            layout_obj = Layout.objects.filter(pk=self.layout.id).first() if refresh_layout else self.layout
+            if layout_obj:
                 self.plan_hover = layout_obj.plan_hover
-        super().save()
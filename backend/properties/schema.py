@@ -7,6 +7,7 @@ from graphene_django_optimizer import (OptimizedDjangoObjectType, query,
 from graphql_relay import from_global_id, to_global_id
 
 from buildings.hints import commercial_space_resolve_auction_hint
+from caches.decorators import cached_query, cached_resolver
 from common.graphene import ExtendedConnection
 from common.scalars import File
 from common.schema import (FacetFilterField, FacetWithCountType,
@@ -15,7 +16,6 @@ from common.schema import (FacetFilterField, FacetWithCountType,
 from graphene import (ID, Boolean, Field, Float, Int, List, Mutation, Node,
                       ObjectType, String)
 
-from .constants import FeatureType as FeatureTypeChoices
 from .constants import PropertyStatus, PropertyType
 from .filters import (CommercialSpaceFilterSet, FlatFilterSet,
                       FurnishFilterSet, FurnishFurnitureFilterSet,
@@ -27,6 +27,7 @@ from .filters import (CommercialSpaceFilterSet, FlatFilterSet,
                       ParkingPantrySpaceFilterSet, ParkingSpaceFilterSet,
                       SimilarPropertyFilterSet, UniquePlanFilterSet)
 from .hints import flat_resolve_special_offer_set_hint
+from .loaders import RequestLoader
 from .models import *
 from .tasks import update_layout_min_mortgage_task
 from .utils import internal_access
@@ -496,12 +497,7 @@ class GlobalFlatType(GlobalFlatFilterType):
 
     @staticmethod
     def resolve_features(obj, info, **kwargs):
-        kinds = []
-        for kind in FeatureTypeChoices.values:
-            if getattr(obj, kind, False):
-                kinds.append(kind)
-        return query(Feature.objects.filter(property_kind=[obj.type],
-                                            kind__in=kinds, lot_page_show=True), info)
+        return RequestLoader.for_info(info).features(obj, property_kind=[obj.type], lot_page_show=True)
 
     @staticmethod
     @resolver_hints(prefetch_related=flat_resolve_special_offer_set_hint)
@@ -962,19 +958,28 @@ class GlobalCommercialSpaceType(OptimizedDjangoObjectType):
     @resolver_hints(select_related=("project", "project__city"))
     def resolve_furnish_set(obj, info, **kwargs):
         city = obj.project.city if hasattr(obj.project, "city") else info.context.site.city
-        return query(Furnish.objects.filter(commercialpropertypage__city=city).distinct(), info)
+        return RequestLoader.for_info(info).memoize(
+            ("furnish_set", getattr(city, "pk", None)),
+            lambda: list(query(Furnish.objects.filter(commercialpropertypage__city=city).distinct(), info)),
+        )
 
     @staticmethod
     @resolver_hints(select_related=("project", "project__city"))
     def resolve_furnish_kitchen_set(obj, info, **kwargs):
         city = obj.project.city if hasattr(obj.project, "city") else info.context.site.city
-        return query(FurnishKitchen.objects.filter(commercialpropertypage__city=city).distinct(), info)
+        return RequestLoader.for_info(info).memoize(
+            ("furnish_kitchen_set", getattr(city, "pk", None)),
+            lambda: list(query(FurnishKitchen.objects.filter(commercialpropertypage__city=city).distinct(), info)),
+        )
 
     @staticmethod
     @resolver_hints(select_related=("project", "project__city"))
     def resolve_furnish_furniture_set(obj, info, **kwargs):
         city = obj.project.city if hasattr(obj.project, "city") else info.context.site.city
-        return query(FurnishFurniture.objects.filter(commercialpropertypage__city=city).distinct(), info)
+        return RequestLoader.for_info(info).memoize(
+            ("furnish_furniture_set", getattr(city, "pk", None)),
+            lambda: list(query(FurnishFurniture.objects.filter(commercialpropertypage__city=city).distinct(), info)),
+        )
 
     @staticmethod
     @resolver_hints(prefetch_related=commercial_space_resolve_auction_hint)
@@ -985,11 +990,7 @@ class GlobalCommercialSpaceType(OptimizedDjangoObjectType):
 
     @staticmethod
     def resolve_features(obj, info, **kwargs):
-        kinds = []
-        for kind in FeatureTypeChoices.values:
-            if getattr(obj, kind, False):
-                kinds.append(kind)
-        return query(Feature.objects.filter(kind__in=kinds, icon_flats_show=True), info)
+        return RequestLoader.for_info(info).features(obj, icon_flats_show=True)
 
 
 class CommercialSpaceType(GlobalCommercialSpaceType):
@@ -1184,11 +1185,7 @@ class LayoutObjectType(OptimizedDjangoObjectType):
 
     @staticmethod
     def resolve_features(obj, info, **kwargs):
-        kinds = []
-        for kind in FeatureTypeChoices.values:
-            if getattr(obj, kind, False):
-                kinds.append(kind)
-        return query(Feature.objects.filter(kind__in=kinds, icon_flats_show=True), info)
+        return RequestLoader.for_info(info).features(obj, icon_flats_show=True)
 
     @staticmethod
     @resolver_hints(select_related="project")
@@ -1213,6 +1210,12 @@ class FlatFacetsType(FacetWithCountType):
     with_commercial_apartment = Boolean()
 
 
+FLATS_CACHE_MODELS = ("properties.Property", "properties.SpecialOffer")
+cached_query(
+    "allFlatsSpecs", variables=True, domain=True, time=5 * 60, models=FLATS_CACHE_MODELS
+)
+
+
 class PropertyQuery(ObjectType):
     """
     Запросы объектов собственности
@@ -1456,6 +1459,9 @@ class PropertyQuery(ObjectType):
         return query(GlobalCommercialSpaceType.get_queryset(Property.objects.all(), info), info)
 
     @staticmethod
+    @cached_resolver(
+        variables=True, user_agent=True, domain=True, time=5 * 60, models=FLATS_CACHE_MODELS
+    )
     def resolve_all_flats(obj, info, **kwargs):
         return query(FlatType.get_queryset(Property.objects.all(), info), info)
 
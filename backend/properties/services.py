@@ -1,5 +1,6 @@
 from typing import Set, List
 from django.db.models import Q, F
+from django.utils.timezone import now
 from buildings.models import Floor
 from properties.constants import PropertyType
 
@@ -62,7 +63,7 @@ class WindowViewService:
 
         for i, ids in enumerate(self.flat_ids):
             self.property.objects.filter(pk__in=ids).update(
-                window_view=window_view_qs[i], mini_plan_point=mini_plan_point_qs[i]
+                window_view=window_view_qs[i], mini_plan_point=mini_plan_point_qs[i], changed=now()
             )
 
         self._set_success(True)
@@ -178,8 +179,11 @@ def update_layout_min_mortgage(layout_id):
 def update_special_offers_activity():
     from .models import SpecialOffer
 
+    from .facets import PropertyFacetSnapshot
+
     offers = SpecialOffer.objects.filter(is_active=True).annotate_activity()
     offers.update(is_active=F("is_active_a"))
+    PropertyFacetSnapshot.invalidate()
 
 
 def update_properties_min_mortgage(project_id=None):
@@ -193,18 +197,26 @@ def update_properties_min_mortgage(project_id=None):
 
 
 def update_price_with_special_offers(project_id=None):
+    from .facets import PropertyFacetSnapshot
     from .models import Layout, Property
 
     q = Q()
     if project_id:
         q = Q(project_id=project_id)
+    # update() не трогает auto_now, changed обновляется явно только у изменившихся цен,
+    # по нему фиды определяют, нужна ли пересборка
     (
         Property.objects.filter(q)
         .exclude(original_price__isnull=True)
         .annotate_price_with_offer()
-        .update(price=F("price_with_offer"))
+        .exclude(price=F("price_with_offer"))
+        .update(price=F("price_with_offer"), changed=now())
     )
     Layout.objects.annotate_max_discount().update(max_discount=F("max_discount_a"))
+    if project_id:
+        PropertyFacetSnapshot.invalidate(project_id)
+    else:
+        PropertyFacetSnapshot.invalidate()
 
 
 def update_layouts_facing_by_property():
@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from buildings.models import Building, Floor
+from projects.models import Project
+
+from .facets import PropertyFacetSnapshot
+from .loaders import feature_catalogue
+from .models import Feature, Property, SpecialOffer
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=Building)
+@receiver(post_delete, sender=Building)
+def invalidate_project_facets(sender, instance, **kwargs) -> None:
+    """
+    Сброс снимка фасетов проекта при изменении помещения или корпуса
+    """
+    if instance.project_id:
+        PropertyFacetSnapshot.invalidate(instance.project_id)
+
+
+@receiver(post_save, sender=Floor)
+def invalidate_project_facets_on_floor_save(sender, instance, **kwargs) -> None:
+    """
+    Номер этажа есть в снимке фасетов
+    """
+    project_id = instance.section.building.project_id
+    if project_id:
+        PropertyFacetSnapshot.invalidate(project_id)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_project_facets_on_project_save(sender, instance, **kwargs) -> None:
+    PropertyFacetSnapshot.invalidate(instance.id)
+
+
+@receiver(post_save, sender=SpecialOffer)
+@receiver(post_delete, sender=SpecialOffer)
+@receiver(m2m_changed, sender=SpecialOffer.properties.through)
+def invalidate_facets_on_special_offer_change(sender, **kwargs) -> None:
+    if kwargs.get("action", "post_").startswith("post_"):
+        PropertyFacetSnapshot.invalidate()
+
+
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+@receiver(m2m_changed, sender=Feature.cities.through)
+def invalidate_feature_catalogue(sender, **kwargs) -> None:
+    """
+    Сброс каталога особенностей при изменении особенности
+    """
+    if kwargs.get("action", "post_").startswith("post_"):
+        feature_catalogue.invalidate()
@@ -0,0 +1,112 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from buildings.services import calculate_building_finish_dates
+from buildings.tests.factories import BuildingFactory, FloorFactory, SectionFactory
+from common.facets import BitmapIndex, RangeIndex, bitmap_count, to_bitmap
+
+from ..constants import PropertyStatus, PropertyType
+from ..facets import PropertyColumnarFacets, PropertyFacetSnapshot
+from ..filters import FlatFilterSet
+from ..models import Property
+from .factories import FlatFactory
+
+
+class RangeIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.values = [
+            None if value is None else Decimal(value) for value in (700, 300, None, 1000, 500, 300, 900)
+        ] * 100
+        self.size = len(self.values)
+        self.index = RangeIndex(self.values, self.size)
+
+    def expected(self, predicate):
+        return to_bitmap(
+            (position for position, value in enumerate(self.values) if value is not None and predicate(value)),
+            self.size,
+        )
+
+    def test_mask(self):
+        self.assertEqual(self.index.mask(300, 700), self.expected(lambda value: 300 <= value <= 700))
+        self.assertEqual(self.index.mask(start=600), self.expected(lambda value: value >= 600))
+        self.assertEqual(self.index.mask(stop=299), 0)
+        self.assertEqual(bitmap_count(self.index.mask()), 600)
+
+    def test_bounds(self):
+        everything = (1 << self.size) - 1
+        self.assertEqual(self.index.bounds(everything), (Decimal(300), Decimal(1000)))
+        mask = self.expected(lambda value: 400 < value < 1000)
+        self.assertEqual(self.index.bounds(mask), (Decimal(500), Decimal(900)))
+        self.assertEqual(self.index.bounds(0), (None, None))
+
+
+class BitmapIndexTest(SimpleTestCase):
+    def test_multiple_values(self):
+        index = BitmapIndex([(1, 2), (), (2,), (None,)], 4)
+        self.assertEqual(index.mask([1]), 0b0001)
+        self.assertEqual(index.mask([1, 2]), 0b0101)
+        self.assertEqual(sorted(index.values(0b0100)), [2])
+        self.assertEqual(index.values(0b1010), [])
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class PropertyColumnarFacetsTest(TestCase):
+    """
+    Фильтры по снимку должны давать те же строки, что и SQL запрос, в том числе без кэша
+    """
+
+    data = {"rooms": ["0", "1"], "price_min": "1000000", "price_max": "5000000"}
+
+    def setUp(self):
+        for rooms, price in ((0, 900000), (1, 1000000), (1, 3000000), (2, 3000000), (1, 5000000), (0, 7000000)):
+            FlatFactory(rooms=rooms, price=Decimal(price), status=PropertyStatus.FREE)
+
+    def columnar_ids(self):
+        filterset = FlatFilterSet(data=self.data, queryset=Property.objects.filter(type=PropertyType.FLAT))
+        filterset.is_valid()
+        columnar = PropertyColumnarFacets(filterset)
+        ids = {pk for position, pk in enumerate(columnar.frame.ids) if columnar.full >> position & 1}
+        self.assertEqual(columnar.count, len(ids))
+        return ids, set(filterset.qs.values_list("id", flat=True))
+
+    def test_matches_queryset(self):
+        columnar_ids, sql_ids = self.columnar_ids()
+        self.assertEqual(len(sql_ids), 3)
+        self.assertEqual(columnar_ids, sql_ids)
+
+    def test_reloads_without_cache(self):
+        self.columnar_ids()
+        Property.objects.filter(price=Decimal(900000)).update(price=Decimal(2000000))
+        Property.objects.filter(price=Decimal(5000000)).update(rooms=3)
+        columnar_ids, sql_ids = self.columnar_ids()
+        self.assertEqual(len(sql_ids), 3)
+        self.assertEqual(columnar_ids, sql_ids)
+
+
+class PropertyFacetSnapshotInvalidationTest(TestCase):
+    """
+    Массовые update() обходят post_save, снимок сбрасывается явно
+    """
+
+    def test_building_finish_dates(self):
+        BuildingFactory()
+        with patch.object(PropertyFacetSnapshot, "invalidate") as invalidate:
+            calculate_building_finish_dates()
+        invalidate.assert_called_once_with()
+
+    def test_disable_zero(self):
+        FlatFactory(price=Decimal(1), status=PropertyStatus.FREE)
+        with patch.object(PropertyFacetSnapshot, "invalidate") as invalidate:
+            call_command("disable_zero")
+        invalidate.assert_called_once_with()
+
+    def test_floor_save(self):
+        building = BuildingFactory()
+        floor = FloorFactory(section=SectionFactory(building=building))
+        floor.number += 1
+        with patch.object(PropertyFacetSnapshot, "invalidate") as invalidate:
+            floor.save()
+        invalidate.assert_called_with(building.project_id)
@@ -2275,6 +2275,34 @@ class GlobalFlatTest(BaseTestCase):
         resp_data = resp.json()["data"]
         self.assertEqual(5, len(resp_data["allGlobalFlats"]["edges"]))
 
+    def test_all_global_flats_features_field(self):
+        facing = FeatureFactory(kind=FeatureTypeChoices.FACING, property_kind=[PropertyType.FLAT])
+        FeatureFactory(kind=FeatureTypeChoices.FACING, property_kind=[PropertyType.FLAT], lot_page_show=False)
+        FeatureFactory(kind=FeatureTypeChoices.PARKING, property_kind=[PropertyType.FLAT])
+        [FlatFactory(facing=i % 2, has_parking=False) for i in range(10)]
+
+        query = """
+                {
+                    allGlobalFlats {
+                        edges {
+                            node {
+                                facing
+                                features {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            """
+
+        resp = self.query(query)
+        self.assertResponseNoErrors(resp)
+
+        for flat in resp.json()["data"]["allGlobalFlats"]["edges"]:
+            names = [feature["name"] for feature in flat["node"]["features"]]
+            self.assertEqual(names, [facing.name] if flat["node"]["facing"] else [])
+
     def test_all_global_flats_with_special_offers(self):
         flats = [FlatFactory() for _ in range(9)]
         special_offers = [SpecialOfferFactory() for _ in range(3)]
@@ -1,2 +1,4 @@
 from .amocrm import AmoCRM
 from .components import AmoCRMFileUploader
+from .pool import AmoCRMClientPool, AmoCRMTokenState, amocrm_pool
+from .scheduler import AmoCRMWriteScheduler
@@ -3,14 +3,14 @@ from types import TracebackType
 from typing import Any, Callable, Coroutine, Optional, Type, Union
 
 import structlog
-from aiohttp import ClientSession, TCPConnector
-from asyncpg import Connection, Record, connect
+from aiohttp import ClientSession
 
-from config import amocrm_config, maintenance_settings
+from config import amocrm_config
 from .components import (AmoCRMCompanies, AmoCRMContacts, AmoCRMInterface,
                          AmoCRMLeads, AmoCRMNotes, AmoCRMTasks)
 from .decorators import refresh_on_status
 from .exceptions import AmocrmHookError
+from .pool import AmoCRMClientPool, AmoCRMTokenState, amocrm_pool
 from ..requests import CommonRequest, CommonResponse
 from ..wrappers import mark_async
 
@@ -23,39 +23,32 @@ class AmoCRM(
     AmoCRM integration
     """
 
-    _refresh_auth_fail_message = "ПРОИЗОШЛА ОШИБКА ПРИ ОБНОВЛЕНИИ ТОКЕНА АВТОРИЗАЦИИ AmoCRM!"
-
     _refresh_statuses: tuple[int] = (401, 403)
     _default_headers: dict[str, str] = {"Content-Type": "application/json"}
 
-    async def __ainit__(self) -> None:
+    async def __ainit__(self, pool: Optional[AmoCRMClientPool] = None) -> None:
         self.logger: Optional[Any] = structlog.getLogger(__name__)
-        self._session: ClientSession = ClientSession(
-            connector=TCPConnector(verify_ssl=False)
-        ) if maintenance_settings.get("environment", "dev") else ClientSession()
+        self._pool: AmoCRMClientPool = pool or amocrm_pool
+        self._tokens: AmoCRMTokenState = self._pool.tokens
+        self._session: ClientSession = self._pool.get_session()
         self._request_class: Type[CommonRequest] = CommonRequest
 
         self._url: str = amocrm_config["url"] + amocrm_config["api_route"]
         self._url_v4: str = amocrm_config["url"] + amocrm_config["api_route_v4"]
-        self._table: str = amocrm_config["db_table"]
-        self._auth_url: str = amocrm_config["url"] + amocrm_config["auth_route"]
-        self._connection_options: dict[str, str] = dict(
-            host=amocrm_config["db_host"],
-            port=amocrm_config["db_port"],
-            user=amocrm_config["db_user"],
-            password=amocrm_config["db_password"],
-            database=amocrm_config["db_name"],
-        )
 
-        print("----AMOCRM SETTINGS----")
-        print("url: ", self._url)
-        print("_connection_options: ", self._connection_options)
-        print("-"*20)
+        await self._tokens.sync()
 
-        self._settings: dict[str, Any] = await self._fetch_settings()
+    @property
+    def _settings(self) -> dict[str, Any]:
+        return self._tokens.settings
 
-        self._access_token: str = self._settings["access_token"]
-        self._refresh_token: str = self._settings["refresh_token"]
+    @property
+    def _access_token(self) -> str:
+        return self._tokens.access_token
+
+    @property
+    def _refresh_token(self) -> str:
+        return self._tokens.refresh_token
 
     @property
     def _auth_headers(self) -> dict[str, str]:
@@ -70,58 +63,19 @@ class AmoCRM(
         """
         Getting amocrm settings from database
         """
-        connection: Connection = await connect(**self._connection_options)
-        query: str = self.__get_select_query()
-        settings: Record = await connection.fetchrow(query=query)
-        await connection.close()
-        settings_dict = dict(settings)
-        print(f"Данные для авторизации из БД: {settings_dict}")
-        return settings_dict
+        return await self._tokens.fetch_settings()
 
-    async def _refresh_auth(self) -> None:
+    async def _refresh_auth(self, access_token: Optional[str] = None) -> None:
         """
         Refreshing authorization
         """
-        payload: dict[str, Any] = dict(
-            grant_type="refresh_token",
-            client_id=self._settings["client_id"],
-            redirect_uri=self._settings["redirect_uri"],
-            client_secret=self._settings["client_secret"],
-            refresh_token=self._settings["refresh_token"],
-        )
-
-        request_options: dict[str, Any] = self.__get_auth_options(payload=payload)
-        refresh_auth: Callable[..., Coroutine] = self._request_class(**request_options)
-
-        print("Запрос на обновление токена авторизации...")
-        print(f"Request Options: {request_options}")
-        response: CommonResponse = await refresh_auth()
-
-        print(f"Response Status: {response.status}")
-        print(f"Response Data: {response.data}")
-        if "access_token" not in response.data:
-            print(self._refresh_auth_fail_message)
-            self._settings = await self._fetch_settings()
-            self._access_token: str = self._settings["access_token"]
-            self._refresh_token: str = self._settings["refresh_token"]
-            return
-
-        self._access_token: str = response.data["access_token"]
-        self._refresh_token: str = response.data["refresh_token"]
-
-        print("Обновление данных для авторизации в AmoCRM в БД...")
-        db_update_status = await self._update_settings()
-        print(f"status: {db_update_status}")
+        await self._tokens.refresh(session=self._session, access_token=access_token)
 
     async def _update_settings(self) -> str:
         """
         Updating amocrm config on database
         """
-        connection: Connection = await connect(**self._connection_options)
-        query: str = self.__get_update_query()
-        status: str = await connection.execute(query=query)
-        await connection.close()
-        return status
+        return await self._tokens.update_settings()
 
     async def __aenter__(self) -> "AmoCRM":
         """
@@ -201,46 +155,13 @@ class AmoCRM(
         exc_tb: Optional[TracebackType],
     ) -> None:
         """
-        Closing session on exiting context manager
+        Session is owned by the process pool and stays open
         """
-        if not self._session.closed:
-            await self._session.close()
         if exc_val and exc_type:
             if hasattr(exc_val, "reason"):
                 raise exc_val
             raise AmocrmHookError(reason=f'{exc_type.__name__}: {exc_val}') from exc_val
 
-    def __get_select_query(self) -> str:
-        """
-        Select query for amocrm config
-        """
-        query: str = f"SELECT * from {self._table}"
-        return query
-
-    def __get_update_query(self) -> str:
-        """
-        Update query for amocrm config
-        """
-        query: str = (
-            f"UPDATE {self._table} "
-            f"SET (access_token, refresh_token) = ('{self._access_token}', '{self._refresh_token}') "
-            f"WHERE id = {self._settings['id']}"
-        )
-        return query
-
-    def __get_auth_options(self, payload: dict[str, Any]) -> dict[str, Any]:
-        """
-        Params for auth request
-        """
-        options: dict[str, Any] = dict(
-            method="POST",
-            payload=payload,
-            url=self._auth_url,
-            session=self._session,
-            headers=self._default_headers,
-        )
-        return options
-
     def __get_post_options(self, route: str, payload: Union[dict[str, Any], list[Any]]) -> dict[str, Any]:
         """
         Params for post request
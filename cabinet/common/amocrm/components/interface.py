@@ -68,7 +68,7 @@ class AmoCRMInterface(ABC, metaclass=RateLimitMeta):
         raise NotImplementedError
 
     @abstractmethod
-    async def _refresh_auth(self) -> None:
+    async def _refresh_auth(self, access_token: Optional[str] = None) -> None:
         raise NotImplementedError
 
     @abstractmethod
@@ -9,7 +9,7 @@ from typing import Any, Optional, Union
 import jmespath
 import structlog
 from common.amocrm.components.interface import AmoCRMInterface
-from config import EnvTypes, maintenance_settings
+from config import EnvTypes, amocrm_config, maintenance_settings
 from pydantic import ValidationError, parse_obj_as
 from pytz import UTC
 from starlette import status as http_status
@@ -25,6 +25,7 @@ from ..types.lead import AmoLeadCompany, AmoLeadContact, AmoLeadEmbedded
 from .decorators import user_tag_test_wrapper
 from ...sentry.utils import send_sentry_log
 from ...unleash.client import UnleashClient
+from ...utils import partition_list
 
 
 class AmoCRMLeads(AmoCRMInterface, ABC):
@@ -57,6 +58,9 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
         1309977: False,
     }
 
+    # Максимальное количество сущностей в одном пакетном запросе v4
+    batch_size: int = amocrm_config["batch_size"]
+
     # Common attributes
     default_lead_name: str = "Бронирование"
 
@@ -734,10 +738,9 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
         else:
             return await self.update_lead_v2(*args, **kwargs)
 
-    async def update_lead_v4(
+    def build_lead_payload_v4(
         self,
         *,
-        lead_id: int,
         price: Optional[int] = None,
         city_slug: Optional[str] = None,
         status_id: Optional[int] = None,
@@ -771,11 +774,11 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
         booking_price: int | None = None,
         is_agency_deal: bool | None = None,
         booking_expires_datetime: int | None = None,
-    ):
+    ) -> dict[str, Any]:
         """
+        Тело запроса на обновление сделки v4 (без id сделки)
         https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-edit
         """
-        route: str = f"/leads/{lead_id}"
         custom_fields = []
 
         if self.__is_strana_lk_2882_enable:
@@ -987,6 +990,16 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
                 )
             )
 
+        return payload
+
+    async def update_lead_v4(self, *, lead_id: int, **lead_options: Any):
+        """
+        https://www.amocrm.ru/developers/content/crm_platform/leads-api#leads-edit
+        Параметры обновления описаны в build_lead_payload_v4
+        """
+        route: str = f"/leads/{lead_id}"
+        payload: dict[str, Any] = self.build_lead_payload_v4(**lead_options)
+
         self.logger.debug(f"Payload lead v4: {payload}")
         response: CommonResponse = await self._request_patch_v4(route=route, payload=payload)
 
@@ -1114,9 +1127,13 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
             payload.append(lead_payload)
 
         self.logger.debug(f"Payload leads v4: {payload}")
-        response: CommonResponse = await self._request_patch_v4(route=route, payload=payload)
-
-        return response.data if response else []
+        # Ответы AmoCRM по каждой пачке до batch_size сделок
+        responses: list[Any] = []
+        for batch in partition_list(payload, self.batch_size):
+            response: CommonResponse = await self._request_patch_v4(route=route, payload=batch)
+            if response:
+                responses.append(response.data)
+        return responses
 
     # deprecated
     async def update_lead_v2(
@@ -1613,7 +1630,8 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
                     ) for entity_id in entity.ids
                 ])
 
-        await self._request_post_v4(route=route, payload=payload)
+        for batch in partition_list(payload, self.batch_size):
+            await self._request_post_v4(route=route, payload=batch)
 
     async def lead_unlink_entities(
         self,
@@ -1655,7 +1673,15 @@ class AmoCRMLeads(AmoCRMInterface, ABC):
                     ) for entity_id in entity.ids
                 ])
 
-        await self._request_post_v4(route=route, payload=payload)
+        for batch in partition_list(payload, self.batch_size):
+            await self._request_post_v4(route=route, payload=batch)
+
+    @property
+    def is_lead_v4_enabled(self) -> bool:
+        """
+        Сделки обновляются через API v4, иначе через v2 (см. update_lead)
+        """
+        return self.__is_strana_lk_2882_enable
 
     @property
     def __is_strana_lk_2882_enable(self) -> bool:
@@ -17,12 +17,13 @@ def refresh_on_status(method: Callable[..., Coroutine]) -> Callable[..., Corouti
     """
 
     async def decorated(self, *args, **kwargs) -> CommonResponse:
+        access_token: str = self._access_token
         response: CommonResponse = await method(self, *args, **kwargs)
         log_data: dict = dict(status=response.raw.status, method=response.raw.method, url=str(response.raw.url))
         amo_logger.debug("", request=args or kwargs, response=log_data)
 
         if response.status in self._refresh_statuses:
-            await self._refresh_auth()
+            await self._refresh_auth(access_token=access_token)
             response: CommonResponse = await method(self, *args, **kwargs)
         return response
 
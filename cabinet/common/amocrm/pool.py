@@ -0,0 +1,308 @@
+from asyncio import AbstractEventLoop, Lock, get_running_loop, sleep
+from time import monotonic
+from typing import Any, Callable, Coroutine, Optional
+from uuid import uuid4
+
+import structlog
+from aiohttp import ClientSession, TCPConnector
+from asyncpg import Connection, Record, connect
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from config import amocrm_config, maintenance_settings, redis_config
+from ..requests import CommonRequest, CommonResponse
+
+
+class AmoCRMTokenState:
+    """
+    Общее для процесса состояние авторизации AmoCRM
+
+    Токены читаются из БД один раз и дальше живут в памяти. Обновление токена
+    выполняется одним запросом на процесс (asyncio.Lock) и одним на все воркеры
+    (блокировка в Redis). После обновления в Redis записывается новая версия токена,
+    по которой остальные процессы понимают, что токены в БД нужно перечитать.
+    """
+
+    _refresh_auth_fail_message = "ПРОИЗОШЛА ОШИБКА ПРИ ОБНОВЛЕНИИ ТОКЕНА АВТОРИЗАЦИИ AmoCRM!"
+    _default_headers: dict[str, str] = {"Content-Type": "application/json"}
+    _remote_wait_step: float = 0.2
+
+    def __init__(self, redis_class: Optional[Callable[..., AsyncRedis]] = None) -> None:
+        self.logger: Any = structlog.getLogger(__name__)
+        self._redis_class: Callable[..., AsyncRedis] = redis_class or AsyncRedis.from_url
+
+        self._table: str = amocrm_config["db_table"]
+        self._auth_url: str = amocrm_config["url"] + amocrm_config["auth_route"]
+        self._version_key: str = amocrm_config["token_version_key"]
+        self._lock_key: str = amocrm_config["token_lock_key"]
+        self._lock_timeout: int = amocrm_config["token_lock_timeout"]
+        self._check_interval: int = amocrm_config["token_check_interval"]
+        self._connection_options: dict[str, str] = dict(
+            host=amocrm_config["db_host"],
+            port=amocrm_config["db_port"],
+            user=amocrm_config["db_user"],
+            password=amocrm_config["db_password"],
+            database=amocrm_config["db_name"],
+        )
+
+        self.settings: Optional[dict[str, Any]] = None
+        self.version: int = 0
+        self._checked_at: float = 0
+
+        self._loop: Optional[AbstractEventLoop] = None
+        self._lock: Optional[Lock] = None
+        self._redis: Optional[AsyncRedis] = None
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.settings["access_token"] if self.settings else None
+
+    @property
+    def refresh_token(self) -> Optional[str]:
+        return self.settings["refresh_token"] if self.settings else None
+
+    def prime(self, settings: dict[str, Any]) -> None:
+        """
+        Заполнение состояния готовыми настройками без похода в БД
+        """
+        self.settings: dict[str, Any] = dict(settings)
+        self._checked_at: float = monotonic()
+
+    async def sync(self) -> None:
+        """
+        Загрузка токенов при первом обращении и сверка версии токена с Redis
+        не чаще, чем раз в token_check_interval секунд
+        """
+        if self.settings is None:
+            async with self._get_lock():
+                if self.settings is None:
+                    self.settings: dict[str, Any] = await self.fetch_settings()
+                    self.version: int = await self._get_remote_version() or self.version
+                    self._checked_at: float = monotonic()
+            return
+        if monotonic() - self._checked_at < self._check_interval:
+            return
+        self._checked_at: float = monotonic()
+        async with self._get_lock():
+            await self._pull_remote_version()
+
+    async def refresh(self, session: ClientSession, access_token: Optional[str] = None) -> None:
+        """
+        Обновление токена авторизации
+
+        access_token - токен, с которым был получен 401/403. Если к моменту захвата
+        блокировки токен уже поменялся, повторно его не обновляем.
+        """
+        stale_token: Optional[str] = access_token or self.access_token
+        async with self._get_lock():
+            if self.access_token != stale_token:
+                return
+            if await self._pull_remote_version() and self.access_token != stale_token:
+                return
+
+            lock_value: Optional[str] = await self._acquire_remote_lock()
+            if lock_value is None:
+                await self._wait_remote_refresh()
+                return
+            try:
+                await self._refresh_tokens(session=session)
+            finally:
+                await self._release_remote_lock(lock_value=lock_value)
+
+    async def fetch_settings(self) -> dict[str, Any]:
+        """
+        Getting amocrm settings from database
+        """
+        connection: Connection = await connect(**self._connection_options)
+        try:
+            settings: Record = await connection.fetchrow(f"SELECT * from {self._table}")
+        finally:
+            await connection.close()
+        return dict(settings)
+
+    async def update_settings(self) -> str:
+        """
+        Updating amocrm config on database
+        """
+        connection: Connection = await connect(**self._connection_options)
+        try:
+            status: str = await connection.execute(
+                f"UPDATE {self._table} SET (access_token, refresh_token) = ($1, $2) WHERE id = $3",
+                self.access_token,
+                self.refresh_token,
+                self.settings["id"],
+            )
+        finally:
+            await connection.close()
+        return status
+
+    async def close(self) -> None:
+        """
+        Closing redis connection
+        """
+        if self._redis is not None and self._loop is not None and not self._loop.is_closed():
+            await self._redis.close()
+        self._redis: Optional[AsyncRedis] = None
+
+    async def _refresh_tokens(self, session: ClientSession) -> None:
+        """
+        Запрос новых токенов в AmoCRM и публикация новой версии
+        """
+        payload: dict[str, Any] = dict(
+            grant_type="refresh_token",
+            client_id=self.settings["client_id"],
+            redirect_uri=self.settings["redirect_uri"],
+            client_secret=self.settings["client_secret"],
+            refresh_token=self.refresh_token,
+        )
+        refresh_auth: Callable[..., Coroutine] = CommonRequest(
+            method="POST",
+            payload=payload,
+            url=self._auth_url,
+            session=session,
+            headers=self._default_headers,
+        )
+        response: CommonResponse = await refresh_auth()
+        self.logger.info("AmoCRM token refresh", status=response.status)
+
+        if not isinstance(response.data, dict) or "access_token" not in response.data:
+            self.logger.error(self._refresh_auth_fail_message, response=response.data)
+            self.settings: dict[str, Any] = await self.fetch_settings()
+            return
+
+        self.settings["access_token"]: str = response.data["access_token"]
+        self.settings["refresh_token"]: str = response.data["refresh_token"]
+        db_update_status: str = await self.update_settings()
+        self.logger.info("AmoCRM token saved", status=db_update_status)
+        await self._publish_version()
+
+    async def _pull_remote_version(self) -> bool:
+        """
+        Перечитывание токенов из БД, если другой процесс опубликовал более новую версию
+        """
+        remote_version: Optional[int] = await self._get_remote_version()
+        if remote_version is None or remote_version <= self.version:
+            return False
+        self.settings: dict[str, Any] = await self.fetch_settings()
+        self.version: int = remote_version
+        return True
+
+    async def _wait_remote_refresh(self) -> None:
+        """
+        Ожидание обновления токена другим процессом
+        """
+        deadline: float = monotonic() + self._lock_timeout
+        while monotonic() < deadline:
+            await sleep(self._remote_wait_step)
+            if await self._pull_remote_version():
+                return
+        self.settings: dict[str, Any] = await self.fetch_settings()
+
+    async def _get_remote_version(self) -> Optional[int]:
+        try:
+            version: Optional[bytes] = await self._get_redis().get(self._version_key)
+        except RedisError as error:
+            self.logger.warning("AmoCRM token version is unavailable", error=str(error))
+            return None
+        return int(version) if version is not None else None
+
+    async def _publish_version(self) -> None:
+        try:
+            self.version: int = await self._get_redis().incr(self._version_key)
+        except RedisError as error:
+            self.logger.warning("AmoCRM token version was not published", error=str(error))
+
+    async def _acquire_remote_lock(self) -> Optional[str]:
+        """
+        Блокировка обновления токена между воркерами. Если Redis недоступен,
+        токен обновляется локально.
+        """
+        lock_value: str = uuid4().hex
+        try:
+            acquired: bool = await self._get_redis().set(
+                self._lock_key, lock_value, nx=True, ex=self._lock_timeout
+            )
+        except RedisError as error:
+            self.logger.warning("AmoCRM token lock is unavailable", error=str(error))
+            return lock_value
+        return lock_value if acquired else None
+
+    async def _release_remote_lock(self, lock_value: str) -> None:
+        try:
+            redis: AsyncRedis = self._get_redis()
+            current: Optional[bytes] = await redis.get(self._lock_key)
+            if current is not None and current.decode("utf-8") == lock_value:
+                await redis.delete(self._lock_key)
+        except RedisError as error:
+            self.logger.warning("AmoCRM token lock was not released", error=str(error))
+
+    def _get_lock(self) -> Lock:
+        self._bind_loop()
+        return self._lock
+
+    def _get_redis(self) -> AsyncRedis:
+        self._bind_loop()
+        if self._redis is None:
+            self._redis: AsyncRedis = self._redis_class(redis_config["address"])
+        return self._redis
+
+    def _bind_loop(self) -> None:
+        """
+        Блокировка и соединение с Redis привязаны к циклу событий, при смене цикла
+        (например, в celery после new_event_loop) создаются заново
+        """
+        loop: AbstractEventLoop = get_running_loop()
+        if self._loop is not loop:
+            self._loop: AbstractEventLoop = loop
+            self._lock: Lock = Lock()
+            self._redis: Optional[AsyncRedis] = None
+
+
+class AmoCRMClientPool:
+    """
+    Долгоживущий пул соединений AmoCRM на процесс
+
+    Хранит одну aiohttp-сессию с keep-alive соединениями и кэшем DNS и общее
+    состояние токенов, поэтому создание AmoCRM не требует ни новых соединений,
+    ни запроса настроек в БД.
+    """
+
+    def __init__(self, tokens: Optional[AmoCRMTokenState] = None) -> None:
+        self.tokens: AmoCRMTokenState = tokens or AmoCRMTokenState()
+
+        self._limit: int = amocrm_config["pool_limit"]
+        self._keepalive_timeout: float = amocrm_config["pool_keepalive_timeout"]
+        self._dns_cache_ttl: int = amocrm_config["pool_dns_cache_ttl"]
+        self._verify_ssl: bool = not maintenance_settings.get("environment", "dev")
+
+        self._loop: Optional[AbstractEventLoop] = None
+        self._session: Optional[ClientSession] = None
+
+    def get_session(self) -> ClientSession:
+        """
+        Сессия текущего цикла событий
+        """
+        loop: AbstractEventLoop = get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector: TCPConnector = TCPConnector(
+                limit=self._limit,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=self._dns_cache_ttl,
+                ssl=None if self._verify_ssl else False,
+            )
+            self._session: ClientSession = ClientSession(connector=connector)
+            self._loop: AbstractEventLoop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Closing pool on application shutdown
+        """
+        if self._session is not None and not self._session.closed:
+            if self._loop is not None and not self._loop.is_closed():
+                await self._session.close()
+        self._session: Optional[ClientSession] = None
+        await self.tokens.close()
+
+
+amocrm_pool: AmoCRMClientPool = AmoCRMClientPool()
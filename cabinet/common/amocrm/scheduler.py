@@ -0,0 +1,324 @@
+from asyncio import Future, Task, TimerHandle, create_task, gather, get_running_loop, sleep
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Awaitable, Callable, Hashable, Optional, Type
+
+import structlog
+
+from config import amocrm_config
+from .constants import AmoEntityTypes, AmoNoteTypes
+from .exceptions import AmocrmHookError
+from .models import Entity
+from ..requests import CommonResponse
+from ..utils import partition_list
+
+
+@dataclass
+class _PendingWrite:
+    """
+    Изменение одной сущности, ожидающее отправки
+    """
+    payload: dict[str, Any]
+    futures: list[Future] = field(default_factory=list)
+
+
+@dataclass
+class _WriteQueue:
+    """
+    Очередь изменений для одного пакетного эндпоинта AmoCRM v4
+    """
+    method: str
+    route: str
+    result_key: str
+    response_key: Callable[[dict[str, Any]], Hashable]
+    merge: bool = False
+    items: dict[Hashable, _PendingWrite] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def pop_all(self) -> dict[Hashable, _PendingWrite]:
+        items, self.items = self.items, dict()
+        return items
+
+
+class AmoCRMWriteScheduler:
+    """
+    Планировщик пакетной записи в AmoCRM v4
+
+    Копит изменения сделок, контактов, примечаний и связей, объединяет изменения
+    одной и той же сущности и отправляет их пакетами до batch_size сущностей.
+    Частота запросов ограничивается общим лимитером AmoCRM (RateLimitSingleton),
+    ответы 429 повторяются с задержкой из Retry-After.
+    Каждый вызов возвращает asyncio.Future с результатом по своей сущности,
+    ошибки записи передаются в Future, их нужно дождаться и обработать.
+    Пока обновление сделок через v4 выключено флагом, update_lead выполняется
+    через AmoCRM.update_lead_v2 по одной сделке.
+
+    Пример:
+        async with await self.amocrm_class() as amocrm:
+            async with AmoCRMWriteScheduler(amocrm) as scheduler:
+                futures = [scheduler.update_lead(lead_id=lead_id, status_id=status_id) for lead_id in lead_ids]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+    """
+
+    _too_many_requests_status: int = 429
+
+    def __init__(
+        self,
+        amocrm: Any,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ) -> None:
+        self.logger: Any = structlog.getLogger(__name__)
+        self._amocrm: Any = amocrm
+
+        self._batch_size: int = batch_size or amocrm_config["batch_size"]
+        self._flush_interval: float = flush_interval or amocrm_config["batch_flush_interval"]
+        self._max_retries: int = amocrm_config["batch_max_retries"]
+        self._retry_backoff: float = amocrm_config["batch_retry_backoff"]
+
+        self._queues: dict[str, _WriteQueue] = dict()
+        self._tasks: set[Task] = set()
+        self._timer: Optional[TimerHandle] = None
+        self._note_counter: int = 0
+
+    async def __aenter__(self) -> "AmoCRMWriteScheduler":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """
+        Отправка всех накопленных изменений на выходе из контекстного менеджера
+        """
+        await self.flush()
+
+    def update_lead(self, *, lead_id: int, **lead_options: Any) -> Future:
+        """
+        Обновление сделки, параметры как у AmoCRMLeads.update_lead
+        """
+        if not self._amocrm.is_lead_v4_enabled:
+            future: Future = get_running_loop().create_future()
+            self._spawn(self._run(future, self._amocrm.update_lead_v2(lead_id=lead_id, **lead_options)))
+            return future
+        payload: dict[str, Any] = self._amocrm.build_lead_payload_v4(**lead_options)
+        return self.update_lead_payload(lead_id=lead_id, payload=payload)
+
+    def update_lead_payload(self, *, lead_id: int, payload: dict[str, Any]) -> Future:
+        """
+        Обновление сделки готовым телом запроса v4
+        """
+        queue: _WriteQueue = self._get_queue(
+            method="_request_patch_v4", route="/leads", result_key="leads", merge=True
+        )
+        return self._enqueue(queue=queue, key=lead_id, payload=dict(payload, id=lead_id))
+
+    def update_contact(self, *, contact_id: int, payload: dict[str, Any]) -> Future:
+        """
+        Обновление контакта готовым телом запроса v4
+        """
+        queue: _WriteQueue = self._get_queue(
+            method="_request_patch_v4", route="/contacts", result_key="contacts", merge=True
+        )
+        return self._enqueue(queue=queue, key=contact_id, payload=dict(payload, id=contact_id))
+
+    def add_note(
+        self,
+        *,
+        entity_id: int,
+        text: str,
+        entity_type: str = AmoEntityTypes.LEADS,
+        note_type: str = AmoNoteTypes.COMMON,
+    ) -> Future:
+        """
+        Добавление примечания к сущности. Примечания не объединяются,
+        ответ сопоставляется с запросом по request_id.
+        """
+        queue: _WriteQueue = self._get_queue(
+            method="_request_post_v4",
+            route=f"/{entity_type}/notes",
+            result_key="notes",
+            response_key=lambda item: item.get("request_id"),
+        )
+        self._note_counter += 1
+        request_id: str = str(self._note_counter)
+        payload: dict[str, Any] = dict(
+            entity_id=entity_id,
+            note_type=note_type,
+            params=dict(text=text),
+            request_id=request_id,
+        )
+        return self._enqueue(queue=queue, key=request_id, payload=payload)
+
+    def link_lead(self, *, lead_id: int, entity: Entity) -> list[Future]:
+        """
+        Привязка сущностей к сделке
+        """
+        return self._link(route="/leads/link", lead_id=lead_id, entity=entity)
+
+    def unlink_lead(self, *, lead_id: int, entity: Entity) -> list[Future]:
+        """
+        Отвязка сущностей от сделки
+        """
+        return self._link(route="/leads/unlink", lead_id=lead_id, entity=entity)
+
+    async def flush(self) -> None:
+        """
+        Отправка всех накопленных изменений
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer: Optional[TimerHandle] = None
+        await gather(*(self._flush_queue(queue) for queue in self._queues.values() if queue))
+        if self._tasks:
+            await gather(*self._tasks, return_exceptions=True)
+
+    def _link(self, route: str, lead_id: int, entity: Entity) -> list[Future]:
+        queue: _WriteQueue = self._get_queue(
+            method="_request_post_v4",
+            route=route,
+            result_key="links",
+            response_key=self._link_key,
+        )
+        futures: list[Future] = []
+        for entity_id in entity.ids:
+            payload: dict[str, Any] = dict(
+                entity_id=lead_id, to_entity_id=entity_id, to_entity_type=entity.type
+            )
+            futures.append(self._enqueue(queue=queue, key=self._link_key(payload), payload=payload))
+        return futures
+
+    def _get_queue(
+        self,
+        method: str,
+        route: str,
+        result_key: str,
+        merge: bool = False,
+        response_key: Optional[Callable[[dict[str, Any]], Hashable]] = None,
+    ) -> _WriteQueue:
+        name: str = f"{method}:{route}"
+        if name not in self._queues:
+            self._queues[name]: _WriteQueue = _WriteQueue(
+                method=method,
+                route=route,
+                result_key=result_key,
+                merge=merge,
+                response_key=response_key or (lambda item: item.get("id")),
+            )
+        return self._queues[name]
+
+    def _enqueue(self, queue: _WriteQueue, key: Hashable, payload: dict[str, Any]) -> Future:
+        future: Future = get_running_loop().create_future()
+        pending: Optional[_PendingWrite] = queue.items.get(key)
+        if pending is None:
+            queue.items[key]: _PendingWrite = _PendingWrite(payload=payload)
+            pending: _PendingWrite = queue.items[key]
+        elif queue.merge:
+            pending.payload: dict[str, Any] = self._merge_payloads(pending.payload, payload)
+        pending.futures.append(future)
+
+        if len(queue) >= self._batch_size:
+            self._spawn(self._flush_queue(queue))
+        elif self._timer is None:
+            self._timer: TimerHandle = get_running_loop().call_later(self._flush_interval, self._on_timer)
+        return future
+
+    def _on_timer(self) -> None:
+        self._timer: Optional[TimerHandle] = None
+        for queue in self._queues.values():
+            if queue:
+                self._spawn(self._flush_queue(queue))
+
+    def _spawn(self, coroutine: Any) -> None:
+        task: Task = create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, future: Future, request: Awaitable[Any]) -> None:
+        """
+        Одиночный запрос в обход очередей, результат передается в Future
+        """
+        try:
+            result: Any = await request
+        except Exception as error:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(error)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _flush_queue(self, queue: _WriteQueue) -> None:
+        items: dict[Hashable, _PendingWrite] = queue.pop_all()
+        for keys in partition_list(list(items), self._batch_size):
+            writes: list[_PendingWrite] = [items[key] for key in keys]
+            try:
+                response: CommonResponse = await self._send(
+                    queue=queue, payload=[write.payload for write in writes]
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self.logger.error("AmoCRM batch write failed", route=queue.route, size=len(keys), error=str(error))
+                for write in writes:
+                    self._resolve(write=write, exception=error)
+                continue
+
+            embedded: dict[str, Any] = response.data.get("_embedded", {}) if isinstance(response.data, dict) else {}
+            results: dict[Hashable, Any] = {
+                queue.response_key(item): item for item in embedded.get(queue.result_key, [])
+            }
+            for key, write in zip(keys, writes):
+                self._resolve(write=write, result=results.get(key))
+
+    async def _send(self, queue: _WriteQueue, payload: list[dict[str, Any]]) -> CommonResponse:
+        request: Callable[..., Any] = getattr(self._amocrm, queue.method)
+        for attempt in range(self._max_retries + 1):
+            response: CommonResponse = await request(route=queue.route, payload=payload)
+            if response.status != self._too_many_requests_status:
+                break
+            delay: float = self._get_retry_delay(response=response, attempt=attempt)
+            self.logger.warning("AmoCRM rate limit exceeded", route=queue.route, attempt=attempt, delay=delay)
+            await sleep(delay)
+        if not response.ok:
+            raise AmocrmHookError(reason=f"{queue.route}: {response.status} {response.data}")
+        return response
+
+    def _get_retry_delay(self, response: CommonResponse, attempt: int) -> float:
+        retry_after: Optional[str] = response.raw.headers.get("Retry-After") if response.raw else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self._retry_backoff * 2 ** attempt
+
+    @staticmethod
+    def _resolve(
+        write: _PendingWrite, result: Any = None, exception: Optional[BaseException] = None
+    ) -> None:
+        for future in write.futures:
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _merge_payloads(current: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+        """
+        Объединение изменений одной сущности: поля верхнего уровня перезаписываются,
+        дополнительные поля объединяются по field_id
+        """
+        merged: dict[str, Any] = {**current, **new}
+        custom_fields: dict[Any, dict[str, Any]] = dict()
+        for custom_field in current.get("custom_fields_values") or []:
+            custom_fields[custom_field.get("field_id", custom_field.get("id"))] = custom_field
+        for custom_field in new.get("custom_fields_values") or []:
+            custom_fields[custom_field.get("field_id", custom_field.get("id"))] = custom_field
+        if custom_fields:
+            merged["custom_fields_values"]: list[dict[str, Any]] = list(custom_fields.values())
+        return merged
+
+    @staticmethod
+    def _link_key(item: dict[str, Any]) -> Hashable:
+        return item.get("entity_id"), item.get("to_entity_id"), item.get("to_entity_type")
@@ -1,4 +1,3 @@
-import asyncio
 
 import tortoise
 from typing import Any
@@ -25,8 +24,7 @@ def update_amocrm_statuses_periodic():
         statuses_repo=AmoStatusesRepo
     )
     service: services.AmoUpdateStatusesService = services.AmoUpdateStatusesService(**resources)
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(service))())
+    celery.run(celery.sentry_catch(celery.init_orm(service))())
 
 
 @celery.app.task
@@ -37,6 +35,5 @@ def bind_contact_to_company(agent_amocrm_id: int, agency_amocrm_id: int):
         orm_config=tortoise_config,
     )
     service: services.BindContactCompanyService = services.BindContactCompanyService(**resources)
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(service))(
+    celery.run(celery.sentry_catch(celery.init_orm(service))(
         agency_amocrm_id=agency_amocrm_id, agent_amocrm_id=agent_amocrm_id))
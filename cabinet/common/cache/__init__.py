@@ -0,0 +1,3 @@
+from .decorators import cache_storage, invalidate_cache, make_cache_key
+from .layers import CacheLayer, LocalCache, cache_layer
+from .storages import CacheStorage
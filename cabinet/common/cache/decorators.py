@@ -1,21 +1,55 @@
-from typing import Any, Callable, Coroutine
+from functools import wraps
 from hashlib import md5
+from typing import Any, Callable, Coroutine, Iterable, Optional, Union
 
-from .storages import CacheStorage
+from .layers import CacheLayer, cache_layer
 
 
-def cache_storage(method: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
+def make_cache_key(method: Callable[..., Coroutine], args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """
+    Ключ кэша по имени метода и аргументам, имена kwargs учитываются
+    """
+    arguments: str = repr((tuple(map(str, args)), sorted((name, str(value)) for name, value in kwargs.items())))
+    return f"{cache_layer.prefix}:{method.__qualname__}:{md5(arguments.encode()).hexdigest()}"
+
+
+def cache_storage(
+    method: Optional[Callable[..., Coroutine]] = None,
+    *,
+    ttl: Optional[int] = None,
+    stale_ttl: Optional[int] = None,
+    tags: Iterable[str] = (),
+    layer: Optional[CacheLayer] = None,
+) -> Union[Callable[..., Coroutine], Callable[[Callable[..., Coroutine]], Callable[..., Coroutine]]]:
     """
     Cache response data
+
+    @cache_storage или @cache_storage(ttl=600, stale_ttl=60, tags=("cities",))
+    """
+    tags: tuple[str, ...] = tuple(tags)
+
+    def decorator(method: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
+        @wraps(method)
+        async def decorated(self, *args: list[Any], **kwargs: dict[str, Any]) -> Any:
+            storage: CacheLayer = layer or cache_layer
+            return await storage.get_or_set(
+                key=make_cache_key(method, args, kwargs),
+                loader=lambda: method(self, *args, **kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                tags=tags,
+                name=method.__qualname__,
+            )
+
+        return decorated
+
+    if method is not None:
+        return decorator(method)
+    return decorator
+
+
+async def invalidate_cache(*tags: str, layer: Optional[CacheLayer] = None) -> None:
+    """
+    Сброс кэша по тегам
     """
-    async def decorated(self, *args: list[Any], **kwargs: dict[str, Any]) -> Any:
-        storage: CacheStorage = await CacheStorage()
-        key = tuple(map(str, (method.__name__,) + args + tuple(kwargs.values())))
-        storage_key = f"method_cache_{md5(''.join(key).encode()).hexdigest()}"
-        result: Any = await storage.get(storage_key)
-        if result is None:
-            result: Any = await method(self, *args, **kwargs)
-            await storage.set(key=storage_key, value=result, expire=3_600*24)
-        return result
-
-    return decorated
+    await (layer or cache_layer).invalidate(*tags)
@@ -0,0 +1,244 @@
+from asyncio import Future, Task, create_task, get_running_loop
+from collections import OrderedDict, defaultdict
+from time import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import structlog
+
+from config import cache_config
+from ..redis import broker as redis, Redis
+
+
+class LocalCache:
+    """
+    LRU кэш процесса с ограничением по времени жизни записей
+    """
+
+    def __init__(self, maxsize: int, ttl: int) -> None:
+        self._maxsize: int = maxsize
+        self._ttl: int = ttl
+        self._data: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        item: Optional[tuple[float, dict[str, Any]]] = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, envelope = item
+        if expires_at <= time():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return envelope
+
+    def set(self, key: str, envelope: dict[str, Any]) -> None:
+        expires_at: float = min(time() + self._ttl, envelope["stale_until"])
+        self._data[key] = (expires_at, envelope)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class CacheLayer:
+    """
+    Двухуровневый кэш результатов методов
+
+    Первый уровень - LRU в памяти процесса (local_ttl), второй - Redis.
+    В Redis значение хранится вместе со временем свежести: после fresh_until
+    устаревшее значение ещё stale_ttl секунд отдаётся сразу, а пересчёт выполняется
+    в фоне. Одновременные промахи по одному ключу ждут одного вычисления.
+    Ключи привязываются к тегам, по которым их можно сбросить (invalidate).
+    Сброс по тегу очищает Redis и локальный уровень текущего процесса,
+    в остальных процессах локальная копия живёт не дольше local_ttl.
+    """
+
+    def __init__(self, broker: Optional[Any] = None) -> None:
+        self.logger: Any = structlog.getLogger(__name__)
+        self.redis: Redis = redis
+        if broker:
+            self.redis: Redis = broker
+
+        self.prefix: str = cache_config["prefix"]
+        self.tag_prefix: str = cache_config["tag_prefix"]
+        self.ttl: int = cache_config["ttl"]
+        self.stale_ttl: int = cache_config["stale_ttl"]
+
+        self._local: LocalCache = LocalCache(
+            maxsize=cache_config["local_maxsize"], ttl=cache_config["local_ttl"]
+        )
+        self._local_tags: defaultdict[str, set[str]] = defaultdict(set)
+        self._inflight: dict[str, Future] = dict()
+        self._tasks: set[Task] = set()
+        self._metrics: defaultdict[str, defaultdict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        name: str = "default",
+    ) -> Any:
+        """
+        Значение из кэша или результат loader с записью в кэш
+        """
+        ttl: int = ttl or self.ttl
+        stale_ttl: int = self.stale_ttl if stale_ttl is None else stale_ttl
+        tags: tuple[str, ...] = tuple(tags)
+        metrics: defaultdict[str, int] = self._metrics[name]
+
+        envelope: Optional[dict[str, Any]] = self._local.get(key)
+        if envelope is not None:
+            metrics["local_hits"] += 1
+        else:
+            try:
+                envelope: Optional[dict[str, Any]] = self._validate(await self.redis.get(key))
+            except Exception as error:  # pylint: disable=broad-except
+                metrics["errors"] += 1
+                self.logger.warning("Cache read failed", key=key, error=str(error))
+                envelope: Optional[dict[str, Any]] = None
+            if envelope is not None:
+                metrics["redis_hits"] += 1
+                self._store_local(key=key, envelope=envelope, tags=tags)
+
+        if envelope is not None:
+            if envelope["fresh_until"] <= time():
+                metrics["stale_hits"] += 1
+                self._refresh_in_background(key, loader, ttl, stale_ttl, tags, name)
+            return envelope["value"]
+
+        metrics["misses"] += 1
+        return await self._load(key, loader, ttl, stale_ttl, tags, name)
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Сброс всех ключей, привязанных к тегам
+        """
+        for tag in tags:
+            tag_key: str = self._tag_key(tag)
+            members: list[bytes] = await self.redis.execute("SMEMBERS", tag_key) or []
+            keys: set[str] = {
+                member.decode("utf-8") if isinstance(member, bytes) else member for member in members
+            }
+            keys |= self._local_tags.pop(tag, set())
+            self._local.delete(*keys)
+            await self.redis.delete(*keys, tag_key)
+
+    async def delete(self, *keys: str) -> None:
+        """
+        Сброс ключей
+        """
+        self._local.delete(*keys)
+        await self.redis.delete(*keys)
+
+    def metrics(self) -> dict[str, dict[str, int]]:
+        """
+        Счётчики попаданий и промахов по функциям
+        """
+        return {name: dict(counters) for name, counters in self._metrics.items()}
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: tuple[str, ...],
+        name: str,
+    ) -> Any:
+        inflight: Optional[Future] = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is get_running_loop():
+            self._metrics[name]["coalesced"] += 1
+            return await inflight
+
+        future: Future = get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value: Any = await loader()
+            await self._store(key=key, value=value, ttl=ttl, stale_ttl=stale_ttl, tags=tags, name=name)
+        except BaseException as error:
+            future.set_exception(error)
+            # Исключение получит тот, кто вычислял; ожидающие получат его через future
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            if self._inflight.get(key) is future:
+                self._inflight.pop(key, None)
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: tuple[str, ...],
+        name: str,
+    ) -> None:
+        inflight: Optional[Future] = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is get_running_loop():
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._load(key, loader, ttl, stale_ttl, tags, name)
+            except Exception as error:  # pylint: disable=broad-except
+                self._metrics[name]["errors"] += 1
+                self.logger.warning("Cache refresh failed", key=key, error=str(error))
+
+        task: Task = create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _store(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        stale_ttl: int,
+        tags: tuple[str, ...],
+        name: str,
+    ) -> None:
+        if value is None:
+            return
+        now: float = time()
+        envelope: dict[str, Any] = dict(value=value, fresh_until=now + ttl, stale_until=now + ttl + stale_ttl)
+        self._store_local(key=key, envelope=envelope, tags=tags)
+        try:
+            await self.redis.set(key=key, value=envelope, expire=ttl + stale_ttl)
+            for tag in tags:
+                tag_key: str = self._tag_key(tag)
+                await self.redis.execute("SADD", tag_key, key)
+                await self.redis.execute("EXPIRE", tag_key, ttl + stale_ttl)
+        except Exception as error:  # pylint: disable=broad-except
+            self._metrics[name]["errors"] += 1
+            self.logger.warning("Cache write failed", key=key, error=str(error))
+
+    def _store_local(self, key: str, envelope: dict[str, Any], tags: tuple[str, ...]) -> None:
+        self._local.set(key, envelope)
+        for tag in tags:
+            self._local_tags[tag].add(key)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.tag_prefix}:{tag}"
+
+    @staticmethod
+    def _validate(envelope: Any) -> Optional[dict[str, Any]]:
+        """
+        Значения старого формата (без времени свежести) считаются промахом
+        """
+        if isinstance(envelope, dict) and {"value", "fresh_until", "stale_until"} <= envelope.keys():
+            return envelope
+        return None
+
+
+cache_layer: CacheLayer = CacheLayer()
@@ -24,8 +24,6 @@ class CacheStorage(object):
         """
         expire: int = expire or self.expire
         ok: bool = await self.redis.set(key=key, value=value, expire=expire)
-        if not ok:
-            self.data.pop(key)
         return ok
 
     async def get(self, key: Union[str, int, bytes, bytearray], default: Optional[Any] = None) -> Any:
@@ -37,3 +35,18 @@ class CacheStorage(object):
             value: Any = default
         return value
 
+
+    async def get_many(self, keys: list[Union[str, int, bytes, bytearray]]) -> dict[Any, Any]:
+        """
+        Get values from session storage by keys with a single MGET
+        """
+        values: list[Any] = await self.redis.mget(keys=list(keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, mapping: dict[Union[str, int, bytes, bytearray], Any], expire: int = None) -> bool:
+        """
+        Set values to session storage in one round trip
+        """
+        expire: int = expire or self.expire
+        ok: bool = await self.redis.mset(mapping=mapping, expire=expire)
+        return ok
@@ -1 +1,2 @@
+from .loop import PersistentEventLoop
 from .priority import Priority
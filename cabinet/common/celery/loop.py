@@ -0,0 +1,102 @@
+from asyncio import AbstractEventLoop, new_event_loop, run_coroutine_threadsafe, set_event_loop
+from os import getpid
+from threading import Event, RLock, Thread, get_ident
+from typing import Any, Coroutine, Optional
+
+
+class PersistentEventLoop:
+    """
+    Постоянный event loop процесса воркера celery
+
+    Loop работает в отдельном потоке процесса, ORM инициализируется на нем один раз
+    при старте процесса и закрывается при его остановке. Задача передает корутину
+    в loop и ждет результат, поэтому задачи из нескольких потоков пула (celery worker -P threads)
+    выполняются на одном loop конкурентно и используют общий пул соединений.
+    После fork loop родителя не используется, в дочернем процессе запускается свой.
+    """
+
+    _thread_name: str = "celery-event-loop"
+    _stop_timeout: int = 30
+
+    def __init__(self, orm_class: Any, orm_config: dict[str, Any]) -> None:
+        self._orm_class: Any = orm_class
+        self._orm_config: dict[str, Any] = orm_config
+        self._lock: RLock = RLock()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+        self._pid: Optional[int] = None
+        self._orm_ready: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._pid == getpid() and self._loop.is_running()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Loop запущен и ORM на нем инициализирована
+        """
+        return self.running and self._orm_ready
+
+    def start(self) -> None:
+        """
+        Запуск loop и инициализация ORM, повторный вызов ничего не делает
+        """
+        if self.ready:
+            return
+        with self._lock:
+            if self.ready:
+                return
+            started: Event = Event()
+            loop: AbstractEventLoop = new_event_loop()
+            thread: Thread = Thread(
+                target=self._run_forever, args=(loop, started), name=self._thread_name, daemon=True
+            )
+            thread.start()
+            started.wait()
+            self._loop, self._thread, self._pid = loop, thread, getpid()
+            try:
+                run_coroutine_threadsafe(self._orm_class.init(config=self._orm_config), loop).result()
+            except Exception:
+                self.stop()
+                raise
+            self._orm_ready = True
+
+    def stop(self) -> None:
+        """
+        Закрытие соединений ORM и остановка loop
+        """
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                if self._orm_ready:
+                    run_coroutine_threadsafe(self._orm_class.close_connections(), loop).result(
+                        timeout=self._stop_timeout
+                    )
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=self._stop_timeout)
+                if not loop.is_running():
+                    loop.close()
+                self._loop, self._thread, self._pid = None, None, None
+                self._orm_ready = False
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """
+        Выполнение корутины на loop с ожиданием результата в текущем потоке
+        """
+        if not self.running:
+            coroutine.close()
+            raise RuntimeError("Persistent event loop is not running")
+        if self._thread.ident == get_ident():
+            coroutine.close()
+            raise RuntimeError("Persistent event loop can not wait for itself")
+        return run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @staticmethod
+    def _run_forever(loop: AbstractEventLoop, started: Event) -> None:
+        set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
@@ -1,4 +1,4 @@
-from .paginations import Pagination
+from .paginations import CursorPagination, Pagination
 from .users import (
     CurrentUserId,
     CurrentAnyTypeUserId,
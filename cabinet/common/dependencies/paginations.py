@@ -3,7 +3,8 @@ from urllib.parse import urlparse, parse_qs, ParseResult
 
 from fastapi import Query, Request
 
-from common.paginations import PagePagination
+from common.paginations import CountModes, PagePagination
+from common.paginations import CursorPagination as CursorPaginationModel
 
 
 class Pagination:
@@ -25,3 +26,31 @@ class Pagination:
         query: dict = parse_qs(parsed_url.query)
         page_size: int = page_size or self.page_size
         return PagePagination(path=path, query=query, page_number=page, page_size=page_size)
+
+
+class CursorPagination:
+    """
+    Курсорный пагинатор, включается параметром cursor (пустой - первая страница)
+    """
+
+    def __init__(self, page_size: int = 12, count_mode: str = CountModes.ESTIMATE) -> None:
+        self.page_size: int = page_size
+        self.count_mode: str = count_mode
+
+    def __call__(
+            self,
+            request: Request,
+            cursor: Optional[str] = Query(None),
+            page_size: Optional[int] = Query(None, gt=1, le=1000),
+            count_mode: Optional[CountModes] = Query(None),
+    ) -> Optional[CursorPaginationModel]:
+        if cursor is None:
+            return None
+        path: str = request.scope["path"]
+        parsed_url: ParseResult = urlparse(str(request.url))
+        query: dict = parse_qs(parsed_url.query)
+        query.pop("count_mode", None)
+        page_size: int = page_size or self.page_size
+        return CursorPaginationModel(
+            path=path, page_size=page_size, cursor=cursor, query=query, count_mode=count_mode or self.count_mode
+        )
@@ -154,6 +154,7 @@ class DeletedUserCheck(object):
         deleted: list[int] = await self.redis.lget(self.redis_key)
         deleted: list[int] = deleted if deleted else list()
         session: SessionStorage = request.session
+        await session.load()
         if session.auth is not None and isinstance(session.auth, dict):
             id: int = session.auth.get("id", None)
             if id is not None and str(id) in deleted:
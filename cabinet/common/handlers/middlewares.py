@@ -1,26 +1,21 @@
-from typing import Callable, Coroutine
-
 import sentry_sdk
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 
 from common.handlers.exceptions import get_exc_info
+from common.middlewares import BaseASGIMiddleware
 
 logger = structlog.getLogger('errors')
 
 
-class CatchExceptionsMiddleware(BaseHTTPMiddleware):
+class CatchExceptionsMiddleware(BaseASGIMiddleware):
     """
     Logger Exceptions middleware
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Coroutine]
-    ) -> Response:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
         try:
-            return await call_next(request)
+            await app(scope, receive, send)
         except Exception as exception:
             sentry_sdk.capture_exception(exception)
             logger.error(f'UNCAUGHT_ERROR', exc_info=get_exc_info(exception))
@@ -1 +1,2 @@
 from .config import LOGGER_CONFIG, STRUCTLOG_CONFIG
+from .writer import BufferedLogWriter, close_log_writers, flush_log_writers
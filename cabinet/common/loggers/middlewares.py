@@ -1,45 +1,58 @@
 import uuid
-from typing import Callable, Coroutine
+from typing import Optional
 
 import structlog
 from config import amocrm_config
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.middlewares import BaseASGIMiddleware, get_middleware_timings
 
 logger = structlog.get_logger("response")
 amo_logger = structlog.get_logger("AmoWebhook")
 
 
-class LoggerMiddleware(BaseHTTPMiddleware):
+class LoggerMiddleware(BaseASGIMiddleware):
     """
     Logger middleware
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Coroutine]
-    ) -> Response:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        request: Request = Request(scope)
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(
             request_id=str(uuid.uuid4()),
             method=request.method,
             view=request.url.path
         )
-        response: Response = await call_next(request)
-        logger.info(status_code=response.status_code)
-        return response
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await app(scope, receive, send_wrapper)
+        logger.info(status_code=status_code, middlewares_ms=get_middleware_timings(scope))
 
 
-class AMOWebhookLoggerMiddleware(BaseHTTPMiddleware):
+class AMOWebhookLoggerMiddleware(BaseASGIMiddleware):
     """
     AMOWebhook Logger Middleware
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Coroutine]
-    ) -> Response:
-        if request.url.path.endswith(amocrm_config.get('secret')):
-            response = await call_next(request)
-            amo_logger.debug("", request=request.__dict__, response=response.__dict__)
-            return response
-        return await call_next(request)
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        request: Request = Request(scope)
+        if not request.url.path.endswith(amocrm_config.get('secret')):
+            await app(scope, receive, send)
+            return
+        response: dict = dict()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response.update(status_code=message["status"], headers=message.get("headers"))
+            await send(message)
+
+        await app(scope, receive, send_wrapper)
+        amo_logger.debug("", request=request.__dict__, response=response)
@@ -0,0 +1,108 @@
+from asyncio import AbstractEventLoop, Event, Lock, Task, TimeoutError, get_running_loop, shield, wait_for
+from typing import Any, Optional, Type
+
+import structlog
+from tortoise import Model
+
+
+class BufferedLogWriter:
+    """
+    Буферизованная запись логов
+
+    Строки логов складываются в ограниченный буфер процесса, фоновая задача пишет их
+    пачками через bulk_create: при накоплении batch_size строк или раз в flush_interval_ms.
+    Если буфер заполнен, write сам дописывает его, т.е. ждет базу вместо потери логов.
+    Буфер дописывается при остановке приложения и после каждой задачи celery (flush_log_writers).
+    """
+
+    instances: list["BufferedLogWriter"] = []
+
+    def __init__(self, repo: Type[Any], batch_size: int, flush_interval_ms: int, queue_size: int) -> None:
+        self.repo: Any = repo()
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval_ms / 1000
+        self.queue_size: int = max(queue_size, batch_size)
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+        self._buffer: list[dict[str, Any]] = []
+        self._loop: Optional[AbstractEventLoop] = None
+        self._lock: Optional[Lock] = None
+        self._full: Optional[Event] = None
+        self._worker: Optional[Task] = None
+        self.instances.append(self)
+
+    def build(self, data: dict[str, Any]) -> Model:
+        """
+        Модель лога из строки буфера
+        """
+        return self.repo.model(**data)
+
+    async def write(self, data: dict[str, Any]) -> None:
+        """
+        Добавление строки лога в буфер
+        """
+        self._start()
+        if len(self._buffer) >= self.queue_size:
+            await self.flush()
+        self._buffer.append(data)
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self) -> None:
+        """
+        Запись всех строк буфера
+        """
+        if not self._buffer:
+            return
+        self._bind()
+        async with self._lock:
+            self._full.clear()
+            while self._buffer:
+                batch: list[dict[str, Any]] = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                try:
+                    await self.repo.model.bulk_create([self.build(data) for data in batch])
+                except Exception as error:  # pylint: disable=broad-except
+                    self.logger.error("Log batch write failed", rows=len(batch), error=str(error))
+
+    async def close(self) -> None:
+        """
+        Остановка фоновой задачи и запись оставшихся строк
+        """
+        if self._worker and self._loop is get_running_loop():
+            self._worker.cancel()
+            self._worker = None
+        await self.flush()
+
+    def _start(self) -> None:
+        self._bind()
+        if self._worker is None or self._worker.done():
+            self._worker = self._loop.create_task(self._run())
+
+    def _bind(self) -> None:
+        loop: AbstractEventLoop = get_running_loop()
+        if self._loop is not loop:
+            # Примитивы asyncio привязаны к loop, на новом loop (задачи celery) создаются заново
+            self._loop, self._lock, self._full, self._worker = loop, Lock(), Event(), None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await wait_for(self._full.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            # Отмена задачи не должна прерывать запись уже взятой из буфера пачки
+            await shield(self.flush())
+            if not self._buffer:
+                # Следующая запись в пустой буфер запустит задачу снова
+                return
+
+
+async def flush_log_writers() -> None:
+    for writer in BufferedLogWriter.instances:
+        await writer.flush()
+
+
+async def close_log_writers() -> None:
+    for writer in BufferedLogWriter.instances:
+        await writer.close()
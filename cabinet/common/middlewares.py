@@ -1,21 +1,70 @@
-from typing import Callable, Coroutine
+from time import perf_counter
+from typing import Any
 
 from config import application_config
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class SafePathMiddleware(BaseHTTPMiddleware):
+MIDDLEWARE_TIMINGS_KEY: str = "middleware_timings"
+
+
+class BaseASGIMiddleware:
+    """
+    Base pure ASGI middleware
+
+    Scopes of scope_types are passed to handle(), others go straight to the app.
+    Time spent in the layer itself, without the wrapped app, is recorded to the scope
+    (see get_middleware_timings).
+    """
+
+    scope_types: tuple[str, ...] = ("http",)
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+        self.name: str = self.__class__.__name__
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in self.scope_types:
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, float] = scope.setdefault(MIDDLEWARE_TIMINGS_KEY, {})
+        inner: float = 0.0
+
+        async def app(app_scope: Scope, app_receive: Receive, app_send: Send) -> None:
+            nonlocal inner
+            started: float = perf_counter()
+            try:
+                await self.app(app_scope, app_receive, app_send)
+            finally:
+                inner += perf_counter() - started
+
+        started: float = perf_counter()
+        try:
+            await self.handle(scope, receive, send, app)
+        finally:
+            timings[self.name] = perf_counter() - started - inner
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        raise NotImplementedError
+
+
+def get_middleware_timings(scope: Scope) -> dict[str, float]:
+    """
+    Overhead of each middleware in milliseconds, filled in as middlewares complete
+    """
+    timings: dict[str, float] = scope.get(MIDDLEWARE_TIMINGS_KEY, {})
+    return {name: round(seconds * 1000, 3) for name, seconds in timings.items()}
+
+
+class SafePathMiddleware(BaseASGIMiddleware):
     """
     Deletes duplicates of root path in path
     """
 
-    async def dispatch(
-            self, request: Request, call_next: Callable[[Request], Coroutine]
-    ) -> Response:
-        if path := request.scope.get("path"):
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        if path := scope.get("path"):
             if path.count(application_config["root_path"]) > 0:
                 path: str = path.replace(application_config["root_path"], "", 1)
-        request.scope["path"]: str = path
-        response: Response = await call_next(request)
-        return response
+        scope["path"]: Any = path
+        await app(scope, receive, send)
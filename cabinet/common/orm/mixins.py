@@ -2,9 +2,12 @@
 Model Mixins
 """
 
+import json
+from hashlib import md5
 from typing import Any, Optional, Union
 
 from tortoise import Model
+from tortoise.models import MetaInfo
 from tortoise.expressions import F, Q
 from tortoise.functions import Max, Min
 from tortoise.query_utils import Prefetch
@@ -16,6 +19,7 @@ from tortoise.queryset import (
     ValuesListQuery,
     ValuesQuery,
 )
+from tortoise.signals import Signals
 
 
 class BaseMixin:
@@ -30,6 +34,79 @@ class ExecuteMixin(BaseMixin):
         return await self.model.raw(raw_sql)
 
 
+def _update_columns(model: Model, data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Колонки и значения для UPDATE только по переданным полям и полям с auto_now
+    """
+    meta: MetaInfo = model._meta
+    columns: dict[str, Any] = {}
+    for field_name, value in data.items():
+        setattr(model, field_name, value)
+        if field_name in meta.fk_fields or field_name in meta.o2o_fields:
+            field_name: str = meta.fields_map[field_name].source_field
+            value: Any = getattr(model, field_name)
+        if field_name not in meta.fields_db_projection or field_name == meta.pk_attr:
+            # Обратные и m2m связи в UPDATE не участвуют
+            continue
+        columns[meta.fields_db_projection[field_name]] = meta.fields_map[field_name].to_db_value(value, model)
+    if columns:
+        for field_name, field in meta.fields_map.items():
+            if getattr(field, "auto_now", False) and field_name not in data:
+                columns[meta.fields_db_projection[field_name]] = field.to_db_value(None, model)
+    return columns
+
+
+def _hydrate(model: Model, row: dict[str, Any]) -> Model:
+    """
+    Заполнение модели строкой из RETURNING
+    """
+    meta: MetaInfo = model._meta
+    for column, value in row.items():
+        if (field_name := meta.fields_db_projection_reverse.get(column)) is not None:
+            setattr(model, field_name, meta.fields_map[field_name].to_python_value(value))
+    return model
+
+
+def _returning_supported(model: type[Model]) -> bool:
+    return model._meta.db.capabilities.dialect == "postgres"
+
+
+def _has_save_hooks(model: type[Model]) -> bool:
+    """
+    У модели переопределен save() или есть обработчики pre_save/post_save (например,
+    Booking.save() и проверка агента без email у User), сырой UPDATE их обходит
+    """
+    listeners: dict = model._meta._listeners
+    return (
+        model.save is not Model.save
+        or bool(listeners.get(Signals.pre_save, {}).get(model))
+        or bool(listeners.get(Signals.post_save, {}).get(model))
+    )
+
+
+async def _partial_update(model_class: type[Model], model: Model, data: dict[str, Any]) -> Model:
+    columns: dict[str, Any] = _update_columns(model, data) if data else {}
+    if not columns or not _returning_supported(model_class) or _has_save_hooks(model_class):
+        update_fields: Optional[list[str]] = None
+        if columns:
+            update_fields = [model_class._meta.fields_db_projection_reverse[column] for column in columns]
+        await model.save(update_fields=update_fields)
+        await model.refresh_from_db()
+        return model
+
+    meta: MetaInfo = model_class._meta
+    values: list[Any] = list(columns.values())
+    assignments: str = ", ".join(f'"{column}" = ${number}' for number, column in enumerate(columns, start=1))
+    query: str = (
+        f'UPDATE "{meta.db_table}" SET {assignments} '
+        f'WHERE "{meta.db_pk_column}" = ${len(values) + 1} RETURNING *'
+    )
+    _, rows = await meta.db.execute_query(query, [*values, model.pk])
+    if rows:
+        _hydrate(model, dict(rows[0]))
+    return model
+
+
 class UpdateMixin(BaseMixin):
     """
     Update Mixin
@@ -38,17 +115,64 @@ class UpdateMixin(BaseMixin):
         """
         Обновление модели
         """
-        for field, value in data.items():
-            setattr(model, field, value)
-        await model.save()
-        await model.refresh_from_db()
-        return model
+        return await self.partial_update(model=model, data=data)
+
+    async def partial_update(self, model: 'UpdateMixin.model', data: dict[str, Any]) -> 'UpdateMixin.model':
+        """
+        Обновление только переданных полей одним UPDATE ... RETURNING,
+        модель заполняется возвращенной строкой.
+        Модели с переопределенным save() или сигналами сохраняются через save(update_fields=...).
+        Без данных модель сохраняется целиком, как раньше
+        """
+        return await _partial_update(self.model, model=model, data=data)
 
 
 class BulkUpdateMixin(BaseMixin):
     """
     Bulk Update Mixin
     """
+    bulk_partial_update_size: int = 500
+
+    async def bulk_partial_update(self, data: dict[Any, dict[str, Any]]) -> list['BulkUpdateMixin.model']:
+        """
+        Обновление разных полей разных моделей по id одним UPDATE ... RETURNING на пачку:
+        SET column = CASE id WHEN ... THEN ... ELSE column END.
+        Модели с переопределенным save() или сигналами обновляются по одной через partial_update
+        """
+        meta: MetaInfo = self.model._meta
+        models: list[Model] = []
+        if _has_save_hooks(self.model) or not _returning_supported(self.model):
+            instances: dict[Any, Model] = {
+                instance.pk: instance for instance in await self.model.filter(**{f"{meta.pk_attr}__in": list(data)})
+            }
+            for pk, fields_data in data.items():
+                if (instance := instances.get(pk)) is not None:
+                    models.append(await _partial_update(self.model, model=instance, data=fields_data))
+            return models
+        items: list[tuple[Any, dict[str, Any]]] = list(data.items())
+        for start in range(0, len(items), self.bulk_partial_update_size):
+            chunk: list[tuple[Any, dict[str, Any]]] = items[start:start + self.bulk_partial_update_size]
+            values: list[Any] = []
+            cases: dict[str, list[str]] = {}
+            for pk, fields_data in chunk:
+                instance: Model = self.model(**{meta.pk_attr: pk})
+                for column, value in _update_columns(instance, fields_data).items():
+                    values.extend((pk, value))
+                    cases.setdefault(column, []).append(f"WHEN ${len(values) - 1} THEN ${len(values)}")
+            if not cases:
+                continue
+            assignments: str = ", ".join(
+                f'"{column}" = CASE "{meta.db_pk_column}" {" ".join(whens)} ELSE "{column}" END'
+                for column, whens in cases.items()
+            )
+            values.append([pk for pk, _ in chunk])
+            query: str = (
+                f'UPDATE "{meta.db_table}" SET {assignments} '
+                f'WHERE "{meta.db_pk_column}" = ANY(${len(values)}) RETURNING *'
+            )
+            _, rows = await meta.db.execute_query(query, values)
+            models.extend(self.model._init_from_db(**dict(row)) for row in rows)
+        return models
     async def bulk_update(
         self, data: dict[str, Any], filters: dict[str, Any], exclude_filters: dict[str, Any] = None
     ) -> None:
@@ -197,6 +321,49 @@ class ListMixin(BaseMixin):
             models: QuerySet[Model] = models.distinct()
         return models
 
+    def keyset_supported(self, ordering: str | None) -> bool:
+        """
+        Курсорная пагинация возможна только по собственному полю модели
+        """
+        return (ordering or "id").lstrip("-") in self.model._meta.fields_db_projection
+
+    def keyset_list(
+        self,
+        limit: int,
+        after: tuple[Any, Any] | None = None,
+        ordering: str | None = None,
+        **kwargs: Any,
+    ) -> QuerySet['ListMixin.model']:
+        """
+        Получение списка моделей после пары (ключ сортировки, id), без OFFSET.
+        Запрашивается limit записей, id - дополнительный ключ сортировки с тем же направлением.
+        Пустые значения ключа в postgres идут последними при сортировке по возрастанию
+        и первыми при сортировке по убыванию
+        """
+        ordering: str = ordering or "id"
+        field: str = ordering.lstrip("-")
+        descending: bool = ordering.startswith("-")
+        pk: str = self.model._meta.pk_attr
+        models: QuerySet[Model] = self.list(**kwargs)
+        if after is not None:
+            value, last_pk = after
+            direction: str = "lt" if descending else "gt"
+            if field == pk:
+                keyset: Q = Q(**{f"{pk}__{direction}": last_pk})
+            elif value is None and descending:
+                keyset: Q = Q(**{f"{field}__isnull": True, f"{pk}__{direction}": last_pk}) | Q(
+                    **{f"{field}__isnull": False}
+                )
+            elif value is None:
+                keyset: Q = Q(**{f"{field}__isnull": True, f"{pk}__{direction}": last_pk})
+            else:
+                keyset: Q = Q(**{f"{field}__{direction}": value}) | Q(**{field: value, f"{pk}__{direction}": last_pk})
+                if not descending:
+                    keyset: Q = keyset | Q(**{f"{field}__isnull": True})
+            models: QuerySet[Model] = models.filter(keyset)
+        order: list[str] = [ordering] if field == pk else [ordering, f"-{pk}" if descending else pk]
+        return models.order_by(*order).limit(limit)
+
 
 class CountMixin(BaseMixin):
     """
@@ -216,6 +383,65 @@ class CountMixin(BaseMixin):
         # models: CountQuery = models.annotate(count=Count("id", distinct=True))
         return models.count()
 
+    async def estimate_count(
+        self,
+        filters: Optional[dict[str, Any]] = None,
+        q_filters: Optional[list[Q]] = None,
+        exact_below: int = 1000,
+    ) -> int:
+        """
+        Оценка количества по плану запроса postgres, небольшие количества считаются точно
+        """
+        models: QuerySet[Model] = self.model.all()
+        if filters:
+            models: QuerySet[Model] = models.filter(**filters)
+        if q_filters:
+            models: QuerySet[Model] = models.filter(*q_filters)
+        _, rows = await self.model._meta.db.execute_query(f"EXPLAIN (FORMAT JSON) {models.sql()}")
+        plan: Any = rows[0][0]
+        if isinstance(plan, str):
+            plan: Any = json.loads(plan)
+        estimate: int = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate < exact_below:
+            return await models.count()
+        return estimate
+
+    async def cached_count(
+        self,
+        filters: Optional[dict[str, Any]] = None,
+        q_filters: Optional[list[Q]] = None,
+        ttl: int = 300,
+    ) -> int:
+        """
+        Точное количество, закэшированное по тексту запроса
+        """
+        from common.cache import cache_layer
+
+        models: QuerySet[Model] = self.model.all()
+        if filters:
+            models: QuerySet[Model] = models.filter(**filters)
+        if q_filters:
+            models: QuerySet[Model] = models.filter(*q_filters)
+        key: str = f"{cache_layer.prefix}:count:{self.model.__name__}:{md5(models.sql().encode()).hexdigest()}"
+        return await cache_layer.get_or_set(key=key, loader=models.count, ttl=ttl, stale_ttl=ttl, name="count")
+
+    async def count_by_mode(
+        self,
+        count_mode: str,
+        filters: Optional[dict[str, Any]] = None,
+        q_filters: Optional[list[Q]] = None,
+    ) -> Optional[int]:
+        """
+        Подсчет количества выбранным способом (exact, estimate, cached, none)
+        """
+        if count_mode == "none":
+            return None
+        if count_mode == "estimate":
+            return await self.estimate_count(filters=filters, q_filters=q_filters)
+        if count_mode == "cached":
+            return await self.cached_count(filters=filters, q_filters=q_filters)
+        return await self.count(filters=filters, q_filters=q_filters)
+
 
 class SCountMixin(BaseMixin):
     """
@@ -1 +1,2 @@
 from .page import PagePagination
+from .cursor import CursorPagination, CountModes
@@ -0,0 +1,123 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from copy import copy
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, StrEnum
+from typing import Any, Optional
+
+from config import site_config
+
+
+class CountModes(StrEnum):
+    """
+    Способы подсчета общего количества для курсорной пагинации
+    """
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    CACHED = "cached"
+    NONE = "none"
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(ordering: str, value: Any, pk: Any) -> str:
+    """
+    Непрозрачный курсор: сортировка, значение ключа сортировки и id последней записи страницы
+    """
+    payload: str = json.dumps([ordering, _dump_value(value), pk], separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple[str, Any, Any]]:
+    try:
+        payload: bytes = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ordering, value, pk = json.loads(payload)
+        return ordering, _load_value(value), pk
+    except (ValueError, TypeError):
+        return None
+
+
+class CursorPagination(object):
+    """
+    Cursor (keyset) pagination
+
+    Страница выбирается условием по паре (ключ сортировки, id) после последней записи
+    предыдущей страницы, поэтому глубокие страницы не медленнее первых.
+    Курсор привязан к сортировке: при другой сортировке выдача начинается сначала.
+    """
+
+    url_template: str = "https://{}/api{}?cursor={}"
+
+    def __init__(
+        self, path: str, page_size: int, cursor: Optional[str], query: dict, count_mode: str = CountModes.ESTIMATE
+    ) -> None:
+        self.path: str = path
+        self.page_size: int = page_size
+        self.count_mode: str = count_mode
+        self.query: dict = copy(query)
+        self.query.pop("cursor", None)
+        self.query.pop("page", None)
+        self._cursor: Optional[tuple[str, Any, Any]] = decode_cursor(cursor) if cursor else None
+        self.next_cursor: Optional[str] = None
+
+    def after(self, ordering: str) -> Optional[tuple[Any, Any]]:
+        """
+        Ключ сортировки и id, после которых начинается страница
+        """
+        if self._cursor is None or self._cursor[0] != ordering:
+            return None
+        return self._cursor[1], self._cursor[2]
+
+    def paginate(self, models: list[Any], ordering: str) -> list[Any]:
+        """
+        Отрезание лишней записи (запрашивается page_size + 1) и курсор следующей страницы
+        """
+        if len(models) <= self.page_size:
+            self.next_cursor = None
+            return models
+        models: list[Any] = models[:self.page_size]
+        last: Any = models[-1]
+        self.next_cursor = encode_cursor(ordering, getattr(last, ordering.lstrip("-")), last.pk)
+        return models
+
+    def __call__(self, count: Optional[int]) -> OrderedDict[str, Any]:
+        filters: str = str()
+        for key, values in self.query.items():
+            for query in values:
+                filters += f"&{key}={query}"
+        next_page: Optional[str] = None
+        if self.next_cursor:
+            next_page: str = self.url_template.format(site_config["site_host"], self.path, self.next_cursor) + filters
+        page_info: OrderedDict[str, Any] = OrderedDict(
+            [
+                ("total", int(count / self.page_size) + 1 if count is not None else None),
+                ("query", filters[1:] if filters else None),
+                ("next_cursor", self.next_cursor),
+                ("next_page", next_page),
+                ("count_mode", self.count_mode),
+            ]
+        )
+        return page_info
@@ -1,17 +1,18 @@
-from aioredis import ConnectionClosedError
+from redis.exceptions import ConnectionError as RedisConnectionError
 from typing import Any, Callable, Coroutine
 
 
 def avoid_disconnect(method: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
     """
-    Restores connection in case of ConnectionClosedError
+    Retries the method once in case of ConnectionError.
+    redis-py has already dropped the failed connection, the pool reconnects lazily,
+    so the shared pool and its other connections are left intact
     """
 
     async def decorated(self: Any, *args: list[Any], **kwargs: dict[str, Any]) -> Any:
         try:
             result: Any = await method(self, *args, **kwargs)
-        except ConnectionClosedError:
-            await self.connect()
+        except RedisConnectionError:
             result: Any = await method(self, *args, **kwargs)
         return result
 
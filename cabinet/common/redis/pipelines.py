@@ -0,0 +1,81 @@
+from asyncio import AbstractEventLoop, Future, Task, create_task, get_running_loop
+from typing import Any
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio.client import Pipeline
+
+
+class AutoPipeline:
+    """
+    Автоматическая конвейеризация команд
+
+    Команды, пришедшие за одну итерацию цикла событий, отправляются одним
+    pipeline (без транзакции) по одному соединению из пула. Одиночная команда
+    выполняется как обычно.
+    """
+
+    def __init__(self, client: AsyncRedis, max_batch: int) -> None:
+        self._client: AsyncRedis = client
+        self._max_batch: int = max_batch
+        self._pending: list[tuple[tuple[Any, ...], Future]] = []
+        self._scheduled: bool = False
+        self._tasks: set[Task] = set()
+
+    def execute(self, *args: Any) -> Future:
+        """
+        Постановка команды в очередь текущей итерации цикла
+        """
+        loop: AbstractEventLoop = get_running_loop()
+        future: Future = loop.create_future()
+        self._pending.append((args, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif not self._scheduled:
+            self._scheduled: bool = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        self._scheduled: bool = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        task: Task = create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: list[tuple[tuple[Any, ...], Future]]) -> None:
+        if len(pending) == 1:
+            args, future = pending[0]
+            try:
+                result: Any = await self._client.execute_command(*args)
+            except Exception as error:  # pylint: disable=broad-except
+                self._set_exception(future, error)
+            else:
+                self._set_result(future, result)
+            return
+
+        pipe: Pipeline = self._client.pipeline(transaction=False)
+        for args, _ in pending:
+            pipe.execute_command(*args)
+        try:
+            results: list[Any] = await pipe.execute(raise_on_error=False)
+        except Exception as error:  # pylint: disable=broad-except
+            for _, future in pending:
+                self._set_exception(future, error)
+            return
+        for result, (_, future) in zip(results, pending):
+            if isinstance(result, Exception):
+                self._set_exception(future, result)
+            else:
+                self._set_result(future, result)
+
+    @staticmethod
+    def _set_result(future: Future, result: Any) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _set_exception(future: Future, error: BaseException) -> None:
+        if not future.done():
+            future.set_exception(error)
@@ -1,53 +1,112 @@
+from asyncio import AbstractEventLoop, gather, get_running_loop
 from collections.abc import Iterable
-from json import dumps, loads
+from typing import Any, AsyncIterator, Optional, Union
 
-from config import redis_config
-from typing import Any, Union, Optional
-from aioredis import RedisConnection, create_connection, ReplyError
-from aioredis.commands.transaction import TransactionsCommandsMixin, Pipeline
+from redis.asyncio import BlockingConnectionPool, Redis as AsyncRedis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ResponseError, WatchError
 
+from config import redis_config
 from .decorators import avoid_disconnect
+from .pipelines import AutoPipeline
+from .serializers import BaseSerializer, get_serializer
 
 
-class Redis(TransactionsCommandsMixin):
+class Redis:
     """
     Redis service
+
+    Пул соединений на процесс, автоматическая конвейеризация одновременных команд
+    и подключаемый сериализатор значений (redis_config["serializer"]).
+    Пул привязан к циклу событий и пересоздаётся при его смене.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        serializer: Optional[BaseSerializer] = None,
+        pool_size: Optional[int] = None,
+        auto_pipeline: Optional[bool] = None,
+    ) -> None:
         self._address: str = redis_config["address"]
-        self._connection: RedisConnection = None
+        self._pool_size: int = pool_size or redis_config["pool_size"]
+        self._pool_timeout: int = redis_config["pool_timeout"]
+        self._scan_count: int = redis_config["scan_count"]
+        self._pipeline_max_batch: int = redis_config["pipeline_max_batch"]
+        self._auto_pipeline: bool = (
+            redis_config["auto_pipeline"] if auto_pipeline is None else auto_pipeline
+        )
+        self._serializer: BaseSerializer = serializer or get_serializer(redis_config["serializer"])
+
+        self._loop: Optional[AbstractEventLoop] = None
+        self._client: Optional[AsyncRedis] = None
+        self._pipeline: Optional[AutoPipeline] = None
 
     async def connect(self) -> None:
         """
-        Create connection on application startup
+        Create connection pool on application startup
+        """
+        if self._client is not None and self._loop is get_running_loop():
+            return
+        pool: BlockingConnectionPool = BlockingConnectionPool.from_url(
+            self._address, max_connections=self._pool_size, timeout=self._pool_timeout
+        )
+        self._client: AsyncRedis = AsyncRedis(connection_pool=pool)
+        self._pipeline: AutoPipeline = AutoPipeline(client=self._client, max_batch=self._pipeline_max_batch)
+        self._loop: AbstractEventLoop = get_running_loop()
+
+    async def disconnect(self) -> None:
+        """
+        Remove connection pool on application shutdown
+        """
+        if self._client is not None:
+            await self._client.close(close_connection_pool=True)
+        self._client: Optional[AsyncRedis] = None
+        self._pipeline: Optional[AutoPipeline] = None
+        self._loop: Optional[AbstractEventLoop] = None
+
+    async def execute(self, *args: Any) -> Any:
+        """
+        Raw command execution
         """
-        self._connection: RedisConnection = await create_connection(self._address)
+        if self._client is None or self._loop is not get_running_loop():
+            await self.connect()
+        if self._auto_pipeline:
+            return await self._pipeline.execute(*args)
+        return await self._client.execute_command(*args)
 
     @avoid_disconnect
     async def flush(self) -> None:
-        await self._connection.execute(b"FLUSHALL")
+        await self.execute("FLUSHALL")
 
-    @avoid_disconnect
-    async def all(self) -> Union[str, dict[str, Any], None]:
-        result: list[bytes] = await self._connection.execute(b"KEYS", "*")
-        if result is not None:
-            result: list[str] = [res.decode("utf-8") for res in result]
-        return result
+    async def scan(self, match: str = "*", count: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Iterate keys with SCAN
+        """
+        if self._client is None or self._loop is not get_running_loop():
+            await self.connect()
+        async for key in self._client.scan_iter(match=match, count=count or self._scan_count):
+            yield key.decode("utf-8")
+
+    async def all(self) -> list[str]:
+        return [key async for key in self.scan()]
 
     @avoid_disconnect
     async def get(self, key: str) -> Union[str, dict[str, Any], None]:
         """
         Get item from redis
         """
-        result: bytes = await self._connection.execute(b"GET", key)
-        if result is not None:
-            result: str = result.decode("utf-8")
-            try:
-                result: Union[list[Any], dict[str, Any]] = loads(result)
-            except ValueError:
-                result: str = result
-        return result
+        result: Optional[bytes] = await self.execute("GET", key)
+        return self._serializer.loads(result)
+
+    @avoid_disconnect
+    async def mget(self, keys: list[str]) -> list[Union[str, dict[str, Any], None]]:
+        """
+        Get several items from redis with a single MGET
+        """
+        if not keys:
+            return []
+        results: list[Optional[bytes]] = await self.execute("MGET", *keys)
+        return [self._serializer.loads(result) for result in results]
 
     @avoid_disconnect
     async def lget(self, key: str, start: Optional[int] = 0, end: Optional[int] = -1) -> list[Any]:
@@ -55,10 +114,10 @@ class Redis(TransactionsCommandsMixin):
         Get list item from redis
         """
         try:
-            result: list[bytes] = await self._connection.execute(b"LRANGE", key, start, end)
+            result: list[bytes] = await self.execute("LRANGE", key, start, end)
             if result is not None:
                 result: list[Any] = list(map(lambda x: x.decode("utf-8"), result))
-        except ReplyError:
+        except ResponseError:
             result: Union[str, dict[str, Any], None] = await self.get(key)
         return result
 
@@ -67,12 +126,11 @@ class Redis(TransactionsCommandsMixin):
         """
         Append item to list-like key storage
         """
-        if isinstance(value, Iterable):
+        if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
             value: str = " ".join(
                 list(str(v) for v in list(filter(lambda x: x is not None, value)))
             )
-        print(value)
-        result: bytes = await self._connection.execute(b"LPUSH", key, value)
+        result: Any = await self.execute("LPUSH", key, value)
         ok: bool = result.decode("utf-8") == "OK" if isinstance(result, bytes) else bool(result)
         return ok
 
@@ -86,42 +144,85 @@ class Redis(TransactionsCommandsMixin):
         """
         Set item to redis
         """
-        if isinstance(value, dict) or isinstance(value, list):
-            try:
-                result: bytes = await self._connection.execute(
-                    b"SET", key, dumps(value), b"EX", expire
-                )
-                ok: bool = result.decode("utf-8") == "OK"
-            except ValueError:
-                ok: bool = False
-        else:
-            result: bytes = await self._connection.execute(b"SET", key, value, b"EX", expire)
-            ok: bool = result.decode("utf-8") == "OK"
-        return ok
+        try:
+            serialized: Any = self._serializer.dumps(value)
+        except (TypeError, ValueError):
+            return False
+        result: Any = await self.execute("SET", key, serialized, "EX", expire)
+        return bool(result)
 
     @avoid_disconnect
-    async def delete(self, key: str) -> bool:
+    async def mset(
+        self,
+        mapping: dict[str, Any],
+        expire: Optional[Union[int, str]] = 2_147_483_647,
+    ) -> bool:
         """
-        Delete item from redis
+        Set several items to redis in one round trip
         """
-        await self._connection.execute(b"DEL", key)
-        return True
+        if not mapping:
+            return True
+        if self._auto_pipeline:
+            results: list[bool] = await gather(
+                *(self.set(key=key, value=value, expire=expire) for key, value in mapping.items())
+            )
+            return all(results)
+        pipe: Pipeline = self.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, self._serializer.dumps(value), ex=expire)
+        return all(await self.execute_pipeline(pipe))
 
-    async def disconnect(self) -> None:
+    @avoid_disconnect
+    async def merge(
+        self,
+        key: str,
+        changes: dict[str, Any],
+        deleted: Iterable[str] = (),
+        expire: Optional[Union[int, str]] = 2_147_483_647,
+    ) -> dict[str, Any]:
+        """
+        Atomic merge of changed and deleted fields into a dict stored by key (WATCH/MULTI),
+        repeated if the key was written concurrently. Empty result deletes the key
+        """
+        if self._client is None or self._loop is not get_running_loop():
+            await self.connect()
+        while True:
+            async with self.pipeline() as pipe:
+                try:
+                    await pipe.watch(key)
+                    stored: Any = self._serializer.loads(await pipe.get(key))
+                    data: dict[str, Any] = stored if isinstance(stored, dict) else dict()
+                    data.update(changes)
+                    for field in deleted:
+                        data.pop(field, None)
+                    pipe.multi()
+                    if data:
+                        pipe.set(key, self._serializer.dumps(data), ex=expire)
+                    else:
+                        pipe.delete(key)
+                    await pipe.execute()
+                    return data
+                except WatchError:
+                    continue
+
+    @avoid_disconnect
+    async def delete(self, *keys: str) -> bool:
         """
-        Remove connection on application shutdown
+        Delete items from redis
         """
-        self._connection.close()
-        await self._connection.wait_closed()
+        if keys:
+            await self.execute("DEL", *keys)
+        return True
 
-    async def pipeline(self):
+    def pipeline(self, transaction: bool = True) -> Pipeline:
         """
-        Create a pipeline context manager using multi_exec()
+        Explicit pipeline, transaction by default (MULTI/EXEC)
         """
-        async with self.multi_exec() as pipe:
-            yield pipe
+        if self._client is None:
+            raise RuntimeError("Redis is not connected")
+        return self._client.pipeline(transaction=transaction)
 
-    async def execute_pipeline(self, pipe: Pipeline):
+    async def execute_pipeline(self, pipe: Pipeline) -> list[Any]:
         """
         Execute a pipeline
         """
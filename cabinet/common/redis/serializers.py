@@ -0,0 +1,97 @@
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+import ujson
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class BaseSerializer(ABC):
+    """
+    Сериализатор значений redis
+
+    Словари и списки сериализуются, строки и числа хранятся как есть,
+    чтобы значения оставались читаемыми и совместимыми с ранее записанными
+    """
+
+    def dumps(self, value: Any) -> Union[str, bytes, int, float]:
+        if isinstance(value, (dict, list)):
+            return self._dumps(value)
+        return value
+
+    def loads(self, value: bytes) -> Any:
+        if value is None:
+            return None
+        try:
+            return self._loads(value)
+        except ValueError:
+            return value.decode("utf-8")
+
+    @abstractmethod
+    def _dumps(self, value: Union[dict[str, Any], list[Any]]) -> Union[str, bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _loads(self, value: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(BaseSerializer):
+    """
+    JSON через orjson, если он установлен, иначе через ujson
+    """
+
+    def _dumps(self, value: Union[dict[str, Any], list[Any]]) -> Union[str, bytes]:
+        if orjson is not None:
+            return orjson.dumps(value, default=str)
+        return ujson.dumps(value, ensure_ascii=False)
+
+    def _loads(self, value: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(value)
+        return ujson.loads(value)
+
+
+class MsgpackSerializer(BaseSerializer):
+    """
+    msgpack для словарей и списков
+
+    Значения, записанные ранее в JSON или строкой, начинаются с ASCII-символа
+    и читаются через JsonSerializer. Упакованные msgpack словари и списки
+    всегда начинаются с байта >= 0x80.
+    """
+
+    _fallback: JsonSerializer = JsonSerializer()
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise ImportError("msgpack is required for MsgpackSerializer")
+
+    def _dumps(self, value: Union[dict[str, Any], list[Any]]) -> bytes:
+        return msgpack.packb(value, default=str)
+
+    def _loads(self, value: bytes) -> Any:
+        if value and value[0] >= 0x80:
+            return msgpack.unpackb(value)
+        return self._fallback._loads(value)  # pylint: disable=protected-access
+
+
+serializers: dict[str, type[BaseSerializer]] = dict(
+    json=JsonSerializer,
+    msgpack=MsgpackSerializer,
+)
+
+
+def get_serializer(name: str) -> BaseSerializer:
+    """
+    Сериализатор по имени из настроек
+    """
+    return serializers[name]()
@@ -1,18 +1,20 @@
 import time
 from http import HTTPStatus
+from http.cookies import SimpleCookie
 from secrets import token_urlsafe
-from typing import Any, Callable, Coroutine, Optional, Union
+from typing import Any, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, DispatchFunction, RequestResponseEndpoint
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .storages import SessionStorage
+from ..middlewares import BaseASGIMiddleware
 from ..redis import broker as redis, Redis
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
+class SessionMiddleware(BaseASGIMiddleware):
     """
     Adds .session attribute to fastapi.Request object
     """
@@ -29,9 +31,7 @@ class SessionMiddleware(BaseHTTPMiddleware):
         *args: Any,
         **kwargs: Any
     ) -> None:
-        app: ASGIApp = kwargs.pop("app", None)
-        dispatch: DispatchFunction = kwargs.pop("dispatch", None)
-        super().__init__(app=app, dispatch=dispatch, *args)
+        super().__init__(app=kwargs.pop("app", None))
 
         self.redis: Redis = redis
         if broker:
@@ -44,26 +44,34 @@ class SessionMiddleware(BaseHTTPMiddleware):
         self.cookie_len: int = cookie_len
         self.amocrm_exclusion: list[str] = amocrm_exclusion
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Coroutine]
-    ) -> Response:
-        session_id: str = request.cookies.get(self.key)
-        path_valid: bool = self.amocrm_exclusion not in request.scope["path"]
-        if path_valid:
-            request, session_id, generated_first = await self.process_request(
-                request=request, session_id=session_id
-            )
-            response: Response = await call_next(request)
-            response: Response = await self.process_response(
-                response=response, session_id=session_id, generated_first=generated_first
-            )
-        else:
-            response: Response = await call_next(request)
-        return response
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        path_valid: bool = self.amocrm_exclusion not in scope["path"]
+        if not path_valid:
+            await app(scope, receive, send)
+            return
+
+        session_id: str = Request(scope).cookies.get(self.key)
+        session, session_id, generated_first = await self.process_request(scope=scope, session_id=session_id)
+        saved: bool = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal saved
+            if message["type"] == "http.response.start":
+                # Изменения сессии пишутся в redis один раз за запрос, до отправки ответа
+                await session.save()
+                saved = True
+                self.process_response(message=message, session_id=session_id, generated_first=generated_first)
+            await send(message)
+
+        try:
+            await app(scope, receive, send_wrapper)
+        finally:
+            if not saved:
+                await session.save()
 
     async def process_request(
-        self, request: Request, session_id: Optional[str]
-    ) -> tuple[Request, str, bool]:
+        self, scope: Scope, session_id: Optional[str]
+    ) -> tuple[SessionStorage, str, bool]:
         generated_first: bool = False
         if not session_id:
             generated_first: bool = True
@@ -73,25 +81,25 @@ class SessionMiddleware(BaseHTTPMiddleware):
                 await self.redis.delete(session_id)
                 generated_first: bool = True
                 session_id: str = token_urlsafe(self.len)
-            else:
-                session_data: Union[dict[str, Any], None] = await self.redis.get(session_id)
-                if not session_data:
-                    session_data: dict[str, Any] = dict()
-                    await self.redis.set(key=session_id, value=session_data, expire=self.expire)
-        request.scope["session"]: SessionStorage = await SessionStorage(session_id=session_id)
-        return request, session_id, generated_first
-
-    async def process_response(
-        self, response: Response, session_id: Optional[str], generated_first: bool
-    ) -> Response:
+        # Сессия загружается из redis при первом обращении, пустая сессия в redis не создается
+        session: SessionStorage = await SessionStorage(
+            session_id=session_id, broker=self.redis, new=generated_first
+        )
+        scope["session"]: SessionStorage = session
+        return session, session_id, generated_first
+
+    def process_response(self, message: Message, session_id: str, generated_first: bool) -> None:
         if generated_first:
-            response.set_cookie(
-                key=self.key, value=session_id, domain=self.domain, samesite="none", secure=True
-            )
-        return response
+            cookie: SimpleCookie = SimpleCookie()
+            cookie[self.key] = session_id
+            cookie[self.key]["domain"] = self.domain
+            cookie[self.key]["path"] = "/"
+            cookie[self.key]["samesite"] = "none"
+            cookie[self.key]["secure"] = True
+            MutableHeaders(scope=message).append("set-cookie", cookie.output(header="").strip())
 
 
-class SessionTimeoutMiddleware(BaseHTTPMiddleware):
+class SessionTimeoutMiddleware(BaseASGIMiddleware):
     """
     Middleware to invalidate session after specified timeout
     """
@@ -119,21 +127,22 @@ class SessionTimeoutMiddleware(BaseHTTPMiddleware):
         if broker:
             self.redis: Redis = broker
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path_valid: bool = self.amocrm_exclusion not in request.scope["path"]
+    async def handle(self, scope: Scope, receive: Receive, send: Send, app: ASGIApp) -> None:
+        path_valid: bool = self.amocrm_exclusion not in scope["path"]
         if not path_valid:
             # Skip session timeout check for amocrm requests
-            response = await call_next(request)
-            return response
+            await app(scope, receive, send)
+            return
 
+        request: Request = Request(scope)
         session_data: SessionStorage = request.session  # type: ignore
         last_activity_timestamp: int = await session_data.get(key=self.last_activity_key)
         current_timestamp: int = int(time.time())
         if not last_activity_timestamp:
             # Session was just created
             await session_data.set(key=self.last_activity_key, value=current_timestamp)
-            response = await call_next(request)
-            return response
+            await app(scope, receive, send)
+            return
 
         if current_timestamp - last_activity_timestamp > self.session_timeout:
             # Invalidate session
@@ -156,9 +165,8 @@ class SessionTimeoutMiddleware(BaseHTTPMiddleware):
             response.headers["Pragma"] = "no-cache"
             response.headers["Expires"] = "0"
 
-            return response
+            await response(scope, receive, send)
         else:
             # Update session timestamp and continue processing the request
             await session_data.set(key=self.last_activity_key, value=current_timestamp)
-            response = await call_next(request)
-            return response
+            await app(scope, receive, send)
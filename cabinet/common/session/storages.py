@@ -5,13 +5,21 @@ from ..wrappers import mark_async
 from ..redis import broker as redis, Redis
 
 
+_missing: object = object()
+
+
 @mark_async
 class SessionStorage(object):
     """
     Storage of session data
+
+    Session is loaded from redis lazily on first read and cached for the request.
+    Changed and deleted keys are tracked and merged into the stored session once by save()
+    at the end of the response, so concurrent requests of one session don't overwrite
+    each other's keys. Empty sessions are never stored.
     """
 
-    async def __ainit__(self, session_id: str, broker: Optional[Any] = None) -> None:
+    async def __ainit__(self, session_id: str, broker: Optional[Any] = None, new: bool = False) -> None:
         self.redis: Redis = redis
         if broker:
             self.redis: Redis = broker
@@ -27,58 +35,135 @@ class SessionStorage(object):
         self.password_reset_key: str = session_config["password_reset_key"]
         self.password_settable_key: str = session_config["password_settable_key"]
 
-        self.data: dict[str, Any] = await self.redis.get(key=self.session_id)
+        # Для только что созданной сессии в redis ничего нет, загружать нечего
+        self._data: Optional[dict[str, Any]] = dict() if new else None
+        # None - неизвестно, есть ли сессия в redis (данные не загружались)
+        self._stored: Optional[bool] = False if new else None
+        # Измененные ключи, удаленные помечаются _missing
+        self._changes: dict[str, Any] = dict()
+        # Сессия очищена целиком и перезаписывается при сохранении
+        self._pruned: bool = False
+        self._save_expire: Optional[int] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._changes) or self._pruned
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """
+        Loaded session data, await load() before synchronous access
+        """
+        if self._data is None:
+            raise RuntimeError("Session is not loaded")
+        return self._data
 
-        if self.data is None:
-            self.data: dict[str, Any] = dict()
-            await self.redis.set(key=self.session_id, value=self.data, expire=self.expire)
+    async def load(self) -> dict[str, Any]:
+        """
+        Load session data from redis once, changes made before loading are applied on top
+        """
+        if self._data is None:
+            stored: Any = await self.redis.get(key=self.session_id)
+            self._stored = bool(stored)
+            self._data = stored if isinstance(stored, dict) else dict()
+            for key, value in self._changes.items():
+                if value is _missing:
+                    self._data.pop(key, None)
+                else:
+                    self._data[key] = value
+        return self._data
+
+    async def save(self) -> None:
+        """
+        Merge changed keys into the stored session, pruned session is written as a whole.
+        Empty session is deleted instead of being stored
+        """
+        if not self.dirty:
+            return
+        expire: int = self._save_expire or self.expire
+        if self._pruned:
+            data: dict[str, Any] = await self.load()
+            if data:
+                await self.redis.set(key=self.session_id, value=data, expire=expire)
+                self._stored = True
+            elif self._stored is not False:
+                await self.redis.delete(self.session_id)
+                self._stored = False
+        else:
+            changes: dict[str, Any] = {key: value for key, value in self._changes.items() if value is not _missing}
+            if changes or self._stored is not False:
+                deleted: list[str] = [key for key, value in self._changes.items() if value is _missing]
+                data: dict[str, Any] = await self.redis.merge(
+                    key=self.session_id, changes=changes, deleted=deleted, expire=expire
+                )
+                self._stored = bool(data)
+                if self._data is not None:
+                    self._data = data
+        self._changes.clear()
+        self._pruned = False
+        self._save_expire = None
 
     async def set(self, key: str, value: Any, expire: int = None) -> bool:
         """
         Set value to session storage by key
         """
-        self.data[key]: Any = value
-        expire: int = expire or self.expire
-        ok: bool = await self.redis.set(key=self.session_id, value=self.data, expire=expire)
-        if not ok:
-            self.data.pop(key)
-        return ok
+        self[key] = value
+        if expire:
+            self._save_expire: int = expire
+        return True
 
     async def get(self, key: str, default: Optional[Any] = None) -> Any:
         """
         Get value from session storage by key
         """
-        data: dict[str, Any] = await self.redis.get(key=self.session_id)
-        data: Any = data.get(key)
+        data: Any = (await self.load()).get(key)
         if data is None:
             data: Any = default
         return data
 
     async def insert(self) -> None:
         """
-        Insert current self.data state to redis
+        Mark session to be written to redis, assigned keys are already tracked
         """
-        await self.redis.set(key=self.session_id, value=self.data, expire=self.expire)
 
     async def prune(self) -> None:
         """
-        Clear redis data
+        Clear session data
         """
-        await self.redis.set(key=self.session_id, value=dict(), expire=self.expire)
+        self._data: dict[str, Any] = dict()
+        self._changes.clear()
+        self._pruned = True
 
     async def pop(self, key: str, default: Optional[Any] = None) -> Any:
         """
-        Pop value from self.data and insert updated state to redis
+        Pop value from session data
         """
-        value: Any = self.data.pop(key, default)
-        await self.insert()
+        value: Any = (await self.load()).pop(key, default)
+        self._changes[key]: object = _missing
         return value
 
     async def refresh(self) -> None:
         """
-        Refresh current session state
+        Refresh current session state, unsaved changes are dropped
+        """
+        self._data = None
+        self._changes.clear()
+        self._pruned = False
+        await self.load()
+
+    async def delete(self) -> None:
+        """
+        Delete session from redis and drop unsaved changes
         """
-        self.data: dict[str, Any] = await self.redis.get(key=self.session_id)
+        await self.redis.delete(self.session_id)
+        self._data: dict[str, Any] = dict()
+        self._changes.clear()
+        self._stored = False
+        self._pruned = False
 
     @property
     def auth(self) -> Any:
@@ -100,10 +185,14 @@ class SessionStorage(object):
         return self.data[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
-        self.data[key]: Any = value
+        if self._data is not None:
+            self._data[key]: Any = value
+        self._changes[key]: Any = value
 
     def __delitem__(self, key: str) -> None:
-        del self.data[key]
+        if self._data is not None:
+            del self._data[key]
+        self._changes[key]: object = _missing
 
     def __str__(self) -> str:
-        return str(self.data)
+        return str(self._data if self._data is not None else self._changes)
@@ -5,7 +5,7 @@ from typing import Any
 from config.settings import (
     AerichSettings, AMOCrmSettings, AMOCrmSettingsOld,
     ApplicationSettings, AuthSettings, AWSSettings,
-    BackendSettings, BazisSettings, BookingSettings,
+    BackendSettings, BazisSettings, BookingSettings, CacheSettings,
     CelerySettings, CORSSettings, DataBaseSettings,
     EmailRecipientsSettings, EmailSettings, EnvTypes,
     GetdocSettings, ImgproxySettings, LKAdminSettins,
@@ -41,6 +41,7 @@ mc_backend_config: dict[str, Any] = MCSettings().dict()
 mc_loyalty_config: dict[str, Any] = MCLoyaltySettings().dict()
 uvicorn_config: dict[str, Any] = UvicornSettings().dict()
 session_config: dict[str, Any] = SessionSettings().dict()
+cache_config: dict[str, Any] = CacheSettings().dict()
 imgproxy_config: dict[str, Any] = ImgproxySettings().dict()
 sberbank_config: dict[str, Any] = SberbankSettings().dict()
 database_config: dict[str, Any] = DataBaseSettings().dict()
@@ -1,4 +1,5 @@
 from config.initializers import (
+    initialize_amocrm,
     initialize_application,
     initialize_database,
     initialize_exceptions,
@@ -8,6 +9,7 @@ from config.initializers import (
     initialize_sentry,
     initialize_websockets,
     initialize_logger,
+    initialize_log_writers,
     initialize_unleash,
     initialize_event_emitter,
 )
@@ -17,8 +19,10 @@ from fastapi import FastAPI
 def get_fastapi_application() -> FastAPI:
     application: FastAPI = initialize_application()
     initialize_logger()
+    initialize_log_writers(application)
     initialize_database(application)
     initialize_redis(application)
+    initialize_amocrm(application)
     initialize_routers(application)
     initialize_middlewares(application)
     initialize_exceptions(application)
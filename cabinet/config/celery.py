@@ -5,18 +5,21 @@ For lightweight tasks use asyncio.Future and asyncio.Task
 Documentation: https://docs.python.org/3/library/asyncio-task.html
 """
 import traceback
-from asyncio import new_event_loop, set_event_loop
+from asyncio import get_event_loop, new_event_loop, set_event_loop
 from importlib import import_module
 from json import dumps
-from typing import Any, Callable
+from typing import Any, Callable, Coroutine
 from celery import Celery
 from celery.schedules import crontab
-from common.celery import Priority
-from config import application_config, celery_config, sentry_config
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from common.celery import PersistentEventLoop, Priority
+from common.loggers import flush_log_writers
+from config import application_config, celery_config, sentry_config, tortoise_config
 from kombu import Queue, Exchange
 from sentry_sdk import capture_exception
 from sentry_sdk import init as sentry_init
 from sentry_sdk.integrations.celery import CeleryIntegration
+from tortoise import Tortoise
 
 
 class CeleryTaskQueue:
@@ -363,6 +366,36 @@ task_queue: CeleryTaskQueue = CeleryTaskQueue(config=celery_config)
 app: Celery = task_queue.app
 # Настройка после получения инстанса Celery
 task_queue.setup()
+# Постоянный loop процесса воркера, используется при CELERY_ASYNCIO_WORKER
+event_loop: PersistentEventLoop = PersistentEventLoop(orm_class=Tortoise, orm_config=tortoise_config)
+
+
+@worker_process_init.connect
+def start_event_loop(**kwargs: Any) -> None:
+    """
+    Запуск loop в дочернем процессе prefork воркера, для пулов threads и solo loop запускается при первой задаче
+    """
+    if celery_config["asyncio_worker"]:
+        event_loop.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_event_loop(**kwargs: Any) -> None:
+    if event_loop.ready:
+        event_loop.run(flush_log_writers())
+    event_loop.stop()
+
+
+def run(coroutine: Coroutine) -> Any:
+    """
+    Выполнение корутины задачи
+    """
+    if celery_config["asyncio_worker"]:
+        event_loop.start()
+        return event_loop.run(coroutine)
+    loop: Any = get_event_loop()
+    return loop.run_until_complete(coroutine)
 
 
 class TaskError(Exception):
@@ -374,14 +407,19 @@ class TaskError(Exception):
 def init_orm(service: Callable[..., Any]) -> Callable[..., Any]:
     """
     Orm initialization on task
+    При постоянном loop ORM уже инициализирована на процесс
     """
+    owner: Any = getattr(service, "__self__", service)
 
     async def decorated(*args: list[Any], **kwargs: dict[str, Any]) -> Any:
-        if hasattr(service, "orm_class") and hasattr(service, "orm_config"):
-            await service.orm_class.init(config=service.orm_config)
+        with_orm: bool = hasattr(owner, "orm_class") and hasattr(owner, "orm_config") and not event_loop.ready
+        if with_orm:
+            await owner.orm_class.init(config=owner.orm_config)
         result: Any = await service(*args, **kwargs)
-        if hasattr(service, "orm_class") and hasattr(service, "orm_config"):
-            await service.orm_class.close_connections()
+        if with_orm:
+            # Буферизованные логи задачи пишутся до закрытия соединений
+            await flush_log_writers()
+            await owner.orm_class.close_connections()
         return result
 
     return decorated
@@ -411,7 +449,11 @@ def sentry_catch(service: Callable[..., Any]) -> Callable[..., Any]:
         try:
             result: Any = await service(*args, **kwargs)
             return result
-        except RuntimeError:
+        except RuntimeError as error:
+            if event_loop.ready:
+                # Новый loop не поможет, задача уже выполняется на постоянном loop
+                _handle_error(error=error, args=args, kwargs=kwargs)
+                return
             try:
                 set_event_loop(new_event_loop())
                 result: Any = await service(*args, **kwargs)
@@ -41,6 +41,19 @@ def initialize_redis(application: FastAPI) -> None:
     application.on_event("shutdown")(broker.disconnect)
 
 
+def initialize_amocrm(application: FastAPI) -> None:
+    from common.amocrm import amocrm_pool
+
+    application.on_event("shutdown")(amocrm_pool.close)
+
+
+def initialize_log_writers(application: FastAPI) -> None:
+    from common.loggers import close_log_writers
+
+    # Регистрируется до initialize_database: буфер логов дописывается до закрытия соединений
+    application.on_event("shutdown")(close_log_writers)
+
+
 def initialize_database(application: FastAPI) -> None:
     from config import tortoise_config
 
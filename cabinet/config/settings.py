@@ -211,6 +211,8 @@ class CelerySettings(BaseSettings):
     visibility_timeout: int = Field(86400, env="VISIBILITY_TIMEOUT")
     periodic_eta_timeout_hours: float = Field(24, env="PERIODIC_ETA_TIMEOUT_HOURS")
     periodic_timeout_hours: float = Field(24, env="PERIODIC_TIMEOUT_HOURS")
+    # Постоянный event loop и пул соединений ORM на процесс воркера вместо инициализации на каждую задачу
+    asyncio_worker: bool = Field(False, env="CELERY_ASYNCIO_WORKER")
 
     class Config:
         env_file = ".env"
@@ -257,6 +259,19 @@ class AMOCrmSettings(BaseSettings):
     client_secret: str = Field("SomeClientSecretCode", env="AMOCRM_CLIENT_SECRET")
     partition_limit: int = Field(50, env="AMOCRM_PARTITION_LIMIT")
 
+    pool_limit: int = Field(50, env="AMOCRM_POOL_LIMIT")
+    pool_keepalive_timeout: float = Field(60, env="AMOCRM_POOL_KEEPALIVE_TIMEOUT")
+    pool_dns_cache_ttl: int = Field(600, env="AMOCRM_POOL_DNS_CACHE_TTL")
+    token_version_key: str = Field("amocrm_token_version")
+    token_lock_key: str = Field("amocrm_token_refresh_lock")
+    token_lock_timeout: int = Field(30, env="AMOCRM_TOKEN_LOCK_TIMEOUT")
+    token_check_interval: int = Field(60, env="AMOCRM_TOKEN_CHECK_INTERVAL")
+
+    batch_size: int = Field(250, env="AMOCRM_BATCH_SIZE")
+    batch_flush_interval: float = Field(0.2, env="AMOCRM_BATCH_FLUSH_INTERVAL")
+    batch_max_retries: int = Field(5, env="AMOCRM_BATCH_MAX_RETRIES")
+    batch_retry_backoff: float = Field(1, env="AMOCRM_BATCH_RETRY_BACKOFF")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -339,6 +354,13 @@ class RedisSettings(BaseSettings):
     port: int = Field(6379, env='LK_REDIS_PORT')
     db: int = Field(13, env='LK_REDIS_DB')
 
+    pool_size: int = Field(20, env='LK_REDIS_POOL_SIZE')
+    pool_timeout: int = Field(5, env='LK_REDIS_POOL_TIMEOUT')
+    auto_pipeline: bool = Field(True, env='LK_REDIS_AUTO_PIPELINE')
+    pipeline_max_batch: int = Field(500, env='LK_REDIS_PIPELINE_MAX_BATCH')
+    scan_count: int = Field(500, env='LK_REDIS_SCAN_COUNT')
+    serializer: str = Field("json", env='LK_REDIS_SERIALIZER')
+
     deleted_users_key: str = Field("deleted_users")
     deleted_users_expire: int = Field(2_147_483_647)
 
@@ -370,6 +392,19 @@ class SessionSettings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+class CacheSettings(BaseSettings):
+    prefix: str = Field("method_cache")
+    tag_prefix: str = Field("method_cache_tag")
+    ttl: int = Field(3_600 * 24, env="LK_CACHE_TTL")
+    stale_ttl: int = Field(300, env="LK_CACHE_STALE_TTL")
+    local_ttl: int = Field(30, env="LK_CACHE_LOCAL_TTL")
+    local_maxsize: int = Field(1024, env="LK_CACHE_LOCAL_MAXSIZE")
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+
+
 class BookingDevSettings(BaseSettings):
     period_days: Union[int, float] = Field(1/96)
     time_minutes: int = Field(15)
@@ -385,6 +420,15 @@ class BookingSettings(BaseSettings):
     time_hours: Union[int, float] = Field(24)
     fast_time_hours: int = Field(24)
 
+    expired_page_size: int = Field(100, env="LK_EXPIRED_BOOKINGS_PAGE_SIZE")
+    expired_concurrency: int = Field(10, env="LK_EXPIRED_BOOKINGS_CONCURRENCY")
+    expired_failures_key: str = Field("deactivate_expired_bookings_failures")
+    expired_max_attempts: int = Field(10, env="LK_EXPIRED_BOOKINGS_MAX_ATTEMPTS")
+
+    log_batch_size: int = Field(500, env="LK_BOOKING_LOG_BATCH_SIZE")
+    log_flush_interval_ms: int = Field(200, env="LK_BOOKING_LOG_FLUSH_INTERVAL_MS")
+    log_queue_size: int = Field(10_000, env="LK_BOOKING_LOG_QUEUE_SIZE")
+
     @root_validator
     def set_dev_time(cls, values: dict):
         print("ENVIRONMENT", MaintenanceSettings().environment)
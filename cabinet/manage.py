@@ -86,6 +86,8 @@ coroutines_map: dict[str, Callable[..., Coroutine]] = {
     "remove_slash_in_plan": manage.RemoveSlashInPlan(),
     "check_client_interests": manage.CheckClientInterestManage(),
     "compare_type_and_role": manage.CompareTypeAndRole(),
+    "benchmark_amocrm_client": manage.BenchmarkAmoCRMClient(),
+    "benchmark_celery_loop": manage.BenchmarkCeleryLoop(),
 }
 
 
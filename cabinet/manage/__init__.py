@@ -4,3 +4,5 @@ from .users import *
 from .agents import *
 from .profitbase import *
 from .events_list import *
+from .amocrm import *
+from .celery import *
@@ -0,0 +1 @@
+from .benchmark_amocrm_client import BenchmarkAmoCRMClient
@@ -0,0 +1,109 @@
+from asyncio import gather
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+import structlog
+from aiohttp import web
+
+from common.amocrm import AmoCRM, AmoCRMClientPool, AmoCRMTokenState
+from config import amocrm_config
+
+
+class BenchmarkAmoCRMClient:
+    """
+    Замер количества запросов в секунду к локальной заглушке AmoCRM
+
+    Сравниваются два режима:
+        fresh - новый пул (сессия, коннектор, DNS, handshake) на каждый вызов, как было раньше
+        pooled - общий пул процесса с keep-alive соединениями
+
+    Запуск: python manage.py benchmark_amocrm_client -a 2000
+    Время на чтение токенов из БД в режиме fresh не учитывается, реальный выигрыш больше.
+    """
+
+    _concurrency: int = 20
+    _default_calls: int = 1000
+    _stub_settings: dict[str, Any] = dict(
+        id=1,
+        client_id="client_id",
+        client_secret="client_secret",
+        redirect_uri="http://localhost",
+        access_token="access_token",
+        refresh_token="refresh_token",
+    )
+
+    def __init__(self) -> None:
+        self.logger = structlog.get_logger(__name__)
+
+    async def __call__(self, calls: str) -> None:
+        calls: int = int(calls) if calls.isdigit() else self._default_calls
+        runner, url = await self._start_stub()
+        original_url: str = amocrm_config["url"]
+        amocrm_config["url"] = url
+        try:
+            fresh: float = await self._measure(self._fresh_call, calls)
+            pooled_client: AmoCRMClientPool = self._make_pool()
+            try:
+                pooled: float = await self._measure(lambda: self._pooled_call(pooled_client), calls)
+            finally:
+                await pooled_client.close()
+        finally:
+            amocrm_config["url"] = original_url
+            await runner.cleanup()
+
+        self.logger.info(
+            "AmoCRM client benchmark",
+            calls=calls,
+            fresh_rps=round(calls / fresh, 1),
+            pooled_rps=round(calls / pooled, 1),
+            speedup=round(fresh / pooled, 2),
+        )
+
+    async def _fresh_call(self) -> None:
+        pool: AmoCRMClientPool = self._make_pool()
+        try:
+            async with await AmoCRM(pool=pool) as amocrm:
+                await self._call(amocrm)
+        finally:
+            await pool.close()
+
+    async def _pooled_call(self, pool: AmoCRMClientPool) -> None:
+        async with await AmoCRM(pool=pool) as amocrm:
+            await self._call(amocrm)
+
+    @staticmethod
+    async def _call(amocrm: AmoCRM) -> None:
+        # Вызываем метод в обход общего ограничителя частоты запросов,
+        # иначе оба режима упрутся в LK_MAX_REQUESTS
+        request_get: Callable[..., Awaitable] = AmoCRM._request_get_v4.__wrapped__
+        await request_get(amocrm, route="/leads/1", query={})
+
+    async def _measure(self, call: Callable[[], Awaitable], calls: int) -> float:
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                await call()
+
+        chunk, rest = divmod(calls, self._concurrency)
+        counts: list[int] = [chunk + (1 if index < rest else 0) for index in range(self._concurrency)]
+        started: float = perf_counter()
+        await gather(*(worker(count) for count in counts))
+        return perf_counter() - started
+
+    def _make_pool(self) -> AmoCRMClientPool:
+        tokens: AmoCRMTokenState = AmoCRMTokenState()
+        tokens.prime(self._stub_settings)
+        return AmoCRMClientPool(tokens=tokens)
+
+    @staticmethod
+    async def _start_stub() -> tuple[web.AppRunner, str]:
+        async def lead(request: web.Request) -> web.Response:
+            return web.json_response(dict(id=int(request.match_info["lead_id"]), name="Benchmark"))
+
+        application: web.Application = web.Application()
+        application.router.add_get(amocrm_config["api_route_v4"] + "/leads/{lead_id}", lead)
+        runner: web.AppRunner = web.AppRunner(application)
+        await runner.setup()
+        site: web.TCPSite = web.TCPSite(runner, host="127.0.0.1", port=0)
+        await site.start()
+        port: int = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        return runner, f"http://127.0.0.1:{port}"
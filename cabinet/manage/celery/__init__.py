@@ -0,0 +1 @@
+from .benchmark_celery_loop import BenchmarkCeleryLoop
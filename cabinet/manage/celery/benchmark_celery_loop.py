@@ -0,0 +1,91 @@
+from asyncio import AbstractEventLoop, new_event_loop, to_thread
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any
+
+import structlog
+from tortoise import Tortoise
+
+from common.celery import PersistentEventLoop
+from config import tortoise_config
+
+
+class BenchmarkTask:
+    """
+    Задача для замера: один запрос к БД
+    """
+
+    _connection: str = "cabinet"
+
+    def __init__(self) -> None:
+        self.orm_class: type[Tortoise] = Tortoise
+        self.orm_config: dict[str, Any] = tortoise_config
+
+    async def __call__(self) -> None:
+        await self.orm_class.get_connection(self._connection).execute_query("select 1")
+
+
+class BenchmarkCeleryLoop:
+    """
+    Замер количества задач celery в секунду для режимов выполнения
+
+    Сравниваются режимы:
+        per_task - run_until_complete и init/close_connections ORM на каждую задачу, как было раньше
+        persistent - постоянный loop и пул соединений процесса (CELERY_ASYNCIO_WORKER=true)
+        persistent_threads - то же, задачи из нескольких потоков (celery worker -P threads)
+
+    Запуск: python manage.py benchmark_celery_loop -a 500
+    Брокер не участвует, замеряются только накладные расходы на выполнение корутины задачи.
+    """
+
+    _concurrency: int = 8
+    _default_tasks: int = 500
+
+    def __init__(self) -> None:
+        self.logger = structlog.get_logger(__name__)
+
+    async def __call__(self, tasks: str) -> None:
+        tasks: int = int(tasks) if tasks.isdigit() else self._default_tasks
+        per_task: float = await to_thread(self._measure_per_task, tasks)
+        persistent: float = await to_thread(self._measure_persistent, tasks, 1)
+        persistent_threads: float = await to_thread(self._measure_persistent, tasks, self._concurrency)
+
+        self.logger.info(
+            "Celery event loop benchmark",
+            tasks=tasks,
+            concurrency=self._concurrency,
+            per_task_tps=round(tasks / per_task, 1),
+            persistent_tps=round(tasks / persistent, 1),
+            persistent_threads_tps=round(tasks / persistent_threads, 1),
+            speedup=round(per_task / persistent, 2),
+        )
+
+    @staticmethod
+    def _measure_per_task(tasks: int) -> float:
+        async def run_task(task: BenchmarkTask) -> None:
+            await task.orm_class.init(config=task.orm_config)
+            await task()
+            await task.orm_class.close_connections()
+
+        loop: AbstractEventLoop = new_event_loop()
+        task: BenchmarkTask = BenchmarkTask()
+        try:
+            started: float = perf_counter()
+            for _ in range(tasks):
+                loop.run_until_complete(run_task(task))
+            return perf_counter() - started
+        finally:
+            loop.close()
+
+    @staticmethod
+    def _measure_persistent(tasks: int, concurrency: int) -> float:
+        event_loop: PersistentEventLoop = PersistentEventLoop(orm_class=Tortoise, orm_config=tortoise_config)
+        event_loop.start()
+        task: BenchmarkTask = BenchmarkTask()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                started: float = perf_counter()
+                list(executor.map(lambda _: event_loop.run(task()), range(tasks)))
+                return perf_counter() - started
+        finally:
+            event_loop.stop()
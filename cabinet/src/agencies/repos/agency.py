@@ -107,10 +107,8 @@ class AgencyRepo(BaseAgencyRepo, ReadWriteMixin, DeleteMixin, CountMixin):
         """
         Обновление агентства
         """
-        for field, value in data.items():
-            setattr(model, field, value)
         try:
-            await model.save()
+            model: Agency = await self.partial_update(model=model, data=data)
         except IntegrityError:
             model = None
         return model
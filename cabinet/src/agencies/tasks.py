@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 from hashlib import md5
 
@@ -39,8 +38,7 @@ def check_organization_task_periodic() -> None:
     check_organization: services.CheckOrganizationService = services.CheckOrganizationService(
         **resources
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(check_organization))())
+    celery.run(celery.sentry_catch(celery.init_orm(check_organization))())
 
 
 @celery.app.task
@@ -56,8 +54,7 @@ def create_organization_task(agency_id: int):
         agency_repo=agencies_repos.AgencyRepo,
     )
     create_organization_service = services.CreateOrganizationService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(create_organization_service))(agency_id=agency_id)
     )
 
@@ -74,8 +71,7 @@ def update_organization_task(agency_id: int):
         orm_config=tortoise_config,
     )
     create_organization_service = services.UpdateOrganizationService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(create_organization_service))(agency_id=agency_id)
     )
 
@@ -89,8 +85,7 @@ def create_agency_log_task(log_data: dict[str, Any]) -> None:
         orm_class=Tortoise, orm_config=tortoise_config, agency_log_repo=agencies_repos.AgencyLogRepo
     )
     create_log: loggers.CreateAgencyLogger = loggers.CreateAgencyLogger(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(create_log))(log_data=log_data))
+    celery.run(celery.sentry_catch(celery.init_orm(create_log))(log_data=log_data))
 
 
 @celery.app.task
@@ -121,8 +116,7 @@ def fire_agent_task(
         orm_config=tortoise_config,
     )
     change_agent: services.FireAgentService = services.FireAgentService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(change_agent))(
             agent_amocrm_id=agent_amocrm_id,
             repres_amocrm_id=repres_amocrm_id,
@@ -150,5 +144,4 @@ def periodic_update_missed_amocrm_id_task() -> None:
     update_organization_amocrm_id: services.UpdateOrganizationAmocrmIdService = (
         services.UpdateOrganizationAmocrmIdService(**resources)
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(update_organization_amocrm_id))())
+    celery.run(celery.sentry_catch(celery.init_orm(update_organization_amocrm_id))())
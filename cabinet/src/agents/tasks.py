@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 from common import amocrm
@@ -47,8 +46,7 @@ def import_clients_task(agent_id: int) -> None:
 
     import_clients: services.ImportClientsService = services.ImportClientsService(**resources)
 
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(import_clients))(agent_id=agent_id))
+    celery.run(celery.sentry_catch(celery.init_orm(import_clients))(agent_id=agent_id))
 
 
 @celery.app.task
@@ -82,5 +80,4 @@ def import_clients_with_all_booking_task(agent_id: int) -> None:
 
     import_clients: services.ImportClientsAllBookingService = services.ImportClientsAllBookingService(**resources)
 
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(import_clients))(agent_id=agent_id))
+    celery.run(celery.sentry_catch(celery.init_orm(import_clients))(agent_id=agent_id))
@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 import tortoise
@@ -27,5 +26,4 @@ def import_amocrm_periodic() -> None:
         pipelines_repo=AmocrmPipelineRepo, statuses_repo=AmocrmStatusRepo,
     )
     import_cities_service = ImportAmocrmService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(import_cities_service))())
+    celery.run(celery.sentry_catch(celery.init_orm(import_cities_service))())
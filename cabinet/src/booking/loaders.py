@@ -0,0 +1,182 @@
+from collections import defaultdict
+
+from src.amocrm.repos import (
+    AmocrmAction,
+    AmocrmGroupStatus,
+    AmocrmGroupStatusRepo,
+    ClientAmocrmGroupStatus,
+    ClientAmocrmGroupStatusRepo,
+)
+from src.task_management.exceptions import TaskStatusNotFoundError
+from src.task_management.helpers import Slugs
+from src.task_management.repos import TaskChain, TaskInstance, TaskInstanceRepo, TaskStatus, TaskStatusRepo
+
+from .repos import Booking, BookingTag, BookingTagRepo
+
+
+class BookingListLoader:
+    """
+    Пакетная загрузка связанных данных для списка сделок.
+
+    Ключи (сделки, групповые статусы, слаги цепочек задач) собираются по всему списку,
+    каждое отношение загружается одним запросом. Справочники групповых статусов
+    запоминаются на время жизни загрузчика, т.е. на один запрос к API.
+    """
+
+    task_instance_prefetch_fields: list[str] = [
+        "status__tasks_chain__task_visibility",
+        "status__tasks_chain__systems",
+        "status__buttons",
+        "status__button_detail_views",
+    ]
+
+    def __init__(
+        self,
+        booking_tag_repo: type[BookingTagRepo],
+        amocrm_group_status_repo: type[AmocrmGroupStatusRepo],
+        client_amocrm_group_status_repo: type[ClientAmocrmGroupStatusRepo],
+        task_instance_repo: type[TaskInstanceRepo] = TaskInstanceRepo,
+        task_status_repo: type[TaskStatusRepo] = TaskStatusRepo,
+    ) -> None:
+        self.booking_tag_repo: BookingTagRepo = booking_tag_repo()
+        self.amocrm_group_status_repo: AmocrmGroupStatusRepo = amocrm_group_status_repo()
+        self.client_amocrm_group_status_repo: ClientAmocrmGroupStatusRepo = client_amocrm_group_status_repo()
+        self.task_instance_repo: TaskInstanceRepo = task_instance_repo()
+        self.task_status_repo: TaskStatusRepo = task_status_repo()
+
+        self._task_instances: dict[int, list[TaskInstance]] = defaultdict(list)
+        self._task_chains: dict[str, TaskChain] = {}
+        self._booking_tags: dict[int | None, list[BookingTag]] = {}
+        self._group_statuses: list[AmocrmGroupStatus] | None = None
+        self._final_group_status_ids: set[int] = set()
+        self._group_status_actions: dict[int, list[AmocrmAction]] = {}
+        self._client_group_statuses: list[ClientAmocrmGroupStatus] | None = None
+
+    async def load(self, bookings: list[Booking], task_chain_slugs: dict[int, list[str]]) -> None:
+        """
+        Загрузка данных для всех сделок списка.
+        task_chain_slugs - слаги интересующих цепочек задач по id сделки
+        """
+        await self._load_task_instances(bookings=bookings, task_chain_slugs=task_chain_slugs)
+        await self._load_task_chains(slugs={slugs[0] for slugs in task_chain_slugs.values() if slugs})
+        await self._load_group_statuses()
+        await self._load_booking_tags(
+            group_status_ids={
+                booking.amocrm_status.group_status.id
+                if booking.amocrm_status and booking.amocrm_status.group_status
+                else None
+                for booking in bookings
+            }
+        )
+        await self._load_client_group_statuses()
+
+    def get_task_instances(self, booking: Booking) -> list[TaskInstance]:
+        return self._task_instances.get(booking.id, [])
+
+    def get_task_chain(self, slug: str) -> TaskChain:
+        """
+        Цепочка задач по слагу статуса задачи
+        """
+        if slug not in self._task_chains:
+            raise TaskStatusNotFoundError
+        return self._task_chains[slug]
+
+    def get_booking_tags(self, group_status: AmocrmGroupStatus | None) -> list[BookingTag]:
+        return self._booking_tags.get(group_status.id if group_status else None, [])
+
+    @property
+    def group_statuses(self) -> list[AmocrmGroupStatus]:
+        """
+        Незавершающие групповые статусы, отсортированные по sort
+        """
+        return self._group_statuses or []
+
+    @property
+    def final_group_status_ids(self) -> set[int]:
+        return self._final_group_status_ids
+
+    def get_group_status_actions(self, group_status: AmocrmGroupStatus) -> list[AmocrmAction]:
+        return self._group_status_actions.get(group_status.id, [])
+
+    @property
+    def client_group_statuses(self) -> list[ClientAmocrmGroupStatus]:
+        return self._client_group_statuses or []
+
+    async def _load_task_instances(self, bookings: list[Booking], task_chain_slugs: dict[int, list[str]]) -> None:
+        interested_slugs: dict[int, set[str]] = {
+            booking_id: {value for slug in slugs for value in Slugs.get_slug_values(slug)}
+            for booking_id, slugs in task_chain_slugs.items()
+        }
+        all_slugs: set[str] = set().union(*interested_slugs.values())
+        if not bookings or not all_slugs:
+            return
+        task_instances: list[TaskInstance] = await self.task_instance_repo.list(
+            filters=dict(booking_id__in=[booking.id for booking in bookings], status__slug__in=list(all_slugs)),
+            prefetch_fields=self.task_instance_prefetch_fields,
+        )
+        for task_instance in task_instances:
+            if task_instance.status.slug in interested_slugs.get(task_instance.booking_id, ()):
+                self._task_instances[task_instance.booking_id].append(task_instance)
+                self._task_chains[task_instance.status.slug] = task_instance.status.tasks_chain
+
+    async def _load_task_chains(self, slugs: set[str]) -> None:
+        slugs: set[str] = slugs - self._task_chains.keys()
+        if not slugs:
+            return
+        task_statuses: list[TaskStatus] = await self.task_status_repo.list(
+            filters=dict(slug__in=list(slugs)),
+            prefetch_fields=["tasks_chain__systems"],
+        )
+        for task_status in task_statuses:
+            self._task_chains[task_status.slug] = task_status.tasks_chain
+
+    async def _load_group_statuses(self) -> None:
+        if self._group_statuses is not None:
+            return
+        group_statuses: list[AmocrmGroupStatus] = await self.amocrm_group_status_repo.list(
+            ordering="sort",
+            prefetch_fields=["amocrm_actions"],
+        )
+        self._group_statuses = [group_status for group_status in group_statuses if not group_status.is_final]
+        self._final_group_status_ids = {group_status.id for group_status in group_statuses if group_status.is_final}
+        self._group_status_actions = {
+            group_status.id: list(group_status.amocrm_actions) for group_status in group_statuses
+        }
+
+    async def _load_booking_tags(self, group_status_ids: set[int | None]) -> None:
+        group_status_ids: set[int | None] = group_status_ids - self._booking_tags.keys()
+        if None in group_status_ids:
+            group_status_ids.discard(None)
+            self._booking_tags[None] = await self.booking_tag_repo.list(
+                filters=dict(is_active=True, group_statuses=None),
+                ordering="-priority",
+            )
+        if not group_status_ids:
+            return
+        tags: list[BookingTag] = await self.booking_tag_repo.list(
+            filters=dict(is_active=True, group_statuses__id__in=list(group_status_ids)),
+            ordering="-priority",
+            prefetch_fields=["group_statuses"],
+        )
+        for group_status_id in group_status_ids:
+            self._booking_tags[group_status_id] = []
+        seen_tag_ids: set[int] = set()
+        for tag in tags:
+            if tag.id in seen_tag_ids:
+                continue
+            seen_tag_ids.add(tag.id)
+            for group_status in tag.group_statuses:
+                if group_status.id in group_status_ids:
+                    self._booking_tags[group_status.id].append(tag)
+
+    async def _load_client_group_statuses(self) -> None:
+        if self._client_group_statuses is not None:
+            return
+        self._client_group_statuses = await self.client_amocrm_group_status_repo.list(
+            filters=dict(is_hide=False),
+            ordering="sort",
+            prefetch_fields=[
+                "booking_tags__booking_sources",
+                "booking_tags__systems",
+            ],
+        )
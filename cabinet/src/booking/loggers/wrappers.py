@@ -1,13 +1,12 @@
-import json
-from asyncio import create_task
+from typing import Any
 
-from common.loggers.utils import get_difference_between_two_dicts, dumps_dict
+from common.loggers.utils import get_difference_between_two_dicts
 from ..repos import Booking, BookingRepo
 from ..entities import BaseBookingCase
+from .writer import booking_log_writer
 
 
 def booking_changes_logger(booking_change: BookingRepo(), use_case: BaseBookingCase, content: str):
-    from src.booking.tasks import create_booking_log_task_v2
     """
     Логирование изменений бронирования
     """
@@ -18,9 +17,11 @@ def booking_changes_logger(booking_change: BookingRepo(), use_case: BaseBookingC
         filters: dict = None,
         exclude_filters: list[dict] = None
     ):
-        booking_after, response_data = dict(), dict()
-        booking_before: str = dumps_dict(dict(booking) if booking else dict())
-        booking_difference_json: str = ""
+        # Снимки полей модели, сериализуются только при записи пачки логов
+        booking_before: dict[str, Any] = dict(booking) if booking else dict()
+        booking_after: dict[str, Any] = dict()
+        booking_difference: dict[str, Any] | None = None
+        response_data: dict = dict()
         error_data, booking_id = None, None
 
         if data and filters:
@@ -35,25 +36,23 @@ def booking_changes_logger(booking_change: BookingRepo(), use_case: BaseBookingC
         try:
             booking: Booking = await update_booking
             booking_id: int = booking.id if booking else None
-            booking_after: str = dumps_dict(dict(booking) if booking else dict())
-            booking_difference: dict = get_difference_between_two_dicts(
-                json.loads(booking_before), json.loads(booking_after)
-            )
-            booking_difference_json: str = json.dumps(booking_difference, indent=4, sort_keys=True, default=str)
+            booking_after: dict[str, Any] = dict(booking) if booking else dict()
+            booking_difference: dict[str, Any] = get_difference_between_two_dicts(booking_before, booking_after)
         except Exception as error:
             error_data = str(error)
 
-        log_data: dict = dict(
-            state_before=booking_before,
-            state_after=booking_after,
-            state_difference=booking_difference_json,
-            content=content,
-            booking_id=booking_id,
-            response_data=response_data,
-            use_case=use_case.__class__.__name__,
-            error_data=error_data,
+        await booking_log_writer.write(
+            dict(
+                state_before=booking_before,
+                state_after=booking_after,
+                state_difference=booking_difference,
+                content=content,
+                booking_id=booking_id,
+                response_data=response_data,
+                use_case=use_case.__class__.__name__,
+                error_data=error_data,
+            )
         )
-        create_task(create_booking_log_task_v2(log_data=log_data))
 
         return booking
 
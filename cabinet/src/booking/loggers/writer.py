@@ -0,0 +1,36 @@
+import json
+from typing import Any
+
+from common.loggers import BufferedLogWriter
+from common.loggers.utils import dumps_dict
+from config import booking_config
+
+from ..repos import BookingLog, BookingLogRepo
+
+
+class BookingLogWriter(BufferedLogWriter):
+    """
+    Буферизованная запись логов изменений бронирований.
+    Состояния сериализуются при записи пачки, а не в запросе
+    """
+
+    def build(self, data: dict[str, Any]) -> BookingLog:
+        state_difference: dict[str, Any] | None = data["state_difference"]
+        return self.repo.model(
+            **{
+                **data,
+                "state_before": dumps_dict(data["state_before"]),
+                "state_after": dumps_dict(data["state_after"]),
+                "state_difference": "" if state_difference is None else json.dumps(
+                    state_difference, indent=4, sort_keys=True, default=str
+                ),
+            }
+        )
+
+
+booking_log_writer: BookingLogWriter = BookingLogWriter(
+    repo=BookingLogRepo,
+    batch_size=booking_config["log_batch_size"],
+    flush_interval_ms=booking_config["log_flush_interval_ms"],
+    queue_size=booking_config["log_queue_size"],
+)
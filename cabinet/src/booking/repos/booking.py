@@ -786,15 +786,13 @@ class BookingRepo(BaseBookingRepo, CRUDMixin, SCountMixin, FacetsMixin, SpecsMix
                 fields_to_check=self.non_false_fields + self.non_nullable_fields,
             )
 
-        for field, value in data.items():
-            if field in self.non_false_fields and value is False:
-                continue
-            elif field in self.non_nullable_fields and value is None:
-                continue
-            setattr(model, field, value)
-        await model.save()
-        await model.refresh_from_db()
-        return model
+        data: dict[str, Any] = {
+            field: value
+            for field, value in data.items()
+            if not (field in self.non_false_fields and value is False)
+            and not (field in self.non_nullable_fields and value is None)
+        }
+        return await self.partial_update(model=model, data=data)
 
     async def bulk_update(
         self,
@@ -1,14 +1,20 @@
+import json
+from asyncio import Semaphore, gather
 from copy import copy
 from datetime import datetime
-from typing import Any, Optional, Type
+from typing import Any, Awaitable, Callable, Optional, Type
 
+import structlog
 from pytz import UTC
 from tortoise import Tortoise
+from tortoise.transactions import in_transaction
 
 from common.amocrm import AmoCRM
 from common.profitbase import ProfitBase
+from common.redis import broker as redis, Redis
 from common.requests import GraphQLRequest
 from src.booking.loggers.wrappers import booking_changes_logger
+from src.properties.constants import PropertyStatuses
 from src.properties.repos import PropertyRepo
 from ..constants import BookingStages, BookingSubstages
 from ..entities import BaseBookingService
@@ -21,11 +27,19 @@ class DeactivateExpiredBookingsService(BaseBookingService):
 
     По какой-то причине тестовые квартиры не деактивировались по таймеру.
     Вероятнее всего это связано с тем, что Redis терял таску при проливке пайплайна.
+
+    Бронирования обрабатываются страницами: страница блокируется через
+    SELECT ... FOR UPDATE SKIP LOCKED и обновляется в одной транзакции: бронирования через
+    BookingRepo.update (с Booking.save и логом изменений), квартиры пакетно. После фиксации транзакции разбронирование
+    в AmoCRM, ProfitBase и на портале выполняется параллельно (не более
+    expired_concurrency бронирований одновременно). Неудавшиеся внешние шаги
+    сохраняются в Redis и повторяются при следующих запусках, но не более expired_max_attempts раз.
     """
 
     query_type: str = "changePropertyStatus"
     query_name: str = "changePropertyStatus.graphql"
     query_directory: str = "/src/booking/queries/"
+    log_content: str = "Деактивация бронирований"
 
     def __init__(
         self,
@@ -35,38 +49,47 @@ class DeactivateExpiredBookingsService(BaseBookingService):
         request_class: Type[GraphQLRequest],
         profitbase_class: Type[ProfitBase],
         property_repo: Type[PropertyRepo],
+        booking_config: dict[str, Any],
         orm_class: Optional[Type[Tortoise]] = None,
         orm_config: Optional[dict[str, Any]] = None,
-        create_booking_log_task: Optional[Any] = None,
+        broker: Optional[Any] = None,
     ) -> None:
+        self.logger: Any = structlog.getLogger(__name__)
         self.booking_repo: BookingRepo = booking_repo()
         self.property_repo: PropertyRepo = property_repo()
 
         self.amocrm_class: Type[AmoCRM] = amocrm_class
         self.request_class: Type[GraphQLRequest] = request_class
         self.profitbase_class: Type[ProfitBase] = profitbase_class
-        self.create_booking_log_task: Any = create_booking_log_task
+
+        self.redis: Redis = redis
+        if broker:
+            self.redis: Redis = broker
 
         self.login: str = backend_config["internal_login"]
         self.password: str = backend_config["internal_password"]
         self.backend_url: str = backend_config["url"] + backend_config["graphql"]
 
+        self.page_size: int = booking_config["expired_page_size"]
+        self.concurrency: int = booking_config["expired_concurrency"]
+        self.failures_key: str = booking_config["expired_failures_key"]
+        self.max_attempts: int = booking_config["expired_max_attempts"]
+
         self.orm_class: Optional[Type[Tortoise]] = orm_class
         self.orm_config: Optional[dict[str, Any]] = copy(orm_config)
         if self.orm_config:
             self.orm_config.pop("generate_schemas", None)
-        self.booking_update = booking_changes_logger(
-            self.booking_repo.update, self, content="Деактивация бронирований"
-        )
+        self.booking_update = booking_changes_logger(self.booking_repo.update, self, content=self.log_content)
 
     async def __call__(self) -> None:
+        await self._retry_failures()
+
         # Не должно быть активных оплаченных бронирований,
         # которые должны быть деактивированы по таймеру
-        filters: dict = dict(active=True, price_payed=True, should_be_deactivated_by_timer=True)
-        confused_bookings: list[Booking] = await self.booking_repo.list(filters=filters)
-        for booking in confused_bookings:
-            booking_data = dict(should_be_deactivated_by_timer=False)
-            await self.booking_update(booking=booking, data=booking_data)
+        filters: dict[str, Any] = dict(active=True, price_payed=True, should_be_deactivated_by_timer=True)
+        booking_data: dict[str, Any] = dict(should_be_deactivated_by_timer=False)
+        async for _ in self._deactivate_pages(filters=filters, data=booking_data):
+            pass
 
         # Деактивация бронирований, которые просрочены по таймеру и не оплачены
         filters: dict[str, Any] = dict(
@@ -75,57 +98,160 @@ class DeactivateExpiredBookingsService(BaseBookingService):
             expires__lte=datetime.now(tz=UTC),
             should_be_deactivated_by_timer=True,
         )
-        expired_bookings: list[Booking] = await self.booking_repo.list(
-            filters=filters,
-            related_fields=["user", "project", "project__city", "property", "building"],
+        booking_data: dict[str, Any] = dict(
+            active=False,
+            project_id=None,
+            building_id=None,
+            property_id=None,
+            profitbase_booked=False,
+            amocrm_stage=BookingStages.START,
+            amocrm_substage=BookingSubstages.START,
+            should_be_deactivated_by_timer=False,
         )
-        for booking in expired_bookings:
-            booking_data: dict[str, Any] = dict(
-                active=False,
-                project_id=None,
-                building_id=None,
-                property_id=None,
-                profitbase_booked=False,
-                amocrm_stage=BookingStages.START,
-                amocrm_substage=BookingSubstages.START,
-                should_be_deactivated_by_timer=False,
+        async for jobs in self._deactivate_pages(
+            filters=filters,
+            data=booking_data,
+            related_fields=["project__city", "property"],
+            free_properties=True,
+        ):
+            await self._run_jobs(jobs)
+
+    async def _deactivate_pages(
+        self,
+        filters: dict[str, Any],
+        data: dict[str, Any],
+        related_fields: Optional[list[str]] = None,
+        free_properties: bool = False,
+    ):
+        """
+        Обновление бронирований страницами с SKIP LOCKED.
+        Отдаёт внешние задачи разбронирования по каждой странице после фиксации транзакции.
+        """
+        while True:
+            async with in_transaction() as connection:
+                booking_ids: list[int] = await (
+                    self.booking_repo.model.select_for_update(skip_locked=True)
+                    .filter(**filters)
+                    .order_by("id")
+                    .limit(self.page_size)
+                    .using_db(connection)
+                    .values_list("id", flat=True)
+                )
+                if not booking_ids:
+                    return
+                bookings: list[Booking] = await (
+                    self.booking_repo.model.filter(id__in=booking_ids)
+                    .order_by("id")
+                    .prefetch_related(*(related_fields or []))
+                    .using_db(connection)
+                )
+                # Задачи собираются до обновления, пока у бронирований есть квартиры
+                jobs: list[dict[str, Any]] = [job for booking in bookings if (job := self._build_job(booking))]
+
+                for booking in bookings:
+                    await self.booking_update(booking=booking, data=dict(data))
+                if free_properties:
+                    property_ids: list[int] = [booking.property_id for booking in bookings if booking.property_id]
+                    if property_ids:
+                        await self.property_repo.model.filter(id__in=property_ids).using_db(connection).update(
+                            status=PropertyStatuses.FREE
+                        )
+
+            self.logger.info("Expired bookings page deactivated", bookings=booking_ids)
+            yield jobs
+
+    async def _run_jobs(self, jobs: list[dict[str, Any]]) -> None:
+        """
+        Параллельное разбронирование во внешних системах
+        """
+        semaphore: Semaphore = Semaphore(self.concurrency)
+
+        async def run(job: dict[str, Any]) -> None:
+            async with semaphore:
+                await self._run_job(job)
+
+        await gather(*(run(job) for job in jobs))
+
+    async def _run_job(self, job: dict[str, Any]) -> None:
+        steps: list[tuple[str, Callable[[dict[str, Any]], Awaitable[Any]]]] = [
+            ("profitbase", self._profitbase_unbooking),
+            ("amocrm", self._amocrm_unbooking),
+            ("backend", self._backend_unbooking),
+        ]
+        job_steps: list[str] = [step for step, _ in steps if step in job["steps"]]
+        actions: dict[str, Callable[[dict[str, Any]], Awaitable[Any]]] = dict(steps)
+        failed: list[str] = []
+        error_data: Optional[str] = None
+        for number, step in enumerate(job_steps):
+            try:
+                await actions[step](job)
+            except Exception as error:  # pylint: disable=broad-except
+                failed.append(step)
+                error_data: str = f"{step}: {error}"
+                self.logger.warning(
+                    "Expired booking unbooking failed", booking_id=job["booking_id"], step=step, error=str(error)
+                )
+                if step == "profitbase":
+                    # AmoCRM и портал не разбронируем, пока не освобождена квартира в ProfitBase
+                    failed.extend(job_steps[number + 1:])
+                    break
+        if not failed:
+            await self.redis.execute("HDEL", self.failures_key, job["booking_id"])
+            return
+        attempts: int = job.get("attempts", 0) + 1
+        if attempts >= self.max_attempts:
+            self.logger.error(
+                "Expired booking unbooking attempts exhausted",
+                booking_id=job["booking_id"],
+                steps=failed,
+                error=error_data,
             )
-            if booking.property:
-                property_data: dict[str, Any] = dict(status=booking.property.statuses.FREE)
-                await self.property_repo.update(booking.property, data=property_data)
-            if booking.step_one() and not booking.step_two() and booking.amocrm_id:
-                await self._amocrm_unbooking(booking)
-            elif booking.step_two():
-                await self._profitbase_unbooking(booking)
-                await self._amocrm_unbooking(booking)
-            await self.booking_update(booking=booking, data=booking_data)
-            if booking.property:
-                await self._backend_unbooking(booking)
-
-    async def _amocrm_unbooking(self, booking: Booking) -> int:
+            await self.redis.execute("HDEL", self.failures_key, job["booking_id"])
+            return
+        await self._record_failure(job=dict(job, steps=failed, error_data=error_data, attempts=attempts))
+
+    async def _retry_failures(self) -> None:
+        """
+        Повтор внешних шагов, не выполненных при прошлых запусках
+        """
+        failures: Any = await self.redis.execute("HGETALL", self.failures_key)
+        if not failures:
+            return
+        if isinstance(failures, list):
+            failures: dict[bytes, bytes] = dict(zip(failures[::2], failures[1::2]))
+        jobs: list[dict[str, Any]] = [json.loads(job) for job in failures.values()]
+        self.logger.info("Retrying expired bookings unbooking", bookings=[job["booking_id"] for job in jobs])
+        await self._run_jobs(jobs)
+
+    async def _record_failure(self, job: dict[str, Any]) -> None:
+        await self.redis.execute("HSET", self.failures_key, job["booking_id"], json.dumps(job, default=str))
+
+    async def _amocrm_unbooking(self, job: dict[str, Any]) -> int:
         """
         Разбронирование amocrm
         """
         async with await self.amocrm_class() as amocrm:
             lead_options: dict[str, Any] = dict(
                 status=BookingSubstages.START,
-                lead_id=booking.amocrm_id,
-                city_slug=booking.project.city.slug,
+                lead_id=job["amocrm_id"],
+                city_slug=job["city_slug"],
             )
             data: list[Any] = await amocrm.update_lead(**lead_options)
             lead_id: int = data[0]["id"]
         return lead_id
 
-    async def _profitbase_unbooking(self, booking: Booking) -> bool:
+    async def _profitbase_unbooking(self, job: dict[str, Any]) -> bool:
         """
         Разбронирование profitbase
         """
         async with await self.profitbase_class() as profitbase:
-            data: dict[str, bool] = await profitbase.unbook_property(deal_id=booking.amocrm_id)
+            data: dict[str, bool] = await profitbase.unbook_property(deal_id=job["amocrm_id"])
         success: bool = data["success"]
+        if not success:
+            raise ValueError("ProfitBase unbook_property failed")
         return success
 
-    async def _backend_unbooking(self, booking: Booking) -> bool:
+    async def _backend_unbooking(self, job: dict[str, Any]) -> bool:
         """
         Разбрование портал
         """
@@ -136,8 +262,33 @@ class DeactivateExpiredBookingsService(BaseBookingService):
             password=self.password,
             query_name=self.query_name,
             query_directory=self.query_directory,
-            filters=(booking.property.global_id, booking.property.statuses.FREE),
+            filters=(job["property_global_id"], PropertyStatuses.FREE),
         )
         async with self.request_class(**unbook_options) as response:
             response_ok: bool = response.ok
+        if not response_ok:
+            raise ValueError("Backend changePropertyStatus failed")
         return response_ok
+
+    @staticmethod
+    def _build_job(booking: Booking) -> Optional[dict[str, Any]]:
+        """
+        Внешние шаги разбронирования, как в check_booking_task
+        """
+        steps: list[str] = []
+        if booking.step_one() and not booking.step_two() and booking.amocrm_id:
+            steps.append("amocrm")
+        elif booking.step_two():
+            steps.extend(("profitbase", "amocrm"))
+        if booking.property:
+            steps.append("backend")
+        if not steps:
+            return None
+        project: Any = booking.project
+        return dict(
+            booking_id=booking.id,
+            amocrm_id=booking.amocrm_id,
+            city_slug=project.city.slug if project and project.city else None,
+            property_global_id=booking.property.global_id if booking.property else None,
+            steps=steps,
+        )
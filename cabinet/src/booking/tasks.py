@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any, Optional
 
 import structlog
@@ -6,7 +5,7 @@ import structlog
 from common import amocrm, bitrix, email, messages, profitbase, requests, security, utils
 from common.amocrm import repos as amo_repos
 from common.celery.utils import redis_lock
-from config import amocrm_config, backend_config, celery, site_config, tortoise_config
+from config import amocrm_config, backend_config, booking_config, celery, site_config, tortoise_config
 from src.agents import repos as agents_repos
 from src.amocrm import repos as src_amocrm_repos
 from src.booking import loggers
@@ -39,8 +38,7 @@ def create_booking_log_task(log_data: dict[str, Any]) -> None:
         booking_log_repo=booking_repos.BookingLogRepo, orm_class=Tortoise, orm_config=tortoise_config,
     )
     create_log: loggers.CreateBookingLogLogger = loggers.CreateBookingLogLogger(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(create_log))(log_data=log_data))
+    celery.run(celery.sentry_catch(celery.init_orm(create_log))(log_data=log_data))
 
 
 async def create_booking_log_task_v2(log_data: dict[str, Any]) -> None:
@@ -61,8 +59,7 @@ def create_amocrm_log_task(note_data: dict[str, Any]) -> None:
     """
     resources: dict[str, Any] = dict(amocrm_class=amocrm.AmoCRM)
     create_log: loggers.CreateAmoCRMLogLogger = loggers.CreateAmoCRMLogLogger(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(create_log)(note_data=note_data))
+    celery.run(celery.sentry_catch(create_log)(note_data=note_data))
 
 
 @celery.app.task
@@ -95,8 +92,7 @@ def check_booking_task(booking_id: int, status: Optional[str] = '') -> None:
         booking_notification_sms_task=notification_tasks.booking_notification_sms_task,
     )
     check_booking: services.CheckBookingService = services.CheckBookingService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(check_booking))(booking_id=booking_id, status=status)
     )
     logger.info(f'Finished check_booking_task for booking_id={booking_id}')
@@ -117,10 +113,9 @@ def deactivate_expired_bookings_task_periodic() -> None:
         profitbase_class=profitbase.ProfitBase,
         booking_repo=booking_repos.BookingRepo,
         property_repo=properties_repos.PropertyRepo,
-        create_booking_log_task=create_booking_log_task,
+        booking_config=booking_config,
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(deactivate_expired_bookings))())
+    celery.run(celery.sentry_catch(celery.init_orm(deactivate_expired_bookings))())
 
 
 @celery.app.task
@@ -154,8 +149,7 @@ def import_bookings_task(user_id: int) -> None:
         check_booking_task=check_booking_task,
     )
     import_bookings_service = services.ImportBookingsService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(import_bookings_service))(user_id=user_id)
     )
 
@@ -187,8 +181,7 @@ def update_bookings_task() -> None:
         cities_repo=cities_repos.CityRepo,
     )
     update_bookings: services.UpdateBookingsService = services.UpdateBookingsService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(update_bookings))())
+    celery.run(celery.sentry_catch(celery.init_orm(update_bookings))())
 
 
 async def deactivate_bookings_task(booking_data: dict) -> None:
@@ -237,8 +230,7 @@ def change_booking_status_task(booking_id: int, status: str) -> None:
         orm_config=tortoise_config,
         booking_repo=booking_repos.BookingRepo,
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(change_booking_status))(booking_id=booking_id, status=status)
     )
 
@@ -261,8 +253,7 @@ def send_sms_to_msk_client_task(booking_id: int, sms_slug: str) -> None:
     send_sms_to_msk_client: services.SendSmsToMskClientService = services.SendSmsToMskClientService(
         **resources
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(send_sms_to_msk_client))(booking_id=booking_id, sms_slug=sms_slug)
     )
 
@@ -285,8 +276,7 @@ def periodic_check_test_booking_task() -> None:
     )
     check_test_booking: services.CheckTestBookingService = services.CheckTestBookingService(**resources)
     # return await check_test_booking()
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(check_test_booking))()
     )
     logger.info(f'Finished periodic_check_test_booking_task')
@@ -1,3 +1,4 @@
+from copy import copy
 from typing import Any
 
 from common.settings.repos import SystemList
@@ -8,12 +9,10 @@ from src.amocrm.repos import (
     ClientAmocrmGroupStatusRepo,
     ClientAmocrmGroupStatus,
 )
-from src.task_management.utils import (
-    get_booking_tasks,
-    get_interesting_task_chain,
-)
+from src.task_management.utils import TaskDataBuilder
 from src.booking.constants import BookingCreatedSources
 from ..entities import BaseBookingCase
+from ..loaders import BookingListLoader
 from ..models import BookingListFilters
 from ..repos import Booking, BookingRepo, BookingTag, BookingTagRepo
 from src.task_management.repos import TaskChain
@@ -39,6 +38,11 @@ class BookingListCase(BaseBookingCase):
             amocrm_group_status_repo()
         )
         self.client_amocrm_group_status_repo: ClientAmocrmGroupStatusRepo = client_amocrm_group_status_repo()
+        self.loader: BookingListLoader = BookingListLoader(
+            booking_tag_repo=booking_tag_repo,
+            amocrm_group_status_repo=amocrm_group_status_repo,
+            client_amocrm_group_status_repo=client_amocrm_group_status_repo,
+        )
 
     async def __call__(
         self,
@@ -53,13 +57,22 @@ class BookingListCase(BaseBookingCase):
             statuses=statuses,
             property_types_filter=property_types_filter,
         )
+        task_chain_slugs: dict[int, list[str]] = {}
+        for booking in bookings:
+            task_chain_slug: str | list[str] = await self._get_task_chain_slug(booking=booking)
+            task_chain_slugs[booking.id] = [task_chain_slug] if isinstance(task_chain_slug, str) else task_chain_slug
+        await self.loader.load(bookings=bookings, task_chain_slugs=task_chain_slugs)
+
         for booking in bookings:
             booking.tasks = await self._get_booking_tasks(booking=booking)
-            booking.client_group_statuses = await self._get_client_group_statuses(booking=booking)
+            booking.client_group_statuses = self._get_client_group_statuses(
+                booking=booking,
+                task_chain_slug=task_chain_slugs[booking.id][0],
+            )
 
             if booking.amocrm_status:
-                await self._set_group_statuses(booking=booking)
-            booking.booking_tags = await self._get_booking_tags(booking)
+                self._set_group_statuses(booking=booking)
+            booking.booking_tags = self._get_booking_tags(booking)
 
         data: dict = dict(result=bookings, count=len(bookings))
 
@@ -112,15 +125,9 @@ class BookingListCase(BaseBookingCase):
         )
         return bookings
 
-    async def _get_booking_tags(self, booking: Booking) -> list[BookingTag] | None:
-        group_statuses = booking.amocrm_status.group_status if booking.amocrm_status else None
-        tag_filters: dict = dict(
-            is_active=True,
-            group_statuses=group_statuses,
-        )
-        return (
-            await self.booking_tag_repo.list(filters=tag_filters, ordering="-priority")
-        ) or None
+    def _get_booking_tags(self, booking: Booking) -> list[BookingTag] | None:
+        group_status = booking.amocrm_status.group_status if booking.amocrm_status else None
+        return self.loader.get_booking_tags(group_status) or None
 
     def _get_additional_filters(
         self,
@@ -141,12 +148,15 @@ class BookingListCase(BaseBookingCase):
 
     async def _get_booking_tasks(self, booking: Booking) -> list[dict[str, Any] | None]:
         """Get booking tasks"""
-        task_chain_slug: str | list[str] = await self._get_task_chain_slug(booking=booking)
-        tasks: list[dict[str, Any] | None] = await get_booking_tasks(
-            booking_id=booking.id,
-            task_chain_slug=task_chain_slug,
-        )
-        tasks: list[dict | None] = await self._clear_tasks(tasks=tasks, booking=booking)
+        task_instances = self.loader.get_task_instances(booking)
+        if not task_instances:
+            return []
+        tasks: list[dict[str, Any] | None] = await TaskDataBuilder(
+            task_instances=task_instances,
+            booking=booking,
+            prefetched=True,
+        ).build()
+        tasks: list[dict | None] = self._clear_tasks(tasks=tasks, booking=booking)
         return tasks
 
     async def _get_task_chain_slug(self, booking: Booking) -> str | list[str]:
@@ -167,21 +177,9 @@ class BookingListCase(BaseBookingCase):
                 task_chain_slug: list[str] = slugs
         return task_chain_slug
 
-    async def _set_group_statuses(self, booking: Booking) -> None:
-        group_statuses: list[
-            AmocrmGroupStatus
-        ] = await self.amocrm_group_status_repo.list(
-            filters=dict(is_final=False),
-            ordering="sort",
-        )
-        final_group_statuses: list[
-            AmocrmGroupStatus
-        ] = await self.amocrm_group_status_repo.list(
-            filters=dict(is_final=True),
-        )
-        final_group_statuses_ids = [
-            final_group_status.id for final_group_status in final_group_statuses
-        ]
+    def _set_group_statuses(self, booking: Booking) -> None:
+        group_statuses: list[AmocrmGroupStatus] = self.loader.group_statuses
+        final_group_statuses_ids: set[int] = self.loader.final_group_status_ids
 
         booking_group_status = booking.amocrm_status.group_status
         if not booking_group_status:
@@ -194,7 +192,7 @@ class BookingListCase(BaseBookingCase):
                     booking_group_status_current_step = number + 1
 
         booking_group_status_actions = (
-            await booking_group_status.amocrm_actions if booking_group_status else None
+            self.loader.get_group_status_actions(booking_group_status) if booking_group_status else None
         )
 
         if booking_group_status:
@@ -214,19 +212,21 @@ class BookingListCase(BaseBookingCase):
         booking.amocrm_status.current_step = booking_group_status_current_step
         booking.amocrm_status.actions = booking_group_status_actions
 
-    async def _get_client_group_statuses(self, booking: Booking) -> list[ClientAmocrmGroupStatus | None]:
-        group_statuses: list[ClientAmocrmGroupStatus] = await self.client_amocrm_group_status_repo.list(
-            filters=dict(is_hide=False),
-            ordering="sort",
-            prefetch_fields=[
-                'booking_tags__booking_sources',
-                'booking_tags__systems',
-            ],
-        )
+    def _get_client_group_statuses(
+        self,
+        booking: Booking,
+        task_chain_slug: str,
+    ) -> list[ClientAmocrmGroupStatus | None]:
+        # справочник общий для всех сделок списка, поля статуса заполняются для каждой сделки
+        group_statuses: list[ClientAmocrmGroupStatus] = [
+            copy(status) for status in self.loader.client_group_statuses
+        ]
+        task_chain: TaskChain = self.loader.get_task_chain(task_chain_slug)
         for status in group_statuses:
-            status.tags = await self._get_client_group_status_tags(
+            status.tags = self._get_client_group_status_tags(
                 booking=booking,
                 status=status,
+                task_chain=task_chain,
             )
             match status:
                 case booking.amocrm_status.client_group_status:
@@ -235,10 +235,11 @@ class BookingListCase(BaseBookingCase):
                     status.is_current = False
         return group_statuses
 
-    async def _get_client_group_status_tags(
+    def _get_client_group_status_tags(
         self,
         booking: Booking,
         status: ClientAmocrmGroupStatus,
+        task_chain: TaskChain,
     ) -> list[BookingTag]:
         """
         Ищем теги, которые подходят под источник бронирования и под системы.
@@ -246,12 +247,6 @@ class BookingListCase(BaseBookingCase):
         которая должна выводиться для этой брони.
         Так как брони с системой больше никак не связаны
         """
-        task_chain_slug: str | list[str] = await self._get_task_chain_slug(booking=booking)
-        if isinstance(task_chain_slug, list):
-            task_chain_slug: str = task_chain_slug[0]
-        task_chain: TaskChain = await get_interesting_task_chain(status=task_chain_slug)
-        await task_chain.fetch_related('systems')
-
         tags: list[BookingTag] = []
         for tag in status.booking_tags:
             common_booking_source: bool = booking.booking_source in tag.booking_sources
@@ -260,7 +255,7 @@ class BookingListCase(BaseBookingCase):
                 tags.append(tag)
         return tags
 
-    async def _clear_tasks(
+    def _clear_tasks(
         self,
         tasks: list[dict[str, Any] | None],
         booking: Booking,
@@ -278,22 +273,20 @@ class BookingListCase(BaseBookingCase):
 
         cleared_tasks: list[dict | None] = []
         for task in tasks:
-            task_chain: TaskChain = await get_interesting_task_chain(status=task["task_status"])
+            task_chain: TaskChain = self.loader.get_task_chain(task["task_status"])
 
-            valid_task_chain: bool = await self._is_valid_task_chain(
+            valid_task_chain: bool = self._is_valid_task_chain(
                 task_chain=task_chain,
                 booking=booking,
             )
             valid_task_status: bool = task["task_status"] not in banned_statuses
             valid_property_type: bool = booking.property.property_type.slug.upper() not in banned_properties_types
 
-            print(f'{valid_task_chain=}, {valid_task_status=}, {valid_property_type=}')
-
             if all((valid_task_chain, valid_task_status, valid_property_type)):
                 cleared_tasks.append(task)
         return cleared_tasks
 
-    async def _is_valid_task_chain(
+    def _is_valid_task_chain(
         self,
         task_chain: TaskChain,
         booking: Booking,
@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 
 import tortoise
 
@@ -24,5 +23,4 @@ def periodic_cities_update_task() -> None:
                      cities_repo=CityRepo,
                      portal_class=PortalAPI(request_class=GraphQLRequest, portal_config=backend_config))
     update_cities: UpdateCitiesService = UpdateCitiesService(**resources)
-    loop = get_event_loop()
-    loop.run_until_complete(celery.init_orm(update_cities)())
+    celery.run(celery.init_orm(update_cities)())
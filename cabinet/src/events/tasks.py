@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 from tortoise import Tortoise
@@ -37,8 +36,7 @@ def sending_sms_to_broker_on_event_task(event_id: int, broker_id: int, sms_event
     sending_sms_to_broker_on_event_service: SendingSmsToBrokerOnEventService = SendingSmsToBrokerOnEventService(
         **resources
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(sending_sms_to_broker_on_event_service))(
+    celery.run(celery.sentry_catch(celery.init_orm(sending_sms_to_broker_on_event_service))(
         event_id=event_id,
         broker_id=broker_id,
         sms_event_slug=sms_event_slug,
@@ -68,5 +66,4 @@ def periodic_event_notification_task() -> None:
         PeriodicEventNotificationTaskService(
             **resources
         )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(periodic_event_notification_task_service))())
+    celery.run(celery.sentry_catch(celery.init_orm(periodic_event_notification_task_service))())
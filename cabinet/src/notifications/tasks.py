@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 from common import email, messages
@@ -43,8 +42,7 @@ def periodic_notification_logs_clean() -> None:
         orm_config=tortoise_config,
     )
     notiification_clean_logs_service: CleanLogsNotificationService = CleanLogsNotificationService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(notiification_clean_logs_service))(days))
+    celery.run(celery.sentry_catch(celery.init_orm(notiification_clean_logs_service))(days))
 
 
 @celery.app.task
@@ -60,8 +58,7 @@ def booking_notification_sms_task(booking_id: int) -> bool:
         orm_config=tortoise_config,
     )
     booking_sms_notification_service: BookingNotificationService = BookingNotificationService(**resources)
-    loop: Any = get_event_loop()
-    return loop.run_until_complete(
+    return celery.run(
         celery.sentry_catch(celery.init_orm(booking_sms_notification_service))(booking_id=booking_id)
     )
 
@@ -80,8 +77,7 @@ def send_booking_notify_sms_task(data: dict[str, Any]) -> bool:
         send_booking_notify_sms_task=send_booking_notify_sms_task,
     )
     send_booking_notify_service: SendSMSBookingNotifyService = SendSMSBookingNotifyService(**resources)
-    loop: Any = get_event_loop()
-    return loop.run_until_complete(
+    return celery.run(
         celery.sentry_catch(celery.init_orm(send_booking_notify_service))(data=data)
     )
 
@@ -102,8 +98,7 @@ def periodic_booking_fixation_notification_email_task() -> None:
     )
     booking_email_fixation_notification_service: BookingFixationNotificationService = \
         BookingFixationNotificationService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(booking_email_fixation_notification_service))()
     )
 
@@ -128,8 +123,7 @@ def send_booking_fixation_notify_email_task(data: dict[str, Any]) -> None:
     )
     send_booking_fixation_notify_service: SendEmailBookingFixationNotifyService = \
         SendEmailBookingFixationNotifyService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(send_booking_fixation_notify_service))(data=data)
     )
 
@@ -148,8 +142,7 @@ def periodic_send_qrcode_sms_task() -> None:
         orm_config=tortoise_config,
     )
     check_qrcode_sms_send: CheckQRCodeSMSSend = CheckQRCodeSMSSend(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(check_qrcode_sms_send))())
+    celery.run(celery.sentry_catch(celery.init_orm(check_qrcode_sms_send))())
     print("finish periodic_send_qrcode_sms_task")
 
 
@@ -169,6 +162,5 @@ def send_qrcode_sms_task(data: dict[str, int]) -> None:
         orm_config=tortoise_config,
     )
     send_qrcode_sms: SendQRCodeSMS = SendQRCodeSMS(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(send_qrcode_sms))(data=data))
+    celery.run(celery.sentry_catch(celery.init_orm(send_qrcode_sms))(data=data))
     print("finish send_qrcode_sms_task")
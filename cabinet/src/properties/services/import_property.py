@@ -619,14 +619,12 @@ class ImportPropertyService(BasePropertyService):
         """
         Периодический запуск
         """
-        await self.orm_class.init(config=self.orm_config)
         await self.import_building_booking_types_service()
         async for _property in self.property_repo.list():
             try:
                 await self(property=_property)
             except Exception:
                 continue
-        await self.orm_class.close_connections()
         return True
 
     async def _get_similar_property_from_backend(
@@ -1,6 +1,3 @@
-from asyncio import get_event_loop
-from typing import Any
-
 from common.backend import repos as backend_repos
 from common.celery.utils import redis_lock
 from config import celery, tortoise_config
@@ -20,8 +17,7 @@ def import_property_task(property_id: int) -> None:
         orm_class=Tortoise,
         orm_config=tortoise_config
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(import_property))(property_id=property_id)
     )
 
@@ -45,5 +41,4 @@ def import_properties_task_periodic() -> None:
         orm_config=tortoise_config,
         import_building_booking_types_service=import_building_booking_types_service,
     )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(import_property.periodic)())
+    celery.run(celery.sentry_catch(celery.init_orm(import_property.periodic))())
@@ -1,5 +1,4 @@
 from typing import Any
-from asyncio import get_event_loop
 
 from tortoise import Tortoise
 
@@ -24,7 +23,6 @@ def create_contact_task(repres_id: int) -> None:
         agency_repo=agencies_repos.AgencyRepo,
     )
     create_contact_service = represes_services.CreateContactService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(create_contact_service))(repres_id=repres_id)
     )
@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 from tortoise import Tortoise
@@ -18,8 +17,7 @@ def create_task_instance_task(booking_ids: list[int], task_context: CreateTaskDT
     Создание инстанса задачи для цепочки заданий
     """
     create_task_instance_service: services.CreateTaskInstanceService = CreateTaskInstanceServiceFactory.create()
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(create_task_instance_service))(
             booking_ids=booking_ids, task_context=task_context
         )
@@ -38,8 +36,7 @@ def update_task_instance_status_task(
     """
     ic(caller_info)
     update_status_service: services.UpdateTaskInstanceStatusService = UpdateTaskInstanceStatusServiceFactory.create()
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(update_status_service))(
             booking_id=booking_id, status_slug=status_slug, task_context=task_context
         )
@@ -64,8 +61,7 @@ def periodic_update_deal_to_need_extension_status_task() -> None:
         services.UpdateDealToNeedExtensionStatusService(
             **resources
         )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(update_deal_to_need_extension_service))())
+    celery.run(celery.sentry_catch(celery.init_orm(update_deal_to_need_extension_service))())
 
 
 @celery.app.task
@@ -86,5 +82,4 @@ def periodic_update_deal_to_cant_extend_deal_by_date_task() -> None:
         services.UpdateDealToCantExtendDealByDateStatusService(
             **resources
         )
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(update_deal_to_cant_extend_deal_by_date_service))())
+    celery.run(celery.sentry_catch(celery.init_orm(update_deal_to_cant_extend_deal_by_date_service))())
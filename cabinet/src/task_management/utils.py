@@ -43,7 +43,11 @@ class TaskDataBuilder:
         task_instances: list[TaskInstance] | TaskInstance,
         booking: Booking,
         booking_settings: BookingSettings | None = None,
+        prefetched: bool = False,
     ):
+        """
+        prefetched - связи статусов задач уже загружены (см. BookingListLoader)
+        """
         if isinstance(task_instances, list):
             self.task_instances: list[TaskInstance] = task_instances
         else:
@@ -51,6 +55,7 @@ class TaskDataBuilder:
 
         self.booking = booking
         self.booking_settings = booking_settings
+        self.prefetched = prefetched
 
         self.task: TaskInstance | None = None
         self.result: list[dict[str, Any] | None] = []
@@ -64,12 +69,13 @@ class TaskDataBuilder:
 
         for task in self.task_instances:
             self.task: TaskInstance = task
-            await self.task.fetch_related(
-                "status__button_detail_views",
-                "status__buttons",
-                "status__tasks_chain__task_visibility",
-                "status__tasks_chain__systems",
-            )
+            if not self.prefetched:
+                await self.task.fetch_related(
+                    "status__button_detail_views",
+                    "status__buttons",
+                    "status__tasks_chain__task_visibility",
+                    "status__tasks_chain__systems",
+                )
             task_visibility: list[AmocrmStatus] = self.task.status.tasks_chain.task_visibility
             if self.booking.amocrm_status not in task_visibility:
                 continue
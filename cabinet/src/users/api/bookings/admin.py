@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Optional
 
 from common import dependencies, paginations
 from common.settings.repos import BookingSettingsRepo
@@ -79,6 +79,7 @@ async def admins_bookings_lookup_view(
 async def admins_bookings_list_view(
     init_filters: dict[str, Any] = Depends(filters.BookingUserFilter.filterize),
     pagination: paginations.PagePagination = Depends(dependencies.Pagination()),
+    cursor_pagination: Optional[paginations.CursorPagination] = Depends(dependencies.CursorPagination()),
 ):
     """
     Сделки администратором
@@ -92,7 +93,9 @@ async def admins_bookings_list_view(
         booking_settings_repo=BookingSettingsRepo,
     )
     admins_users_list: use_cases.UsersBookingsCase = use_cases.UsersBookingsCase(**resources)
-    return await admins_users_list(pagination=pagination, init_filters=init_filters)
+    return await admins_users_list(
+        pagination=pagination, init_filters=init_filters, cursor_pagination=cursor_pagination
+    )
 
 
 @router.get(
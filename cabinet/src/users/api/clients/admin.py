@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Optional
 
 from common import dependencies, paginations, amocrm
 from common.email import email
@@ -84,6 +84,7 @@ async def admins_users_lookup_view(
 async def admin_clients_view(
     init_filters: dict = Depends(filters.UserFilter.filterize),
     pagination: paginations.PagePagination = Depends(dependencies.Pagination()),
+    cursor_pagination: Optional[paginations.CursorPagination] = Depends(dependencies.CursorPagination()),
 ):
     """Список клиентов админом"""
     resources: dict = dict(
@@ -92,7 +93,9 @@ async def admin_clients_view(
         user_pinning_repo=users_repos.UserPinningStatusRepo,
     )
     clients_case: use_cases.AdminListClientsCase = use_cases.AdminListClientsCase(**resources)
-    return await clients_case(init_filters=init_filters, pagination=pagination)
+    return await clients_case(
+        init_filters=init_filters, pagination=pagination, cursor_pagination=cursor_pagination
+    )
 
 
 @router.get(
@@ -120,7 +120,7 @@ class ResponseClientsListModel(BaseUserModel):
     Модель ответа списка пользователей представителя агенства
     """
 
-    count: int
+    count: Optional[int]
     page_info: dict[str, Any]
     result: list[_ClientsListModel]
 
@@ -285,7 +285,7 @@ class ResponseBookingsUsersListModel(BaseUserModel):
     Модель ответа списка пользователей администратором
     """
 
-    count: int
+    count: Optional[int]
     page_info: dict[str, Any]
     result: list[_UserBookingsListModel]
 
@@ -346,10 +346,8 @@ class UserRepo(BaseUserRepo, UserRepoSpecsMixin, UserRepoFacetsMixin, GenericMix
         """
         self.logger.debug("User update: ", id=model.id, data=data)
         self.logger.debug(traceback.print_stack(limit=5))
-        for field, value in data.items():
-            setattr(model, field, value)
         try:
-            await model.save()
+            model: User = await self.partial_update(model=model, data=data)
         except IntegrityError as ex:
             exception_message = str(ex)
             traceback_str = traceback.format_exc()
@@ -1,4 +1,3 @@
-from asyncio import get_event_loop
 from typing import Any
 
 from common import amocrm, email, requests, security, utils
@@ -70,8 +69,7 @@ def create_amocrm_contact_task(user_id: int, phone: str) -> None:
         amocrm_config=amocrm_config,
     )
     create_contact: services.CreateContactService = services.CreateContactService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(create_contact))(user_id=user_id, phone=phone)
     )
 
@@ -91,8 +89,7 @@ def check_client_unique_task(user_id: int, agent_id: int, check_id: int, phone:
         amocrm_config=amocrm_config,
     )
     check_unique: services.CheckUniqueService = services.CheckUniqueService(**resources)
-    loop: Any = get_event_loop()
-    result = loop.run_until_complete(
+    result = celery.run(
         celery.sentry_catch(celery.init_orm(check_unique))(
             user_id=user_id, agent_id=agent_id, check_id=check_id, phone=phone
         )
@@ -115,8 +112,7 @@ def change_client_agent_task(user_id: int, agent_id: int) -> None:
         booking_substages=booking_constants.BookingSubstages,
     )
     change_agent: services.ChangeAgentService = services.ChangeAgentService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(
+    celery.run(
         celery.sentry_catch(celery.init_orm(change_agent))(user_id=user_id, agent_id=agent_id)
     )
 
@@ -142,8 +138,7 @@ def check_client_task_periodic() -> None:
         amocrm_config=amocrm_config,
     )
     check_client: services.CheckClientService = services.CheckClientService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(check_client))())
+    celery.run(celery.sentry_catch(celery.init_orm(check_client))())
 
 
 async def update_user_data_task(user_id: int) -> None:
@@ -208,8 +203,7 @@ def check_user_interests() -> None:
         token_creator=security.create_access_token,
     )
     check_client_interests: services.CheckClientInterestService = services.CheckClientInterestService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(check_client_interests))())
+    celery.run(celery.sentry_catch(celery.init_orm(check_client_interests))())
 
 
 @celery.app.task
@@ -229,8 +223,7 @@ def periodic_users_clean() -> None:
     )
 
     clean_users: services.CleanUsersService = services.CleanUsersService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(clean_users))())
+    celery.run(celery.sentry_catch(celery.init_orm(clean_users))())
 
 
 @celery.app.task
@@ -253,5 +246,4 @@ def periodic_logs_clean() -> None:
     )
 
     clean_logs: services.CleanLogsService = services.CleanLogsService(**resources)
-    loop: Any = get_event_loop()
-    loop.run_until_complete(celery.sentry_catch(celery.init_orm(clean_logs))(days))
+    celery.run(celery.sentry_catch(celery.init_orm(clean_logs))(days))
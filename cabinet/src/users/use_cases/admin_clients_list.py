@@ -1,5 +1,7 @@
 from datetime import datetime, time
-from typing import Any, List, Type, Union
+from typing import Any, List, Optional, Type, Union
+
+from common.paginations import CursorPagination
 
 from src.booking.constants import BookingSubstages
 from src.users.entities import BaseUserCase
@@ -27,6 +29,7 @@ class AdminListClientsCase(BaseUserCase):
         *,
         init_filters: dict,
         pagination: UserPagination,
+        cursor_pagination: Optional[CursorPagination] = None,
     ):
         additional_filters = dict(type=UserType.CLIENT)
         search = init_filters.pop("search", [])
@@ -39,33 +42,51 @@ class AdminListClientsCase(BaseUserCase):
             q_filters += search_q_filters
 
         bookings_count_annotations: dict[str, Any] = self._get_booking_count_annotation()
-        users: List[User] = await self.user_repo.list(
-            filters=init_filters,
-            q_filters=q_filters,
-            end=pagination.end,
-            start=pagination.start,
-            ordering=ordering,
-            annotations=bookings_count_annotations,
-            prefetch_fields=[
-                "agent",
-                "agency",
-                "bookings",
-                dict(relation="users_checks",
-                     queryset=self.check_repo.list(ordering="-requested", related_fields=["unique_status"]),
-                     to_attr="statuses"),
-                dict(relation="users_pinning_status",
-                     queryset=self.user_pinning_repo.list(related_fields=["unique_status"]),
-                     to_attr="pinning_statuses"),
-            ],
-        )
-        count: int = await self.user_repo.count(
-            filters=init_filters,
-            q_filters=q_filters
-        )
+        prefetch_fields: list[Any] = [
+            "agent",
+            "agency",
+            "bookings",
+            dict(relation="users_checks",
+                 queryset=self.check_repo.list(ordering="-requested", related_fields=["unique_status"]),
+                 to_attr="statuses"),
+            dict(relation="users_pinning_status",
+                 queryset=self.user_pinning_repo.list(related_fields=["unique_status"]),
+                 to_attr="pinning_statuses"),
+        ]
+        if cursor_pagination and self.user_repo.keyset_supported(ordering):
+            users: List[User] = await self.user_repo.keyset_list(
+                filters=init_filters,
+                q_filters=q_filters,
+                limit=cursor_pagination.page_size + 1,
+                after=cursor_pagination.after(ordering),
+                ordering=ordering,
+                annotations=bookings_count_annotations,
+                prefetch_fields=prefetch_fields,
+            )
+            users: List[User] = cursor_pagination.paginate(users, ordering=ordering)
+            count: Optional[int] = await self.user_repo.count_by_mode(
+                cursor_pagination.count_mode, filters=init_filters, q_filters=q_filters
+            )
+            page_info: dict[str, Any] = cursor_pagination(count=count)
+        else:
+            users: List[User] = await self.user_repo.list(
+                filters=init_filters,
+                q_filters=q_filters,
+                end=pagination.end,
+                start=pagination.start,
+                ordering=ordering,
+                annotations=bookings_count_annotations,
+                prefetch_fields=prefetch_fields,
+            )
+            count: int = await self.user_repo.count(
+                filters=init_filters,
+                q_filters=q_filters
+            )
+            page_info: dict[str, Any] = pagination(count=count)
         for user in users:
             user.status = next(iter(user.statuses), None)
             user.pinning_status = next(iter(user.pinning_statuses), None)
-        data: dict[str, Any] = dict(count=count, result=users, page_info=pagination(count=count))
+        data: dict[str, Any] = dict(count=count, result=users, page_info=page_info)
 
         return data
 
@@ -12,7 +12,7 @@ import structlog
 from pytz import UTC
 from fastapi import Request
 
-from common.amocrm import AmoCRM
+from common.amocrm import AmoCRM, AmoCRMWriteScheduler
 from common.amocrm.constants import AmoContactQueryWith, AmoCompanyEntityType, AmoLeadQueryWith
 from common.amocrm.repos import AmoStatusesRepo
 from common.amocrm.types import AmoContact, AmoLead
@@ -794,8 +794,14 @@ class AssignClientCase(BaseUserCase):
                 entities=[agent_entities, agency_entities],
             )
 
-            for lead_id in active_leads_ids:
-                await amocrm.update_lead(lead_id=lead_id, is_agency_deal=True)
+            async with AmoCRMWriteScheduler(amocrm) as scheduler:
+                futures: list[asyncio.Future] = [
+                    scheduler.update_lead(lead_id=lead_id, is_agency_deal=True) for lead_id in active_leads_ids
+                ]
+            results: list[Any] = await asyncio.gather(*futures, return_exceptions=True)
+            for lead_id, result in zip(active_leads_ids, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Не удалось обновить сделку {lead_id} в AmoCRM", error=str(result))
 
     async def _notify_client_sms(
         self,
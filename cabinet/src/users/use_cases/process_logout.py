@@ -25,8 +25,6 @@ class ProcessLogoutCase(BaseUserCase):
         self.request: Request = request
 
     async def __call__(self) -> None:
-        self.session[self.auth_key]: dict[str, None] = dict(type=None, token=None)
-        await self.session.insert()
-        await self.session.redis.delete(self.session.session_id)
+        await self.session.delete()
         for cookie in self.request.cookies:
             self.response.delete_cookie(key=cookie)
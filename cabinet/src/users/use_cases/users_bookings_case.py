@@ -3,6 +3,7 @@ from typing import Any, Optional, Type, Union
 
 from tortoise.expressions import Q
 
+from common.paginations import CursorPagination
 from common.settings.constants import SystemListSlug
 from common.settings.repos import BookingSettingsRepo, SystemList
 from common.settings.utils import get_system_by_slug
@@ -48,6 +49,7 @@ class UsersBookingsCase(BaseUserCase, CurrentUserDataMixin):
             pagination: UserPagination,
             agency_id: Optional[int] = None,
             agent_id: Optional[int] = None,
+            cursor_pagination: Optional[CursorPagination] = None,
     ) -> dict[str, Any]:
         self.init_user_data(agent_id=agent_id, agency_id=agency_id)
         ordering: Union[str, None] = init_filters.pop("ordering", "-id")
@@ -73,17 +75,33 @@ class UsersBookingsCase(BaseUserCase, CurrentUserDataMixin):
         q_filters += self.get_work_period_q_filters(init_filters)
         filters: dict[str, Any] = self.get_bookings_filters(init_filters=init_filters)
 
-        bookings: list[Booking] = await self.booking_repo.list(
-            filters=filters,
-            ordering=ordering,
-            end=pagination.end,
-            q_filters=q_filters,
-            start=pagination.start,
-            prefetch_fields=prefetch_fields,
-        )
-        count: int = await self.booking_repo.scount(
-            filters=filters, q_filters=q_filters
-        )
+        if cursor_pagination and self.booking_repo.keyset_supported(ordering):
+            bookings: list[Booking] = await self.booking_repo.keyset_list(
+                filters=filters,
+                ordering=ordering,
+                limit=cursor_pagination.page_size + 1,
+                after=cursor_pagination.after(ordering),
+                q_filters=q_filters,
+                prefetch_fields=prefetch_fields,
+            )
+            bookings: list[Booking] = cursor_pagination.paginate(bookings, ordering=ordering)
+            count: Optional[int] = await self.booking_repo.count_by_mode(
+                cursor_pagination.count_mode, filters=filters, q_filters=q_filters
+            )
+            page_info: dict[str, Any] = cursor_pagination(count=count)
+        else:
+            bookings: list[Booking] = await self.booking_repo.list(
+                filters=filters,
+                ordering=ordering,
+                end=pagination.end,
+                q_filters=q_filters,
+                start=pagination.start,
+                prefetch_fields=prefetch_fields,
+            )
+            count: int = await self.booking_repo.scount(
+                filters=filters, q_filters=q_filters
+            )
+            page_info: dict[str, Any] = pagination(count=count)
 
         for booking in bookings:
             if booking.project and booking.project.status == ProjectStatus.FUTURE:
@@ -107,7 +125,7 @@ class UsersBookingsCase(BaseUserCase, CurrentUserDataMixin):
             booking.booking_tags = await self._get_booking_tags(booking)
 
         data: dict[str, Any] = dict(
-            count=count, result=bookings, page_info=pagination(count=count)
+            count=count, result=bookings, page_info=page_info
         )
         return data
 
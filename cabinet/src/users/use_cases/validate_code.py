@@ -54,7 +54,7 @@ class ValidateCodeCase(BaseUserCase):
         phone: str = data["phone"]
         filters: dict[str, Any] = dict(phone=phone, type=UserType.CLIENT)
         user: User = await self.user_repo.retrieve(filters=filters)
-        auth_attempts: int = self.session.data.get(self.auth_attempts_key, 0)
+        auth_attempts: int = await self.session.get(self.auth_attempts_key, 0)
 
         if auth_attempts >= 3:
             raise UserMaxCodeAttemptsError
@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from common.amocrm import AmoCRMWriteScheduler
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _amocrm(is_lead_v4_enabled: bool) -> Mock:
+    amocrm = Mock(is_lead_v4_enabled=is_lead_v4_enabled)
+    amocrm.build_lead_payload_v4.side_effect = lambda **options: dict(status_id=options.get("status_id"))
+    amocrm._request_patch_v4 = AsyncMock(
+        side_effect=lambda route, payload: SimpleNamespace(
+            status=200, ok=True, raw=None, data=dict(_embedded=dict(leads=[dict(id=item["id"]) for item in payload]))
+        )
+    )
+    amocrm.update_lead_v2 = AsyncMock(side_effect=lambda lead_id, **options: [dict(id=lead_id)])
+    return amocrm
+
+
+class TestAmoCRMWriteScheduler:
+
+    async def test_update_leads_v4(self):
+        amocrm = _amocrm(is_lead_v4_enabled=True)
+
+        async with AmoCRMWriteScheduler(amocrm, batch_size=2, flush_interval=10) as scheduler:
+            futures = [scheduler.update_lead(lead_id=lead_id, status_id=1) for lead_id in (1, 2, 3)]
+
+        assert [future.result() for future in futures] == [dict(id=1), dict(id=2), dict(id=3)]
+        assert sorted(len(call.kwargs["payload"]) for call in amocrm._request_patch_v4.await_args_list) == [1, 2]
+        amocrm.update_lead_v2.assert_not_awaited()
+
+    async def test_update_leads_v2(self):
+        amocrm = _amocrm(is_lead_v4_enabled=False)
+
+        async with AmoCRMWriteScheduler(amocrm, batch_size=2, flush_interval=10) as scheduler:
+            futures = [scheduler.update_lead(lead_id=lead_id, status_id=1) for lead_id in (1, 2)]
+
+        assert [future.result() for future in futures] == [[dict(id=1)], [dict(id=2)]]
+        amocrm.update_lead_v2.assert_any_await(lead_id=1, status_id=1)
+        amocrm._request_patch_v4.assert_not_awaited()
+
+    async def test_failed_batch(self):
+        amocrm = _amocrm(is_lead_v4_enabled=True)
+        amocrm._request_patch_v4.side_effect = None
+        amocrm._request_patch_v4.return_value = SimpleNamespace(status=400, ok=False, raw=None, data={})
+
+        async with AmoCRMWriteScheduler(amocrm, batch_size=2, flush_interval=10) as scheduler:
+            futures = [scheduler.update_lead(lead_id=lead_id, status_id=1) for lead_id in (1, 2)]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+        assert all(isinstance(result, Exception) for result in results)
@@ -0,0 +1,101 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from common.amocrm import AmoCRM
+from common.profitbase import ProfitBase
+from common.requests import GraphQLRequest
+from src.booking.repos import BookingRepo
+from src.booking.services import DeactivateExpiredBookingsService
+from src.properties.repos import PropertyRepo
+
+
+pytestmark = pytest.mark.asyncio
+
+FAILURES_KEY = "test_expired_failures"
+
+
+@pytest.fixture(scope="function")
+def redis_mock() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def deactivate_service(redis_mock) -> DeactivateExpiredBookingsService:
+    service = DeactivateExpiredBookingsService(
+        backend_config=dict(internal_login="login", internal_password="password", url="http://backend", graphql="/"),
+        booking_repo=BookingRepo,
+        amocrm_class=AmoCRM,
+        request_class=GraphQLRequest,
+        profitbase_class=ProfitBase,
+        property_repo=PropertyRepo,
+        booking_config=dict(
+            expired_page_size=10,
+            expired_concurrency=2,
+            expired_failures_key=FAILURES_KEY,
+            expired_max_attempts=3,
+        ),
+        broker=redis_mock,
+    )
+    service._profitbase_unbooking = AsyncMock(side_effect=ValueError("ProfitBase unbook_property failed"))
+    service._amocrm_unbooking = AsyncMock()
+    service._backend_unbooking = AsyncMock()
+    return service
+
+
+def _job(**kwargs) -> dict:
+    return dict(booking_id=1, amocrm_id=2, city_slug="tmn", property_global_id="UHJvcGVydHk6MQ==", **kwargs)
+
+
+class TestDeactivateExpiredBookingsService:
+
+    async def test_profitbase_failure_keeps_remaining_steps(self, deactivate_service, redis_mock):
+        await deactivate_service._run_job(_job(steps=["profitbase", "amocrm", "backend"]))
+
+        deactivate_service._amocrm_unbooking.assert_not_awaited()
+        deactivate_service._backend_unbooking.assert_not_awaited()
+        command, key, booking_id, payload = redis_mock.execute.await_args.args
+        assert (command, key, booking_id) == ("HSET", FAILURES_KEY, 1)
+        failure = json.loads(payload)
+        assert failure["steps"] == ["profitbase", "amocrm", "backend"]
+        assert failure["attempts"] == 1
+
+    async def test_other_steps_run_after_failure(self, deactivate_service, redis_mock):
+        deactivate_service._amocrm_unbooking.side_effect = ValueError("AmoCRM failed")
+
+        await deactivate_service._run_job(_job(steps=["amocrm", "backend"], attempts=1))
+
+        deactivate_service._backend_unbooking.assert_awaited_once()
+        failure = json.loads(redis_mock.execute.await_args.args[3])
+        assert failure["steps"] == ["amocrm"]
+        assert failure["attempts"] == 2
+
+    async def test_attempts_exhausted(self, deactivate_service, redis_mock):
+        await deactivate_service._run_job(_job(steps=["profitbase", "amocrm"], attempts=2))
+
+        redis_mock.execute.assert_awaited_once_with("HDEL", FAILURES_KEY, 1)
+
+    async def test_success_clears_failure(self, deactivate_service, redis_mock):
+        deactivate_service._profitbase_unbooking.side_effect = None
+
+        await deactivate_service._run_job(_job(steps=["profitbase", "amocrm", "backend"], attempts=1))
+
+        deactivate_service._backend_unbooking.assert_awaited_once()
+        redis_mock.execute.assert_awaited_once_with("HDEL", FAILURES_KEY, 1)
+
+    async def test_page_goes_through_booking_repo_update(self, deactivate_service, booking, booking_repo):
+        await booking_repo.update(booking, data=dict(active=True, should_be_deactivated_by_timer=True))
+        data = dict(active=False, property_id=None, should_be_deactivated_by_timer=False)
+
+        with patch("src.booking.loggers.wrappers.booking_log_writer.write", new=AsyncMock()) as write:
+            async for _ in deactivate_service._deactivate_pages(filters=dict(id=booking.id, active=True), data=data):
+                pass
+
+        updated = await booking_repo.retrieve(filters=dict(id=booking.id))
+        assert not updated.active
+        assert not updated.should_be_deactivated_by_timer
+        assert updated.property_id == booking.property_id
+        log = write.await_args.args[0]
+        assert log["booking_id"] == booking.id
+        assert log["content"] == deactivate_service.log_content
@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from pytest import mark
+
+from common.paginations.cursor import CountModes, CursorPagination, decode_cursor, encode_cursor
+
+
+class TestCursor:
+
+    @mark.parametrize(
+        "value",
+        [
+            None,
+            42,
+            "name",
+            Decimal("1234.50"),
+            date(2024, 2, 29),
+            datetime(2024, 2, 29, 12, 30, tzinfo=timezone(timedelta(hours=3))),
+        ],
+    )
+    def test_roundtrip(self, value):
+        cursor = encode_cursor("-created_at", value, 7)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == ("-created_at", value, 7)
+
+    def test_enum_value(self):
+        assert decode_cursor(encode_cursor("status", CountModes.CACHED, 1)) == ("status", "cached", 1)
+
+    @mark.parametrize("cursor", ["", "not a cursor", encode_cursor("id", 1, 1)[:-3]])
+    def test_invalid(self, cursor):
+        assert decode_cursor(cursor) is None
+
+    def test_after_is_bound_to_ordering(self):
+        cursor = encode_cursor("order", 3, 10)
+
+        pagination = CursorPagination(path="/tips", page_size=2, cursor=cursor, query={})
+
+        assert pagination.after("order") == (3, 10)
+        assert pagination.after("-order") is None
+
+
+@mark.asyncio
+class TestKeysetList:
+
+    orders = [3, None, 1, 3, None, 2, 1]
+
+    async def _walk(self, tips_repo, title, ordering, page_size=2):
+        pages, after = [], None
+        while True:
+            page = await tips_repo.keyset_list(
+                limit=page_size + 1, after=after, ordering=ordering, filters=dict(title=title)
+            )
+            pagination = CursorPagination(path="/tips", page_size=page_size, cursor=None, query={})
+            pages.extend(pagination.paginate(page, ordering))
+            if not pagination.next_cursor:
+                return pages
+            after = CursorPagination(
+                path="/tips", page_size=page_size, cursor=pagination.next_cursor, query={}
+            ).after(ordering)
+
+    @mark.parametrize("ordering", ["order", "-order", "id", "-id"])
+    async def test_pages_match_full_ordering(self, tips_repo, ordering):
+        title = str(uuid4())
+        for order in self.orders:
+            await tips_repo.create(data=dict(title=title, order=order))
+
+        # В postgres NULL больше любого значения: последние по возрастанию, первые по убыванию
+        order = [ordering] if ordering.lstrip("-") == "id" else [ordering, "-id" if ordering.startswith("-") else "id"]
+        expected = await tips_repo.list(filters=dict(title=title)).order_by(*order)
+        pages = await self._walk(tips_repo, title, ordering)
+
+        assert [tip.id for tip in pages] == [tip.id for tip in expected]
+        assert len(pages) == len(self.orders)
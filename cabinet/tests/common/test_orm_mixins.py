@@ -0,0 +1,66 @@
+from pytest import mark, raises
+
+from common.orm.mixins import BulkUpdateMixin, UpdateMixin
+from src.tips.repos import Tip
+
+
+class TipUpdateRepo(UpdateMixin, BulkUpdateMixin):
+    """
+    Модель без переопределенного save() и сигналов: обновление сырым UPDATE ... RETURNING
+    """
+    model = Tip
+
+
+@mark.asyncio
+class TestPartialUpdate:
+
+    async def test_partial_update(self, tips_repo, fake_tip):
+        tip = await tips_repo.create(data=fake_tip)
+
+        updated = await TipUpdateRepo().partial_update(model=tip, data=dict(title="new title"))
+
+        assert updated is tip
+        assert tip.title == "new title"
+        assert tip.text == fake_tip["text"]
+        stored = await Tip.get(id=tip.id)
+        assert stored.title == "new title"
+        assert stored.order == int(fake_tip["order"])
+
+    async def test_bulk_partial_update(self, tips_repo, fake_tip):
+        first = await tips_repo.create(data=fake_tip)
+        second = await tips_repo.create(data=fake_tip)
+
+        updated = await TipUpdateRepo().bulk_partial_update(
+            {first.id: dict(title="first"), second.id: dict(text="second", order=42)}
+        )
+
+        assert {tip.id for tip in updated} == {first.id, second.id}
+        first, second = await Tip.get(id=first.id), await Tip.get(id=second.id)
+        assert (first.title, first.text) == ("first", fake_tip["text"])
+        assert (second.title, second.text, second.order) == (fake_tip["title"], "second", 42)
+
+    async def test_booking_save_override(self, booking_repo, booking):
+        until = booking.until
+
+        await booking_repo.partial_update(model=booking, data=dict(until=None, contract_accepted=False))
+
+        stored = await booking_repo.retrieve(filters=dict(id=booking.id))
+        assert stored.until == until
+        assert stored.contract_accepted is True
+
+    async def test_bulk_booking_save_override(self, booking_repo, booking):
+        until = booking.until
+
+        updated = await booking_repo.bulk_partial_update({booking.id: dict(until=None, personal_filled=True)})
+
+        assert [model.id for model in updated] == [booking.id]
+        stored = await booking_repo.retrieve(filters=dict(id=booking.id))
+        assert stored.until == until
+        assert stored.personal_filled is True
+
+    async def test_agent_without_email(self, user_repo, agent):
+        with raises(ValueError, match="Agent without email"):
+            await user_repo.partial_update(model=agent, data=dict(email=None))
+
+        stored = await user_repo.retrieve(filters=dict(id=agent.id))
+        assert stored.email == "test_agent@email.com"
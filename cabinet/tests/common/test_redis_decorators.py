@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock
+
+from pytest import mark, raises
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from common.redis.decorators import avoid_disconnect
+
+
+class FlakyRedis:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+        self.connect = AsyncMock()
+        self.disconnect = AsyncMock()
+
+    @avoid_disconnect
+    async def get(self, key: str) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RedisConnectionError("Connection reset by peer")
+        return key
+
+
+@mark.asyncio
+class TestAvoidDisconnect:
+
+    async def test_retry_keeps_pool(self):
+        redis = FlakyRedis(failures=1)
+
+        assert await redis.get("key") == "key"
+        assert redis.calls == 2
+        redis.disconnect.assert_not_awaited()
+        redis.connect.assert_not_awaited()
+
+    async def test_retry_once(self):
+        redis = FlakyRedis(failures=2)
+
+        with raises(RedisConnectionError):
+            await redis.get("key")
+        assert redis.calls == 2
+        redis.disconnect.assert_not_awaited()
@@ -0,0 +1,83 @@
+from typing import Any
+
+from pytest import mark
+
+from common.session import SessionStorage
+
+
+class DictRedis:
+    """
+    Redis broker over a dict, merge() applies changes to the currently stored value
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = dict()
+
+    async def get(self, key: str) -> Any:
+        value: Any = self.values.get(key)
+        return dict(value) if isinstance(value, dict) else value
+
+    async def set(self, key: str, value: Any, expire: int = None) -> bool:
+        self.values[key] = dict(value)
+        return True
+
+    async def merge(self, key: str, changes: dict[str, Any], deleted=(), expire: int = None) -> dict[str, Any]:
+        data: dict[str, Any] = dict(self.values.get(key) or dict())
+        data.update(changes)
+        for field in deleted:
+            data.pop(field, None)
+        if data:
+            self.values[key] = data
+        else:
+            self.values.pop(key, None)
+        return dict(data)
+
+    async def delete(self, *keys: str) -> bool:
+        for key in keys:
+            self.values.pop(key, None)
+        return True
+
+
+@mark.asyncio
+class TestSessionStorage:
+
+    async def test_interleaved_sessions_keep_each_others_keys(self):
+        redis = DictRedis()
+        redis.values["session"] = dict(auth="token", document="old", reset=1)
+        first = await SessionStorage(session_id="session", broker=redis)
+        second = await SessionStorage(session_id="session", broker=redis)
+
+        await first.load()
+        await second.load()
+        first["document"] = "new"
+        await second.set("last_activity", 100)
+        await second.pop("reset")
+        await first.save()
+        await second.save()
+
+        assert redis.values["session"] == dict(auth="token", document="new", last_activity=100)
+        assert second.data == redis.values["session"]
+
+    async def test_keys_changed_after_load_are_saved(self):
+        redis = DictRedis()
+        redis.values["session"] = dict(auth="token")
+        session = await SessionStorage(session_id="session", broker=redis)
+
+        assert await session.get("auth") == "token"
+        session["document"] = "new"
+        assert session.dirty
+        await session.save()
+
+        assert redis.values["session"] == dict(auth="token", document="new")
+        assert not session.dirty
+
+    async def test_prune_overwrites_session(self):
+        redis = DictRedis()
+        redis.values["session"] = dict(auth="token", document="old")
+        session = await SessionStorage(session_id="session", broker=redis)
+
+        await session.prune()
+        session["auth"] = "other"
+        await session.save()
+
+        assert redis.values["session"] == dict(auth="other")
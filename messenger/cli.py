@@ -8,11 +8,13 @@ from src.core.settings import BASE_SETTINGS, LoggingSettings
 from src.entrypoints.chatclient import chatclient_cli
 from src.entrypoints.migrator import migrator_cli
 from src.entrypoints.services import services_cli
+from src.entrypoints.statistics import statistics_cli
 
 cli = typer.Typer(no_args_is_help=True)
 cli.add_typer(services_cli, name="service", short_help="Run service")
 cli.add_typer(chatclient_cli, name="client", short_help="Interactive client")
 cli.add_typer(migrator_cli, name="migrator", short_help="Database migrator")
+cli.add_typer(statistics_cli, name="stats", short_help="Ticket statistics rollups")
 
 
 @cli.callback()
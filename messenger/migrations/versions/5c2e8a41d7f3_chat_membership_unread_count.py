@@ -0,0 +1,37 @@
+"""Materialized unread counter in chat_membership
+
+Revision ID: 5c2e8a41d7f3
+Revises: 884b890fa127
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "5c2e8a41d7f3"
+down_revision: str | None = "884b890fa127"
+branch_labels: tuple[str, ...] | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_membership", sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False))
+    op.execute(
+        sa.text(
+            """
+            update chat_membership cm
+            set unread_count = (
+                select count(m.id)
+                from messages m
+                where m.chat_id = cm.chat_id
+                  and m.id > cm.last_read_message_id
+                  and (m.sender_id != cm.user_id or m.sender_id is null)
+            );
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("chat_membership", "unread_count")
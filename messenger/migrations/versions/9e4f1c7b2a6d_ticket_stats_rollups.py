@@ -0,0 +1,47 @@
+"""Ticket statistics rollups
+
+Revision ID: 9e4f1c7b2a6d
+Revises: 5c2e8a41d7f3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "9e4f1c7b2a6d"
+down_revision: str | None = "5c2e8a41d7f3"
+branch_labels: tuple[str, ...] | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_stats_daily",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("returned_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("first_response_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("first_response_time_sum", sa.BigInteger(), server_default="0", nullable=False, comment="in seconds"),
+        sa.Column("solve_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("solve_time_sum", sa.BigInteger(), server_default="0", nullable=False, comment="in seconds"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.create_table(
+        "ticket_stats_solved",
+        sa.Column("ticket_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ticket_id"],
+            ["tickets.id"],
+        ),
+        sa.PrimaryKeyConstraint("ticket_id", "day"),
+    )
+    op.create_index("ix_ticket_stats_solved_user_id_day", "ticket_stats_solved", ["user_id", "day"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ticket_stats_solved_user_id_day", table_name="ticket_stats_solved")
+    op.drop_table("ticket_stats_solved")
+    op.drop_table("ticket_stats_daily")
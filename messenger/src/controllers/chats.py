@@ -156,7 +156,9 @@ class ChatsController:
             chat_ids=[chat.chat_id for chat in chats],
         )
 
-        online_users_ids = {user.user_id for user in await self._presence.get_active_users()}
+        online_users_ids = await self._presence.get_online_user_ids(
+            user_ids=[member.user_id for chat in chats for member in chat.members or []],
+        )
 
         for chat in chats:
             for member in chat.members or []:
@@ -182,7 +184,9 @@ class ChatsController:
                 detail="Chat not found",
             )
 
-        online_users_ids = {user.user_id for user in await self._presence.get_active_users()}
+        online_users_ids = await self._presence.get_online_user_ids(
+            user_ids=[member.user_id for member in chat.members or []],
+        )
 
         if chat.members:
             for member in chat.members:
@@ -7,7 +7,6 @@ from src.entities.users import Ability, AuthPayload
 from src.exceptions import NotPermittedError
 from src.modules.storage.dependencies import inject_storage
 from src.modules.storage.interface import StorageProtocol
-from src.providers.time import end_of_day, start_of_day
 
 
 class StatisticsController:
@@ -37,8 +36,8 @@ class StatisticsController:
 
         result = await self._storage.statistics.get_ticket_stats(
             for_user=for_user,
-            date_from=start_of_day(date_from),
-            date_to=end_of_day(date_to),
+            date_from=date_from,
+            date_to=date_to,
         )
 
         returned_tickets_percent = 0.0
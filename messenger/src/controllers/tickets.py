@@ -66,7 +66,9 @@ class TicketsController:
             chat_ids=[ticket.chat_info.chat_id for ticket in result],
         )
 
-        online_users = {user.user_id for user in await self._presence.get_active_users()}
+        online_users = await self._presence.get_online_user_ids(
+            user_ids=[member.user_id for ticket in result for member in ticket.chat_info.members or []],
+        )
 
         for ticket in result:
             ticket.chat_info.unread_count = unread_counters[ticket.chat_info.chat_id]
@@ -85,7 +87,9 @@ class TicketsController:
         if not details:
             return None
 
-        online_users = {user.user_id for user in await self._presence.get_active_users()}
+        online_users = await self._presence.get_online_user_ids(
+            user_ids=[member.user_id for member in details.chat_info.members or []],
+        )
 
         details.chat_info.unread_count = await self._unread_counters.get_unread_count_by_chat_id(
             user_id=user.id,
@@ -7,7 +7,7 @@ from src.core.common.redis.cacher import RedisCacher
 from src.core.common.redis.lib import IntegerSerializer
 from src.core.di import Injected
 from src.core.types import UserId
-from src.entities.matches import ChatType
+from src.entities.chats import UnreadCountersDTO
 from src.entities.redis import UnreadCountCacheKey
 from src.entities.tickets import TicketStatus
 from src.entities.users import AuthPayload
@@ -85,7 +85,26 @@ class UnreadCountersController:
 
     @cached_method(key_tpl=UnreadCountCacheKey.TOTAL)
     async def get_total_unread_count(self, *, user_id: UserId) -> int:
-        return await self._storage.unread_counters.get_unread_count(user_id=user_id, chat_type=None)
+        counters = await self.hydrate_unread_counters(user_id=user_id)
+        return counters.total
+
+    async def hydrate_unread_counters(self, *, user_id: UserId) -> UnreadCountersDTO:
+        """Loads all counters of the user with a single query and stores them in the cache in bulk"""
+        counters = await self._storage.unread_counters.get_unread_counters(user_id)
+
+        pairs = [
+            *(
+                (UnreadCountCacheKey.BY_CHAT.format(user_id=user_id, chat_id=chat_id), count)
+                for chat_id, count in counters.by_chat.items()
+            ),
+            *(
+                (UnreadCountCacheKey.BY_MATCH.format(user_id=user_id, match_id=match_id), count)
+                for match_id, count in counters.by_match.items()
+            ),
+            (UnreadCountCacheKey.TOTAL.format(user_id=user_id), counters.total),
+        ]
+        await self.cacher.cache.multi_set(pairs, ttl=self._settings.counters_ttl)
+        return counters
 
     async def update_total_unread_count(self, *, user_id: UserId, update_by: int) -> None:
         await self.cacher.cache.increment(
@@ -104,12 +123,10 @@ class CountersController:
         self._storage = storage
 
     async def get_unread_counters(self, user: AuthPayload) -> ChatUnreadCountersResponse:
+        counters = await self._caching_controller.hydrate_unread_counters(user_id=user.id)
         return ChatUnreadCountersResponse(
-            total=await self._caching_controller.get_total_unread_count(user_id=user.id),
-            by_chat_type={
-                chat_type: await self._storage.unread_counters.get_unread_count(user.id, chat_type)
-                for chat_type in ChatType
-            },
+            total=counters.total,
+            by_chat_type=counters.by_chat_type,
         )
 
     async def get_ticket_counters(self, user: AuthPayload) -> TicketUnreadCountersResponse:
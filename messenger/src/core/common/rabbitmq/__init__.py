@@ -2,7 +2,7 @@ from boilerplates.rabbitmq import AMQPConnectionSettings, ConnectionHolder
 
 from .exceptions import DropMessageError
 from .helpers import parse_amqp_message, publish_amqp_message
-from .listener import ListenerAMQPArgs, QueueListener
+from .listener import BatchQueueListener, ListenerAMQPArgs, QueueListener
 from .publisher import (
     RabbitMQPublisherFactory,
     RabbitMQPublisherFactoryProto,
@@ -13,6 +13,7 @@ from .publisher import (
 __all__ = (
     "ConnectionHolder",
     "QueueListener",
+    "BatchQueueListener",
     "parse_amqp_message",
     "publish_amqp_message",
     "AMQPConnectionSettings",
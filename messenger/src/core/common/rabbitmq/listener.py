@@ -1,7 +1,7 @@
 import asyncio
 from dataclasses import dataclass, field
 from functools import partial
-from typing import Any, Awaitable, Callable, Generic, Type
+from typing import Any, Awaitable, Callable, Collection, Generic, Type
 
 from aio_pika.abc import (
     AbstractChannel,
@@ -72,6 +72,20 @@ class QueueListener(Generic[T]):
         callback: Callable[[T], Awaitable[Any]],
         prefetch_count: int = 1,
     ) -> "QueueListener[T]":
+        queue = await cls._declare_queue(channel=channel, amqp_args=amqp_args, prefetch_count=prefetch_count)
+        consumer_tag = await queue.consume(
+            callback=partial(cls._callback, expected_type=incoming_message_type, callback=callback, logger=logger),
+        )
+        instance = cls(channel=channel, consumer_tag=consumer_tag, queue=queue, logger=logger)
+        instance._set_is_running()
+        return instance
+
+    @staticmethod
+    async def _declare_queue(
+        channel: AbstractChannel,
+        amqp_args: ListenerAMQPArgs,
+        prefetch_count: int,
+    ) -> AbstractQueue:
         if amqp_args.exchange_type and amqp_args.exchange_durable:
             exchange = await channel.declare_exchange(
                 amqp_args.exchange_name,
@@ -84,12 +98,7 @@ class QueueListener(Generic[T]):
         await channel.set_qos(prefetch_count=prefetch_count)
         queue = await channel.declare_queue(name=amqp_args.queue_name, durable=amqp_args.queue_durable)
         await queue.bind(exchange)
-        consumer_tag = await queue.consume(
-            callback=partial(cls._callback, expected_type=incoming_message_type, callback=callback, logger=logger),
-        )
-        instance = cls(channel=channel, consumer_tag=consumer_tag, queue=queue, logger=logger)
-        instance._set_is_running()
-        return instance
+        return queue
 
     def __init__(
         self,
@@ -115,3 +124,110 @@ class QueueListener(Generic[T]):
         await self._queue.cancel(self._consumer_tag)
         self._is_running = False
         return self._channel
+
+
+class BatchQueueListener(QueueListener[T]):
+    """
+    Queue listener that hands incoming messages to the callback in batches.
+
+    Prefetch is set to the batch size. A batch is handled when it is full or `batch_window` seconds
+    after its first message arrived, whichever comes first. The callback returns indexes of the messages
+    it failed to handle, only those are rejected and the rest of the batch is acked. An exception raised
+    from the callback rejects the whole batch.
+    """
+
+    @classmethod
+    async def create(  # type: ignore[override]
+        cls,
+        logger: LoggerType,
+        channel: AbstractChannel,
+        amqp_args: ListenerAMQPArgs,
+        incoming_message_type: Type[T],
+        callback: Callable[[list[T]], Awaitable[Collection[int] | None]],
+        batch_size: int = 100,
+        batch_window: float = 0.05,
+    ) -> "BatchQueueListener[T]":
+        queue = await cls._declare_queue(channel=channel, amqp_args=amqp_args, prefetch_count=batch_size)
+        instance = cls(channel=channel, consumer_tag=ConsumerTag(""), queue=queue, logger=logger)
+        instance._expected_type = incoming_message_type
+        instance._batch_callback = callback
+        instance._batch_size = batch_size
+        instance._batch_window = batch_window
+        instance._consumer_tag = await queue.consume(callback=instance._on_message)
+        instance._set_is_running()
+        return instance
+
+    def __init__(
+        self,
+        logger: LoggerType,
+        channel: AbstractChannel,
+        queue: AbstractQueue,
+        consumer_tag: ConsumerTag,
+    ) -> None:
+        super().__init__(logger=logger, channel=channel, queue=queue, consumer_tag=consumer_tag)
+        self._expected_type: Type[T]
+        self._batch_callback: Callable[[list[T]], Awaitable[Collection[int] | None]]
+        self._batch_size = 1
+        self._batch_window = 0.0
+        self._pending: list[tuple[AbstractIncomingMessage, T]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def stop(self) -> AbstractChannel:
+        channel = await super().stop()
+        await self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        return channel
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        decoded = parse_amqp_message(message, expected_type=self._expected_type)
+        if not decoded:
+            self.logger.error(f"Incorrect message type: {message.body!r}")
+            await message.reject(requeue=False)
+            return
+
+        self._pending.append((message, decoded))
+        if len(self._pending) >= self._batch_size:
+            await self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._batch_window, self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        self._timer = None
+        task = asyncio.create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        messages = [message for message, _ in batch]
+        with time_it(self.logger, "Batch handle time"):
+            try:
+                failed = await self._batch_callback([decoded for _, decoded in batch]) or ()
+
+            except asyncio.CancelledError:
+                # Batch processing has been cancelled, return messages to the queue
+                await asyncio.gather(*(message.reject(requeue=True) for message in messages))
+
+            except DropMessageError:
+                await asyncio.gather(*(message.reject(requeue=False) for message in messages))
+
+            except Exception as exc:  # pylint: disable=broad-except
+                self.logger.error(f"Error when processing an incoming batch: {type(exc).__name__}]", exc_info=True)
+                await asyncio.gather(*(message.reject(requeue=False) for message in messages))
+
+            else:
+                await asyncio.gather(
+                    *(
+                        message.reject(requeue=False) if index in failed else message.ack()
+                        for index, message in enumerate(messages)
+                    )
+                )
@@ -1,8 +1,8 @@
 from .cacher import RedisCacher
 from .helpers import create_redis_conn_pool, is_redis_conn_healthy
 from .lib import IntegerSerializer
-from .pubsub import RedisListener, RedisPublisher
-from .scripting import DecrementManyIfExists, IncrementManyIfExists
+from .pubsub import RedisListener, RedisMultiplexedListener, RedisPublisher
+from .scripting import DecrementManyIfExists, IncrementManyIfExists, SetManyIfGreater
 from .settings import RedisSettings
 from .throttling import Throttler
 
@@ -13,8 +13,10 @@ __all__ = (
     "is_redis_conn_healthy",
     "RedisPublisher",
     "RedisListener",
+    "RedisMultiplexedListener",
     "Throttler",
     "IntegerSerializer",
     "IncrementManyIfExists",
     "DecrementManyIfExists",
+    "SetManyIfGreater",
 )
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 from inspect import iscoroutinefunction
 from typing import Any, Callable, Self
 
@@ -157,3 +158,97 @@ class RedisListener:
 
         finally:
             self.logger.debug("Reader task exited")
+
+
+class RedisMultiplexedListener:
+    """
+    Single pub/sub connection per process shared by many subscribers.
+
+    Every channel is subscribed on the same `PubSub` connection and incoming frames
+    are routed to the registered handler by channel name. Handlers are called from
+    the reader task and must not block: heavy work should be queued by the handler.
+    """
+
+    def __init__(
+        self,
+        conn: RedisConn,
+        polling_interval: float = 1.0,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.logger = get_logger(LoggerName.PUBSUB)
+
+        self._redis_conn = conn
+        self._pubsub: PubSub = self._redis_conn.pubsub(ignore_subscribe_messages=True)
+        self._reader: asyncio.Task[Any] | None = None
+        self._handlers: dict[str, Callable[[bytes], Any]] = {}
+        self._polling_interval = polling_interval
+        self._reconnect_delay = reconnect_delay
+
+    @property
+    def is_running(self) -> bool:
+        return self._reader is not None
+
+    @property
+    def channels_count(self) -> int:
+        return len(self._handlers)
+
+    async def health_check(self) -> bool:
+        return self.is_running and await is_redis_conn_healthy(self._redis_conn)
+
+    async def start(self) -> None:
+        await self._pubsub.connect()  # type: ignore
+        self._reader = asyncio.create_task(self._reader_task())
+
+    async def stop(self) -> None:
+        if self._reader:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+
+        await self._pubsub.reset()
+        self._handlers.clear()
+        self.logger.debug("Multiplexed listening stopped")
+
+    async def subscribe(self, channel_name: str, handler: Callable[[bytes], Any]) -> None:
+        if channel_name in self._handlers:
+            self.logger.warning(f"Already subscribed to channel: {channel_name}")
+
+        self._handlers[channel_name] = handler
+        await self._pubsub.subscribe(channel_name)
+
+    async def unsubscribe(self, channel_name: str) -> None:
+        if self._handlers.pop(channel_name, None) is None:
+            return
+
+        await self._pubsub.unsubscribe(channel_name)
+
+    async def _reader_task(self) -> None:
+        while True:
+            try:
+                msg = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self._polling_interval,
+                )
+
+            except asyncio.CancelledError:
+                self.logger.info("Multiplexed reader task was cancelled")
+                raise
+
+            except (RedisConnectionError, RuntimeError):
+                # PubSub resubscribes to all channels on reconnect
+                self.logger.warning("Pub/sub connection lost, reconnecting", exc_info=True)
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+
+            if not msg or msg.get("type") != "message":
+                continue
+
+            channel = msg["channel"].decode() if isinstance(msg["channel"], bytes) else msg["channel"]
+            if not (handler := self._handlers.get(channel)):
+                continue
+
+            try:
+                handler(msg["data"])
+            except Exception:  # pylint: disable=broad-except
+                self.logger.error("Error when routing message", channel=channel, exc_info=True)
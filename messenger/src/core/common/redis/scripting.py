@@ -30,6 +30,20 @@ class IncrementManyIfExists(RedisScript):
         return {item[0].decode(): item[1] for item in script_output}
 
 
+class SetManyIfGreater(RedisScript):
+    """
+    Sets integer values of the keys unless the stored values are already greater or equal
+    """
+
+    source_name = "set_many_if_greater"
+
+    async def __call__(self, values: dict[str, int], ex: int) -> None:
+        if not values:
+            return
+
+        await self._script(args=[ex, *(item for pair in values.items() for item in pair)])
+
+
 class DecrementManyIfExists(RedisScript):
     source_name = "decrement_many_if_exists"
 
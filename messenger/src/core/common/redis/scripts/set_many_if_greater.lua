@@ -0,0 +1,14 @@
+local ttl = tonumber(ARGV[1])
+
+for i = 2, #ARGV, 2 do
+    local key = ARGV[i]
+    local value = tonumber(ARGV[i + 1])
+    local current = tonumber(redis.call("GET", key))
+
+    -- Only ever raise the stored value, a lower one is stale
+    if current == nil or current < value then
+        redis.call("SET", key, value, "EX", ttl)
+    end
+end
+
+return 1
@@ -30,7 +30,10 @@ class LoggerName(StringEnum):
     SL_SYNC = auto()
     PERIODIC_TASKS = auto()
     USERS_CACHE = auto()
+    CHAT_MEMBERS_CACHE = auto()
     JOB_AUTOCLOSE_PRIVATE_CHATS = auto()
+    JOB_UNREAD_COUNTERS_RECONCILE = auto()
+    TICKET_STATS = auto()
     MATCH_STATE_UPDATES_LISTENER = auto()
     MATCH_SCOUT_CHANGES_LISTENER = auto()
     COUNTERS_STREAMER = auto()
@@ -37,6 +37,24 @@ class ChatMembershipDetailsDTO:
     first_available_message_id: int | None
 
 
+@dataclass
+class UnreadCountersDTO:
+    by_chat: dict[int, int]
+    by_match: dict[int, int]
+    by_chat_type: dict[ChatType, int]
+    total: int
+
+
+@dataclass(repr=True, frozen=True)
+class UnreadCounterDriftDTO:
+    membership_id: int
+    user_id: UserId
+    chat_id: int
+    match_id: int | None
+    stored_count: int
+    actual_count: int
+
+
 class ChatMeta(BaseModel):
     related_ticket_id: int | None = Field(
         default=None,
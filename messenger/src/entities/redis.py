@@ -10,5 +10,5 @@ class UnreadCountCacheKey(PatternStrEnum):
 
 class RedisPubSubChannelName(PatternStrEnum):
     CONNECTION_UPDATES = "[user_updates]:[{connection_id}]"
-    UNREAD_COUNTERS_UPDATES = "[unread_counters_updates]:[{user_id}]"
+    UNREAD_COUNTERS_SHARD_UPDATES = "[unread_counters_updates]:[shard-{shard}]"
     USER_DATA_CACHE_INVALIDATION = "[user_cache_invalidation]"
@@ -8,6 +8,8 @@ from src.entrypoints.services.http_server.settings import HTTPServiceSettings
 from src.entrypoints.services.http_server.state import HTTPServiceState
 from src.modules.auth import AuthServiceProto
 from src.modules.auth.service import AuthService
+from src.modules.chat_members import ChatMembersCacheProto
+from src.modules.chat_members.service import ChatMembersCacheService
 from src.modules.presence import PresenceServiceProto
 from src.modules.presence.service import PresenceService
 from src.modules.sportlevel import SportlevelServiceProto
@@ -35,6 +37,7 @@ class HTTPServiceFactory(AppFactory[HTTPServiceState, HTTPServiceSettings]):
             HealthCheckable("storage", context.storage.health_check()),
             HealthCheckable("sportlevel", context.sportlevel.health_check()),
             HealthCheckable("presence", context.presence.health_check()),
+            HealthCheckable("chat_members", context.chat_members.health_check()),
         ]
 
     def _setup_state(self, app: HTTPServiceApp, settings: HTTPServiceSettings) -> HTTPServiceApp:
@@ -50,6 +53,8 @@ class HTTPServiceFactory(AppFactory[HTTPServiceState, HTTPServiceSettings]):
 
         users_cache = UsersCacheService(settings.users_cache)
 
+        chat_members = ChatMembersCacheService(settings=settings.chat_members_cache, storage=storage)
+
         app.state = HTTPServiceState(
             state={
                 "auth": auth,
@@ -58,6 +63,7 @@ class HTTPServiceFactory(AppFactory[HTTPServiceState, HTTPServiceSettings]):
                 "rabbitmq_publisher": rabbitmq_publisher,
                 "sportlevel": sportlevel,
                 "users_cache": users_cache,
+                "chat_members": chat_members,
             },
         )
 
@@ -70,6 +76,7 @@ class HTTPServiceFactory(AppFactory[HTTPServiceState, HTTPServiceSettings]):
                 StorageServiceProto: storage,
                 SportlevelServiceProto: sportlevel,
                 UsersCacheProtocol: users_cache,
+                ChatMembersCacheProto: chat_members,
                 RabbitMQPublisherFactoryProto: rabbitmq_publisher,
             },
         )
@@ -82,12 +89,14 @@ class HTTPServiceFactory(AppFactory[HTTPServiceState, HTTPServiceSettings]):
         await app.state.sportlevel.start()
         await app.state.storage.start()
         await app.state.users_cache.start()
+        await app.state.chat_members.start()
         await app.state.rabbitmq_publisher.start()
         self.logger.debug("App started")
 
     async def on_shutdown(self, app: HTTPServiceApp) -> None:
         await super().on_shutdown(app)
         await app.state.rabbitmq_publisher.stop()
+        await app.state.chat_members.stop()
         await app.state.users_cache.stop()
         await app.state.storage.stop()
         await app.state.sportlevel.stop()
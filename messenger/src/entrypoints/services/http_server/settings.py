@@ -1,6 +1,7 @@
 from src.core.common.rabbitmq import RabbitMQPublisherSettings
 from src.core.settings import BaseServiceSettings
 from src.modules.auth import AuthSettings
+from src.modules.chat_members import ChatMembersCacheSettings
 from src.modules.file_uploads import FileUploadsSettings
 from src.modules.presence import PresenceSettings
 from src.modules.push_notifications import PushNotificationsVapidSettings
@@ -17,6 +18,7 @@ class HTTPServiceSettings(BaseServiceSettings):
     auth: AuthSettings
     sportlevel: SportlevelSettings
     users_cache: UsersCacheSettings
+    chat_members_cache: ChatMembersCacheSettings
     file_uploads: FileUploadsSettings
     unread_counters: UnreadCountersSettings
     vapid: PushNotificationsVapidSettings
@@ -2,6 +2,7 @@ from starlette.datastructures import State
 
 from src.core.common.rabbitmq import RabbitMQPublisherFactoryProto
 from src.modules.auth import AuthServiceProto
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.presence import PresenceServiceProto
 from src.modules.sportlevel import SportlevelServiceProto
 from src.modules.storage import StorageServiceProto
@@ -15,3 +16,4 @@ class HTTPServiceState(State):
     storage: StorageServiceProto
     sportlevel: SportlevelServiceProto
     users_cache: UsersCacheProtocol
+    chat_members: ChatMembersCacheProto
@@ -11,6 +11,8 @@ from src.jobs.match_state_updates_listener.job import MatchStateUpdatesListener
 from src.jobs.presence_track.job import PresenceTrackManager
 from src.jobs.runner import BackgroundJobsRunner
 from src.jobs.sportlevel_users_sync.job import SportlevelUsersSyncManager
+from src.jobs.unread_counters_reconcile.job import UnreadCountersReconcileManager
+from src.modules.chat_members.service import ChatMembersCacheService
 from src.modules.sportlevel.service import SportlevelService
 from src.modules.storage.service import StorageService
 
@@ -26,12 +28,15 @@ class JobsServiceFactory(AppFactory[JobsServiceState, JobsServiceSettings]):
     def health_check(self, app: JobsServiceApp) -> list[HealthCheckable]:
         context = app.state
         return [
+            HealthCheckable("chat_members", context.chat_members.health_check()),
             HealthCheckable("rabbitmq_publisher", context.rabbitmq_publisher.health_check()),
             HealthCheckable("storage", context.storage.health_check()),
         ]
 
     def _setup_state(self, app: JobsServiceApp, settings: JobsServiceSettings) -> JobsServiceApp:
         storage = StorageService(settings=settings.storage.db)
+        # Registers invalidation of cached chat versions, the jobs close chats
+        chat_members = ChatMembersCacheService(settings=settings.chat_members_cache, storage=storage)
 
         rabbitmq_publisher = RabbitMQPublisherFactory(amqp_settings=settings.rabbitmq_publisher.amqp)
 
@@ -77,6 +82,10 @@ class JobsServiceFactory(AppFactory[JobsServiceState, JobsServiceSettings]):
                 storage=storage,
                 settings=settings.background_jobs.autoclose_private_chats,
             ),
+            unread_counters_reconcile_manager=UnreadCountersReconcileManager(
+                storage=storage,
+                settings=settings.background_jobs.unread_counters_reconcile,
+            ),
             sl_match_state_updates_listener=sl_updates_listener,
             sl_match_scout_changes_listener=sl_scout_changes_listener,
             settings=settings.background_jobs,
@@ -85,6 +94,7 @@ class JobsServiceFactory(AppFactory[JobsServiceState, JobsServiceSettings]):
         app.state = JobsServiceState(
             state={
                 "storage": storage,
+                "chat_members": chat_members,
                 "rabbitmq_publisher": rabbitmq_publisher,
                 "sportlevel": sportlevel,
                 "background_jobs": background_jobs,
@@ -96,6 +106,7 @@ class JobsServiceFactory(AppFactory[JobsServiceState, JobsServiceSettings]):
     async def on_startup(self, app: JobsServiceApp) -> None:
         await super().on_startup(app)
         await app.state.storage.start()
+        await app.state.chat_members.start()
         await app.state.rabbitmq_publisher.start()
         await app.state.sportlevel.start()
         await app.state.background_jobs.start()
@@ -106,6 +117,7 @@ class JobsServiceFactory(AppFactory[JobsServiceState, JobsServiceSettings]):
         await app.state.background_jobs.stop()
         await app.state.sportlevel.stop()
         await app.state.rabbitmq_publisher.stop()
+        await app.state.chat_members.stop()
         await app.state.storage.stop()
         self.logger.debug("App stopped")
 
@@ -1,12 +1,14 @@
 from src.core.common.rabbitmq import RabbitMQPublisherSettings
 from src.core.settings import BaseServiceSettings
 from src.jobs.settings import BackgroundJobsSettings
+from src.modules.chat_members import ChatMembersCacheSettings
 from src.modules.sportlevel import SportlevelSettings
 from src.modules.storage import StorageSettings
 
 
 class JobsServiceSettings(BaseServiceSettings):
     storage: StorageSettings
+    chat_members_cache: ChatMembersCacheSettings
     rabbitmq_publisher: RabbitMQPublisherSettings
     sportlevel: SportlevelSettings
     background_jobs: BackgroundJobsSettings
@@ -2,6 +2,7 @@ from starlette.datastructures import State
 
 from src.core.common.rabbitmq import RabbitMQPublisherFactoryProto
 from src.jobs.runner import BackgroundJobsRunner
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.sportlevel import SportlevelServiceProto
 from src.modules.storage import StorageServiceProto
 
@@ -9,5 +10,6 @@ from src.modules.storage import StorageServiceProto
 class JobsServiceState(State):
     rabbitmq_publisher: RabbitMQPublisherFactoryProto
     storage: StorageServiceProto
+    chat_members: ChatMembersCacheProto
     sportlevel: SportlevelServiceProto
     background_jobs: BackgroundJobsRunner
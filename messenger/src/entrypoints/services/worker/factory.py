@@ -8,6 +8,7 @@ from src.core.settings import load_settings
 from src.entrypoints.services.worker.settings import WorkerSettings
 from src.entrypoints.services.worker.state import WorkerState
 from src.modules.auth.service import AuthService
+from src.modules.chat_members.service import ChatMembersCacheService
 from src.modules.connections.service import ConnectionsService
 from src.modules.presence.service import PresenceService
 from src.modules.service_updates.listener import UpdatesListenerService
@@ -28,6 +29,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
     def health_check(self, app: WorkerApp) -> list[HealthCheckable]:
         context = app.state
         return [
+            HealthCheckable("chat_members", context.chat_members.health_check()),
             HealthCheckable("connections", context.connections.health_check()),
             HealthCheckable("presence", context.presence.health_check()),
             HealthCheckable("updates_listener", context.updates_listener.health_check()),
@@ -45,6 +47,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
             cache=LFUCache(maxsize=settings.updates_listener.cache.memory_cache_maxsize),
         )
         telegram_srvc = TelegramService(settings=settings.telegram)
+        chat_members = ChatMembersCacheService(settings=settings.chat_members_cache, storage=storage)
         updates_listener = UpdatesListenerService(
             settings=settings.updates_listener,
             conn_service=connections_srvc,
@@ -54,6 +57,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
             auth_service=auth_srvc,
             telegram_service=telegram_srvc,
             cacher=cacher,
+            chat_members=chat_members,
         )
         sportlevel = SportlevelService(settings=settings.sportlevel)
 
@@ -61,6 +65,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
             state={
                 "auth": auth_srvc,
                 "storage": storage,
+                "chat_members": chat_members,
                 "connections": connections_srvc,
                 "presence": presence_srvc,
                 "rabbitmq_publisher": rabbitmq_publisher,
@@ -77,6 +82,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
         await app.state.telegram.start()
         await app.state.auth.start()
         await app.state.storage.start()
+        await app.state.chat_members.start()
         await app.state.updates_listener.start()
         await app.state.rabbitmq_publisher.start()
         await app.state.sportlevel.start()
@@ -87,6 +93,7 @@ class WorkerFactory(AppFactory[WorkerState, WorkerSettings]):
         await app.state.sportlevel.stop()
         await app.state.rabbitmq_publisher.stop()
         await app.state.updates_listener.stop()
+        await app.state.chat_members.stop()
         await app.state.storage.stop()
         await app.state.auth.stop()
         await app.state.telegram.stop()
@@ -1,6 +1,7 @@
 from src.core.common.rabbitmq.publisher import RabbitMQPublisherSettings
 from src.core.settings import BaseServiceSettings
 from src.modules.auth import AuthSettings
+from src.modules.chat_members import ChatMembersCacheSettings
 from src.modules.connections import ConnectionsServiceSettings
 from src.modules.presence import PresenceSettings
 from src.modules.service_updates import UpdatesListenerSettings
@@ -16,6 +17,7 @@ class WorkerSettings(BaseServiceSettings):
     push_updates_publisher: RabbitMQPublisherSettings
     updates_listener: UpdatesListenerSettings
     connections: ConnectionsServiceSettings
+    chat_members_cache: ChatMembersCacheSettings
     sportlevel: SportlevelSettings
     auth: AuthSettings
     telegram: TelegramServiceSettings
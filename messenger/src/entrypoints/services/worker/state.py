@@ -2,6 +2,7 @@ from starlette.datastructures import State
 
 from src.core.common.rabbitmq import RabbitMQPublisherFactoryProto
 from src.modules.auth.interface import AuthServiceProto
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.connections import ConnectionsServiceProto
 from src.modules.presence import PresenceServiceProto
 from src.modules.push_notifications import PushNotificationsSenderProto
@@ -12,6 +13,7 @@ from src.modules.telegram import TelegramServiceProto
 
 
 class WorkerState(State):
+    chat_members: ChatMembersCacheProto
     connections: ConnectionsServiceProto
     presence: PresenceServiceProto
     updates_listener: UpdatesListenerProto
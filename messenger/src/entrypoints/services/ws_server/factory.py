@@ -9,6 +9,10 @@ from src.entrypoints.services.ws_server.settings import WSServiceSettings
 from src.entrypoints.services.ws_server.state import WSServiceState
 from src.modules.auth import AuthServiceProto
 from src.modules.auth.service import AuthService
+from src.modules.chat import ChatUpdatesRouterProto
+from src.modules.chat.updates_router import ChatUpdatesRouter
+from src.modules.chat_members import ChatMembersCacheProto
+from src.modules.chat_members.service import ChatMembersCacheService
 from src.modules.connections import ConnectionsServiceProto
 from src.modules.connections.service import ConnectionsService
 from src.modules.presence import PresenceServiceProto
@@ -33,6 +37,8 @@ class WSServiceFactory(AppFactory[WSServiceState, WSServiceSettings]):
         context = app.state
         return [
             HealthCheckable("auth", context.auth.health_check()),
+            HealthCheckable("chat_updates", context.chat_updates.health_check()),
+            HealthCheckable("chat_members", context.chat_members.health_check()),
             HealthCheckable("connections", context.connections.health_check()),
             HealthCheckable("presence", context.presence.health_check()),
             HealthCheckable("rabbitmq_publisher", context.rabbitmq_publisher.health_check()),
@@ -46,10 +52,14 @@ class WSServiceFactory(AppFactory[WSServiceState, WSServiceSettings]):
         presence_srvc = PresenceService(settings=settings.presence)
         auth = AuthService(settings=settings.auth)
         sportlevel = SportlevelService(settings=settings.sportlevel)
+        chat_updates = ChatUpdatesRouter(settings=settings.chat)
+        chat_members = ChatMembersCacheService(settings=settings.chat_members_cache, storage=storage)
 
         app.state = WSServiceState(
             state={
                 "auth": auth,
+                "chat_updates": chat_updates,
+                "chat_members": chat_members,
                 "storage": storage,
                 "connections": connections_srvc,
                 "presence": presence_srvc,
@@ -64,6 +74,8 @@ class WSServiceFactory(AppFactory[WSServiceState, WSServiceSettings]):
             settings,
             deps={
                 AuthServiceProto: auth,
+                ChatUpdatesRouterProto: chat_updates,
+                ChatMembersCacheProto: chat_members,
                 ConnectionsServiceProto: connections_srvc,
                 PresenceServiceProto: presence_srvc,
                 RabbitMQPublisherFactoryProto: rabbitmq_publisher,
@@ -80,10 +92,14 @@ class WSServiceFactory(AppFactory[WSServiceState, WSServiceSettings]):
         await app.state.storage.start()
         await app.state.rabbitmq_publisher.start()
         await app.state.sportlevel.start()
+        await app.state.chat_updates.start()
+        await app.state.chat_members.start()
         self.logger.debug("App started")
 
     async def on_shutdown(self, app: WSServiceApp) -> None:
         await super().on_shutdown(app)
+        await app.state.chat_updates.stop()
+        await app.state.chat_members.stop()
         await app.state.sportlevel.stop()
         await app.state.rabbitmq_publisher.stop()
         await app.state.storage.stop()
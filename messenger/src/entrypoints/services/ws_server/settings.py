@@ -2,6 +2,7 @@ from src.core.common.rabbitmq import RabbitMQPublisherSettings
 from src.core.settings import BaseServiceSettings
 from src.modules.auth import AuthSettings
 from src.modules.chat import ChatSettings
+from src.modules.chat_members import ChatMembersCacheSettings
 from src.modules.connections import ConnectionsServiceSettings
 from src.modules.presence import PresenceSettings
 from src.modules.sportlevel import SportlevelSettings
@@ -14,6 +15,7 @@ class WSServiceSettings(BaseServiceSettings):
     storage: StorageSettings
     presence: PresenceSettings
     chat: ChatSettings
+    chat_members_cache: ChatMembersCacheSettings
     rabbitmq_publisher: RabbitMQPublisherSettings
     connections: ConnectionsServiceSettings
     auth: AuthSettings
@@ -3,6 +3,8 @@ from starlette.datastructures import State
 from src.core.common.rabbitmq import RabbitMQPublisherFactoryProto
 from src.entrypoints.services.ws_server.settings import WSServiceSettings
 from src.modules.auth import AuthServiceProto
+from src.modules.chat import ChatUpdatesRouterProto
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.connections import ConnectionsServiceProto
 from src.modules.presence import PresenceServiceProto
 from src.modules.sportlevel import SportlevelServiceProto
@@ -11,6 +13,8 @@ from src.modules.storage import StorageServiceProto
 
 class WSServiceState(State):
     auth: AuthServiceProto
+    chat_updates: ChatUpdatesRouterProto
+    chat_members: ChatMembersCacheProto
     connections: ConnectionsServiceProto
     presence: PresenceServiceProto
     rabbitmq_publisher: RabbitMQPublisherFactoryProto
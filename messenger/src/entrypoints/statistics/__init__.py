@@ -0,0 +1,3 @@
+from src.entrypoints.statistics.cli import statistics_cli
+
+__all__ = ("statistics_cli",)
@@ -0,0 +1,82 @@
+from asyncio.runners import Runner
+from datetime import date, datetime, timedelta
+
+import typer
+
+from src.core.logger import LoggerName, get_logger
+from src.core.settings import load_settings
+from src.modules.storage.helpers import create_engine, create_session
+from src.modules.storage.impl import StatisticsOperations
+from src.modules.storage.settings import StorageSettings
+from src.providers.time import start_of_day
+
+statistics_cli = typer.Typer(name="Ticket statistics", no_args_is_help=True)
+storage_settings = load_settings(StorageSettings, section_name="storage")
+logger = get_logger(LoggerName.TICKET_STATS)
+
+DATE_FORMATS = ["%Y-%m-%d"]
+
+
+def _iter_periods(date_from: date, date_to: date, days: int) -> list[tuple[date, date]]:
+    periods = []
+    while date_from <= date_to:
+        period_end = min(date_from + timedelta(days=days - 1), date_to)
+        periods.append((date_from, period_end))
+        date_from = period_end + timedelta(days=1)
+    return periods
+
+
+async def backfill(date_from: date, date_to: date, period_days: int) -> None:
+    engine, sessionmaker = create_engine(storage_settings.db)
+    for period_from, period_to in _iter_periods(date_from, date_to, period_days):
+        async with create_session(sessionmaker) as session:
+            await StatisticsOperations(session).rebuild_ticket_stats(date_from=period_from, date_to=period_to)
+            await session.commit()
+
+        logger.info(f"Rebuilt ticket statistics from {period_from} to {period_to}")
+
+    await engine.dispose()
+
+
+async def check(date_from: date, date_to: date, for_user: int | None) -> bool:
+    engine, sessionmaker = create_engine(storage_settings.db)
+    async with create_session(sessionmaker) as session:
+        statistics = StatisticsOperations(session)
+        rollup = await statistics.get_ticket_stats(for_user=for_user, date_from=date_from, date_to=date_to)
+        raw = await statistics.get_ticket_stats_raw(
+            for_user=for_user,
+            date_from=start_of_day(date_from),
+            date_to=start_of_day(date_to + timedelta(days=1)),
+        )
+
+    await engine.dispose()
+
+    if rollup == raw:
+        logger.info("Ticket statistics are consistent", stats=rollup.dict())
+        return True
+
+    logger.error("Ticket statistics mismatch", rollup=rollup.dict(), raw=raw.dict())
+    return False
+
+
+@statistics_cli.command(name="backfill", short_help="Rebuild ticket statistics rollups from status logs")
+def backfill_command(
+    date_from: datetime = typer.Option(..., formats=DATE_FORMATS),
+    date_to: datetime = typer.Option(..., formats=DATE_FORMATS),
+    period_days: int = typer.Option(default=31, min=1, help="Days rebuilt in one transaction"),
+) -> None:
+    with Runner() as runner:
+        runner.run(backfill(date_from=date_from.date(), date_to=date_to.date(), period_days=period_days))
+
+
+@statistics_cli.command(name="check", short_help="Compare ticket statistics rollups with status logs")
+def check_command(
+    date_from: datetime = typer.Option(..., formats=DATE_FORMATS),
+    date_to: datetime = typer.Option(..., formats=DATE_FORMATS),
+    for_user: int | None = typer.Option(default=None),
+) -> None:
+    with Runner() as runner:
+        is_consistent = runner.run(check(date_from=date_from.date(), date_to=date_to.date(), for_user=for_user))
+
+    if not is_consistent:
+        raise typer.Exit(code=1)
@@ -5,6 +5,7 @@ from src.jobs.match_state_updates_listener.job import MatchStateUpdatesListener
 from src.jobs.presence_track import PresenceTrackManager
 from src.jobs.settings import BackgroundJobsSettings
 from src.jobs.sportlevel_users_sync import SportlevelUsersSyncManager
+from src.jobs.unread_counters_reconcile import UnreadCountersReconcileManager
 
 
 class BackgroundJobsRunner:
@@ -13,6 +14,7 @@ class BackgroundJobsRunner:
         sl_sync_manager: SportlevelUsersSyncManager,
         presence_track_manager: PresenceTrackManager,
         autoclose_private_chats_manager: AutoclosePrivateChatManager,
+        unread_counters_reconcile_manager: UnreadCountersReconcileManager,
         sl_match_state_updates_listener: MatchStateUpdatesListener,
         sl_match_scout_changes_listener: MatchScoutChangesListener,
         settings: BackgroundJobsSettings,
@@ -43,6 +45,12 @@ class BackgroundJobsRunner:
             coro=autoclose_private_chats_manager.try_close_chats,
             settings=settings.autoclose_private_chats,
         )
+        self._runner.add_task(
+            task_name="unread_counters_reconcile",
+            call_interval=settings.unread_counters_reconcile.check_interval,
+            coro=unread_counters_reconcile_manager.reconcile,
+            settings=settings.unread_counters_reconcile,
+        )
 
         self._sl_match_state_updates_listener = sl_match_state_updates_listener
         self._sl_match_scout_changes_listener = sl_match_scout_changes_listener
@@ -6,6 +6,7 @@ from src.jobs.match_scout_changes_listener.settings import MatchScoutChangesList
 from src.jobs.match_state_updates_listener.settings import MatchStateUpdatesListenerSettings
 from src.jobs.presence_track import PresenceTrackerSettings
 from src.jobs.sportlevel_users_sync import SportlevelUsersSyncSettings
+from src.jobs.unread_counters_reconcile import UnreadCountersReconcileSettings
 
 
 class BackgroundJobsSettings(BaseModel):
@@ -14,6 +15,7 @@ class BackgroundJobsSettings(BaseModel):
     sportlevel_users_sync: SportlevelUsersSyncSettings
     presence_track: PresenceTrackerSettings
     autoclose_private_chats: AutoclosePrivateChatsSettings
+    unread_counters_reconcile: UnreadCountersReconcileSettings
     sl_match_state_updates_listener: MatchStateUpdatesListenerSettings
     sl_match_scout_changes_listener: MatchScoutChangesListenerSettings
     matches_cache: CacheSettings
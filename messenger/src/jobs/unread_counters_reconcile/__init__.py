@@ -0,0 +1,4 @@
+from .job import UnreadCountersReconcileManager
+from .settings import UnreadCountersReconcileSettings
+
+__all__ = ("UnreadCountersReconcileManager", "UnreadCountersReconcileSettings")
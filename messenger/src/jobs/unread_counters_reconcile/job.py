@@ -0,0 +1,53 @@
+from src.core.common.redis import create_redis_conn_pool
+from src.core.logger import LoggerName, get_logger
+from src.entities.chats import UnreadCounterDriftDTO
+from src.entities.redis import UnreadCountCacheKey
+from src.jobs.unread_counters_reconcile.settings import UnreadCountersReconcileSettings
+from src.modules.storage.interface.storage import StorageServiceProto
+
+
+class UnreadCountersReconcileManager:
+    """
+    Periodically compares materialized unread counters (`ChatMembership.unread_count`)
+    with the ones calculated from messages, fixes the drift and drops affected cached counters.
+    Memberships are checked in pages of `batch_size`, one page per run.
+    """
+
+    def __init__(
+        self,
+        storage: StorageServiceProto,
+        settings: UnreadCountersReconcileSettings,
+    ) -> None:
+        self.logger = get_logger(LoggerName.JOB_UNREAD_COUNTERS_RECONCILE)
+        self.settings = settings
+        self._storage = storage
+        self._redis_conn = create_redis_conn_pool(settings.redis)
+        self._last_checked_id = 0
+
+    async def reconcile(self) -> None:
+        async with self._storage.connect() as db:
+            drift, self._last_checked_id = await db.unread_counters.find_unread_counters_drift(
+                after_id=self._last_checked_id,
+                limit=self.settings.batch_size,
+            )
+            if not drift:
+                return
+
+            await db.unread_counters.fix_unread_counters(drift)
+            await db.commit_transaction()
+
+        self.logger.warning(
+            f"Unread counters drift fixed for {len(drift)} memberships",
+            drift=[(item.user_id, item.chat_id, item.stored_count, item.actual_count) for item in drift],
+        )
+        await self._drop_cached_counters(drift)
+
+    async def _drop_cached_counters(self, drift: list[UnreadCounterDriftDTO]) -> None:
+        keys = set()
+        for item in drift:
+            keys.add(UnreadCountCacheKey.TOTAL.format(user_id=item.user_id))
+            keys.add(UnreadCountCacheKey.BY_CHAT.format(user_id=item.user_id, chat_id=item.chat_id))
+            if item.match_id is not None:
+                keys.add(UnreadCountCacheKey.BY_MATCH.format(user_id=item.user_id, match_id=item.match_id))
+
+        await self._redis_conn.delete(*keys)
@@ -0,0 +1,13 @@
+from pydantic import Field
+
+from src.core.common.redis.settings import RedisSettings
+from src.jobs.base_settings import PeriodicJobSettings
+
+
+class UnreadCountersReconcileSettings(PeriodicJobSettings):
+    redis: RedisSettings
+
+    batch_size: int = Field(
+        1000,
+        description="Number of chat memberships checked per run",
+    )
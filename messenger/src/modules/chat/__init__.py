@@ -1,6 +1,7 @@
 from src.modules.chat.interface import (
     ChatMsgTransportProto,
     ChatServiceProto,
+    ChatUpdatesRouterProto,
     ConnectedLocalUsers,
     LocalConnectionInfo,
 )
@@ -9,6 +10,7 @@ from src.modules.chat.settings import ChatSettings
 __all__ = (
     "ChatSettings",
     "ChatServiceProto",
+    "ChatUpdatesRouterProto",
     "LocalConnectionInfo",
     "ChatMsgTransportProto",
     "ConnectedLocalUsers",
@@ -7,6 +7,7 @@ from src.core.types import ProtobufMessageT, RedisConn
 from src.exceptions import ServerError
 from src.modules.chat.interface import LocalConnectionInfo
 from src.modules.chat.settings import ChatSettings
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.presence.interface import PresenceServiceProto
 from src.modules.service_updates.interface import ServiceUpdatesRMQOpts
 from src.modules.storage.interface import StorageServiceProto
@@ -22,6 +23,7 @@ class BaseMessageHandler(Generic[ProtobufMessageT]):
         redis_conn: RedisConn,
         settings: ChatSettings,
         cacher: RedisCacher,
+        chat_members: ChatMembersCacheProto,
     ) -> None:
         self.logger = get_logger(LoggerName.MESSAGE_HANDLER)
         self.connection = connection
@@ -31,6 +33,7 @@ class BaseMessageHandler(Generic[ProtobufMessageT]):
         self.redis_conn = redis_conn
         self._cacher = cacher
         self.chat_settings = settings
+        self.chat_members = chat_members
 
     async def __call__(self, message: ProtobufMessageT) -> None: ...
 
@@ -29,20 +29,20 @@ class MessageHandler(BaseMessageHandler[SendMessageCommand]):
 
     async def __call__(self, message: SendMessageCommand) -> None:
         try:
-            async with self.storage.connect(autocommit=True) as storage_conn:
-                chat_version = await storage_conn.chats.get_chat_version(chat_id=message.chat_id)
+            chat_version = await self.chat_members.get_version(message.chat_id)
 
-                # Check permissions
-                is_permitted, error_msg = await self.cached_check_permissions(
-                    user_id=self.connection.user_id,
-                    chat_id=message.chat_id,
-                    chat_version=chat_version,
-                )
-                if not is_permitted:
-                    raise NotPermittedError(message=error_msg)
+            # Check permissions
+            is_permitted, error_msg = await self.cached_check_permissions(
+                user_id=self.connection.user_id,
+                chat_id=message.chat_id,
+                chat_version=chat_version,
+            )
+            if not is_permitted:
+                raise NotPermittedError(message=error_msg)
 
-                await self._validate_message(message_command=message)
+            await self._validate_message(message_command=message)
 
+            async with self.storage.connect(autocommit=True) as storage_conn:
                 # Save message to storage
                 stored_message = await storage_conn.messages.create_message(
                     sender_id=self.connection.user_id,
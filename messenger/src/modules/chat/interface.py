@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Protocol
+from typing import AsyncContextManager, Protocol
 
 from starlette.websockets import WebSocket
 
@@ -12,6 +12,16 @@ class ChatMsgTransportProto(WSTransportProto, Protocol):
     async def get_message(self) -> ProtobufMessage: ...
 
 
+class ChatUpdatesRouterProto(Protocol):
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def health_check(self) -> bool: ...
+
+    def route(self, cid: ConnectionId, transport: ChatMsgTransportProto) -> AsyncContextManager[None]: ...
+
+
 class ChatServiceProto(Protocol):
     async def process_connection(self, web_socket: WebSocket, token: str) -> None: ...
 
@@ -1,24 +1,20 @@
 import asyncio
 from contextlib import asynccontextmanager
-from functools import partial
 from typing import AsyncGenerator
 
 import sentry_sdk
 from redis.exceptions import ConnectionError as RedisConnectionError
 from sl_messenger_protobuf.enums_pb2 import ErrorReason
-from sl_messenger_protobuf.main_pb2 import ServerMessage
 from sl_messenger_protobuf.responses_pb2 import ErrorOccuredUpdate
 from starlette import status
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from src.core.common.rabbitmq import RabbitMQPublisherFactoryProto
-from src.core.common.redis import RedisListener, create_redis_conn_pool
+from src.core.common.redis import create_redis_conn_pool
 from src.core.common.redis.cacher import RedisCacher
 from src.core.di import Injected
 from src.core.logger import LoggerName, get_connection_id, get_logger
-from src.core.protobuf import pretty_format_pb
 from src.core.types import ProtobufMessage
-from src.entities.redis import RedisPubSubChannelName
 from src.exceptions import (
     AuthRequiredError,
     ClientError,
@@ -31,9 +27,10 @@ from src.exceptions import (
 from src.modules.auth import AuthServiceProto
 from src.modules.chat import ChatMsgTransportProto, LocalConnectionInfo
 from src.modules.chat.handlers.base import get_handler_for
-from src.modules.chat.interface import ChatServiceProto
+from src.modules.chat.interface import ChatServiceProto, ChatUpdatesRouterProto
 from src.modules.chat.settings import ChatSettings
 from src.modules.chat.transport import ChatWebsocketTransport
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.connections.interface import ConnectionsServiceProto
 from src.modules.presence.interface import PresenceServiceProto
 from src.modules.storage.interface import StorageServiceProto
@@ -48,6 +45,8 @@ class ChatService(ChatServiceProto):
         connections: ConnectionsServiceProto = Injected[ConnectionsServiceProto],
         presence: PresenceServiceProto = Injected[PresenceServiceProto],
         rabbitmq_publisher: RabbitMQPublisherFactoryProto = Injected[RabbitMQPublisherFactoryProto],
+        updates_router: ChatUpdatesRouterProto = Injected[ChatUpdatesRouterProto],
+        chat_members: ChatMembersCacheProto = Injected[ChatMembersCacheProto],
     ) -> None:
         self.logger = get_logger(LoggerName.WS)
 
@@ -56,6 +55,8 @@ class ChatService(ChatServiceProto):
         self._presence = presence
         self._storage = storage
         self._rabbitmq_publisher = rabbitmq_publisher
+        self._updates_router = updates_router
+        self._chat_members = chat_members
         self._redis_conn = create_redis_conn_pool(settings.redis)
         self._settings = settings
         self._cacher = RedisCacher(settings=settings.redis, alias="chat")
@@ -141,31 +142,12 @@ class ChatService(ChatServiceProto):
                 ip=web_socket.client.host if web_socket.client else None,
             )
 
-            updates_listener = RedisListener(
-                conn=self._redis_conn,
-                callback=partial(self._handle_update, transport=transport),
-            )
-            async with updates_listener:
-                await updates_listener.subscribe(
-                    RedisPubSubChannelName.CONNECTION_UPDATES.format(connection_id=connection.cid)
-                )
+            async with self._updates_router.route(connection.cid, transport):
                 await self._communicate(connection)
 
         if connection:
             await self._connections.connection_closed(connection=connection)
 
-    async def _handle_update(self, update: bytes, *, transport: ChatMsgTransportProto) -> None:
-        command_wrapper = ServerMessage.FromString(update)
-        message_type = command_wrapper.WhichOneof("message")
-        message = getattr(command_wrapper, message_type)  # type: ignore
-
-        self.logger.debug(f"Received command to send: {pretty_format_pb(message)}")
-
-        try:
-            await transport.send_message(message)
-        except (ConnectionClosedError, asyncio.CancelledError):
-            return
-
     async def _communicate(
         self,
         connection: LocalConnectionInfo,
@@ -188,5 +170,6 @@ class ChatService(ChatServiceProto):
             redis_conn=self._redis_conn,
             settings=self._settings,
             cacher=self._cacher,
+            chat_members=self._chat_members,
         )
         await handler(message)
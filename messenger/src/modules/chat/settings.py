@@ -9,3 +9,4 @@ class ChatSettings(BaseModel):
     activity_throttle_time: int
     delivery_status_updated_throttle_time: int
     unread_message_delay_sec: int
+    updates_queue_size: int = 256
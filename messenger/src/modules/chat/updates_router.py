@@ -0,0 +1,125 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import AsyncGenerator, Callable
+
+from sl_messenger_protobuf.main_pb2 import ServerMessage
+from starlette import status
+
+from src.core.common.redis import RedisMultiplexedListener, create_redis_conn_pool
+from src.core.logger import LoggerName, get_logger
+from src.core.protobuf import pretty_format_pb
+from src.core.types import ConnectionId, ProtobufMessage
+from src.entities.redis import RedisPubSubChannelName
+from src.exceptions import ConnectionClosedError
+from src.modules.chat.interface import ChatMsgTransportProto, ChatUpdatesRouterProto
+from src.modules.chat.settings import ChatSettings
+
+
+def decode_server_message(update: bytes) -> ProtobufMessage:
+    command_wrapper = ServerMessage.FromString(update)
+    message_type = command_wrapper.WhichOneof("message")
+    return getattr(command_wrapper, message_type)  # type: ignore
+
+
+@dataclass(kw_only=True, slots=True)
+class _Outbox:
+    transport: ChatMsgTransportProto
+    queue: asyncio.Queue[bytes]
+    sender: asyncio.Task[None] | None = None
+    evicted: bool = field(default=False)
+
+
+class ChatUpdatesRouter(ChatUpdatesRouterProto):
+    """
+    Routes connection updates from Redis to local websocket transports.
+
+    One pub/sub connection per process is shared by all local websockets,
+    frames are dispatched by the `cid -> outbox` index. Every connection has
+    a bounded send queue drained by its own sender task; a connection whose
+    queue overflows is considered a slow consumer and is closed.
+    """
+
+    def __init__(
+        self,
+        settings: ChatSettings,
+        listener: RedisMultiplexedListener | None = None,
+        decode: Callable[[bytes], ProtobufMessage] = decode_server_message,
+    ) -> None:
+        self.logger = get_logger(LoggerName.WS)
+
+        self._listener = listener or RedisMultiplexedListener(conn=create_redis_conn_pool(settings.redis))
+        self._queue_size = settings.updates_queue_size
+        self._decode = decode
+        self._outboxes: dict[ConnectionId, _Outbox] = {}
+        self._background_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def connections_count(self) -> int:
+        return len(self._outboxes)
+
+    async def start(self) -> None:
+        await self._listener.start()
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+        for outbox in self._outboxes.values():
+            if outbox.sender:
+                outbox.sender.cancel()
+        self._outboxes.clear()
+
+    async def health_check(self) -> bool:
+        return await self._listener.health_check()
+
+    @asynccontextmanager
+    async def route(self, cid: ConnectionId, transport: ChatMsgTransportProto) -> AsyncGenerator[None, None]:
+        outbox = _Outbox(transport=transport, queue=asyncio.Queue(maxsize=self._queue_size))
+        outbox.sender = asyncio.create_task(self._sender(outbox))
+        self._outboxes[cid] = outbox
+
+        channel_name = RedisPubSubChannelName.CONNECTION_UPDATES.format(connection_id=cid)
+        try:
+            await self._listener.subscribe(channel_name, partial(self._on_update, cid))
+            yield
+
+        finally:
+            self._outboxes.pop(cid, None)
+            outbox.sender.cancel()
+            await self._listener.unsubscribe(channel_name)
+
+    def _on_update(self, cid: ConnectionId, update: bytes) -> None:
+        if not (outbox := self._outboxes.get(cid)) or outbox.evicted:
+            return
+
+        try:
+            outbox.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self._evict(cid, outbox)
+
+    def _evict(self, cid: ConnectionId, outbox: _Outbox) -> None:
+        self.logger.warning("Slow consumer evicted", cid=cid, queue_size=self._queue_size)
+        outbox.evicted = True
+        if outbox.sender:
+            outbox.sender.cancel()
+
+        task = asyncio.create_task(
+            outbox.transport.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Slow consumer"),
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _sender(self, outbox: _Outbox) -> None:
+        while True:
+            update = await outbox.queue.get()
+            try:
+                message = self._decode(update)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.error("Failed to decode update", exc_info=True)
+                continue
+
+            self.logger.debug(f"Received command to send: {pretty_format_pb(message)}")
+            try:
+                await outbox.transport.send_message(message)
+            except ConnectionClosedError:
+                return
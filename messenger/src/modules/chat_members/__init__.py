@@ -0,0 +1,4 @@
+from .interface import ChatMembers, ChatMembersCacheProto
+from .settings import ChatMembersCacheSettings
+
+__all__ = ("ChatMembers", "ChatMembersCacheProto", "ChatMembersCacheSettings")
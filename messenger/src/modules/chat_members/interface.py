@@ -0,0 +1,40 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Protocol
+
+from src.core.common.utility import SupportsHealthCheck, SupportsLifespan
+from src.core.types import UserId
+
+
+@dataclass(frozen=True, slots=True)
+class ChatMembers:
+    """Snapshot of chat members for a given chat version, user ids are sorted"""
+
+    chat_id: int
+    version: int
+    user_ids: array  # array("q")
+
+    def __contains__(self, user_id: object) -> bool:
+        index = bisect_left(self.user_ids, user_id)  # type: ignore
+        return index < len(self.user_ids) and self.user_ids[index] == user_id
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def to_list(self) -> list[UserId]:
+        return self.user_ids.tolist()
+
+
+class ChatMembersCacheProto(SupportsLifespan, SupportsHealthCheck, Protocol):
+    async def get_version(self, chat_id: int) -> int | None:
+        """Returns the version of the chat, `None` if the chat does not exist"""
+        ...
+
+    async def get_members(self, chat_id: int) -> ChatMembers | None:
+        """Returns members of the chat, `None` if the chat does not exist"""
+        ...
+
+    async def invalidate(self, chat_id: int) -> None:
+        """Refreshes the cached version of the chat, storage does it on every committed version change"""
+        ...
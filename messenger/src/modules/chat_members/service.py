@@ -0,0 +1,104 @@
+from array import array
+
+from src.core.common.redis import SetManyIfGreater, create_redis_conn_pool, is_redis_conn_healthy
+from src.core.common.redis.layered_cache import LayeredCache
+from src.core.common.utility import PatternStrEnum
+from src.core.logger import LoggerName, get_logger
+from src.modules.chat_members.interface import ChatMembers, ChatMembersCacheProto
+from src.modules.chat_members.settings import ChatMembersCacheSettings
+from src.modules.storage import StorageServiceProto
+
+
+class ChatMembersCacheKey(PatternStrEnum):
+    VERSION = "[chat_members]:[version]:[chat-{chat_id}]"
+    MEMBERS = "[chat_members]:[members]:[chat-{chat_id}]:[v-{version}]"
+
+
+class ChatMembersCacheService(ChatMembersCacheProto):
+    """
+    Versioned cache of chat members.
+
+    Members are stored under a key containing the chat version, so a stored snapshot never changes
+    and can be kept in the memory tier of `LayeredCache` without cross-process invalidation.
+    The current version (`Chat.version`, bumped on every join/leave, close/reopen and meta update) is kept
+    in Redis for `version_ttl` seconds. The storage calls `invalidate_many` after any version change is committed,
+    it writes the new versions. Cached versions are only ever raised, so a reader that loaded a version
+    before the commit can't put it back over the new one.
+    """
+
+    def __init__(
+        self,
+        settings: ChatMembersCacheSettings,
+        storage: StorageServiceProto,
+    ) -> None:
+        self.settings = settings
+        self.logger = get_logger(LoggerName.CHAT_MEMBERS_CACHE)
+        self._storage = storage
+        self._storage.on_chat_versions_changed(self.invalidate_many)
+        self._redis_conn = create_redis_conn_pool(settings.redis)
+        self._set_versions = SetManyIfGreater(bind_to=self._redis_conn)
+        self._members = LayeredCache[str, ChatMembers](
+            maxsize=settings.memory_cache_maxsize,
+            ttl=settings.members_ttl,
+            redis=self._redis_conn,
+        )
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return await is_redis_conn_healthy(self._redis_conn)
+
+    async def get_version(self, chat_id: int) -> int | None:
+        version_key = ChatMembersCacheKey.VERSION.format(chat_id=chat_id)
+        if (raw_version := await self._redis_conn.get(version_key)) is not None:
+            return int(raw_version)
+
+        async with self._storage.connect() as conn:
+            version = await conn.chats.get_chat_version(chat_id=chat_id)
+
+        if version is not None:
+            await self._set_versions({version_key: version}, ex=self.settings.version_ttl)
+
+        return version
+
+    async def get_members(self, chat_id: int) -> ChatMembers | None:
+        version = await self.get_version(chat_id)
+        if version is None:
+            return None
+
+        members_key = ChatMembersCacheKey.MEMBERS.format(chat_id=chat_id, version=version)
+        if (members := await self._members.get(members_key)) is not None:
+            return members
+
+        async with self._storage.connect() as conn:
+            users_in_chat = await conn.chats.get_users_in_chat(chat_id)
+
+        members = ChatMembers(
+            chat_id=chat_id,
+            version=version,
+            user_ids=array("q", sorted(user.user_id for user in users_in_chat)),
+        )
+        await self._members.set(members_key, members)
+        self.logger.debug(f"Chat members loaded: {chat_id=}, {version=}, count={len(members)}")
+        return members
+
+    async def invalidate(self, chat_id: int) -> None:
+        await self.invalidate_many({chat_id})
+
+    async def invalidate_many(self, chat_ids: set[int]) -> None:
+        if not chat_ids:
+            return
+
+        async with self._storage.connect() as conn:
+            versions = await conn.chats.get_chat_versions(chat_ids)
+
+        await self._set_versions(
+            {ChatMembersCacheKey.VERSION.format(chat_id=chat_id): version for chat_id, version in versions.items()},
+            ex=self.settings.version_ttl,
+        )
+        if deleted := chat_ids - versions.keys():
+            await self._redis_conn.delete(*(ChatMembersCacheKey.VERSION.format(chat_id=chat_id) for chat_id in deleted))
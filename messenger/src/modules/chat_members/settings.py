@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from src.core.common.redis.settings import RedisSettings
+
+
+class ChatMembersCacheSettings(BaseModel):
+    memory_cache_maxsize: int = 10_000
+    members_ttl: int = 3600
+    version_ttl: int = 30
+    redis: RedisSettings
@@ -1,11 +1,21 @@
+from collections import Counter
 from dataclasses import dataclass, field
+from typing import Iterable
 
+from src.core.types import UserId
 from src.modules.chat.interface import ConnectedLocalUsers, LocalConnectionInfo
 
 
 @dataclass(repr=True)
 class LocalConnections:
+    """
+    Connections to this node, indexed by user and ip.
+    All indexes are updated on connect and disconnect, so lookups don't scan every connection
+    """
+
     _connections: ConnectedLocalUsers = field(default_factory=dict)
+    _count_by_ip: Counter[str | None] = field(default_factory=Counter)
+    _active_connections_count: int = 0
 
     @property
     def connected_users_count(self) -> int:
@@ -13,21 +23,34 @@ class LocalConnections:
 
     @property
     def active_connections_count(self) -> int:
-        return sum(len(conn) for conn in self._connections.values())
+        return self._active_connections_count
 
-    def get_connections(self, include_user_ids: list[int] | None = None) -> ConnectedLocalUsers:
+    def get_connections(self, include_user_ids: Iterable[UserId] | None = None) -> ConnectedLocalUsers:
+        """
+        Connections of the given users (e.g. chat members) that are connected to this node
+        """
         if not include_user_ids:
             return self._connections
 
         return {
-            user_id: connections for user_id, connections in self._connections.items() if user_id in include_user_ids
+            user_id: connections for user_id in set(include_user_ids) if (connections := self._connections.get(user_id))
         }
 
+    def get_connections_count_by_ip(self, ip: str | None) -> int:
+        return self._count_by_ip[ip]
+
     def add_connection(self, connection: LocalConnectionInfo) -> None:
         self._connections.setdefault(connection.user_id, []).append(connection)
+        self._count_by_ip[connection.ip] += 1
+        self._active_connections_count += 1
 
     def remove_connection(self, connection: LocalConnectionInfo) -> None:
         self._connections[connection.user_id].remove(connection)
-
         if not self._connections[connection.user_id]:
             del self._connections[connection.user_id]
+
+        self._count_by_ip[connection.ip] -= 1
+        if self._count_by_ip[connection.ip] <= 0:
+            del self._count_by_ip[connection.ip]
+
+        self._active_connections_count -= 1
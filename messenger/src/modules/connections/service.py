@@ -24,9 +24,7 @@ class ConnectionsService(ConnectionsServiceProto):
         return await is_redis_conn_healthy(self._redis_conn)
 
     def get_connections_count_by_ip(self, ip: str | None) -> int:
-        return len(
-            [conn for conns in self.local_connections.get_connections().values() for conn in conns if conn.ip == ip]
-        )
+        return self.local_connections.get_connections_count_by_ip(ip)
 
     async def get_all_connections(
         self,
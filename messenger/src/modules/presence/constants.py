@@ -1,3 +1,4 @@
 CHAT_ACTIVITY_CACHE_KEY = "chat:[{chat_id}]:active_users"
 CHAT_ACTIVITY_WILDCARD = "chat:[*]:active_users"
 ACTIVE_USERS_CACHE_KEY = "active_users"
+ACTIVE_USER_IDS_CACHE_KEY = "active_user_ids"
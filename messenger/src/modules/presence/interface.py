@@ -37,3 +37,9 @@ class PresenceServiceProto(SupportsHealthCheck, Protocol):
         filter_by_role: Role | None = None,
         activity_time: timedelta | None = None,
     ) -> list[PackedUserData]: ...
+
+    async def get_online_user_ids(
+        self,
+        user_ids: list[UserId],
+        activity_time: timedelta | None = None,
+    ) -> set[UserId]: ...
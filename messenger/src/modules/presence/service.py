@@ -56,3 +56,14 @@ class PresenceService(PresenceServiceProto):
 
         threshold = (datetime_now() - activity_time).timestamp()
         return await self.storage.get_active_users(threshold, filter_by_role=filter_by_role)
+
+    async def get_online_user_ids(
+        self,
+        user_ids: list[UserId],
+        activity_time: timedelta | None = None,
+    ) -> set[UserId]:
+        if not activity_time:
+            activity_time = self.settings.activity_time_threshold
+
+        threshold = (datetime_now() - activity_time).timestamp()
+        return await self.storage.get_online_user_ids(user_ids=user_ids, active_after=threshold)
@@ -1,7 +1,8 @@
 from src.core.common.redis import create_redis_conn_pool
-from src.core.types import LoggerType
+from src.core.types import LoggerType, UserId
 from src.entities.users import Role
 from src.modules.presence.constants import (
+    ACTIVE_USER_IDS_CACHE_KEY,
     ACTIVE_USERS_CACHE_KEY,
     CHAT_ACTIVITY_CACHE_KEY,
     CHAT_ACTIVITY_WILDCARD,
@@ -47,15 +48,38 @@ class PresenceStorage:
 
         return result
 
+    async def get_online_user_ids(self, user_ids: list[UserId], active_after: float) -> set[UserId]:
+        """
+        Returns those of the given users who were active after `active_after`.
+        Looks up only the given ids in the per-user activity set, so the cost depends on the
+        number of ids asked for, not on the number of users online.
+        """
+        if not user_ids:
+            return set()
+
+        unique_ids = list(set(user_ids))
+        scores: list[float | None] = await self.conn.zmscore(ACTIVE_USER_IDS_CACHE_KEY, unique_ids)
+        return {
+            user_id
+            for user_id, score in zip(unique_ids, scores, strict=True)
+            if score is not None and score >= active_after
+        }
+
     async def set_last_user_activity(
         self,
         user_data: PackedUserData,
         active_at: float,
     ) -> None:
-        await self.conn.zadd(
+        pipe = self.conn.pipeline(transaction=False)
+        await pipe.zadd(
             name=ACTIVE_USERS_CACHE_KEY,
             mapping={user_data.pack(): active_at},
         )
+        await pipe.zadd(
+            name=ACTIVE_USER_IDS_CACHE_KEY,
+            mapping={str(user_data.user_id): active_at},
+        )
+        await pipe.execute()
 
     async def set_last_chat_activity(
         self,
@@ -69,11 +93,14 @@ class PresenceStorage:
         )
 
     async def cleanup_user_activity(self, active_before: float) -> None:
-        await self.conn.zremrangebyscore(
-            name=ACTIVE_USERS_CACHE_KEY,
-            min=0,
-            max=active_before,
-        )
+        pipe = self.conn.pipeline(transaction=False)
+        for name in (ACTIVE_USERS_CACHE_KEY, ACTIVE_USER_IDS_CACHE_KEY):
+            await pipe.zremrangebyscore(
+                name=name,
+                min=0,
+                max=active_before,
+            )
+        await pipe.execute()
 
     async def cleanup_last_chat_activity(self, active_before: float) -> None:
         async for activity_chat_key in self.conn.scan_iter(match=CHAT_ACTIVITY_WILDCARD, _type="zset"):
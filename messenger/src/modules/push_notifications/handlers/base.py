@@ -54,6 +54,17 @@ class BaseUpdateHandler(ABC, Generic[SourceEventTypeT]):
     @abstractmethod
     async def handle(self, update: SourceEventTypeT) -> list[PreparedPushNotification]: ...
 
+    async def handle_batch(self, updates: list[SourceEventTypeT]) -> list[PreparedPushNotification]:
+        """
+        Prepares notifications for several updates of the handler's type.
+        Handlers that can share lookups between updates override this, by default updates are handled one by one.
+        Errors are raised, the listener then retries the updates one by one and drops only the failing ones.
+        """
+        result = []
+        for update in updates:
+            result.extend(await self.handle(update))
+        return result
+
     def _truncate_message(self, message: PushNotificationContent) -> None:
         preview_length = self.settings.message_preview_length
 
@@ -78,22 +89,34 @@ class BaseUpdateHandler(ABC, Generic[SourceEventTypeT]):
                 return
 
     async def get_active_configs_for_user(self, db: StorageProtocol, user_id: int) -> list[PushNotificationConfig]:
-        push_configs = await db.push_notifications.get_configs_for_user(user_id=user_id)
-        if not push_configs:
-            return []
-
-        results = []
-
-        for config in push_configs:
-            last_alive_at = config.last_alive_at
-            now = datetime_now()
-            if now - self.settings.device_last_alive_threshold > last_alive_at:
-                await db.push_notifications.remove_configs(device_id=config.device_id)
-                self.logger.debug(
-                    "Push cfg invalidated (last_alive_at)",
-                    device_id=config.device_id,
-                )
-            else:
-                results.append(config)
+        return (await self.get_active_configs_for_users(db=db, user_ids=[user_id]))[user_id]
 
+    async def get_active_configs_for_users(
+        self,
+        db: StorageProtocol,
+        user_ids: list[int],
+    ) -> dict[int, list[PushNotificationConfig]]:
+        """
+        Loads push configs of all given users with one query, configs of devices that have not been alive
+        for too long are removed
+        """
+        push_configs = await db.push_notifications.get_configs_for_users(user_ids=user_ids)
+
+        expired_after = datetime_now() - self.settings.device_last_alive_threshold
+        expired_device_ids = []
+        results: dict[int, list[PushNotificationConfig]] = {}
+
+        for user_id, configs in push_configs.items():
+            results[user_id] = []
+            for config in configs:
+                if expired_after > config.last_alive_at:
+                    expired_device_ids.append(config.device_id)
+                    self.logger.debug(
+                        "Push cfg invalidated (last_alive_at)",
+                        device_id=config.device_id,
+                    )
+                else:
+                    results[user_id].append(config)
+
+        await db.push_notifications.remove_configs_by_device_ids(device_ids=expired_device_ids)
         return results
@@ -1,4 +1,5 @@
 import base64
+from dataclasses import dataclass
 
 from sl_messenger_protobuf.messages_pb2 import MessageContent as PBMessageContent
 from sl_messenger_protobuf.notifications_pb2 import (
@@ -12,111 +13,170 @@ from web_pusher import ClientCredentials
 from web_pusher.enums import Urgency
 
 from src.controllers.push_notifications import PushNotificationsController
-from src.entities.users import Role
+from src.entities.users import ChatUserDTO, Role
 from src.exceptions import InternalError
 from src.modules.chat.serializers.converters import role_to_pb
 from src.modules.service_updates.entities import MessageSentToChat
+from src.modules.storage.interface import StorageProtocol
 from src.providers.time import timestamp_now
 
 from .base import BaseUpdateHandler, PreparedPushNotification
 
 MESSAGE_NOTIFICATION_TTL = 86400  # 1 day
+# Pending pushes with the same topic replace each other, so a device keeps only the latest message of a chat
+MESSAGE_NOTIFICATION_TOPIC = "chat-{chat_id}"
+
+
+@dataclass(kw_only=True)
+class _ChatContext:
+    users_in_chat: list[ChatUserDTO]
+    match_data: NotificationMatchData | None
+    ticket_data: NotificationTicketData | None
 
 
 class NewMessageNotificationsSender(BaseUpdateHandler[MessageSentToChat], update_type=MessageSentToChat):
     async def handle(self, update: MessageSentToChat) -> list[PreparedPushNotification]:
-        result = []
+        return await self.handle_batch([update])
 
-        message_content = PBMessageContent.FromString(base64.b64decode(update.content_raw.encode()))
+    async def handle_batch(self, updates: list[MessageSentToChat]) -> list[PreparedPushNotification]:
+        """
+        Chat, members and match are loaded once per chat of the batch, referenced users and push configs
+        of all recipients are loaded with one query each
+        """
+        result = []
 
-        referenced_users = PushNotificationsController.extract_referenced_user_ids_from_content(message_content)
+        message_contents = {
+            update.message_id: PBMessageContent.FromString(base64.b64decode(update.content_raw.encode()))
+            for update in updates
+        }
 
-        if update.sender_id:
-            referenced_users.append(update.sender_id)
+        referenced_users: dict[int, list[int]] = {}
+        for update in updates:
+            user_ids = PushNotificationsController.extract_referenced_user_ids_from_content(
+                message_contents[update.message_id]
+            )
+            if update.sender_id:
+                user_ids.append(update.sender_id)
+            referenced_users[update.message_id] = list(dict.fromkeys(user_ids))
 
         async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(update.chat_id)
-
-            chat_info = await conn.chats.get_chat_by_id(update.chat_id)
-            if not chat_info:
-                raise InternalError(f"Chat with id {update.chat_id} was not found")
-
-            if chat_info.match_id:
-                match_info = await conn.matches.get_match_by_id(chat_info.match_id)
-                if not match_info:
-                    raise InternalError(f"Match with id {chat_info.match_id} was not found")
-
-                match_data = NotificationMatchData(
-                    id=match_info.sportlevel_id,
-                    team_a_name_ru=match_info.team_a.name_ru,
-                    team_b_name_ru=match_info.team_b.name_ru,
-                    team_a_name_en=match_info.team_a.name_en,
-                    team_b_name_en=match_info.team_b.name_en,
-                )
-            else:
-                match_data = None
-
-            if not referenced_users:
-                ref_user_data = []
-            else:
-                ref_user_data = [
-                    NotificationUserData(
+            chats: dict[int, _ChatContext] = {}
+            for chat_id in dict.fromkeys(update.chat_id for update in updates):
+                try:
+                    chats[chat_id] = await self._load_chat_context(conn, chat_id)
+                except InternalError as exc:
+                    self.logger.error("Failed to prepare push notifications", exc_info=exc, chat_id=chat_id)
+
+            updates = [update for update in updates if update.chat_id in chats]
+
+            all_referenced_ids = list(
+                {user_id for update in updates for user_id in referenced_users[update.message_id]}
+            )
+            users_data = (
+                {
+                    user.sportlevel_id: NotificationUserData(
                         id=user.sportlevel_id,
                         name=user.name,
                         role=role_to_pb(user.role),
                         scout_number=user.scout_number,
                     )
-                    for user in await conn.users.get_by_ids(referenced_users)
+                    for user in await conn.users.get_by_ids(all_referenced_ids)
+                }
+                if all_referenced_ids
+                else {}
+            )
+
+            recipients_by_message = {
+                update.message_id: {
+                    user
+                    for user in chats[update.chat_id].users_in_chat
+                    if user.user_id not in {update.sender_id, update.initiator_id}
+                }
+                for update in updates
+            }
+            configs_by_user = await self.get_active_configs_for_users(
+                db=conn,
+                user_ids=list({user.user_id for users in recipients_by_message.values() for user in users}),
+            )
+
+            for update in updates:
+                chat = chats[update.chat_id]
+                ref_user_data = [
+                    users_data[user_id] for user_id in referenced_users[update.message_id] if user_id in users_data
                 ]
 
-            if chat_info.chat_meta.assigned_ticket_id:
-                ticket_data = NotificationTicketData(id=chat_info.chat_meta.assigned_ticket_id)
-            else:
-                ticket_data = None
-
-            for recipient in {
-                user for user in users_in_chat if user.user_id not in {update.sender_id, update.initiator_id}
-            }:
-                push_configs = await self.get_active_configs_for_user(db=conn, user_id=recipient.user_id)
-                self.logger.debug(f"Push configs for user {recipient.user_id}: {push_configs}")
-                if not push_configs:
-                    continue
-
-                notification_content = PushNotificationContent(
-                    created_at=timestamp_now(),
-                    new_message=NewMessageNotification(
-                        id=update.message_id,
-                        chat_id=update.chat_id,
-                        sent_at=update.msg_created_at,
-                        sender_id=update.sender_id,
-                        content=message_content,
-                        match_data=match_data,
-                        ticket_data=ticket_data,
-                        user_data=ref_user_data,
-                    ),
-                )
-
-                self._truncate_message(notification_content)
-                if _should_anonymize_users := recipient.user_role != Role.SUPERVISOR:
-                    self._anonymize_message(notification_content)
-
-                for config in push_configs:
-                    result.append(
-                        PreparedPushNotification(
-                            recipient_user_id=config.user_id,
-                            content=notification_content,
-                            client_credentials=ClientCredentials.parse_from_dict(
-                                {
-                                    "endpoint": config.endpoint,
-                                    "keys": config.keys,
-                                }
-                            ),
-                            device_id=config.device_id,
-                            ttl=MESSAGE_NOTIFICATION_TTL,
-                            urgency=Urgency.HIGH,
-                        )
+                for recipient in recipients_by_message[update.message_id]:
+                    push_configs = configs_by_user.get(recipient.user_id)
+                    self.logger.debug(f"Push configs for user {recipient.user_id}: {push_configs}")
+                    if not push_configs:
+                        continue
+
+                    notification_content = PushNotificationContent(
+                        created_at=timestamp_now(),
+                        new_message=NewMessageNotification(
+                            id=update.message_id,
+                            chat_id=update.chat_id,
+                            sent_at=update.msg_created_at,
+                            sender_id=update.sender_id,
+                            content=message_contents[update.message_id],
+                            match_data=chat.match_data,
+                            ticket_data=chat.ticket_data,
+                            user_data=ref_user_data,
+                        ),
                     )
 
+                    self._truncate_message(notification_content)
+                    if _should_anonymize_users := recipient.user_role != Role.SUPERVISOR:
+                        self._anonymize_message(notification_content)
+
+                    for config in push_configs:
+                        result.append(
+                            PreparedPushNotification(
+                                recipient_user_id=config.user_id,
+                                content=notification_content,
+                                client_credentials=ClientCredentials.parse_from_dict(
+                                    {
+                                        "endpoint": config.endpoint,
+                                        "keys": config.keys,
+                                    }
+                                ),
+                                device_id=config.device_id,
+                                ttl=MESSAGE_NOTIFICATION_TTL,
+                                urgency=Urgency.HIGH,
+                                topic=MESSAGE_NOTIFICATION_TOPIC.format(chat_id=update.chat_id),
+                            )
+                        )
+
             await conn.commit_transaction()
 
         return result
+
+    @staticmethod
+    async def _load_chat_context(conn: StorageProtocol, chat_id: int) -> _ChatContext:
+        users_in_chat = await conn.chats.get_users_in_chat(chat_id)
+
+        chat_info = await conn.chats.get_chat_by_id(chat_id)
+        if not chat_info:
+            raise InternalError(f"Chat with id {chat_id} was not found")
+
+        if chat_info.match_id:
+            match_info = await conn.matches.get_match_by_id(chat_info.match_id)
+            if not match_info:
+                raise InternalError(f"Match with id {chat_info.match_id} was not found")
+
+            match_data = NotificationMatchData(
+                id=match_info.sportlevel_id,
+                team_a_name_ru=match_info.team_a.name_ru,
+                team_b_name_ru=match_info.team_b.name_ru,
+                team_a_name_en=match_info.team_a.name_en,
+                team_b_name_en=match_info.team_b.name_en,
+            )
+        else:
+            match_data = None
+
+        if chat_info.chat_meta.assigned_ticket_id:
+            ticket_data = NotificationTicketData(id=chat_info.chat_meta.assigned_ticket_id)
+        else:
+            ticket_data = None
+
+        return _ChatContext(users_in_chat=users_in_chat, match_data=match_data, ticket_data=ticket_data)
@@ -44,8 +44,13 @@ class NewTicketNotificationsSender(BaseUpdateHandler[TicketCreated], update_type
                 ),
             )
 
+            configs_by_user = await self.get_active_configs_for_users(
+                db=conn,
+                user_ids=[user.sportlevel_id for user in supervisors],
+            )
+
             for user in supervisors:
-                if not (push_configs := await self.get_active_configs_for_user(db=conn, user_id=user.sportlevel_id)):
+                if not (push_configs := configs_by_user.get(user.sportlevel_id)):
                     continue
 
                 self.logger.debug(f"Push configs for user {user.sportlevel_id}: {push_configs}")
@@ -42,8 +42,14 @@ class TicketStatusChangedNotificationsSender(BaseUpdateHandler[TicketStatusChang
             else:
                 match_id = None
 
-            for recipient in {user for user in users_in_chat if user.user_id != update.changed_by_user_id}:
-                push_configs = await self.get_active_configs_for_user(db=conn, user_id=recipient.user_id)
+            recipients = {user for user in users_in_chat if user.user_id != update.changed_by_user_id}
+            configs_by_user = await self.get_active_configs_for_users(
+                db=conn,
+                user_ids=[recipient.user_id for recipient in recipients],
+            )
+
+            for recipient in recipients:
+                push_configs = configs_by_user.get(recipient.user_id)
                 self.logger.debug(f"Push configs for user {recipient.user_id}: {push_configs}")
                 if not push_configs:
                     continue
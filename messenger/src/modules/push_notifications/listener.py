@@ -6,9 +6,8 @@ from tenacity.stop import stop_after_attempt
 from web_pusher.exceptions import InvalidEndpointError, TryAgainLaterError
 
 from src.core.common import ProtectedProperty
-from src.core.common.rabbitmq import ConnectionHolder, ListenerAMQPArgs, QueueListener
+from src.core.common.rabbitmq import BatchQueueListener, ConnectionHolder, ListenerAMQPArgs
 from src.core.logger import LoggerName, get_logger
-from src.exceptions import InternalError
 from src.modules.storage import StorageServiceProto
 
 from .handlers.base import BaseUpdateHandler, PreparedPushNotification
@@ -23,7 +22,7 @@ from .settings import PushNotificationsListenerSettings
 
 class PushNotificationsListener(PushNotificationsListenerProto):
     _amqp_conn = ProtectedProperty[ConnectionHolder]()
-    _updates_listener = ProtectedProperty[QueueListener[SendPushQueueMessage]]()
+    _updates_listener = ProtectedProperty[BatchQueueListener[SendPushQueueMessage]]()
 
     def __init__(
         self,
@@ -58,7 +57,7 @@ class PushNotificationsListener(PushNotificationsListenerProto):
     async def start(self) -> None:
         await self._sender.start()
         await self._amqp_conn.start()
-        self._updates_listener = await QueueListener.create(
+        self._updates_listener = await BatchQueueListener.create(
             amqp_args=ListenerAMQPArgs(
                 exchange_durable=True,
                 exchange_name=PushNotificationsRMQOpts.exchange_name,
@@ -68,8 +67,10 @@ class PushNotificationsListener(PushNotificationsListenerProto):
             ),
             channel=await self._amqp_conn.get_channel_from_pool(),
             incoming_message_type=SendPushQueueMessage,
-            callback=self._handle_message,
+            callback=self._handle_batch,
             logger=self.logger.bind(subtype="listener"),
+            batch_size=self._settings.batch_size,
+            batch_window=self._settings.batch_window,
         )
         self.logger.debug("Listening for push notifications")
 
@@ -79,23 +80,48 @@ class PushNotificationsListener(PushNotificationsListenerProto):
         await self._sender.stop()
         self.logger.debug("Stopped listening for push notifications")
 
-    async def _handle_message(self, update: SendPushQueueMessage) -> None:
-        self.logger.debug(f"Received push notification update: {update}")
-        update_type = type(update.source_event)
-        handler = BaseUpdateHandler.handlers.get(update_type)
-        if not handler:
-            raise InternalError(f"Handler for {update_type} not found")
-
-        handler_instance = handler(
-            logger=self.logger,
-            settings=self._settings,
-            storage_srvc=self.storage,
-        )
-
-        notifications = await handler_instance.handle(update.source_event)
-
+    async def _handle_batch(self, updates: list[SendPushQueueMessage]) -> set[int]:
+        """
+        Prepares and sends notifications for a batch of updates, returns indexes of the updates that failed.
+        When a handler fails on a batch, its updates are retried one by one so that only broken ones are dropped
+        """
+        self.logger.debug(f"Received {len(updates)} push notification updates")
+        indexes_by_type: dict[type, list[int]] = {}
+        for index, update in enumerate(updates):
+            indexes_by_type.setdefault(type(update.source_event), []).append(index)
+
+        failed: set[int] = set()
+        notifications: list[PreparedPushNotification] = []
+        for update_type, indexes in indexes_by_type.items():
+            handler = BaseUpdateHandler.handlers.get(update_type)
+            if not handler:
+                self.logger.error(f"Handler for {update_type} not found")
+                failed.update(indexes)
+                continue
+
+            handler_instance = handler(
+                logger=self.logger,
+                settings=self._settings,
+                storage_srvc=self.storage,
+            )
+            try:
+                notifications.extend(await handler_instance.handle_batch([updates[i].source_event for i in indexes]))
+            except Exception:  # pylint: disable=broad-except
+                self.logger.warning(f"Failed to handle a batch of {update_type}, retrying one by one", exc_info=True)
+                for index in indexes:
+                    try:
+                        notifications.extend(await handler_instance.handle(updates[index].source_event))
+                    except Exception:  # pylint: disable=broad-except
+                        self.logger.error(
+                            "Failed to prepare push notifications",
+                            exc_info=True,
+                            update_str=repr(updates[index]),
+                        )
+                        failed.add(index)
+
+        notifications = self._collapse(notifications)
         if not notifications:
-            return
+            return failed
 
         notify_tasks = [self._retrier(self._send_notification, notification) for notification in notifications]
 
@@ -104,6 +130,20 @@ class PushNotificationsListener(PushNotificationsListenerProto):
             if isinstance(result, Exception):
                 self.logger.error("Failed to send push notification", exc_info=result)
 
+        return failed
+
+    @staticmethod
+    def _collapse(notifications: list[PreparedPushNotification]) -> list[PreparedPushNotification]:
+        """
+        Keeps only the latest notification per device and topic, notifications without a topic are all kept
+        """
+        collapsed: dict[tuple[str, str] | int, PreparedPushNotification] = {}
+        for index, notification in enumerate(notifications):
+            key = (notification.device_id, notification.topic) if notification.topic else index
+            collapsed.pop(key, None)
+            collapsed[key] = notification
+        return list(collapsed.values())
+
     async def _send_notification(self, notification: PreparedPushNotification) -> None:
         try:
             await self._sender.send_notification(
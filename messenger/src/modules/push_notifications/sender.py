@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import time
 
@@ -34,6 +35,7 @@ class PushNotificationsSender(PushNotificationsSenderProto):
             send_push_request_timeout=settings.send_push_request_timeout,
         )
         self._logger = get_logger(LoggerName.PUSH_SENDER)
+        self._requests_limit = asyncio.Semaphore(settings.max_concurrent_requests)
 
     async def start(self) -> None:
         self._logger.debug("Starting push notifications service")
@@ -79,13 +81,14 @@ class PushNotificationsSender(PushNotificationsSenderProto):
 
         tstart = time.perf_counter()
         try:
-            await self._client.send_push(
-                recipient=client_credentials,
-                payload=serialized_msg,
-                ttl=ttl,
-                urgency=urgency,
-                topic=topic,
-            )
+            async with self._requests_limit:
+                await self._client.send_push(
+                    recipient=client_credentials,
+                    payload=serialized_msg,
+                    ttl=ttl,
+                    urgency=urgency,
+                    topic=topic,
+                )
 
         except BadRequestError as exc:
             self._logger.warning(
@@ -21,6 +21,7 @@ class RetrySettings(BaseModel):
 class PushNotificationsSenderSettings(BaseModel):
     vapid: PushNotificationsVapidSettings
     send_push_request_timeout: float = 5.0
+    max_concurrent_requests: int = 50
 
 
 class PushNotificationsListenerSettings(BaseModel):
@@ -28,6 +29,8 @@ class PushNotificationsListenerSettings(BaseModel):
     retries: RetrySettings
     message_preview_length: int
     device_last_alive_threshold: timedelta
+    batch_size: int = 100
+    batch_window: float = 0.05
 
 
 class PushNotificationEventsPublisherSettings(BaseModel):
@@ -9,6 +9,7 @@ from src.core.common.redis import RedisPublisher
 from src.core.types import ConnectionId, LoggerType, ProtobufMessage, UserId
 from src.entities.redis import RedisPubSubChannelName
 from src.modules.auth import AuthServiceProto
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.connections import ConnectionsServiceProto
 from src.modules.presence import PresenceServiceProto
 from src.modules.service_updates import UpdatesListenerSettings
@@ -37,6 +38,7 @@ class BaseUpdateHandler(ABC, Generic[UpdateTypeT]):
         telegram_srvc: TelegramServiceProto,
         rabbitmq_publisher: RabbitMQPublisherFactoryProto,
         redis_publisher: RedisPublisher,
+        chat_members: ChatMembersCacheProto,
     ) -> None:
         self.logger = logger
         self.settings = settings
@@ -48,6 +50,7 @@ class BaseUpdateHandler(ABC, Generic[UpdateTypeT]):
         self.telegram_srvc = telegram_srvc
         self.rabbitmq_publisher = rabbitmq_publisher
         self.redis_publisher = redis_publisher
+        self.chat_members = chat_members
         self._id = str(uuid4())
 
     def __init_subclass__(
@@ -78,6 +81,10 @@ class BaseUpdateHandler(ABC, Generic[UpdateTypeT]):
 
         return False
 
+    async def _get_chat_member_ids(self, chat_id: int) -> list[UserId]:
+        members = await self.chat_members.get_members(chat_id)
+        return members.to_list() if members else []
+
     async def _broadcast_updates(
         self,
         update: ProtobufMessage,
@@ -123,6 +130,7 @@ async def call_handler(
     telegram_srvc: TelegramServiceProto,
     rabbitmq_publisher: RabbitMQPublisherFactoryProto,
     redis_publisher: RedisPublisher,
+    chat_members: ChatMembersCacheProto,
 ) -> None:
     handler_cls = BaseUpdateHandler._handlers.get(type(update))
     if not handler_cls:
@@ -140,6 +148,7 @@ async def call_handler(
         auth_srvc=auth_srvc,
         telegram_srvc=telegram_srvc,
         redis_publisher=redis_publisher,
+        chat_members=chat_members,
     )
 
     if handler_cls.check_overtime and await handler._is_overtime(update):
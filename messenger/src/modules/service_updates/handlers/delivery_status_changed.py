@@ -7,10 +7,11 @@ from sl_messenger_protobuf.updates_streamer_pb2 import UnreadCountersUpdate
 from src.core.common.redis import DecrementManyIfExists
 from src.core.types import ConnectionId
 from src.entities.messages import DeliveryStatus
-from src.entities.redis import RedisPubSubChannelName, UnreadCountCacheKey
+from src.entities.redis import UnreadCountCacheKey
 from src.modules.service_updates.entities import DeliveryStatusChanged
 from src.modules.service_updates.handlers.base import BaseUpdateHandler
 from src.modules.storage.models.chat import Chat
+from src.modules.unread_counters.streaming import pack_unread_counters, unread_counters_channel
 
 
 class DeliveryStatusChangedUpdateHandler(BaseUpdateHandler[DeliveryStatusChanged], update_type=DeliveryStatusChanged):
@@ -32,8 +33,7 @@ class DeliveryStatusChangedUpdateHandler(BaseUpdateHandler[DeliveryStatusChanged
         if not chat_info:
             raise RuntimeError(f"Chat was not found: {update=}")
 
-        async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(chat_info.id)
+        users_in_chat = await self._get_chat_member_ids(chat_info.id)
 
         await self._update_caches(update, chat_info)
 
@@ -69,7 +69,7 @@ class DeliveryStatusChangedUpdateHandler(BaseUpdateHandler[DeliveryStatusChanged
                         match_id=chat_info.match_id,
                     ),
                 ),
-                user_ids=[user.user_id for user in users_in_chat],
+                user_ids=users_in_chat,
                 skip_connection=cid,
                 skip_user=update.user_id,
             )
@@ -101,7 +101,9 @@ class DeliveryStatusChangedUpdateHandler(BaseUpdateHandler[DeliveryStatusChanged
                 decremented_to := decrement_result.get(UnreadCountCacheKey.TOTAL.format(user_id=update.user_id))
             ) is not None:
                 await self.redis_publisher.publish(
-                    channel_name=RedisPubSubChannelName.UNREAD_COUNTERS_UPDATES.format(user_id=update.user_id),
-                    data=UnreadCountersUpdate(user_id=update.user_id, unread_count=decremented_to).SerializeToString(),
+                    channel_name=unread_counters_channel(update.user_id),
+                    data=pack_unread_counters(
+                        [UnreadCountersUpdate(user_id=update.user_id, unread_count=decremented_to)]
+                    ),
                     warn_no_consumers_found=False,
                 )
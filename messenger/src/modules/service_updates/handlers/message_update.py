@@ -11,8 +11,7 @@ from src.modules.service_updates.handlers.base import BaseUpdateHandler
 
 class EditMessageHandler(BaseUpdateHandler[MessageEdited], update_type=MessageEdited):
     async def handle(self, cid: ConnectionId | None, update: MessageEdited) -> None:
-        async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(update.chat_id)
+        users_in_chat = await self._get_chat_member_ids(update.chat_id)
 
         chat_update = ServerMessage(
             message_edited_update=MessageEditedUpdate(
@@ -24,14 +23,13 @@ class EditMessageHandler(BaseUpdateHandler[MessageEdited], update_type=MessageEd
 
         await self._broadcast_updates(
             chat_update,
-            user_ids=[user.user_id for user in users_in_chat],
+            user_ids=users_in_chat,
         )
 
 
 class DeleteMessageHandler(BaseUpdateHandler[MessageDeleted], update_type=MessageDeleted):
     async def handle(self, cid: ConnectionId | None, update: MessageDeleted) -> None:
-        async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(update.chat_id)
+        users_in_chat = await self._get_chat_member_ids(update.chat_id)
 
         chat_update = ServerMessage(
             message_deleted_update=MessageDeletedUpdate(
@@ -42,5 +40,5 @@ class DeleteMessageHandler(BaseUpdateHandler[MessageDeleted], update_type=Messag
 
         await self._broadcast_updates(
             chat_update,
-            user_ids=[user.user_id for user in users_in_chat],
+            user_ids=users_in_chat,
         )
@@ -9,13 +9,13 @@ from sl_messenger_protobuf.responses_pb2 import MessageReceivedUpdate
 from sl_messenger_protobuf.updates_streamer_pb2 import UnreadCountersUpdate
 
 from src.core.common.redis import IncrementManyIfExists
-from src.core.types import ConnectionId
-from src.entities.redis import RedisPubSubChannelName, UnreadCountCacheKey
-from src.entities.users import ChatUserDTO
+from src.core.types import ConnectionId, UserId
+from src.entities.redis import UnreadCountCacheKey
 from src.modules.push_notifications import PushNotificationsRMQOpts, SendPushQueueMessage
 from src.modules.service_updates.entities import MessageSentToChat
 from src.modules.service_updates.handlers.base import BaseUpdateHandler
 from src.modules.storage.models.chat import Chat
+from src.modules.unread_counters.streaming import group_by_channel, pack_unread_counters
 
 
 class NewMessageUpdateHandler(BaseUpdateHandler[MessageSentToChat], update_type=MessageSentToChat):
@@ -58,8 +58,7 @@ class NewMessageUpdateHandler(BaseUpdateHandler[MessageSentToChat], update_type=
         if not chat_info:
             raise RuntimeError(f"Chat was not found: {update=}")
 
-        async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(update.chat_id)
+        users_in_chat = await self._get_chat_member_ids(update.chat_id)
 
         await self._update_caches(
             update=update,
@@ -86,7 +85,7 @@ class NewMessageUpdateHandler(BaseUpdateHandler[MessageSentToChat], update_type=
 
         await self._broadcast_updates(
             chat_update,
-            user_ids=[user.user_id for user in users_in_chat],
+            user_ids=users_in_chat,
             skip_connection=cid,
         )
 
@@ -99,25 +98,25 @@ class NewMessageUpdateHandler(BaseUpdateHandler[MessageSentToChat], update_type=
         self,
         update: MessageSentToChat,
         chat_info: Chat,
-        users_in_chat: list[ChatUserDTO],
+        users_in_chat: list[UserId],
     ) -> None:
-        users_to_update_cache = [user_info for user_info in users_in_chat if user_info.user_id != update.sender_id]
+        users_to_update_cache = [user_id for user_id in users_in_chat if user_id != update.sender_id]
 
-        incr_keys = [UnreadCountCacheKey.TOTAL.format(user_id=user_info.user_id) for user_info in users_to_update_cache]
+        incr_keys = [UnreadCountCacheKey.TOTAL.format(user_id=user_id) for user_id in users_to_update_cache]
 
         if not update.do_not_increment_counter:
             incr_keys.extend(
                 [
-                    UnreadCountCacheKey.BY_CHAT.format(user_id=user_info.user_id, chat_id=update.chat_id)
-                    for user_info in users_to_update_cache
+                    UnreadCountCacheKey.BY_CHAT.format(user_id=user_id, chat_id=update.chat_id)
+                    for user_id in users_to_update_cache
                 ]
             )
 
             if chat_info.match_id:
                 incr_keys.extend(
                     [
-                        UnreadCountCacheKey.BY_MATCH.format(user_id=user_info.user_id, match_id=chat_info.match_id)
-                        for user_info in users_to_update_cache
+                        UnreadCountCacheKey.BY_MATCH.format(user_id=user_id, match_id=chat_info.match_id)
+                        for user_id in users_to_update_cache
                     ]
                 )
 
@@ -127,22 +126,20 @@ class NewMessageUpdateHandler(BaseUpdateHandler[MessageSentToChat], update_type=
         if not incr_result:
             return
 
-        pipeline = self.redis_publisher.redis_conn.pipeline()
-
+        updates = []
         for key, value in incr_result.items():
             if "[total]" not in key:
                 continue
 
             user_id = int(UnreadCountCacheKey.TOTAL.parse(key)["user_id"])
+            updates.append(UnreadCountersUpdate(user_id=user_id, unread_count=value))
 
-            channel_name = RedisPubSubChannelName.UNREAD_COUNTERS_UPDATES.format(user_id=user_id)
-            pipeline.publish(
-                channel=channel_name,
-                message=UnreadCountersUpdate(
-                    user_id=user_id,
-                    unread_count=value,
-                ).SerializeToString(),
-            )
-            self.logger.debug(f"Publishing unread counters update: {user_id=}, {channel_name=} count={value}")
+        if not updates:
+            return
+
+        pipeline = self.redis_publisher.redis_conn.pipeline()
+        for channel_name, channel_updates in group_by_channel(updates).items():
+            pipeline.publish(channel=channel_name, message=pack_unread_counters(channel_updates))
+            self.logger.debug(f"Publishing unread counters updates: {channel_name=} count={len(channel_updates)}")
 
         await pipeline.execute()
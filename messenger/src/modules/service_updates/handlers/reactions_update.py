@@ -8,8 +8,7 @@ from src.modules.service_updates.handlers.base import BaseUpdateHandler
 
 class ReactionUpdateHandler(BaseUpdateHandler[ReactionUpdatedMessage], update_type=ReactionUpdatedMessage):
     async def handle(self, cid: ConnectionId | None, update: ReactionUpdatedMessage) -> None:
-        async with self.storage_srvc.connect() as conn:
-            users_in_chat = await conn.chats.get_users_in_chat(update.chat_id)
+        users_in_chat = await self._get_chat_member_ids(update.chat_id)
 
         chat_update = ServerMessage(
             reaction_update=ReactionUpdate(
@@ -24,5 +23,5 @@ class ReactionUpdateHandler(BaseUpdateHandler[ReactionUpdatedMessage], update_ty
 
         await self._broadcast_updates(
             chat_update,
-            user_ids=[user.user_id for user in users_in_chat],
+            user_ids=users_in_chat,
         )
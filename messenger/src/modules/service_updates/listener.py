@@ -12,6 +12,7 @@ from src.core.common.rabbitmq import (
 from src.core.common.redis import RedisPublisher, create_redis_conn_pool
 from src.core.logger import LoggerName, get_logger
 from src.modules.auth.interface import AuthServiceProto
+from src.modules.chat_members import ChatMembersCacheProto
 from src.modules.connections import ConnectionsServiceProto
 from src.modules.presence import PresenceServiceProto
 from src.modules.service_updates.entities import IncomingServiceUpdateModel, ServiceUpdate
@@ -36,6 +37,7 @@ class UpdatesListenerService(UpdatesListenerProto):
         storage_service: StorageServiceProto,
         telegram_service: TelegramServiceProto,
         rabbitmq_publisher: RabbitMQPublisherFactoryProto,
+        chat_members: ChatMembersCacheProto,
     ) -> None:
         self.logger = get_logger(LoggerName.UPDATES_LISTENER)
         self.settings = settings
@@ -47,6 +49,7 @@ class UpdatesListenerService(UpdatesListenerProto):
         self.presence_srvc = presence_service
         self.telegram_srvc = telegram_service
         self.rabbitmq_publisher = rabbitmq_publisher
+        self.chat_members = chat_members
 
         self.amqp_conn = ConnectionHolder(settings=self.settings.amqp, logger=self.logger.bind(subtype="connection"))
         self.redis_publisher = RedisPublisher(
@@ -99,6 +102,7 @@ class UpdatesListenerService(UpdatesListenerProto):
                 telegram_srvc=self.telegram_srvc,
                 rabbitmq_publisher=self.rabbitmq_publisher,
                 redis_publisher=self.redis_publisher,
+                chat_members=self.chat_members,
             )
 
         except DropMessageError:
@@ -1,6 +1,6 @@
 from contextlib import asynccontextmanager
 from time import perf_counter
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Iterable
 
 from sqlalchemy.engine import Connection, ExecutionContext
 from sqlalchemy.event import listens_for
@@ -71,3 +71,15 @@ async def autocommit_session(session_factory: async_sessionmaker[AsyncSession])
     async with session_factory() as session:
         await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
         yield session
+
+
+CHANGED_CHAT_VERSIONS = "changed_chat_versions"
+
+
+def mark_chat_versions_changed(session: AsyncSession, chat_ids: Iterable[int]) -> None:
+    """Remembers chats whose version was bumped in the current transaction"""
+    session.info.setdefault(CHANGED_CHAT_VERSIONS, set()).update(chat_ids)
+
+
+def pop_changed_chat_versions(session: AsyncSession) -> set[int]:
+    return session.info.pop(CHANGED_CHAT_VERSIONS, set())
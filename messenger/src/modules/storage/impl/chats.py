@@ -1,7 +1,8 @@
 from datetime import datetime
 from itertools import chain
+from typing import Iterable
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import and_, delete, func, or_, select, update
 from sqlalchemy import text as sqla_text
 from sqlalchemy import true as sqla_true
 from sqlalchemy.dialects.postgresql import aggregate_order_by
@@ -19,6 +20,7 @@ from src.entities.chats import (
 )
 from src.entities.matches import ChatType
 from src.entities.users import ChatUserDTO, Role
+from src.modules.storage.helpers import mark_chat_versions_changed
 from src.modules.storage.impl.query_builders import ChatsQueryBuilder
 from src.modules.storage.interface import ChatOperationsProtocol
 from src.modules.storage.models import Chat, ChatMembership, Message
@@ -35,6 +37,11 @@ class ChatOperations(ChatOperationsProtocol):
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_chat_versions(self, chat_ids: Iterable[int]) -> dict[int, int]:
+        query = select(Chat.id, Chat.version).where(Chat.id.in_(list(chat_ids)))
+        result = await self.session.execute(query)
+        return dict(result.tuples().all())
+
     async def get_chat_by_id(self, chat_id: int) -> Chat | None:
         query = select(Chat).where(Chat.id == chat_id)
         result = await self.session.execute(query)
@@ -173,6 +180,7 @@ class ChatOperations(ChatOperationsProtocol):
             .where(Chat.id.in_(chat_ids))
         )
         await self.session.execute(query)
+        mark_chat_versions_changed(self.session, chat_ids)
 
     async def reopen_chat(self, chat_id: int) -> None:
         query = (
@@ -181,6 +189,7 @@ class ChatOperations(ChatOperationsProtocol):
             .where(Chat.id == chat_id)
         )
         await self.session.execute(query)
+        mark_chat_versions_changed(self.session, [chat_id])
 
     async def update_meta(self, chat_id: int, meta: ChatMeta) -> None:
         updates = chain.from_iterable([key, value] for key, value in meta.dict(exclude_unset=True).items())
@@ -195,6 +204,7 @@ class ChatOperations(ChatOperationsProtocol):
             .where(Chat.id == chat_id)
         )
         await self.session.execute(query)
+        mark_chat_versions_changed(self.session, [chat_id])
 
     async def add_user_to_chat(
         self,
@@ -209,6 +219,13 @@ class ChatOperations(ChatOperationsProtocol):
         if await self.is_user_in_chat(chat_id=chat_id, user_id=user_id):
             return False
 
+        # All messages of the chat are unread for a new member (last_read_message_id=0)
+        unread_count_query = select(func.count(Message.id)).where(
+            Message.chat_id == chat_id,
+            or_(Message.sender_id != user_id, Message.sender_id.is_(None)),
+        )
+        unread_count = (await self.session.execute(unread_count_query)).scalar_one()
+
         membership = ChatMembership(
             user_id=user_id,
             chat_id=chat_id,
@@ -222,6 +239,7 @@ class ChatOperations(ChatOperationsProtocol):
             last_available_message_id=None,
             first_available_message_id=None,
             is_archive_member=False,
+            unread_count=unread_count,
         )
         self.session.add(membership)
         await self.session.flush()
@@ -373,6 +391,7 @@ class ChatOperations(ChatOperationsProtocol):
             update(Chat).values(updated_at=datetime_now(), version=Chat.version + 1).where(Chat.id == chat_id)
         )
         await self.session.execute(update_chat_q)
+        mark_chat_versions_changed(self.session, [chat_id])
 
     async def get_inactive_chats_to_close(self, last_message_threshold: datetime) -> list[int]:
         last_message_lateral = (
@@ -39,6 +39,8 @@ class MessageOperations(MessageOperationsProtocol):
         )
         self.session.add(msg)
         await self.session.flush()
+
+        await self._increment_unread_counters(chat_id=chat_id, sender_id=sender_id)
         return msg
 
     async def update_message(
@@ -370,6 +372,10 @@ class MessageOperations(MessageOperationsProtocol):
         result = await self.session.execute(query)
         ids_to_update = result.scalars().all()
 
+        values: dict[str, Any] = {attr_name: message_id}
+        if status == DeliveryStatus.READ:
+            values["unread_count"] = func.greatest(ChatMembership.unread_count - len(ids_to_update), 0)
+
         update_q = (
             update(ChatMembership)
             .where(
@@ -377,7 +383,7 @@ class MessageOperations(MessageOperationsProtocol):
                 ChatMembership.chat_id == chat_id,
                 prop < message_id,
             )
-            .values(**{attr_name: message_id})
+            .values(**values)
             .returning(prop)
         )
         result = await self.session.execute(update_q)
@@ -435,8 +441,38 @@ class MessageOperations(MessageOperationsProtocol):
         if is_updated is None:
             return []
 
+        await self._recount_unread_counter(chat_id=chat_id, user_id=user_id)
         return list(ids_to_update)
 
+    async def _increment_unread_counters(self, chat_id: int, sender_id: int | None) -> None:
+        """Write-through maintenance of `ChatMembership.unread_count` for a new message"""
+        query = update(ChatMembership).where(ChatMembership.chat_id == chat_id)
+        if sender_id is not None:
+            query = query.where(ChatMembership.user_id != sender_id)
+
+        await self.session.execute(query.values(unread_count=ChatMembership.unread_count + 1))
+
+    async def _recount_unread_counter(self, chat_id: int, user_id: int) -> None:
+        """Recalculates `ChatMembership.unread_count` from messages after `last_read_message_id`"""
+        unread_count_subquery = (
+            select(func.count(Message.id))
+            .where(
+                Message.chat_id == chat_id,
+                Message.id > ChatMembership.last_read_message_id,
+                or_(
+                    Message.sender_id != user_id,
+                    Message.sender_id.is_(None),
+                ),
+            )
+            .correlate(ChatMembership)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(ChatMembership)
+            .where(ChatMembership.user_id == user_id, ChatMembership.chat_id == chat_id)
+            .values(unread_count=unread_count_subquery)
+        )
+
     async def _update_msg_delivery_statuses(
         self,
         message_ids: list[int],
@@ -58,6 +58,24 @@ class PushNotificationConfigsOperations(PushNotificationConfigsOperationsProtoco
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_configs_for_users(self, user_ids: list[int]) -> dict[int, list[PushNotificationConfig]]:
+        configs: dict[int, list[PushNotificationConfig]] = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return configs
+
+        query = select(PushNotificationConfig).where(PushNotificationConfig.user_id.in_(set(user_ids)))
+        result = await self.session.execute(query)
+        for config in result.scalars().all():
+            configs[config.user_id].append(config)
+        return configs
+
+    async def remove_configs_by_device_ids(self, device_ids: list[str]) -> None:
+        if not device_ids:
+            return
+
+        query = delete(PushNotificationConfig).where(PushNotificationConfig.device_id.in_(device_ids))
+        await self.session.execute(query)
+
     async def invalidate_configs(self, user_id: int) -> None:
         query = delete(PushNotificationConfig).where(PushNotificationConfig.user_id == user_id)
         await self.session.execute(query)
@@ -1,27 +1,22 @@
 from typing import Any
 
-from sqlalchemy import Select, and_, func, or_, select
-from sqlalchemy import true as sqla_true
-from sqlalchemy.sql.selectable import LateralFromClause
+from sqlalchemy import Select, func, or_, select
 
 from src.core.types import UserId
 from src.entities.matches import ChatType
-from src.modules.storage.models import Chat, ChatMembership, Match, Message
+from src.modules.storage.models import Chat, ChatMembership, Message
 
 
 class UnreadCountersQueryBuilder:
     def __init__(self, user_id: UserId) -> None:
         self.user_id = user_id
 
-        self.unread_by_chat_lateral = self._build_chat_unread_count_lateral()
-        self.unread_by_match_lateral = self._build_match_unread_count_lateral()
-
     def build_total_unread_count_query(self, chat_type: ChatType | None) -> Select[tuple[int]]:
         query = (
-            select(func.sum(self.unread_by_chat_lateral.c.count))
-            .select_from(Chat)
-            .join(ChatMembership, and_(ChatMembership.chat_id == Chat.id, ChatMembership.user_id == self.user_id))
-            .join(self.unread_by_chat_lateral, sqla_true())
+            select(func.sum(ChatMembership.unread_count))
+            .select_from(ChatMembership)
+            .join(Chat, Chat.id == ChatMembership.chat_id)
+            .where(ChatMembership.user_id == self.user_id)
         )
 
         match chat_type:
@@ -36,77 +31,78 @@ class UnreadCountersQueryBuilder:
 
     def build_unread_count_by_chat_query(self, chat_id: int) -> Select[tuple[int]]:
         return (
-            select(self.unread_by_chat_lateral.c.count.label("unread_count"))
-            .select_from(Chat)
-            .join(ChatMembership, and_(ChatMembership.chat_id == Chat.id, ChatMembership.user_id == self.user_id))
-            .join(self.unread_by_chat_lateral, sqla_true())
-            .where(Chat.id == chat_id)
+            select(ChatMembership.unread_count.label("unread_count"))
+            .select_from(ChatMembership)
+            .where(ChatMembership.user_id == self.user_id, ChatMembership.chat_id == chat_id)
         )
 
     def build_unread_count_by_chats_query(self, chat_ids: list[int]) -> Select[tuple[int, int]]:
         return (
-            select(self.unread_by_chat_lateral.c.count.label("unread_count"), Chat.id.label("chat_id"))
-            .select_from(Chat)
-            .join(ChatMembership, and_(ChatMembership.chat_id == Chat.id, ChatMembership.user_id == self.user_id))
-            .join(self.unread_by_chat_lateral, sqla_true())
-            .where(Chat.id.in_(chat_ids))
+            select(ChatMembership.unread_count.label("unread_count"), ChatMembership.chat_id.label("chat_id"))
+            .select_from(ChatMembership)
+            .where(ChatMembership.user_id == self.user_id, ChatMembership.chat_id.in_(chat_ids))
         )
 
     def build_unread_count_by_match_query(self, match_id: int) -> Select[tuple[int]]:
         return (
-            select(self.unread_by_match_lateral.c.unread_count.label("unread_count"))
-            .select_from(Match)
-            .join(Chat, Chat.match_id == Match.sportlevel_id)
-            .join(ChatMembership, and_(ChatMembership.chat_id == Chat.id, ChatMembership.user_id == self.user_id))
-            .join(self.unread_by_match_lateral, sqla_true())
-            .where(Match.sportlevel_id == match_id)
+            select(func.sum(ChatMembership.unread_count).label("unread_count"))
+            .select_from(ChatMembership)
+            .join(Chat, Chat.id == ChatMembership.chat_id)
+            .where(ChatMembership.user_id == self.user_id, Chat.match_id == match_id)
         )
 
     def build_unread_count_by_matches_query(self, match_ids: list[int]) -> Select[tuple[int, int]]:
         return (  # type: ignore
             select(
-                self.unread_by_match_lateral.c.unread_count.label("unread_count"),
+                func.sum(ChatMembership.unread_count).label("unread_count"),
                 Chat.match_id.label("match_id"),
             )
-            .select_from(Match)
-            .join(Chat, Chat.match_id == Match.sportlevel_id)
-            .join(ChatMembership, and_(ChatMembership.chat_id == Chat.id, ChatMembership.user_id == self.user_id))
-            .join(self.unread_by_match_lateral, sqla_true())
-            .where(Match.sportlevel_id.in_(match_ids))
+            .select_from(ChatMembership)
+            .join(Chat, Chat.id == ChatMembership.chat_id)
+            .where(ChatMembership.user_id == self.user_id, Chat.match_id.in_(match_ids))
+            .group_by(Chat.match_id)
         )
 
-    def _build_chat_unread_count_lateral(self) -> LateralFromClause[int]:
-        """Subquery - count unread messages for chat, uses Chat.id, ChatMembership.last_read_message_id"""
+    def build_unread_counters_query(self) -> Select[tuple[int, ChatType, int | None, int]]:
+        """All counters of the user, used to hydrate the cache in bulk"""
         return (
-            select(
-                func.count(Message.id).label("count"),
-            )
-            .select_from(Message)
+            select(ChatMembership.chat_id, Chat.type, Chat.match_id, ChatMembership.unread_count)
+            .select_from(ChatMembership)
+            .join(Chat, Chat.id == ChatMembership.chat_id)
+            .where(ChatMembership.user_id == self.user_id)
+        )
+
+    @staticmethod
+    def build_unread_counters_drift_query(after_id: int, limit: int) -> Select[Any]:
+        """
+        Page of memberships ordered by id with the stored and the actual unread count,
+        the actual one is calculated from messages the same way as before materialization
+        """
+        actual_count = (
+            select(func.count(Message.id))
             .where(
+                Message.chat_id == ChatMembership.chat_id,
+                Message.id > ChatMembership.last_read_message_id,
                 or_(
-                    Message.sender_id != self.user_id,
+                    Message.sender_id != ChatMembership.user_id,
                     Message.sender_id.is_(None),
                 ),
-                Message.chat_id == Chat.id,
-                Message.id > ChatMembership.last_read_message_id,
             )
-            .correlate(Chat, ChatMembership)
-            .lateral("chat_unread_single_subq")
+            .correlate(ChatMembership)
+            .scalar_subquery()
         )
-
-    def _build_match_unread_count_lateral(self) -> LateralFromClause[Any]:
-        """Generates subquery that selects unread count for match, lateral to Match"""
-        chat_unread_single_subq = self._build_chat_unread_count_lateral()
-
         return (
             select(
-                func.sum(chat_unread_single_subq.c.count).label("unread_count"),
+                ChatMembership.id,
+                ChatMembership.user_id,
+                ChatMembership.chat_id,
+                Chat.match_id,
+                ChatMembership.unread_count,
+                actual_count.label("actual_count"),
             )
-            .select_from(Chat)
-            .join(ChatMembership, and_(Chat.id == ChatMembership.chat_id, ChatMembership.user_id == self.user_id))
-            .join(chat_unread_single_subq, sqla_true())
-            .where(Chat.match_id == Match.sportlevel_id)
-            .group_by(Chat.match_id)
-            .correlate(Match)
-            .lateral("match_unread_subq")
+            .select_from(ChatMembership)
+            .join(Chat, Chat.id == ChatMembership.chat_id)
+            .where(ChatMembership.id > after_id)
+            .order_by(ChatMembership.id)
+            .limit(limit)
         )
@@ -1,13 +1,78 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import distinct, func, or_, select
+from sqlalchemy import ColumnElement, Date, and_, cast, delete, distinct, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.entities.statistics import TicketStatistics
 from src.entities.tickets import TicketStatus
 from src.exceptions import InternalError
 from src.modules.storage.interface import StatsOperationsProtocol
-from src.modules.storage.models import Ticket, TicketStatusLog
+from src.modules.storage.models import Ticket, TicketStatsDaily, TicketStatsSolved, TicketStatusLog
+from src.modules.storage.models.statistics import UNASSIGNED_USER_ID
+
+SOLVED_STATUSES = (TicketStatus.CONFIRMED, TicketStatus.SOLVED)
+
+DAILY_COUNTERS = (
+    "returned_count",
+    "first_response_count",
+    "first_response_time_sum",
+    "solve_count",
+    "solve_time_sum",
+)
+
+
+def status_log_counters(
+    old_status: TicketStatus,
+    new_status: TicketStatus,
+    time_after_last_status: int,
+) -> dict[str, int]:
+    """
+    Daily counters increments for a single status log, must match `_daily_counters_columns`
+    """
+    returned = old_status == TicketStatus.SOLVED and new_status == TicketStatus.IN_PROGRESS
+    first_response = old_status == TicketStatus.NEW and new_status == TicketStatus.IN_PROGRESS
+    solve = new_status == TicketStatus.SOLVED
+    return {
+        "returned_count": int(returned),
+        "first_response_count": int(first_response),
+        "first_response_time_sum": time_after_last_status if first_response else 0,
+        "solve_count": int(solve),
+        "solve_time_sum": time_after_last_status if solve else 0,
+    }
+
+
+def _log_day() -> ColumnElement[date]:
+    return cast(func.timezone("UTC", TicketStatusLog.created_at), Date)
+
+
+def _log_user() -> ColumnElement[int]:
+    return func.coalesce(Ticket.assigned_to_user_id, UNASSIGNED_USER_ID)
+
+
+def _daily_counters_columns() -> list[ColumnElement[int]]:
+    returned = and_(
+        TicketStatusLog.old_status == TicketStatus.SOLVED,
+        TicketStatusLog.new_status == TicketStatus.IN_PROGRESS,
+    )
+    first_response = and_(
+        TicketStatusLog.old_status == TicketStatus.NEW,
+        TicketStatusLog.new_status == TicketStatus.IN_PROGRESS,
+    )
+    solve = TicketStatusLog.new_status == TicketStatus.SOLVED
+    return [
+        func.count().filter(returned).label("returned_count"),
+        func.count().filter(first_response).label("first_response_count"),
+        func.coalesce(func.sum(TicketStatusLog.time_after_last_status).filter(first_response), 0).label(
+            "first_response_time_sum"
+        ),
+        func.count().filter(solve).label("solve_count"),
+        func.coalesce(func.sum(TicketStatusLog.time_after_last_status).filter(solve), 0).label("solve_time_sum"),
+    ]
+
+
+def _avg(total: int, count: int) -> int:
+    return total // count if count else 0
 
 
 class StatisticsOperations(StatsOperationsProtocol):
@@ -15,11 +80,49 @@ class StatisticsOperations(StatsOperationsProtocol):
         self.session = session
 
     async def get_ticket_stats(
+        self,
+        for_user: int | None,
+        date_from: date,
+        date_to: date,
+    ) -> TicketStatistics:
+        """
+        Statistics for the days from `date_from` to `date_to` inclusive, summed from the daily rollups
+        """
+        solved_query = select(func.count(distinct(TicketStatsSolved.ticket_id))).where(
+            TicketStatsSolved.day >= date_from,
+            TicketStatsSolved.day <= date_to,
+        )
+        query = select(
+            *(func.coalesce(func.sum(getattr(TicketStatsDaily, name)), 0).label(name) for name in DAILY_COUNTERS)
+        ).where(
+            TicketStatsDaily.day >= date_from,
+            TicketStatsDaily.day <= date_to,
+        )
+        if for_user:
+            solved_query = solved_query.where(TicketStatsSolved.user_id == for_user)
+            query = query.where(TicketStatsDaily.user_id == for_user)
+
+        query = query.add_columns(solved_query.scalar_subquery().label("solved_tickets_count"))
+        result = await self.session.execute(query)
+        if not (first := result.mappings().fetchone()):
+            raise InternalError("Invalid SQL query result")
+
+        return TicketStatistics(
+            solved_tickets_count=first["solved_tickets_count"],
+            returned_tickets_count=first["returned_count"],
+            avg_time_to_first_response=_avg(first["first_response_time_sum"], first["first_response_count"]),
+            avg_time_to_solve=_avg(first["solve_time_sum"], first["solve_count"]),
+        )
+
+    async def get_ticket_stats_raw(
         self,
         for_user: int | None,
         date_from: datetime,
         date_to: datetime,
     ) -> TicketStatistics:
+        """
+        Statistics calculated from the status logs, used to check the rollups
+        """
         query = (
             select(
                 (
@@ -74,3 +177,95 @@ class StatisticsOperations(StatsOperationsProtocol):
             avg_time_to_first_response=int(first["avg_time_to_first_response"]),
             avg_time_to_solve=int(first["avg_time_to_solve"]),
         )
+
+    async def add_status_log(self, status_log: TicketStatusLog, assigned_to_user_id: int | None) -> None:
+        """
+        Updates the rollups with a new status log
+        """
+        user_id = assigned_to_user_id or UNASSIGNED_USER_ID
+        day = status_log.created_at.date()
+        counters = status_log_counters(
+            status_log.old_status,
+            status_log.new_status,
+            status_log.time_after_last_status,
+        )
+        if any(counters.values()):
+            await self._increment_daily([{"user_id": user_id, "day": day, **counters}])
+
+        if status_log.new_status in SOLVED_STATUSES:
+            await self.session.execute(
+                insert(TicketStatsSolved)
+                .values(ticket_id=status_log.ticket_id, day=day, user_id=user_id)
+                .on_conflict_do_nothing()
+            )
+
+    async def move_ticket_stats(self, ticket_id: int, from_user_id: int | None, to_user_id: int | None) -> None:
+        """
+        Moves ticket contribution to the rollups on reassignment, statistics are reported by the current assignee
+        """
+        from_user_id = from_user_id or UNASSIGNED_USER_ID
+        to_user_id = to_user_id or UNASSIGNED_USER_ID
+        if from_user_id == to_user_id:
+            return
+
+        query = (
+            select(_log_day().label("day"), *_daily_counters_columns())
+            .where(TicketStatusLog.ticket_id == ticket_id)
+            .group_by(_log_day())
+        )
+        result = await self.session.execute(query)
+        values = []
+        for row in result.mappings().fetchall():
+            counters = {name: row[name] for name in DAILY_COUNTERS}
+            if not any(counters.values()):
+                continue
+
+            values.append({"user_id": from_user_id, "day": row["day"], **{k: -v for k, v in counters.items()}})
+            values.append({"user_id": to_user_id, "day": row["day"], **counters})
+
+        if values:
+            await self._increment_daily(values)
+
+        await self.session.execute(
+            update(TicketStatsSolved).values(user_id=to_user_id).where(TicketStatsSolved.ticket_id == ticket_id)
+        )
+
+    async def rebuild_ticket_stats(self, date_from: date, date_to: date) -> None:
+        """
+        Recalculates the rollups for the days from `date_from` to `date_to` inclusive from the status logs
+        """
+        await self.session.execute(
+            delete(TicketStatsDaily).where(TicketStatsDaily.day >= date_from, TicketStatsDaily.day <= date_to)
+        )
+        await self.session.execute(
+            delete(TicketStatsSolved).where(TicketStatsSolved.day >= date_from, TicketStatsSolved.day <= date_to)
+        )
+
+        in_range = and_(_log_day() >= date_from, _log_day() <= date_to)
+        daily_query = (
+            select(_log_user().label("user_id"), _log_day().label("day"), *_daily_counters_columns())
+            .select_from(Ticket)
+            .join(TicketStatusLog, TicketStatusLog.ticket_id == Ticket.id)
+            .where(in_range)
+            .group_by(_log_user(), _log_day())
+        )
+        await self.session.execute(
+            insert(TicketStatsDaily).from_select(["user_id", "day", *DAILY_COUNTERS], daily_query)
+        )
+
+        solved_query = (
+            select(Ticket.id, _log_day(), _log_user())
+            .select_from(Ticket)
+            .join(TicketStatusLog, TicketStatusLog.ticket_id == Ticket.id)
+            .where(in_range, TicketStatusLog.new_status.in_(SOLVED_STATUSES))
+            .group_by(Ticket.id, _log_day())
+        )
+        await self.session.execute(insert(TicketStatsSolved).from_select(["ticket_id", "day", "user_id"], solved_query))
+
+    async def _increment_daily(self, values: list[dict[str, int | date]]) -> None:
+        query = insert(TicketStatsDaily).values(values)
+        query = query.on_conflict_do_update(
+            index_elements=[TicketStatsDaily.user_id, TicketStatsDaily.day],
+            set_={name: getattr(TicketStatsDaily, name) + getattr(query.excluded, name) for name in DAILY_COUNTERS},
+        )
+        await self.session.execute(query)
@@ -12,15 +12,16 @@ from src.entities.tickets import TicketCloseReason, TicketFilters, TicketStatus
 from src.entities.users import Language, Role
 from src.modules.storage.impl.query_builders import TicketsQueryBuilder
 from src.modules.storage.impl.query_builders.common import get_count
-from src.modules.storage.interface import TicketOperationsProtocol
+from src.modules.storage.interface import StatsOperationsProtocol, TicketOperationsProtocol
 from src.modules.storage.models import Chat, Ticket, TicketStatusLog
 from src.providers.i18n import parse_message_content
 from src.providers.time import datetime_now
 
 
 class TicketOperations(TicketOperationsProtocol):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, statistics: StatsOperationsProtocol) -> None:
         self.session = session
+        self._statistics = statistics
 
     def _compose_result(self, row: RowMapping) -> TicketInfo:
         last_message_id = row.last_message_id
@@ -160,6 +161,7 @@ class TicketOperations(TicketOperationsProtocol):
             new_status=new_status,
             updated_by=updated_by,
             last_status_updated_at=last_status_updated_at,
+            assigned_to_user_id=ticket.assigned_to_user_id,
         )
 
         return True
@@ -191,6 +193,7 @@ class TicketOperations(TicketOperationsProtocol):
             new_status=TicketStatus.SOLVED,
             updated_by=updated_by,
             last_status_updated_at=last_status_updated_at,
+            assigned_to_user_id=ticket.assigned_to_user_id,
         )
 
     async def get_ticket_detailed(
@@ -210,6 +213,9 @@ class TicketOperations(TicketOperationsProtocol):
         return self._compose_result(row)
 
     async def assign_to_user(self, ticket_id: int, user_id: int) -> None:
+        query = select(Ticket.assigned_to_user_id).where(Ticket.id == ticket_id).with_for_update()
+        old_user_id = (await self.session.execute(query)).scalar_one_or_none()
+
         update_q = (
             update(Ticket)
             .values(
@@ -218,6 +224,7 @@ class TicketOperations(TicketOperationsProtocol):
             .where(Ticket.id == ticket_id)
         )
         await self.session.execute(update_q)
+        await self._statistics.move_ticket_stats(ticket_id=ticket_id, from_user_id=old_user_id, to_user_id=user_id)
 
     async def _save_ticket_status_log(
         self,
@@ -226,6 +233,7 @@ class TicketOperations(TicketOperationsProtocol):
         new_status: TicketStatus,
         updated_by: UserId,
         last_status_updated_at: datetime,
+        assigned_to_user_id: int | None,
     ) -> TicketStatusLog:
         now = datetime_now()
         time_after_last_status = now - last_status_updated_at
@@ -240,6 +248,7 @@ class TicketOperations(TicketOperationsProtocol):
         )
         self.session.add(status_log)
         await self.session.flush()
+        await self._statistics.add_status_log(status_log, assigned_to_user_id=assigned_to_user_id)
         return status_log
 
     async def count_tickets(
@@ -1,9 +1,12 @@
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.types import UserId
+from src.entities.chats import UnreadCounterDriftDTO, UnreadCountersDTO
 from src.entities.matches import ChatType
 from src.modules.storage.impl.query_builders.unread_counters import UnreadCountersQueryBuilder
 from src.modules.storage.interface.unread_counters import UnreadCountersOperationsProtocol
+from src.modules.storage.models import ChatMembership
 
 
 class UnreadCountersOperations(UnreadCountersOperationsProtocol):
@@ -53,3 +56,52 @@ class UnreadCountersOperations(UnreadCountersOperationsProtocol):
             result[match_id] = unread_count
 
         return result
+
+    async def get_unread_counters(self, user_id: UserId) -> UnreadCountersDTO:
+        query_builder = UnreadCountersQueryBuilder(user_id=user_id)
+        query_result = await self.session.execute(query_builder.build_unread_counters_query())
+
+        counters = UnreadCountersDTO(
+            by_chat={},
+            by_match={},
+            by_chat_type={chat_type: 0 for chat_type in ChatType},
+            total=0,
+        )
+        for chat_id, chat_type, match_id, unread_count in query_result.tuples():
+            counters.by_chat[chat_id] = unread_count
+            counters.total += unread_count
+            if chat_type in (ChatType.PERSONAL, ChatType.TICKET):
+                counters.by_chat_type[chat_type] += unread_count
+            if match_id is not None:
+                counters.by_match[match_id] = counters.by_match.get(match_id, 0) + unread_count
+                counters.by_chat_type[ChatType.MATCH] += unread_count
+
+        return counters
+
+    async def find_unread_counters_drift(self, after_id: int, limit: int) -> tuple[list[UnreadCounterDriftDTO], int]:
+        query = UnreadCountersQueryBuilder.build_unread_counters_drift_query(after_id=after_id, limit=limit)
+        rows = (await self.session.execute(query)).all()
+
+        drift = [
+            UnreadCounterDriftDTO(
+                membership_id=row.id,
+                user_id=row.user_id,
+                chat_id=row.chat_id,
+                match_id=row.match_id,
+                stored_count=row.unread_count,
+                actual_count=row.actual_count,
+            )
+            for row in rows
+            if row.unread_count != row.actual_count
+        ]
+        last_id = rows[-1].id if len(rows) == limit else 0
+        return drift, last_id
+
+    async def fix_unread_counters(self, drift: list[UnreadCounterDriftDTO]) -> None:
+        if not drift:
+            return
+
+        await self.session.execute(
+            update(ChatMembership),
+            [{"id": item.membership_id, "unread_count": item.actual_count} for item in drift],
+        )
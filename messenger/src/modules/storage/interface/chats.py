@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Protocol
+from typing import Iterable, Protocol
 
 from src.core.types import UserId
 from src.entities.chats import ChatBaseInfoDTO, ChatInfo, ChatMembershipDetailsDTO, ChatMeta
@@ -13,6 +13,10 @@ class ChatOperationsProtocol(Protocol):
         """Returns the version of the chat with the specified id"""
         ...
 
+    async def get_chat_versions(self, chat_ids: Iterable[int]) -> dict[int, int]:
+        """Returns versions of the existing chats with the specified ids"""
+        ...
+
     async def update_chat_version(self, chat_id: int) -> None:
         """Updates the version of the chat to the new one"""
         ...
@@ -16,6 +16,10 @@ class PushNotificationConfigsOperationsProtocol(Protocol):
 
     async def get_configs_for_user(self, user_id: int) -> list[PushNotificationConfig]: ...
 
+    async def get_configs_for_users(self, user_ids: list[int]) -> dict[int, list[PushNotificationConfig]]: ...
+
+    async def remove_configs_by_device_ids(self, device_ids: list[str]) -> None: ...
+
     async def invalidate_configs(self, user_id: int) -> None: ...
 
     async def get_and_mark_as_alive(self, device_id: str) -> PushNotificationConfig | None: ...
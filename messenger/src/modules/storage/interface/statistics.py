@@ -1,13 +1,27 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Protocol
 
 from src.entities.statistics import TicketStatistics
+from src.modules.storage.models.ticket import TicketStatusLog
 
 
 class StatsOperationsProtocol(Protocol):
     async def get_ticket_stats(
+        self,
+        for_user: int | None,
+        date_from: date,
+        date_to: date,
+    ) -> TicketStatistics: ...
+
+    async def get_ticket_stats_raw(
         self,
         for_user: int | None,
         date_from: datetime,
         date_to: datetime,
     ) -> TicketStatistics: ...
+
+    async def rebuild_ticket_stats(self, date_from: date, date_to: date) -> None: ...
+
+    async def add_status_log(self, status_log: TicketStatusLog, assigned_to_user_id: int | None) -> None: ...
+
+    async def move_ticket_stats(self, ticket_id: int, from_user_id: int | None, to_user_id: int | None) -> None: ...
@@ -1,4 +1,4 @@
-from typing import AsyncContextManager, Protocol
+from typing import AsyncContextManager, Awaitable, Callable, Protocol
 
 from src.core.common import SupportsLifespan
 from src.core.common.utility import SupportsHealthCheck
@@ -32,3 +32,5 @@ class StorageProtocol(Protocol):
 
 class StorageServiceProto(SupportsLifespan, SupportsHealthCheck, Protocol):
     def connect(self, autocommit: bool = False) -> AsyncContextManager[StorageProtocol]: ...
+
+    def on_chat_versions_changed(self, hook: Callable[[set[int]], Awaitable[None]]) -> None: ...
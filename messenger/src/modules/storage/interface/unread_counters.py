@@ -1,6 +1,7 @@
 from typing import Protocol
 
 from src.core.types import UserId
+from src.entities.chats import UnreadCounterDriftDTO, UnreadCountersDTO
 from src.entities.matches import ChatType
 
 
@@ -18,3 +19,16 @@ class UnreadCountersOperationsProtocol(Protocol):
     async def get_unread_count_by_match(self, user_id: UserId, match_id: int) -> int: ...
 
     async def get_unread_count_by_matches(self, user_id: UserId, match_ids: list[int]) -> dict[int, int]: ...
+
+    async def get_unread_counters(self, user_id: UserId) -> UnreadCountersDTO:
+        """Returns all unread counters of the user with a single query"""
+        ...
+
+    async def find_unread_counters_drift(self, after_id: int, limit: int) -> tuple[list[UnreadCounterDriftDTO], int]:
+        """
+        Compares stored counters of `limit` memberships after `after_id` with the ones calculated from messages.
+        Returns found differences and the last checked membership id (0 if there are no more memberships)
+        """
+        ...
+
+    async def fix_unread_counters(self, drift: list[UnreadCounterDriftDTO]) -> None: ...
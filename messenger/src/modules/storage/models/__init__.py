@@ -3,6 +3,7 @@ from src.modules.storage.models.match import Match, MatchScout, Sport
 from src.modules.storage.models.message import Message
 from src.modules.storage.models.push_notification import PushNotificationConfig
 from src.modules.storage.models.reaction import UserReaction
+from src.modules.storage.models.statistics import TicketStatsDaily, TicketStatsSolved
 from src.modules.storage.models.ticket import Ticket, TicketStatusLog
 from src.modules.storage.models.upload import FileUpload
 from src.modules.storage.models.user import User
@@ -17,6 +18,8 @@ __all__ = (
     "Sport",
     "Ticket",
     "TicketStatusLog",
+    "TicketStatsDaily",
+    "TicketStatsSolved",
     "User",
     "FileUpload",
     "UserReaction",
@@ -42,6 +42,7 @@ class ChatMembership(Base):
     has_read_permission: Mapped[bool] = mapped_column(Boolean, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     is_archive_member: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     __tablename__ = "chat_membership"
     __table_args__ = (
@@ -0,0 +1,43 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.modules.storage.models.base import Base
+
+UNASSIGNED_USER_ID = 0
+
+
+class TicketStatsDaily(Base):
+    """
+    Ticket status log counters per assignee and day (UTC), tickets without assignee use UNASSIGNED_USER_ID
+    """
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    day: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
+
+    returned_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    first_response_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    first_response_time_sum: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="in seconds"
+    )
+    solve_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    solve_time_sum: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="in seconds"
+    )
+
+    __tablename__ = "ticket_stats_daily"
+
+
+class TicketStatsSolved(Base):
+    """
+    Days on which a ticket was solved or confirmed, kept separately because solved tickets
+    are counted distinct over the whole range and can't be summed from daily counters
+    """
+
+    ticket_id: Mapped[int] = mapped_column(Integer, ForeignKey("tickets.id"), primary_key=True, nullable=False)
+    day: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_ticket_stats_solved_user_id_day", "user_id", "day"),)
+    __tablename__ = "ticket_stats_solved"
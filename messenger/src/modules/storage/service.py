@@ -1,14 +1,16 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, cast
+from typing import AsyncGenerator, Awaitable, Callable, cast
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from src.core.common import ProtectedProperty
+from src.core.logger import get_logger
 from src.modules.storage.helpers import (
     autocommit_session,
     create_engine,
     create_session,
+    pop_changed_chat_versions,
 )
 from src.modules.storage.impl import (
     ChatOperations,
@@ -25,23 +27,39 @@ from src.modules.storage.impl import (
 from src.modules.storage.interface import StorageProtocol, StorageServiceProto
 from src.modules.storage.settings import DatabaseSettings
 
+ChatVersionsHook = Callable[[set[int]], Awaitable[None]]
+
 
 class Storage(StorageProtocol):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, chat_versions_hooks: list[ChatVersionsHook] | None = None) -> None:
         self._session = session
+        self._chat_versions_hooks = chat_versions_hooks or []
         self.chats = ChatOperations(session)
         self.messages = MessageOperations(session)
         self.matches = MatchOperations(session)
         self.common = CommonOperations(session)
-        self.tickets = TicketOperations(session)
+        self.statistics = StatisticsOperations(session)
+        self.tickets = TicketOperations(session, statistics=self.statistics)
         self.users = UserOperations(session)
         self.file_uploads = FileUploadsOperations(session)
         self.unread_counters = UnreadCountersOperations(session)
-        self.statistics = StatisticsOperations(session)
         self.push_notifications = PushNotificationConfigsOperations(session)
 
     async def commit_transaction(self) -> None:
         await self._session.commit()
+        await self.notify_chat_versions_changed()
+
+    async def notify_chat_versions_changed(self) -> None:
+        """Runs hooks for chats whose version was bumped by committed statements"""
+        chat_ids = pop_changed_chat_versions(self._session)
+        if not chat_ids:
+            return
+
+        for hook in self._chat_versions_hooks:
+            try:
+                await hook(chat_ids)
+            except Exception:  # pylint: disable=broad-except
+                get_logger("storage").error("Chat versions hook failed", chat_ids=chat_ids, exc_info=True)
 
 
 class StorageService(StorageServiceProto):
@@ -50,6 +68,11 @@ class StorageService(StorageServiceProto):
 
     def __init__(self, settings: DatabaseSettings) -> None:
         self._settings = settings
+        self._chat_versions_hooks: list[ChatVersionsHook] = []
+
+    def on_chat_versions_changed(self, hook: ChatVersionsHook) -> None:
+        """Registers a hook called with ids of chats whose version was changed, after the change is committed"""
+        self._chat_versions_hooks.append(hook)
 
     async def health_check(self) -> bool:
         async with autocommit_session(self.sessionmaker) as session:
@@ -66,4 +89,10 @@ class StorageService(StorageServiceProto):
     async def connect(self, autocommit: bool = False) -> AsyncGenerator[Storage, None]:
         context_method = autocommit_session if autocommit else create_session
         async with context_method(self.sessionmaker) as session:
-            yield Storage(session)
+            storage = Storage(session, chat_versions_hooks=self._chat_versions_hooks)
+            try:
+                yield storage
+            finally:
+                if autocommit:
+                    # Every statement is committed on its own
+                    await storage.notify_chat_versions_changed()
@@ -0,0 +1,50 @@
+import struct
+from typing import Iterable, Iterator
+
+from sl_messenger_protobuf.updates_streamer_pb2 import UnreadCountersUpdate
+
+from src.core.types import UserId
+from src.entities.redis import RedisPubSubChannelName
+
+UNREAD_COUNTERS_SHARDS = 64
+
+_FRAME_HEADER = struct.Struct(">I")
+
+
+def unread_counters_shard(user_id: UserId) -> int:
+    return user_id % UNREAD_COUNTERS_SHARDS
+
+
+def unread_counters_channel(user_id: UserId) -> str:
+    """
+    Counter updates are published to one of UNREAD_COUNTERS_SHARDS channels instead of a channel per user
+    """
+    return RedisPubSubChannelName.UNREAD_COUNTERS_SHARD_UPDATES.format(shard=unread_counters_shard(user_id))
+
+
+def pack_unread_counters(updates: Iterable[UnreadCountersUpdate]) -> bytes:
+    """
+    Packs several updates into one pub/sub message, each update is prefixed with its length
+    """
+    frames = []
+    for update in updates:
+        data = update.SerializeToString()
+        frames.append(_FRAME_HEADER.pack(len(data)))
+        frames.append(data)
+    return b"".join(frames)
+
+
+def unpack_unread_counters(data: bytes) -> Iterator[UnreadCountersUpdate]:
+    offset = 0
+    while offset < len(data):
+        (length,) = _FRAME_HEADER.unpack_from(data, offset)
+        offset += _FRAME_HEADER.size
+        yield UnreadCountersUpdate.FromString(data[offset : offset + length])
+        offset += length
+
+
+def group_by_channel(updates: Iterable[UnreadCountersUpdate]) -> dict[str, list[UnreadCountersUpdate]]:
+    grouped: dict[str, list[UnreadCountersUpdate]] = {}
+    for update in updates:
+        grouped.setdefault(unread_counters_channel(update.user_id), []).append(update)
+    return grouped
@@ -46,6 +46,7 @@ class StreamerWebsocketHandler:
         self.subscriptions = StreamerSubscriptionsService(
             redis_settings=self.settings.redis,
             connections=self.connections,
+            coalesce_window=self.settings.counters_coalesce_window,
         )
 
     @asynccontextmanager
@@ -8,3 +8,4 @@ class UpdatesStreamerSettings(BaseModel):
     aud_whitelist: list[str]
     redis: RedisSettings
     unread_counters: UnreadCountersSettings
+    counters_coalesce_window: float = 0.05
@@ -1,19 +1,30 @@
+import asyncio
+
 from sl_messenger_protobuf.updates_streamer_pb2 import StreamerUpdate, UnreadCountersUpdate
 
 from src.core.common.redis import RedisListener, RedisSettings, create_redis_conn_pool
 from src.core.logger import get_logger
-from src.core.protobuf import pretty_format_pb
 from src.core.types import UserId
-from src.entities.redis import RedisPubSubChannelName
+from src.modules.unread_counters.streaming import unpack_unread_counters, unread_counters_channel
 
 from .interface import StreamerConnServiceProto, StreamerSubsServiceProto
 
 
 class StreamerSubscriptionsService(StreamerSubsServiceProto):
+    """
+    Delivers unread counter updates of subscribed users to streamer connections.
+
+    Updates come from sharded channels, a shard channel is subscribed while at least one
+    of its users is subscribed. Updates are coalesced per user during `coalesce_window`
+    seconds, only the latest counter of each user is sent to the connections.
+    Sends are done one at a time by a single flusher task.
+    """
+
     def __init__(
         self,
         redis_settings: RedisSettings,
         connections: StreamerConnServiceProto,
+        coalesce_window: float = 0.05,
     ) -> None:
         self.logger = get_logger("streamer_subs")
         self._connections = connections
@@ -23,6 +34,10 @@ class StreamerSubscriptionsService(StreamerSubsServiceProto):
         )
         self._is_started = False
         self._active_subs = set[UserId]()
+        self._channel_subs: dict[str, int] = {}
+        self._coalesce_window = coalesce_window
+        self._pending: dict[UserId, UnreadCountersUpdate] = {}
+        self._flusher: asyncio.Task[None] | None = None
 
     @property
     def is_started(self) -> bool:
@@ -35,19 +50,25 @@ class StreamerSubscriptionsService(StreamerSubsServiceProto):
         if user_id in self._active_subs:
             return
 
-        tpl = RedisPubSubChannelName.UNREAD_COUNTERS_UPDATES.format(user_id=user_id)
-        await self._listener.subscribe(tpl)
         self._active_subs.add(user_id)
-        self.logger.debug(f"Subscribed to {tpl}")
+        channel = unread_counters_channel(user_id)
+        self._channel_subs[channel] = self._channel_subs.get(channel, 0) + 1
+        if self._channel_subs[channel] == 1:
+            await self._listener.subscribe(channel)
+            self.logger.debug(f"Subscribed to {channel}")
 
     async def remove_sub(self, user_id: UserId) -> None:
         if user_id not in self._active_subs:
             return
 
-        tpl = RedisPubSubChannelName.UNREAD_COUNTERS_UPDATES.format(user_id=user_id)
-        await self._listener.unsubscribe(tpl)
         self._active_subs.remove(user_id)
-        self.logger.debug(f"Unsubscribed from {tpl}")
+        self._pending.pop(user_id, None)
+        channel = unread_counters_channel(user_id)
+        self._channel_subs[channel] -= 1
+        if not self._channel_subs[channel]:
+            del self._channel_subs[channel]
+            await self._listener.unsubscribe(channel)
+            self.logger.debug(f"Unsubscribed from {channel}")
 
     async def start(self) -> None:
         await self._listener.start()
@@ -56,23 +77,58 @@ class StreamerSubscriptionsService(StreamerSubsServiceProto):
 
     async def stop(self) -> None:
         await self._listener.stop()
+        if self._flusher:
+            self._flusher.cancel()
+            self._flusher = None
         self._is_started = False
         self._active_subs.clear()
+        self._channel_subs.clear()
+        self._pending.clear()
         self.logger.debug("Stopped")
 
     async def _handle_update(self, update: bytes) -> None:
         try:
-            msg = UnreadCountersUpdate.FromString(update)
+            messages = list(unpack_unread_counters(update))
         except Exception as exc:
             self.logger.error("Failed to parse update: %s", exc)
             return
 
-        self.logger.debug(f"Received update: {pretty_format_pb(msg)}")
-        user_id = msg.user_id
-        if not user_id:
-            self.logger.warning(f"Received update without user_id: {pretty_format_pb(update)}")
+        for msg in messages:
+            if not msg.user_id:
+                self.logger.warning("Received update without user_id")
+                continue
+
+            # Shard channels carry updates of other users too
+            if msg.user_id in self._active_subs:
+                self._pending[msg.user_id] = msg
+
+        if self._pending and self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """
+        The only running flusher sends pending updates until none are left,
+        so sends never overlap and an older counter can't overtake a newer one
+        """
+        try:
+            while True:
+                await asyncio.sleep(self._coalesce_window)
+                pending, self._pending = self._pending, {}
+                try:
+                    await self._send(pending)
+                except Exception:  # pylint: disable=broad-except
+                    # The flush runs detached from the listener, so nobody else would log the error
+                    self.logger.error("Error when sending counter updates", exc_info=True)
+                if not self._pending:
+                    break
+        finally:
+            self._flusher = None
+
+    async def _send(self, pending: dict[UserId, UnreadCountersUpdate]) -> None:
+        if not pending:
             return
 
-        for connection in self._connections.get_connections_with_online_users(user_ids=[user_id]):
-            self.logger.debug(f"Sending update to connection {connection}")
-            await connection.transport.send_message(StreamerUpdate(unread_counters_update=msg))
+        self.logger.debug(f"Sending {len(pending)} coalesced counter updates")
+        for connection in self._connections.get_connections_with_online_users(user_ids=list(pending)):
+            for user_id in connection.online_user_ids.intersection(pending):
+                await connection.transport.send_message(StreamerUpdate(unread_counters_update=pending[user_id]))
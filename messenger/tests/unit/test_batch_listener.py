@@ -0,0 +1,27 @@
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.core.common.rabbitmq import BatchQueueListener
+
+
+@pytest.mark.unit
+async def test_batch_rejects_only_failed_messages() -> None:
+    listener: BatchQueueListener[Any] = BatchQueueListener(
+        logger=Mock(),
+        channel=Mock(),
+        queue=Mock(),
+        consumer_tag=Mock(),
+    )
+    listener._batch_callback = AsyncMock(return_value={1})
+    messages = [AsyncMock() for _ in range(3)]
+    listener._pending = [(message, index) for index, message in enumerate(messages)]
+
+    await listener._flush()
+
+    listener._batch_callback.assert_awaited_once_with([0, 1, 2])
+    messages[0].ack.assert_awaited_once()
+    messages[1].reject.assert_awaited_once_with(requeue=False)
+    messages[1].ack.assert_not_awaited()
+    messages[2].ack.assert_awaited_once()
@@ -0,0 +1,28 @@
+import pickle
+from array import array
+
+import pytest
+
+from src.modules.chat_members import ChatMembers
+
+
+@pytest.mark.unit
+def test_chat_members_lookup() -> None:
+    members = ChatMembers(chat_id=1, version=3, user_ids=array("q", sorted([42, 7, 15, 100500])))
+
+    assert len(members) == 4
+    assert members.to_list() == [7, 15, 42, 100500]
+    for user_id in (7, 15, 42, 100500):
+        assert user_id in members
+    for user_id in (0, 8, 43, 100501):
+        assert user_id not in members
+
+
+@pytest.mark.unit
+def test_chat_members_pickle_roundtrip() -> None:
+    members = ChatMembers(chat_id=1, version=3, user_ids=array("q", [1, 2, 3]))
+
+    restored = pickle.loads(pickle.dumps(members))  # noqa: S301
+
+    assert restored == members
+    assert 2 in restored
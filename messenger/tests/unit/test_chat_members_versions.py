@@ -0,0 +1,100 @@
+from contextlib import asynccontextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.modules.chat_members.service import ChatMembersCacheKey, ChatMembersCacheService
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+
+    async def get(self, key: str) -> int | None:
+        return self.values.get(key)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+    def register_script(self, _source: str):
+        async def set_many_if_greater(args: list) -> int:
+            # Mirrors set_many_if_greater.lua
+            for key, value in zip(args[1::2], args[2::2], strict=True):
+                if key not in self.values or self.values[key] < value:
+                    self.values[key] = value
+            return 1
+
+        return set_many_if_greater
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.versions: dict[int, int] = {}
+        self.on_read = None
+        self.chats = Mock(get_chat_version=self._get_chat_version, get_chat_versions=self._get_chat_versions)
+
+    def on_chat_versions_changed(self, _hook) -> None:
+        pass
+
+    @asynccontextmanager
+    async def connect(self, autocommit: bool = False):
+        yield self
+
+    async def _get_chat_version(self, chat_id: int) -> int | None:
+        version = self.versions.get(chat_id)
+        if self.on_read:
+            on_read, self.on_read = self.on_read, None
+            await on_read()
+        return version
+
+    async def _get_chat_versions(self, chat_ids: set[int]) -> dict[int, int]:
+        return {chat_id: self.versions[chat_id] for chat_id in chat_ids if chat_id in self.versions}
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def storage() -> FakeStorage:
+    return FakeStorage()
+
+
+@pytest.fixture
+def service(redis: FakeRedis, storage: FakeStorage) -> ChatMembersCacheService:
+    settings = Mock(version_ttl=30, memory_cache_maxsize=10, members_ttl=30)
+    with patch("src.modules.chat_members.service.create_redis_conn_pool", return_value=redis):
+        return ChatMembersCacheService(settings=settings, storage=storage)  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+async def test_invalidation_between_read_and_write(
+    service: ChatMembersCacheService, redis: FakeRedis, storage: FakeStorage
+) -> None:
+    storage.versions[1] = 5
+
+    async def commit_new_version() -> None:
+        # The version is bumped and committed after the reader has loaded the old one
+        storage.versions[1] = 6
+        await service.invalidate_many({1})
+
+    storage.on_read = commit_new_version
+
+    assert await service.get_version(1) == 5
+    assert redis.values[ChatMembersCacheKey.VERSION.format(chat_id=1)] == 6
+    assert await service.get_version(1) == 6
+
+
+@pytest.mark.unit
+async def test_invalidate_many_drops_deleted_chats(
+    service: ChatMembersCacheService, redis: FakeRedis, storage: FakeStorage
+) -> None:
+    storage.versions[1] = 3
+    redis.values[ChatMembersCacheKey.VERSION.format(chat_id=1)] = 2
+    redis.values[ChatMembersCacheKey.VERSION.format(chat_id=2)] = 7
+
+    await service.invalidate_many({1, 2})
+
+    assert redis.values == {ChatMembersCacheKey.VERSION.format(chat_id=1): 3}
@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+from src.entities.redis import RedisPubSubChannelName
+from src.modules.chat.updates_router import ChatUpdatesRouter
+
+
+class _FakeListener:
+    def __init__(self) -> None:
+        self.handlers: dict[str, Callable[[bytes], Any]] = {}
+
+    async def subscribe(self, channel_name: str, handler: Callable[[bytes], Any]) -> None:
+        self.handlers[channel_name] = handler
+
+    async def unsubscribe(self, channel_name: str) -> None:
+        self.handlers.pop(channel_name, None)
+
+    def publish(self, cid: str, data: bytes) -> None:
+        self.handlers[RedisPubSubChannelName.CONNECTION_UPDATES.format(connection_id=cid)](data)
+
+
+class _FakeTransport:
+    def __init__(self, block: bool = False) -> None:
+        self.sent: list[Any] = []
+        self.closed: tuple[int, str] | None = None
+        self._unblocked = asyncio.Event()
+        if not block:
+            self._unblocked.set()
+
+    async def send_message(self, message: Any) -> None:
+        await self._unblocked.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int, reason: str) -> None:
+        self.closed = (code, reason)
+
+
+def _make_router(listener: _FakeListener, queue_size: int = 4) -> ChatUpdatesRouter:
+    return ChatUpdatesRouter(
+        settings=SimpleNamespace(updates_queue_size=queue_size),  # type: ignore
+        listener=listener,  # type: ignore
+        decode=lambda data: data,  # type: ignore
+    )
+
+
+@pytest.mark.unit
+async def test_routes_updates_by_connection_id() -> None:
+    listener = _FakeListener()
+    router = _make_router(listener)
+    first, second = _FakeTransport(), _FakeTransport()
+
+    async with router.route("cid-1", first), router.route("cid-2", second):  # type: ignore
+        listener.publish("cid-1", b"a")
+        listener.publish("cid-2", b"b")
+        listener.publish("cid-1", b"c")
+        await asyncio.sleep(0)
+
+        assert first.sent == [b"a", b"c"]
+        assert second.sent == [b"b"]
+        assert router.connections_count == 2
+
+    assert router.connections_count == 0
+    assert not listener.handlers
+
+
+@pytest.mark.unit
+async def test_slow_consumer_is_evicted() -> None:
+    listener = _FakeListener()
+    router = _make_router(listener, queue_size=2)
+    slow, fast = _FakeTransport(block=True), _FakeTransport()
+
+    async with router.route("slow", slow), router.route("fast", fast):  # type: ignore
+        for i in range(5):
+            listener.publish("slow", bytes([i]))
+            listener.publish("fast", bytes([i]))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert slow.closed is not None
+        assert slow.closed[1] == "Slow consumer"
+        assert fast.closed is None
+        assert len(fast.sent) == 5
@@ -0,0 +1,23 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.modules.storage.helpers import mark_chat_versions_changed
+from src.modules.storage.service import Storage
+
+
+@pytest.mark.unit
+async def test_chat_versions_hooks_run_after_commit() -> None:
+    session = Mock(info={}, commit=AsyncMock())
+    hook = AsyncMock()
+    storage = Storage(session, chat_versions_hooks=[hook])
+
+    mark_chat_versions_changed(session, [1, 2])
+    mark_chat_versions_changed(session, [2, 3])
+    hook.assert_not_awaited()
+
+    await storage.commit_transaction()
+    hook.assert_awaited_once_with({1, 2, 3})
+
+    await storage.commit_transaction()
+    hook.assert_awaited_once()
@@ -0,0 +1,34 @@
+from typing import Any
+
+import pytest
+
+from src.entities.users import Role
+from src.modules.chat.interface import LocalConnectionInfo
+from src.modules.connections.local import LocalConnections
+
+
+def _connection(cid: str, user_id: int, role: Role, ip: str | None) -> LocalConnectionInfo:
+    transport: Any = None
+    return LocalConnectionInfo(cid=cid, user_id=user_id, user_role=role, transport=transport, ip=ip)
+
+
+@pytest.mark.unit
+def test_local_connections_indexes() -> None:
+    connections = LocalConnections()
+    first = _connection("a", 1, Role.SUPERVISOR, "10.0.0.1")
+    second = _connection("b", 1, Role.SUPERVISOR, "10.0.0.2")
+    third = _connection("c", 2, Role.SCOUT, "10.0.0.1")
+    for connection in (first, second, third):
+        connections.add_connection(connection)
+
+    assert connections.active_connections_count == 3
+    assert connections.connected_users_count == 2
+    assert connections.get_connections(include_user_ids=[1, 3]) == {1: [first, second]}
+    assert connections.get_connections_count_by_ip("10.0.0.1") == 2
+
+    connections.remove_connection(first)
+    connections.remove_connection(third)
+
+    assert connections.active_connections_count == 1
+    assert connections.get_connections(include_user_ids=[1, 2]) == {1: [second]}
+    assert connections.get_connections_count_by_ip("10.0.0.1") == 0
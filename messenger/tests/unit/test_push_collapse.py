@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.modules.push_notifications.listener import PushNotificationsListener
+
+
+def _notification(device_id: str, topic: str | None, content: str) -> Any:
+    return SimpleNamespace(device_id=device_id, topic=topic, content=content)
+
+
+@pytest.mark.unit
+def test_collapse_keeps_latest_per_device_and_topic() -> None:
+    notifications = [
+        _notification("a", "chat-1", "first"),
+        _notification("b", "chat-1", "other device"),
+        _notification("a", "chat-2", "other chat"),
+        _notification("a", "chat-1", "second"),
+        _notification("a", None, "ticket 1"),
+        _notification("a", None, "ticket 2"),
+    ]
+
+    collapsed = PushNotificationsListener._collapse(notifications)  # noqa: SLF001
+
+    assert [n.content for n in collapsed] == ["other device", "other chat", "second", "ticket 1", "ticket 2"]
@@ -21,7 +21,7 @@ class PatternTestEnum(PatternStrEnum):
         (UnreadCountCacheKey.BY_CHAT_TYPE, {"user_id": 5, "chat_type": "group"}),
         (UnreadCountCacheKey.TOTAL, {"user_id": 6}),
         (RedisPubSubChannelName.CONNECTION_UPDATES, {"connection_id": 7}),
-        (RedisPubSubChannelName.UNREAD_COUNTERS_UPDATES, {"user_id": 8}),
+        (RedisPubSubChannelName.UNREAD_COUNTERS_SHARD_UPDATES, {"shard": 8}),
         (PatternTestEnum.A, {"arg_a": 1, "arg_b": 2, "arg_c": 3}),
         (PatternTestEnum.B, {"a": 1, "b": 2, "c": 3, "d": 4}),
         (PatternTestEnum.C, {"arg_a": 1}),
@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sl_messenger_protobuf.updates_streamer_pb2 import UnreadCountersUpdate
+
+from src.modules.unread_counters.streaming import pack_unread_counters
+from src.modules.updates_streamer.subscriptions import StreamerSubscriptionsService
+
+
+class SlowTransport:
+    def __init__(self) -> None:
+        self.sent: list[int] = []
+        self.sending = False
+        self.overlapped = False
+
+    async def send_message(self, message) -> None:
+        self.overlapped = self.overlapped or self.sending
+        self.sending = True
+        await asyncio.sleep(0.05)
+        self.sent.append(message.unread_counters_update.unread_count)
+        self.sending = False
+
+
+@pytest.mark.unit
+async def test_sends_do_not_overlap() -> None:
+    transport = SlowTransport()
+    connections = Mock()
+    connections.get_connections_with_online_users.return_value = [Mock(online_user_ids={1}, transport=transport)]
+    with (
+        patch("src.modules.updates_streamer.subscriptions.create_redis_conn_pool"),
+        patch("src.modules.updates_streamer.subscriptions.RedisListener", return_value=AsyncMock()),
+    ):
+        service = StreamerSubscriptionsService(redis_settings=Mock(), connections=connections, coalesce_window=0.01)
+    await service.add_sub(1)
+
+    await service._handle_update(pack_unread_counters([UnreadCountersUpdate(user_id=1, unread_count=1)]))
+    await asyncio.sleep(0.03)  # the first counter is being sent
+    await service._handle_update(pack_unread_counters([UnreadCountersUpdate(user_id=1, unread_count=2)]))
+    await asyncio.sleep(0.15)
+
+    assert not transport.overlapped
+    assert transport.sent == [1, 2]
+    assert service._flusher is None
@@ -0,0 +1,21 @@
+import pytest
+
+from src.entities.tickets import TicketStatus
+from src.modules.storage.impl.statistics import status_log_counters
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    argnames=["old_status", "new_status", "expected"],
+    argvalues=[
+        (TicketStatus.NEW, TicketStatus.IN_PROGRESS, {"first_response_count": 1, "first_response_time_sum": 30}),
+        (TicketStatus.IN_PROGRESS, TicketStatus.SOLVED, {"solve_count": 1, "solve_time_sum": 30}),
+        (TicketStatus.NEW, TicketStatus.SOLVED, {"solve_count": 1, "solve_time_sum": 30}),
+        (TicketStatus.SOLVED, TicketStatus.IN_PROGRESS, {"returned_count": 1}),
+        (TicketStatus.SOLVED, TicketStatus.CONFIRMED, {}),
+    ],
+)
+def test_status_log_counters(old_status: TicketStatus, new_status: TicketStatus, expected: dict[str, int]) -> None:
+    counters = status_log_counters(old_status, new_status, time_after_last_status=30)
+
+    assert {name: value for name, value in counters.items() if value} == expected
@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.entities.matches import ChatType
+from src.modules.storage.impl.unread_counters import UnreadCountersOperations
+
+
+@pytest.mark.unit
+async def test_unread_counters_are_aggregated_from_memberships() -> None:
+    rows = [
+        (1, ChatType.PERSONAL, None, 2),
+        (2, ChatType.MATCH, 100, 3),
+        (3, ChatType.TICKET, 100, 4),
+        (4, ChatType.MATCH, 200, 0),
+    ]
+    session = Mock()
+    session.execute = AsyncMock(return_value=Mock(tuples=Mock(return_value=rows)))
+
+    counters = await UnreadCountersOperations(session).get_unread_counters(user_id=1)
+
+    assert counters.total == 9
+    assert counters.by_chat == {1: 2, 2: 3, 3: 4, 4: 0}
+    assert counters.by_match == {100: 7, 200: 0}
+    assert counters.by_chat_type[ChatType.PERSONAL] == 2
+    assert counters.by_chat_type[ChatType.TICKET] == 4
+    assert counters.by_chat_type[ChatType.MATCH] == 7
+    session.execute.assert_awaited_once()
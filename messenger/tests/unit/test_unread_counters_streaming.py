@@ -0,0 +1,35 @@
+import pytest
+from sl_messenger_protobuf.updates_streamer_pb2 import UnreadCountersUpdate
+
+from src.modules.unread_counters.streaming import (
+    UNREAD_COUNTERS_SHARDS,
+    group_by_channel,
+    pack_unread_counters,
+    unpack_unread_counters,
+    unread_counters_channel,
+)
+
+
+@pytest.mark.unit
+def test_pack_unpack_roundtrip() -> None:
+    updates = [UnreadCountersUpdate(user_id=user_id) for user_id in (1, 2, 3)]
+
+    unpacked = list(unpack_unread_counters(pack_unread_counters(updates)))
+
+    assert unpacked == updates
+
+
+@pytest.mark.unit
+def test_empty_pack() -> None:
+    assert not list(unpack_unread_counters(pack_unread_counters([])))
+
+
+@pytest.mark.unit
+def test_group_by_channel_uses_shards() -> None:
+    updates = [UnreadCountersUpdate(user_id=user_id) for user_id in (1, 1 + UNREAD_COUNTERS_SHARDS, 2)]
+
+    grouped = group_by_channel(updates)
+
+    assert unread_counters_channel(1) == unread_counters_channel(1 + UNREAD_COUNTERS_SHARDS)
+    assert [update.user_id for update in grouped[unread_counters_channel(1)]] == [1, 1 + UNREAD_COUNTERS_SHARDS]
+    assert [update.user_id for update in grouped[unread_counters_channel(2)]] == [2]